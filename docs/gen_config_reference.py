@@ -56,6 +56,7 @@ _FIELD_DOCS: dict[str, str] = {
     # tasks
     "tasks.root": "Override task workspace root directory",
     "tasks.name_categories": "Word categories for auto-generated task names (string or list of strings)",
+    "tasks.workspace_seed": "Seed new task workspaces from the gate on the host: ``off``, ``full``, ``shallow`` or ``template``",
     # gate
     "gate.path": "Override git gate (mirror) path",
     # gatekeeping
@@ -67,6 +68,16 @@ _FIELD_DOCS: dict[str, str] = {
     "gatekeeping.auto_sync.branches": "Branch names to auto-sync",
     # run
     "run.shutdown_timeout": "Seconds to wait before SIGKILL on container stop",
+    "run.warm_pool": "Pre-initialized headless containers kept ready for ``terokctl run`` (0 = off)",
+    "run.idle_timeout": "Seconds a task may sit idle before its container is stopped (0 = never)",
+    "run.idle_cpu_percent": "CPU use (% of one core) below which a container counts as idle",
+    "run.resources.cpus": "CPUs a task container may use (``podman run --cpus``), e.g. ``2`` or ``0.5``",
+    "run.resources.cpuset": "Host CPUs a task container may run on (``--cpuset-cpus``), e.g. ``0-3,8``",
+    "run.resources.memory": "Memory limit of a task container (``--memory``), e.g. ``4g``",
+    "run.resources.memory_swap": "Memory plus swap limit (``--memory-swap``); ``-1`` for unlimited swap",
+    "run.resources.pids_limit": "Maximum processes in a task container (``--pids-limit``); ``-1`` for unlimited",
+    "run.resources.blkio_weight": "Block I/O weight of a task container, 10-1000 (``--blkio-weight``)",
+    "run.hooks.background": "Hooks run by the background hook runner instead of blocking the command, e.g. ``[post_start, post_stop]`` (``post_*`` hooks only)",
     "run.gpus": 'GPU passthrough: ``true``, ``"all"``, or omit to disable',
     # shield
     "shield.drop_on_task_start": "Drop shield (bypass firewall) when task container starts",
@@ -90,6 +101,24 @@ _FIELD_DOCS: dict[str, str] = {
     "tui.default_tmux": "Default to tmux mode when launching the TUI",
     # logs
     "logs.partial_streaming": "Enable typewriter-effect streaming for log viewing",
+    "logs.persist": "Append task container logs to the host continuously while tasks run",
+    "logs.segment_mb": "Rotate a task's live log into a gzip segment at this size (0 = never)",
+    "logs.max_task_mb": "Per-task log cap; oldest compressed segments are dropped (0 = unlimited)",
+    # archive
+    "archive.max_age_days": "``archive gc`` removes task archives and deleted-project tarballs older than this (0 = keep)",
+    "archive.max_total_mb": "Per-project archive size cap; oldest archives go first (0 = unlimited)",
+    "archive.keep_last": "Newest archives kept per project (0 = unlimited)",
+    "archive.bundle_after_days": "Pack task archives older than this into monthly bundles (0 = never)",
+    "archive.gc_on_start": "Run ``archive gc`` in the background when the TUI starts",
+    # queue
+    "queue.max_running": "Queued tasks wait while this many task containers run (0 = unlimited)",
+    "queue.max_running_per_project": "Per-project cap on running task containers (0 = unlimited)",
+    "queue.max_cpus": "CPU budget shared by queue-launched tasks (0 = unlimited)",
+    "queue.max_memory_mb": "Memory budget in MiB shared by queue-launched tasks (0 = unlimited)",
+    "queue.task_cpus": "CPUs a queued task requests unless overridden at submission",
+    "queue.task_memory_mb": "Memory in MiB a queued task requests unless overridden",
+    # hooks (global)
+    "hooks.background": "Hooks run by the background hook runner in every project (``run.hooks.background`` overrides)",
     # shield (global)
     "shield.bypass_firewall_no_protection": "**Dangerous**: disable egress firewall entirely",
     "shield.profiles": "Named shield profiles for per-project firewall rules",
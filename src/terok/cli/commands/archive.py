@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Archive maintenance commands: retention and compaction (``archive gc``)."""
+
+from __future__ import annotations
+
+import argparse
+
+from ...lib.domain.facade import gc_archives
+from ...lib.util.fs import format_size
+from ._completers import complete_project_ids as _complete_project_ids, set_completer
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    """Register the ``archive`` command group."""
+    p = subparsers.add_parser("archive", help="Maintain task archives and deleted-project tarballs")
+    sub = p.add_subparsers(dest="archive_cmd", required=True)
+    p_gc = sub.add_parser(
+        "gc",
+        help="Apply the archive.* retention rules and pack old task archives into monthly bundles",
+    )
+    set_completer(
+        p_gc.add_argument("project_id", nargs="?", help="Only collect this project's task archive"),
+        _complete_project_ids,
+    )
+    p_gc.add_argument(
+        "--dry-run", action="store_true", help="Show what would be removed without removing it"
+    )
+
+
+def dispatch(args: argparse.Namespace) -> bool:
+    """Handle archive commands.  Returns True if handled."""
+    if args.cmd != "archive":
+        return False
+    if args.archive_cmd == "gc":
+        _cmd_gc(args.project_id, dry_run=args.dry_run)
+    return True
+
+
+def _cmd_gc(project_id: str | None, *, dry_run: bool) -> None:
+    """Run an archive collection and print what it did."""
+    report = gc_archives(project_id, dry_run=dry_run)
+    if report is None:
+        raise SystemExit("Another archive gc is already running")
+    for label in report.removed:
+        print(f"  - {label}")
+    verb = ("Would remove", "would pack") if dry_run else ("Removed", "packed")
+    print(
+        f"{verb[0]} {len(report.removed)} archive(s), freeing {format_size(report.freed_bytes)}; "
+        f"{verb[1]} {report.bundled} task archive(s) into monthly bundles."
+    )
@@ -6,10 +6,13 @@
 from __future__ import annotations
 
 import argparse
+import sys
+import time
 
 from ...lib.core.projects import derive_project, list_presets, list_projects, load_project
 from ...lib.domain.facade import delete_project, find_projects_sharing_gate
 from ...lib.domain.wizards.new_project import run_wizard
+from ...lib.util.fs import format_size
 from ._completers import complete_project_ids as _complete_project_ids, set_completer
 from .setup import cmd_project_init
 
@@ -96,6 +99,54 @@ def dispatch(args: argparse.Namespace) -> bool:
     return False
 
 
+class _ArchiveProgress:
+    """Progress line for project archiving, redrawn in place on a terminal."""
+
+    _INTERVAL = 0.2
+
+    def __init__(self) -> None:
+        """Start the clock."""
+        self._start = time.monotonic()
+        self._end: float | None = None
+        self._shown = 0.0
+        self._done = 0
+        self._total = 0
+        self._tty = sys.stderr.isatty()
+
+    def _elapsed(self) -> float:
+        """Return the seconds from the start to the last file archived."""
+        return (self._end or time.monotonic()) - self._start
+
+    def _rate(self) -> float:
+        """Return the bytes archived per second so far."""
+        elapsed = self._elapsed()
+        return self._done / elapsed if elapsed > 0 else 0.0
+
+    def __call__(self, done: int, total: int) -> None:
+        """Record progress; redraw at most every :attr:`_INTERVAL` seconds."""
+        now = self._end = time.monotonic()
+        self._done, self._total = done, total
+        if not self._tty or now - self._shown < self._INTERVAL:
+            return
+        self._shown = now
+        pct = 100 * done // total if total else 100
+        sys.stderr.write(
+            f"\rArchiving: {pct:3d}% {format_size(done)} / {format_size(total)}"
+            f" ({format_size(self._rate())}/s)\x1b[K"
+        )
+        sys.stderr.flush()
+
+    def finish(self) -> None:
+        """Clear the progress line."""
+        if self._tty and self._shown:
+            sys.stderr.write("\r\x1b[K")
+            sys.stderr.flush()
+
+    def summary(self) -> str:
+        """Return the archived size, duration and throughput."""
+        return f"{format_size(self._done)} in {self._elapsed():.1f}s, {format_size(self._rate())}/s"
+
+
 def _cmd_project_delete(project_id: str, *, force: bool = False) -> None:
     """Delete a project after confirmation (unless --force)."""
     project = load_project(project_id)
@@ -116,7 +167,7 @@ def _cmd_project_delete(project_id: str, *, force: bool = False) -> None:
 
     archive_dir = deleted_projects_dir()
     print("\nWARNING: All project data will be permanently deleted.")
-    print("Project config, task data, and build artifacts will be archived at:")
+    print("Project config and task data will be archived at:")
     print(f"{archive_dir}")
 
     if not force:
@@ -129,11 +180,13 @@ def _cmd_project_delete(project_id: str, *, force: bool = False) -> None:
             print("Deletion cancelled.")
             return
 
-    result = delete_project(pid)
+    progress = _ArchiveProgress()
+    result = delete_project(pid, progress=progress)
+    progress.finish()
 
     print(f"\nProject '{pid}' deleted.")
     if result.get("archive"):
-        print(f"Archive: {result['archive']}")
+        print(f"Archive: {result['archive']} ({progress.summary()})")
     if result["deleted"]:
         print("Removed:")
         for path in result["deleted"]:
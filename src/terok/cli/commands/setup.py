@@ -15,6 +15,7 @@ from ...lib.domain.facade import (
     build_images,
     generate_dockerfiles,
     maybe_pause_for_ssh_key_registration,
+    refresh_workspace_template,
 )
 from ...lib.domain.project import make_git_gate, make_ssh_manager
 from ._completers import complete_project_ids as _complete_project_ids, set_completer
@@ -134,6 +135,9 @@ def dispatch(args: argparse.Namespace) -> bool:
             f"Gate ready at {res['path']} "
             f"(upstream: {res['upstream_url']}; created: {res['created']})"
         )
+        project = load_project(args.project_id)
+        if project.workspace_seed == "template" and refresh_workspace_template(project):
+            print("Workspace template refreshed.")
         return True
     if args.cmd == "project-init":
         cmd_project_init(args.project_id)
@@ -4,7 +4,9 @@
 """Health check and reconciliation command (DS9-themed diagnostic bay).
 
 Runs a series of checks and reports their status.  With ``--fix``,
-auto-remediates issues like unfired post_stop hooks.
+auto-remediates issues like unfired post_stop hooks (found in the hook
+journal, or in the ``hooks_fired`` metadata of tasks that predate it) and
+background hooks whose runner died.
 
 Scoping:
 - ``terokctl sickbay`` — all projects
@@ -20,25 +22,40 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import json
 import sys
-from pathlib import Path
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 from terok_sandbox import (
     check_units_outdated,
-    get_container_state,
     get_server_status,
     is_systemd_available,
 )
 
 from ...lib.core.project_model import ProjectConfig
 from ...lib.core.projects import list_projects, load_project
-from ...lib.orchestration.hooks import run_hook
-from ...lib.orchestration.tasks import container_name, tasks_meta_dir
+from ...lib.orchestration.hook_journal import HookRecord, last_hooks_by_task, pending_hook_runs
+from ...lib.orchestration.hooks import BACKGROUND_HOOK_CONCURRENCY, run_hook, run_pending_hooks
+from ...lib.orchestration.tasks import container_name, get_container_states, tasks_meta_dir
 from ...lib.util.yaml import load as _yaml_load
 
 # Type alias for check results: (severity, label, detail)
 _CheckResult = tuple[str, str, str]
 
+#: Hooks whose journal record marks a task as started.
+_START_HOOKS = ("pre_start", "post_start", "post_ready")
+
+#: Age after which a queued background hook counts as abandoned.
+_PENDING_GRACE_SECONDS = 300
+
+#: Projects whose hook journals are scanned at once.
+_SCAN_WORKERS = 8
+
+#: Missed post_stop hooks reconciled at once with ``--fix``.
+_FIX_WORKERS = BACKGROUND_HOOK_CONCURRENCY
+
 
 def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
     """Register the ``sickbay`` subcommand."""
@@ -46,6 +63,7 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     p.add_argument("project", nargs="?", help="Scope to a single project")
     p.add_argument("task", nargs="?", help="Scope to a single task")
     p.add_argument("--fix", action="store_true", help="Auto-remediate issues")
+    p.add_argument("--json", action="store_true", help="Print a JSON report with per-check timings")
 
 
 def dispatch(args: argparse.Namespace) -> bool:
@@ -56,6 +74,7 @@ def dispatch(args: argparse.Namespace) -> bool:
         project_id=getattr(args, "project", None),
         task_id=getattr(args, "task", None),
         fix=getattr(args, "fix", False),
+        json_output=getattr(args, "json", False),
     )
     return True
 
@@ -76,58 +95,97 @@ def _check_gate_server() -> _CheckResult:
     return ("warn", label, "not running — run 'terokctl gate start'")
 
 
-def _check_task_hook(
-    pid: str, tid: str, project: ProjectConfig, *, fix: bool
-) -> _CheckResult | None:
-    """Check a single task for unfired post_stop hook.  Returns None if ok."""
-    meta_path = tasks_meta_dir(pid) / f"{tid}.yml"
-    if not meta_path.is_file():
-        return None
-
-    try:
-        meta = _yaml_load(meta_path.read_text()) or {}
-    except Exception:
-        return ("warn", f"Task {pid}/{tid}", f"bad metadata: {meta_path}")
+def _check_task_hook(hooks: dict[str, HookRecord], states: dict[str, str]) -> HookRecord | None:
+    """Check a single task for unfired post_stop hook.  Returns None if ok.
 
-    mode = meta.get("mode")
-    if not mode:
+    *hooks* maps hook names to the task's latest journal records and
+    *states* maps container names to their podman state.  A task needs
+    reconciling when it reached a start hook after its last post_stop and
+    its container is no longer running; its latest start record is returned.
+    """
+    started = [hooks[h] for h in _START_HOOKS if h in hooks]
+    if not started:
         return None
-
-    cname = container_name(pid, mode, tid)
-    if get_container_state(cname) == "running":
+    last_start = max(started, key=lambda r: r.ts)
+    stopped = hooks.get("post_stop")
+    if stopped is not None and stopped.ts >= last_start.ts:
         return None
-
-    fired = meta.get("hooks_fired") or []
-    if "post_stop" in fired:
+    if states.get(last_start.cname) == "running":
         return None
+    return last_start
 
-    label = f"Task {pid}/{tid}"
-    if not fix:
-        return ("warn", label, "stopped without post_stop hook — run with --fix to reconcile")
-
-    return _reconcile_post_stop(pid, tid, mode, cname, project, meta_path, label)
 
+def _legacy_hooks(project_id: str, task_id: str) -> dict[str, HookRecord]:
+    """Return the hooks a task recorded in its metadata before the hook journal.
 
-def _reconcile_post_stop(
-    pid: str,
-    tid: str,
-    mode: str,
-    cname: str,
-    project: ProjectConfig,
-    meta_path: Path,
-    label: str,
-) -> _CheckResult:
-    """Run the missed post_stop hook and return the result."""
+    Such tasks list the hook points they reached in ``hooks_fired``; they
+    are mapped to records of one timestamp, so a listed ``post_stop``
+    covers every start.  Tasks without the list (or a mode) yield ``{}``.
+    """
+    meta_path = tasks_meta_dir(project_id) / f"{task_id}.yml"
+    try:
+        meta = _yaml_load(meta_path.read_text()) or {}
+    except Exception:
+        return {}
+    fired, mode = meta.get("hooks_fired"), meta.get("mode")
+    if not isinstance(fired, list) or not mode:
+        return {}
+    hooks = [h for h in fired if h in _START_HOOKS or h == "post_stop"]
+    if not set(hooks) & set(_START_HOOKS):
+        hooks.append("pre_start")  # a task with a mode was started
+    ts = meta_path.stat().st_mtime
+    cname = container_name(project_id, mode, task_id)
+    return {
+        hook: HookRecord(
+            run_id=f"legacy-{task_id}-{hook}",
+            project_id=project_id,
+            task_id=task_id,
+            hook=hook,
+            mode=mode,
+            cname=cname,
+            state="ok",
+            ts=ts,
+        )
+        for hook in hooks
+    }
+
+
+def _scan_project(
+    project: ProjectConfig, task_id: str | None, states: dict[str, str]
+) -> list[HookRecord]:
+    """Return the start records of the project's tasks missing a post_stop hook.
+
+    Tasks with no journal records fall back to their ``hooks_fired`` metadata
+    (see :func:`_legacy_hooks`).
+    """
+    by_task = last_hooks_by_task(project.id)
+    if task_id is None:
+        meta_ids = {f.stem for f in tasks_meta_dir(project.id).glob("*.yml")}
+        task_ids = sorted(by_task.keys() | meta_ids)
+    else:
+        task_ids = [task_id]
+    for tid in task_ids:
+        if tid not in by_task:
+            by_task[tid] = _legacy_hooks(project.id, tid)
+    return [
+        rec
+        for tid in task_ids
+        if (rec := _check_task_hook(by_task.get(tid, {}), states)) is not None
+    ]
+
+
+def _reconcile_post_stop(project: ProjectConfig, record: HookRecord) -> _CheckResult:
+    """Run the missed post_stop hook of *record*'s task and return the result."""
+    label = f"Task {record.project_id}/{record.task_id}"
     try:
         run_hook(
             "post_stop",
             project.hook_post_stop,
-            project_id=pid,
-            task_id=tid,
-            mode=mode,
-            cname=cname,
-            task_dir=project.tasks_root / tid,
-            meta_path=meta_path,
+            project_id=record.project_id,
+            task_id=record.task_id,
+            mode=record.mode,
+            cname=record.cname,
+            task_dir=project.tasks_root / record.task_id,
         )
         return ("ok", label, "post_stop hook reconciled")
     except Exception as exc:
@@ -137,28 +195,55 @@ def _reconcile_post_stop(
 def _check_unfired_hooks(
     project_id: str | None, task_id: str | None, *, fix: bool
 ) -> list[_CheckResult]:
-    """Check for stopped tasks with unfired post_stop hooks."""
-    results: list[_CheckResult] = []
-
-    if project_id:
-        projects = [(project_id, load_project(project_id))]
-    else:
-        projects = [(p.id, p) for p in list_projects()]
+    """Check the hook journal for stopped tasks with unfired post_stop hooks.
+
+    Container states come from one podman query; projects are scanned
+    concurrently and, with *fix*, missed hooks run in a bounded pool.
+    """
+    projects = [load_project(project_id)] if project_id else list_projects()
+    projects = [p for p in projects if p.hook_post_stop]
+    if not projects:
+        return []
+    states = get_container_states()
+    if states is None:
+        return [("error", "Container states", "podman query failed — hook checks skipped")]
+
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+        scans = list(pool.map(lambda p: _scan_project(p, task_id, states), projects))
+    missed = [(project, rec) for project, recs in zip(projects, scans, strict=True) for rec in recs]
 
-    for pid, project in projects:
-        if not project.hook_post_stop:
-            continue
-        meta_dir = tasks_meta_dir(pid)
-        if not meta_dir.is_dir():
-            continue
-
-        task_ids = [f.stem for f in meta_dir.glob("*.yml")] if task_id is None else [task_id]
-        for tid in task_ids:
-            result = _check_task_hook(pid, tid, project, fix=fix)
-            if result:
-                results.append(result)
-
-    return results
+    if not fix:
+        return [
+            (
+                "warn",
+                f"Task {rec.project_id}/{rec.task_id}",
+                "stopped without post_stop hook — run with --fix to reconcile",
+            )
+            for _, rec in missed
+        ]
+    with ThreadPoolExecutor(max_workers=_FIX_WORKERS) as pool:
+        return list(pool.map(lambda m: _reconcile_post_stop(*m), missed))
+
+
+def _check_pending_hooks(project_id: str | None, *, fix: bool) -> list[_CheckResult]:
+    """Check for background hooks that stayed queued past the grace period.
+
+    A pending run normally finishes within seconds; one older than
+    :data:`_PENDING_GRACE_SECONDS` means its runner died.  With *fix*, the
+    queued runs are executed in this process.
+    """
+    cutoff = time.time() - _PENDING_GRACE_SECONDS
+    stale = [r for r in pending_hook_runs(project_id) if r.ts < cutoff]
+    if not stale:
+        return []
+    label = "Background hooks"
+    if not fix:
+        detail = f"{len(stale)} queued hook(s) not run — run with --fix to run them"
+        return [("warn", label, detail)]
+    ran = run_pending_hooks()
+    if not ran:
+        return [("warn", label, "another hook runner is active — check again later")]
+    return [("ok", label, f"ran {ran} queued hook(s)")]
 
 
 _GLOBAL_CHECKS = [
@@ -181,27 +266,71 @@ def _update_worst(current: str, status: str) -> str:
     return "ok"
 
 
+def _run_checks(
+    checks: list[tuple[str, Callable[[], list[_CheckResult]]]],
+) -> list[tuple[str, float, list[_CheckResult]]]:
+    """Run named *checks*; returns ``(name, seconds, results)`` for each."""
+    timed = []
+    for name, check in checks:
+        start = time.perf_counter()
+        results = check()
+        timed.append((name, time.perf_counter() - start, results))
+    return timed
+
+
+def _json_report(timed: list[tuple[str, float, list[_CheckResult]]], worst: str) -> str:
+    """Render the check results and their timings as a JSON report."""
+    return json.dumps(
+        {
+            "status": worst,
+            "duration_ms": round(sum(t for _, t, _ in timed) * 1000, 1),
+            "checks": [
+                {
+                    "name": name,
+                    "duration_ms": round(seconds * 1000, 1),
+                    "results": [
+                        {"status": status, "label": label, "detail": detail}
+                        for status, label, detail in results
+                    ],
+                }
+                for name, seconds, results in timed
+            ],
+        },
+        indent=2,
+    )
+
+
 def _cmd_sickbay(
     project_id: str | None = None,
     task_id: str | None = None,
     fix: bool = False,
+    json_output: bool = False,
 ) -> None:
     """Run health checks and report results."""
-    worst = "ok"
-
+    checks: list[tuple[str, Callable[[], list[_CheckResult]]]] = []
     if not task_id:
-        for check in _GLOBAL_CHECKS:
-            status, label, detail = check()
-            print(f"  {label} .... {_STATUS_MARKERS.get(status, status)} ({detail})")
-            worst = _update_worst(worst, status)
+        checks += [
+            (check.__name__.removeprefix("_check_"), lambda check=check: [check()])
+            for check in _GLOBAL_CHECKS
+        ]
+    checks.append(("unfired_hooks", lambda: _check_unfired_hooks(project_id, task_id, fix=fix)))
+    if not task_id:
+        checks.append(("pending_hooks", lambda: _check_pending_hooks(project_id, fix=fix)))
 
-    hook_results = _check_unfired_hooks(project_id, task_id, fix=fix)
-    for status, label, detail in hook_results:
-        print(f"  {label} .... {_STATUS_MARKERS.get(status, status)} ({detail})")
-        worst = _update_worst(worst, status)
+    timed = _run_checks(checks)
+    worst = "ok"
+    for _, _, results in timed:
+        for status, _, _ in results:
+            worst = _update_worst(worst, status)
 
-    if not hook_results and task_id:
-        print(f"  Task {project_id}/{task_id} .... ok (consistent)")
+    if json_output:
+        print(_json_report(timed, worst))
+    else:
+        for _, _, results in timed:
+            for status, label, detail in results:
+                print(f"  {label} .... {_STATUS_MARKERS.get(status, status)} ({detail})")
+        if task_id and not any(results for _, _, results in timed):
+            print(f"  Task {project_id}/{task_id} .... ok (consistent)")
 
     if worst == "error":
         sys.exit(2)
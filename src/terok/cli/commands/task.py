@@ -6,17 +6,46 @@
 from __future__ import annotations
 
 import argparse
+import re
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 
 from terok_agent import PROVIDER_NAMES as _PROVIDER_NAMES
 
 from ...lib.core.config import get_logs_partial_streaming as _get_logs_partial_streaming
 from ...lib.domain.facade import (
+    DU_SORT_KEYS,
+    RESOURCE_LIMIT_KEYS,
+    BulkOutcome,
+    FollowAllOptions,
     HeadlessRunRequest,
+    LogSearchOptions,
     LogViewOptions,
+    ResourceLimits,
+    cancel_queued,
+    drain_warm_pool,
+    enqueue_headless,
+    fill_warm_pool,
+    follow_project_logs,
     get_tasks as _get_tasks,
+    get_warm_pool,
+    is_queue_drainer_running,
+    list_queue,
+    load_batch_file,
+    parse_resource_limits,
+    resume_queue_drainer,
+    run_batch,
+    run_queue_drainer,
+    search_task_logs,
+    select_tasks,
+    start_queue_drainer,
+    stop_idle_tasks,
     task_archive_list,
     task_archive_logs,
     task_delete,
+    task_delete_many,
+    task_du,
     task_followup_headless,
     task_list,
     task_login,
@@ -29,7 +58,11 @@ from ...lib.domain.facade import (
     task_run_toad,
     task_status,
     task_stop,
+    task_stop_many,
+    task_top,
 )
+from ...lib.util.log_store import iter_log_text
+from ...lib.util.timings import launch_timings, span
 from ._completers import complete_project_ids as _complete_project_ids, set_completer
 
 
@@ -54,10 +87,71 @@ def _add_project_arg(parser: argparse.ArgumentParser, **kwargs: object) -> None:
     set_completer(parser.add_argument("project_id", **kwargs), _complete_project_ids)
 
 
-def _add_project_task_args(parser: argparse.ArgumentParser) -> None:
+def _add_project_task_args(parser: argparse.ArgumentParser, **kwargs: object) -> None:
     """Add ``project_id`` and ``task_id`` positionals with completers."""
     _add_project_arg(parser)
-    set_completer(parser.add_argument("task_id"), _complete_task_ids)
+    set_completer(parser.add_argument("task_id", **kwargs), _complete_task_ids)
+
+
+_AGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def _parse_age(text: str) -> float:
+    """Parse an age like ``90m``, ``12h`` or ``7d`` into seconds (argparse type)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", text.lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid age {text!r} (e.g. 90m, 12h, 7d, 2w)")
+    return float(match[1]) * _AGE_UNITS[match[2]]
+
+
+def _parse_since(text: str) -> datetime:
+    """Parse an age (``7d``) or an ISO date/time (``2026-03-01``) into a time (argparse type)."""
+    try:
+        return datetime.now(tz=UTC) - timedelta(seconds=_parse_age(text))
+    except argparse.ArgumentTypeError:
+        pass
+    try:
+        return datetime.fromisoformat(text.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid time {text!r} (an age like 7d or a date like 2026-03-01)"
+        ) from None
+
+
+def _parse_limit(text: str) -> tuple[str, str]:
+    """Parse a ``KEY=VALUE`` container limit (argparse type)."""
+    key, sep, value = text.partition("=")
+    key = key.strip().replace("-", "_")
+    if not sep or key not in RESOURCE_LIMIT_KEYS or not value.strip():
+        raise argparse.ArgumentTypeError(
+            f"invalid limit {text!r} (KEY=VALUE with KEY one of {', '.join(RESOURCE_LIMIT_KEYS)})"
+        )
+    return key, value.strip()
+
+
+def _resource_override(args: argparse.Namespace) -> ResourceLimits | None:
+    """Return the ``--limit`` overrides of a run, or ``None`` if there are none."""
+    limits = getattr(args, "limits", None)
+    if not limits:
+        return None
+    return parse_resource_limits(dict(limits), "--limit")
+
+
+def _add_bulk_selectors(parser: argparse.ArgumentParser) -> None:
+    """Add an optional ``task_id`` plus ``--all``/``--status``/``--older-than`` selectors."""
+    _add_project_task_args(parser, nargs="?")
+    parser.add_argument("--all", action="store_true", help="Select every task of the project")
+    parser.add_argument(
+        "--status",
+        dest="select_status",
+        help="Select tasks by status (e.g. completed, failed, stopped)",
+    )
+    parser.add_argument(
+        "--older-than",
+        type=_parse_age,
+        metavar="AGE",
+        help="Select tasks unchanged for longer than AGE (e.g. 12h, 7d)",
+    )
 
 
 def _add_restriction_flags(parser: argparse.ArgumentParser) -> None:
@@ -86,6 +180,16 @@ def _resolve_unrestricted(args: argparse.Namespace) -> bool | None:
     return None
 
 
+def _add_timings_flag(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--timings`` flag that prints per-phase launch durations."""
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print how long each launch phase took "
+        "(set TEROK_TRACE_DIR to also write a Chrome trace)",
+    )
+
+
 def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
     """Register task-related subcommands."""
     # login (top-level shortcut)
@@ -97,7 +201,7 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         "run", help="Run an agent headlessly in a new task (autopilot mode)"
     )
     _add_project_arg(p_run, help="Project ID")
-    p_run.add_argument("prompt", help="Task prompt for the agent")
+    p_run.add_argument("prompt", nargs="?", help="Task prompt for the agent")
     p_run.add_argument(
         "--provider",
         choices=list(_PROVIDER_NAMES),
@@ -128,6 +232,52 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         help="Path to instructions file (overrides config stack)",
     )
     _add_restriction_flags(p_run)
+    _add_timings_flag(p_run)
+    p_run.add_argument(
+        "--limit",
+        dest="limits",
+        action="append",
+        type=_parse_limit,
+        metavar="KEY=VALUE",
+        help="Container limit overriding run.resources and the preset, e.g. memory=4g "
+        "(repeatable; keys: cpus, cpuset, memory, memory_swap, pids_limit, blkio_weight)",
+    )
+    p_run.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Run every prompt in a YAML batch file instead of a single PROMPT",
+    )
+    p_run.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum concurrently running batch tasks (default: 4)",
+    )
+    p_run.add_argument(
+        "--summary",
+        metavar="FILE",
+        help="Write the batch summary (exit codes, durations, costs) as JSON",
+    )
+    queue_group = p_run.add_argument_group("queue")
+    queue_group.add_argument(
+        "--queue",
+        action="store_true",
+        help="Queue the task and start it once the configured queue limits allow",
+    )
+    queue_group.add_argument(
+        "--cpus",
+        type=float,
+        default=None,
+        help="CPUs the queued task counts against queue.max_cpus (default: queue.task_cpus)",
+    )
+    queue_group.add_argument(
+        "--memory-mb",
+        type=int,
+        default=None,
+        help="Memory the queued task counts against queue.max_memory_mb "
+        "(default: queue.task_memory_mb)",
+    )
 
     # task subcommand group
     p_task = subparsers.add_parser("task", help="Manage tasks")
@@ -155,6 +305,32 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         help="Filter by agent preset name",
     )
 
+    t_du = tsub.add_parser("du", help="Show disk usage per task")
+    set_completer(
+        t_du.add_argument(
+            "--project", dest="project_id", help="Only tasks of this project (default: all)"
+        ),
+        _complete_project_ids,
+    )
+    t_du.add_argument(
+        "--sort",
+        choices=DU_SORT_KEYS,
+        default="id",
+        help="Order by task ID (default) or by size, largest first",
+    )
+    t_du.add_argument(
+        "--rescan", action="store_true", help="Walk every directory again, ignoring the cache"
+    )
+
+    t_top = tsub.add_parser("top", help="Show live CPU, memory and I/O of running tasks")
+    set_completer(
+        t_top.add_argument(
+            "--project", dest="project_id", help="Only tasks of this project (default: all)"
+        ),
+        _complete_project_ids,
+    )
+    t_top.add_argument("--once", action="store_true", help="Print one sample and exit")
+
     t_run_cli = tsub.add_parser("run-cli", help="Run task in CLI (codex agent) mode")
     _add_project_task_args(t_run_cli)
     t_run_cli.add_argument(
@@ -166,6 +342,7 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     )
     t_run_cli.add_argument("--preset", help="Name of a preset to apply (global or project-level)")
     _add_restriction_flags(t_run_cli)
+    _add_timings_flag(t_run_cli)
 
     t_run_toad = tsub.add_parser("run-toad", help="Run Toad multi-agent TUI (browser access)")
     _add_project_task_args(t_run_toad)
@@ -178,12 +355,17 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     )
     t_run_toad.add_argument("--preset", help="Name of a preset to apply (global or project-level)")
     _add_restriction_flags(t_run_toad)
+    _add_timings_flag(t_run_toad)
 
-    t_delete = tsub.add_parser("delete", help="Delete a task and its containers")
-    _add_project_task_args(t_delete)
+    t_delete = tsub.add_parser(
+        "delete", help="Delete a task (or tasks matching selectors) and its containers"
+    )
+    _add_bulk_selectors(t_delete)
 
-    t_stop = tsub.add_parser("stop", help="Gracefully stop a running task container")
-    _add_project_task_args(t_stop)
+    t_stop = tsub.add_parser(
+        "stop", help="Gracefully stop a running task container (or all matching selectors)"
+    )
+    _add_bulk_selectors(t_stop)
     t_stop.add_argument(
         "--timeout",
         type=int,
@@ -191,8 +373,20 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         help="Seconds before SIGKILL (overrides project run.shutdown_timeout, default 10)",
     )
 
+    t_idle = tsub.add_parser(
+        "idle", help="List tasks idle past run.idle_timeout (and stop them with --stop)"
+    )
+    set_completer(
+        t_idle.add_argument(
+            "--project", dest="project_id", help="Only tasks of this project (default: all)"
+        ),
+        _complete_project_ids,
+    )
+    t_idle.add_argument("--stop", action="store_true", help="Stop the idle tasks, recording why")
+
     t_restart = tsub.add_parser("restart", help="Restart a stopped task or re-run if gone")
     _add_project_task_args(t_restart)
+    _add_timings_flag(t_restart)
 
     t_followup = tsub.add_parser(
         "followup", help="Follow up on a completed/failed headless task with a new prompt"
@@ -225,6 +419,7 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     t_start.add_argument("--preset", help="Name of a preset to apply (global or project-level)")
     t_start.add_argument("--name", help="Human-readable task name (slug-style, e.g. fix-auth-bug)")
     _add_restriction_flags(t_start)
+    _add_timings_flag(t_start)
 
     t_rename = tsub.add_parser("rename", help="Rename a task")
     _add_project_task_args(t_rename)
@@ -234,8 +429,19 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     _add_project_task_args(t_status)
 
     t_logs = tsub.add_parser("logs", help="View formatted container logs for a task")
-    _add_project_task_args(t_logs)
+    _add_project_arg(t_logs)
+    set_completer(
+        t_logs.add_argument(
+            "task_id", nargs="?", help="Task ID (optional with --grep: search all tasks)"
+        ),
+        _complete_task_ids,
+    )
     t_logs.add_argument("-f", "--follow", action="store_true", help="Follow live output")
+    t_logs.add_argument(
+        "--follow-all",
+        action="store_true",
+        help="Follow every running task of the project in one view (omit task_id)",
+    )
     t_logs.add_argument(
         "--raw", action="store_true", help="Show raw podman output (bypass formatting)"
     )
@@ -253,12 +459,74 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         default=None,
         help="Disable partial streaming (show coalesced messages only)",
     )
+    grep_group = t_logs.add_argument_group("search")
+    grep_group.add_argument(
+        "--grep",
+        metavar="PATTERN",
+        default=None,
+        help="Show only lines matching PATTERN (regex) across the selected task(s)",
+    )
+    grep_group.add_argument(
+        "-i", "--ignore-case", action="store_true", help="Case-insensitive --grep"
+    )
+    grep_group.add_argument(
+        "-F", "--fixed-strings", action="store_true", help="Treat the --grep pattern as a literal"
+    )
+    grep_group.add_argument(
+        "-C",
+        "--context",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Show N lines of context around each --grep match",
+    )
+    grep_group.add_argument(
+        "-m",
+        "--max-count",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Stop after N matching lines per task",
+    )
+    grep_group.add_argument(
+        "--archived",
+        action="store_true",
+        help="Search the project's archived (deleted) task logs instead",
+    )
+
+    t_queue = tsub.add_parser("queue", help="Inspect and manage queued headless tasks")
+    queue_sub = t_queue.add_subparsers(dest="queue_cmd", required=True)
+
+    t_queue_list = queue_sub.add_parser("list", help="List queued tasks in launch order")
+    _add_project_arg(t_queue_list, nargs="?", help="Only show this project's queued tasks")
+
+    t_queue_cancel = queue_sub.add_parser("cancel", help="Remove a task from the queue")
+    _add_project_task_args(t_queue_cancel)
+
+    queue_sub.add_parser("drain", help="Drain the queue in the foreground until it is empty")
+
+    t_pool = tsub.add_parser("pool", help="Manage the project's warm pool of headless containers")
+    pool_sub = t_pool.add_subparsers(dest="pool_cmd", required=True)
+    _add_project_arg(
+        pool_sub.add_parser("status", help="List warm containers waiting to be claimed")
+    )
+    _add_project_arg(pool_sub.add_parser("fill", help="Top the pool up to run.warm_pool"))
+    _add_project_arg(pool_sub.add_parser("drain", help="Remove all warm containers"))
 
     t_archive = tsub.add_parser("archive", help="View archived (deleted) tasks")
     archive_sub = t_archive.add_subparsers(dest="archive_cmd", required=True)
 
     t_archive_list = archive_sub.add_parser("list", help="List archived tasks")
     _add_project_arg(t_archive_list)
+    t_archive_list.add_argument(
+        "--limit", type=int, metavar="N", help="Show only the newest N archived tasks"
+    )
+    t_archive_list.add_argument(
+        "--since",
+        type=_parse_since,
+        metavar="WHEN",
+        help="Show tasks archived since WHEN (an age like 7d, or a date like 2026-03-01)",
+    )
 
     t_archive_logs = archive_sub.add_parser("logs", help="View logs from an archived task")
     _add_project_arg(t_archive_logs)
@@ -274,6 +542,18 @@ def dispatch(args: argparse.Namespace) -> bool:
         task_login(args.project_id, args.task_id)
         return True
     if args.cmd == "run":
+        if getattr(args, "batch", None):
+            if getattr(args, "limits", None):
+                raise SystemExit("run: --limit does not apply with --batch (use a preset)")
+            _dispatch_run_batch(args)
+            return True
+        if not args.prompt:
+            raise SystemExit("run: a PROMPT or --batch FILE is required")
+        queued = getattr(args, "queue", False)
+        if not queued and (
+            getattr(args, "cpus", None) is not None or getattr(args, "memory_mb", None) is not None
+        ):
+            raise SystemExit("run: --cpus and --memory-mb only apply with --queue")
         # Read instructions file if provided via --instructions
         instructions_text = None
         instructions_path = getattr(args, "instructions", None)
@@ -294,29 +574,89 @@ def dispatch(args: argparse.Namespace) -> bool:
                     f"Failed to read instructions file {instructions_path}: {exc}"
                 ) from exc
 
-        task_run_headless(
-            HeadlessRunRequest(
-                project_id=args.project_id,
-                prompt=args.prompt,
-                config_path=getattr(args, "agent_config", None),
-                model=getattr(args, "model", None),
-                max_turns=getattr(args, "max_turns", None),
-                timeout=getattr(args, "timeout", None),
-                follow=not getattr(args, "no_follow", False),
-                agents=getattr(args, "selected_agents", None),
-                preset=getattr(args, "preset", None),
-                name=getattr(args, "name", None),
-                provider=getattr(args, "provider", None),
-                instructions=instructions_text,
-                unrestricted=_resolve_unrestricted(args),
-            )
+        request = HeadlessRunRequest(
+            project_id=args.project_id,
+            prompt=args.prompt,
+            config_path=getattr(args, "agent_config", None),
+            model=getattr(args, "model", None),
+            max_turns=getattr(args, "max_turns", None),
+            timeout=getattr(args, "timeout", None),
+            follow=not (queued or getattr(args, "no_follow", False)),
+            agents=getattr(args, "selected_agents", None),
+            preset=getattr(args, "preset", None),
+            name=getattr(args, "name", None),
+            provider=getattr(args, "provider", None),
+            instructions=instructions_text,
+            unrestricted=_resolve_unrestricted(args),
+            resources=_resource_override(args),
         )
+        if queued:
+            task_id = enqueue_headless(
+                request,
+                cpus=getattr(args, "cpus", None),
+                memory_mb=getattr(args, "memory_mb", None),
+            )
+            start_queue_drainer()
+            print(
+                f"Queued task {task_id}. Inspect with: terokctl task queue list {args.project_id}"
+            )
+            return True
+        with launch_timings("run", show=getattr(args, "timings", False)):
+            task_run_headless(request)
         return True
     if args.cmd == "task":
         return _dispatch_task_sub(args)
     return False
 
 
+def _dispatch_run_batch(args: argparse.Namespace) -> None:
+    """Handle ``run --batch FILE``: fan out headless runs, ``-j`` at a time."""
+    from pathlib import Path
+
+    if args.prompt:
+        raise SystemExit("run: give either a PROMPT or --batch FILE, not both")
+    if getattr(args, "queue", False):
+        raise SystemExit("run: --queue is not supported with --batch (use --jobs)")
+    if getattr(args, "no_follow", False):
+        raise SystemExit("run: --batch waits for its tasks and cannot be combined with --no-follow")
+    if getattr(args, "instructions", None):
+        raise SystemExit("run: --instructions is not supported with --batch")
+    if args.jobs < 1:
+        raise SystemExit("run: --jobs must be at least 1")
+    entries = load_batch_file(
+        Path(args.batch),
+        defaults={
+            "provider": getattr(args, "provider", None),
+            "preset": getattr(args, "preset", None),
+            "model": getattr(args, "model", None),
+            "max_turns": getattr(args, "max_turns", None),
+            "timeout": getattr(args, "timeout", None),
+            "agents": getattr(args, "selected_agents", None),
+            "config": getattr(args, "agent_config", None),
+            "unrestricted": _resolve_unrestricted(args),
+        },
+    )
+    summary = Path(args.summary) if getattr(args, "summary", None) else None
+    results = run_batch(args.project_id, entries, jobs=args.jobs, summary_path=summary)
+    failed = sum(not r.ok for r in results)
+    if failed:
+        raise SystemExit(f"{failed} of {len(results)} batch task(s) failed")
+
+
+def _dispatch_idle(args: argparse.Namespace) -> None:
+    """Run ``task idle``: report idle tasks, stopping them with ``--stop``."""
+    idle = stop_idle_tasks(args.project_id, dry_run=not args.stop)
+    if not idle:
+        print("No idle tasks")
+        return
+    for t in idle:
+        print(f"  {t.project_id}/{t.task_id}: {t.reason}")
+    if args.stop:
+        print(f"Stopped {len(idle)} idle task(s); logging in starts them again")
+    else:
+        print(f"{len(idle)} idle task(s); stop them with --stop")
+
+
 def _dispatch_task_sub(args: argparse.Namespace) -> bool:
     """Dispatch ``task <subcommand>`` to the right handler."""
     if args.task_cmd == "new":
@@ -328,29 +668,54 @@ def _dispatch_task_sub(args: argparse.Namespace) -> bool:
             mode=getattr(args, "filter_mode", None),
             agent=getattr(args, "filter_agent", None),
         )
+    elif args.task_cmd == "du":
+        task_du(args.project_id, sort=args.sort, rescan=args.rescan)
+    elif args.task_cmd == "top":
+        task_top(args.project_id, once=args.once)
     elif args.task_cmd == "run-cli":
-        task_run_cli(
-            args.project_id,
-            args.task_id,
-            agents=getattr(args, "selected_agents", None),
-            preset=getattr(args, "preset", None),
-            unrestricted=_resolve_unrestricted(args),
-        )
+        with launch_timings("run-cli", show=getattr(args, "timings", False)):
+            task_run_cli(
+                args.project_id,
+                args.task_id,
+                agents=getattr(args, "selected_agents", None),
+                preset=getattr(args, "preset", None),
+                unrestricted=_resolve_unrestricted(args),
+            )
     elif args.task_cmd == "run-toad":
-        task_run_toad(
-            args.project_id,
-            args.task_id,
-            agents=getattr(args, "selected_agents", None),
-            preset=getattr(args, "preset", None),
-            unrestricted=_resolve_unrestricted(args),
+        with launch_timings("run-toad", show=getattr(args, "timings", False)):
+            task_run_toad(
+                args.project_id,
+                args.task_id,
+                agents=getattr(args, "selected_agents", None),
+                preset=getattr(args, "preset", None),
+                unrestricted=_resolve_unrestricted(args),
+            )
+    elif args.task_cmd == "delete" and args.task_id is None:
+        _dispatch_bulk(
+            args,
+            "Deleted",
+            lambda ids, progress: task_delete_many(args.project_id, ids, progress=progress),
         )
     elif args.task_cmd == "delete":
+        _check_no_selectors(args)
         task_delete(args.project_id, args.task_id)
         print(f"Deleted task {args.task_id}. Archive: terokctl task archive list {args.project_id}")
+    elif args.task_cmd == "stop" and args.task_id is None:
+        _dispatch_bulk(
+            args,
+            "Stopped",
+            lambda ids, progress: task_stop_many(
+                args.project_id, ids, timeout=getattr(args, "timeout", None), progress=progress
+            ),
+        )
+    elif args.task_cmd == "idle":
+        _dispatch_idle(args)
     elif args.task_cmd == "stop":
+        _check_no_selectors(args)
         task_stop(args.project_id, args.task_id, timeout=getattr(args, "timeout", None))
     elif args.task_cmd == "restart":
-        task_restart(args.project_id, args.task_id)
+        with launch_timings("restart", show=getattr(args, "timings", False)):
+            task_restart(args.project_id, args.task_id)
     elif args.task_cmd == "followup":
         task_followup_headless(
             args.project_id,
@@ -359,18 +724,29 @@ def _dispatch_task_sub(args: argparse.Namespace) -> bool:
             follow=not getattr(args, "no_follow", False),
         )
     elif args.task_cmd == "start":
-        task_id = task_new(args.project_id, name=getattr(args, "name", None))
         selected = getattr(args, "selected_agents", None)
         preset = getattr(args, "preset", None)
         restriction = _resolve_unrestricted(args)
-        if getattr(args, "toad", False):
-            task_run_toad(
-                args.project_id, task_id, agents=selected, preset=preset, unrestricted=restriction
-            )
-        else:
-            task_run_cli(
-                args.project_id, task_id, agents=selected, preset=preset, unrestricted=restriction
-            )
+        toad = getattr(args, "toad", False)
+        with launch_timings("start", show=getattr(args, "timings", False)):
+            with span("task_new"):
+                task_id = task_new(args.project_id, name=getattr(args, "name", None))
+            if toad:
+                task_run_toad(
+                    args.project_id,
+                    task_id,
+                    agents=selected,
+                    preset=preset,
+                    unrestricted=restriction,
+                )
+            else:
+                task_run_cli(
+                    args.project_id,
+                    task_id,
+                    agents=selected,
+                    preset=preset,
+                    unrestricted=restriction,
+                )
     elif args.task_cmd == "rename":
         task_rename(args.project_id, args.task_id, args.name)
     elif args.task_cmd == "status":
@@ -383,6 +759,19 @@ def _dispatch_task_sub(args: argparse.Namespace) -> bool:
             stream = True
         else:
             stream = _get_logs_partial_streaming()
+        if getattr(args, "grep", None) is not None:
+            _dispatch_logs_search(args)
+            return True
+        if getattr(args, "follow_all", False):
+            if args.task_id:
+                raise SystemExit("--follow-all follows every running task; omit task_id")
+            follow_project_logs(
+                args.project_id,
+                FollowAllOptions(tail=args.tail if args.tail is not None else 20),
+            )
+            return True
+        if not args.task_id:
+            raise SystemExit("task_id is required unless --grep is given")
         task_logs(
             args.project_id,
             args.task_id,
@@ -393,6 +782,10 @@ def _dispatch_task_sub(args: argparse.Namespace) -> bool:
                 streaming=stream,
             ),
         )
+    elif args.task_cmd == "queue":
+        return _dispatch_queue_sub(args)
+    elif args.task_cmd == "pool":
+        return _dispatch_pool_sub(args)
     elif args.task_cmd == "archive":
         return _dispatch_archive_sub(args)
     else:
@@ -400,10 +793,142 @@ def _dispatch_task_sub(args: argparse.Namespace) -> bool:
     return True
 
 
+def _has_selectors(args: argparse.Namespace) -> bool:
+    """Return whether any bulk task selector was given."""
+    return bool(
+        getattr(args, "all", False)
+        or getattr(args, "select_status", None)
+        or getattr(args, "older_than", None) is not None
+    )
+
+
+def _check_no_selectors(args: argparse.Namespace) -> None:
+    """Reject bulk selectors combined with an explicit task ID."""
+    if _has_selectors(args):
+        raise SystemExit("Give either a task ID or --all/--status/--older-than, not both")
+
+
+def _dispatch_bulk(
+    args: argparse.Namespace,
+    verb: str,
+    run: Callable[[list[str], Callable[[BulkOutcome], None]], list[BulkOutcome]],
+) -> None:
+    """Select tasks, run a bulk operation with progress, and report the results."""
+    if not _has_selectors(args):
+        raise SystemExit("Give a task ID, or select tasks with --all, --status or --older-than")
+    tasks = select_tasks(
+        args.project_id,
+        status=getattr(args, "select_status", None),
+        older_than=getattr(args, "older_than", None),
+    )
+    if not tasks:
+        print("No tasks selected")
+        return
+
+    total = len(tasks)
+    done = 0
+    lock = threading.Lock()
+
+    def _progress(outcome: BulkOutcome) -> None:
+        """Print one line per finished task."""
+        nonlocal done
+        with lock:
+            done += 1
+            detail = f" ({outcome.detail})" if outcome.detail else ""
+            print(
+                f"  [{done}/{total}] task {outcome.task_id}: {outcome.status}{detail}", flush=True
+            )
+
+    outcomes = run([t.task_id for t in tasks], _progress)
+    counts = {s: sum(o.status == s for o in outcomes) for s in ("ok", "skipped", "failed")}
+    print(
+        f"{verb} {counts['ok']} of {total} task(s); "
+        f"{counts['skipped']} skipped, {counts['failed']} failed."
+    )
+    if counts["failed"]:
+        failed = ", ".join(o.task_id for o in outcomes if o.status == "failed")
+        raise SystemExit(f"Failed tasks: {failed}")
+
+
+def _dispatch_logs_search(args: argparse.Namespace) -> None:
+    """Run ``task logs --grep`` over one task, all tasks, or the archive."""
+    if getattr(args, "follow", False) or getattr(args, "follow_all", False):
+        raise SystemExit("--grep cannot be combined with --follow/--follow-all")
+    if args.context < 0:
+        raise SystemExit("--context must be >= 0")
+    if getattr(args, "archived", False) and args.task_id:
+        raise SystemExit("--archived searches the whole archive; omit task_id")
+    search_task_logs(
+        args.project_id,
+        LogSearchOptions(
+            pattern=args.grep,
+            ignore_case=args.ignore_case,
+            fixed=args.fixed_strings,
+            context=args.context,
+            max_matches=args.max_count,
+        ),
+        task_ids=[args.task_id] if args.task_id else None,
+        archived=getattr(args, "archived", False),
+        raw=getattr(args, "raw", False),
+    )
+
+
+def _dispatch_queue_sub(args: argparse.Namespace) -> bool:
+    """Dispatch ``task queue <subcommand>``."""
+    if args.queue_cmd == "list":
+        entries = list_queue(getattr(args, "project_id", None))
+        if not entries:
+            print("Queue is empty.")
+            return True
+        if resume_queue_drainer():
+            print("No queue drainer was running; started one.")
+        for pos, entry in enumerate(entries, 1):
+            prompt = str(entry.request.get("prompt") or "").splitlines()
+            summary = prompt[0][:60] if prompt else ""
+            print(
+                f"{pos:>3}. {entry.project_id}/{entry.task_id}  "
+                f"cpus={entry.cpus:g} mem={entry.memory_mb}M  {summary}"
+            )
+    elif args.queue_cmd == "cancel":
+        if not cancel_queued(args.project_id, args.task_id):
+            raise SystemExit(f"Task {args.task_id} of {args.project_id} is not queued")
+        print(f"Removed task {args.task_id} from the queue.")
+    elif args.queue_cmd == "drain":
+        if is_queue_drainer_running():
+            raise SystemExit("A queue drainer is already running")
+        launched = run_queue_drainer()
+        print(f"Queue drained; launched {launched} task(s).")
+    else:
+        return False
+    return True
+
+
+def _dispatch_pool_sub(args: argparse.Namespace) -> bool:
+    """Dispatch ``task pool <subcommand>``."""
+    if args.pool_cmd == "status":
+        pool = get_warm_pool(args.project_id)
+        if not pool:
+            print("Warm pool is empty.")
+            return True
+        for warm in pool:
+            state = "ready" if warm.ready else ("initializing" if warm.started else "starting")
+            mode = "unrestricted" if warm.unrestricted else "restricted"
+            print(f"{warm.task_id:>5}  {warm.cname}  {state}  {mode}")
+    elif args.pool_cmd == "fill":
+        started = fill_warm_pool(args.project_id)
+        print(f"Started {started} warm container(s).")
+    elif args.pool_cmd == "drain":
+        removed = drain_warm_pool(args.project_id)
+        print(f"Removed {removed} warm container(s).")
+    else:
+        return False
+    return True
+
+
 def _dispatch_archive_sub(args: argparse.Namespace) -> bool:
     """Dispatch ``task archive <subcommand>``."""
     if args.archive_cmd == "list":
-        task_archive_list(args.project_id)
+        task_archive_list(args.project_id, limit=args.limit, since=args.since)
     elif args.archive_cmd == "logs":
         log_file = task_archive_logs(args.project_id, args.archive_id)
         if log_file is None:
@@ -411,9 +936,8 @@ def _dispatch_archive_sub(args: argparse.Namespace) -> bool:
                 f"No archived logs found for prefix {args.archive_id!r}. "
                 f"Use 'terokctl task archive list {args.project_id}' to see available archives."
             )
-        with log_file.open("r", encoding="utf-8", errors="replace") as f:
-            for line in f:
-                print(line, end="")
+        for line in iter_log_text(log_file):
+            print(line)
     else:
         return False
     return True
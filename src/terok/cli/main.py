@@ -14,7 +14,18 @@ import argparse
 
 from ..lib.core.config import set_experimental
 from ..lib.core.version import format_version_string, get_version_info
-from .commands import completions, credentials, image, info, project, setup, shield, sickbay, task
+from .commands import (
+    archive,
+    completions,
+    credentials,
+    image,
+    info,
+    project,
+    setup,
+    shield,
+    sickbay,
+    task,
+)
 from .wiring import wire_dispatch, wire_group
 
 # Optional: bash completion via argcomplete
@@ -34,6 +45,7 @@ _DISPATCHERS = [
     wire_dispatch,
     shield.dispatch,
     sickbay.dispatch,
+    archive.dispatch,
     info.dispatch,
     completions.dispatch,
 ]
@@ -97,6 +109,7 @@ def main() -> None:
     image.register(sub)
     shield.register(sub)
     sickbay.register(sub)
+    archive.register(sub)
     info.register(sub)
     completions.register(sub)
 
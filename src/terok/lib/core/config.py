@@ -8,6 +8,7 @@ import logging
 import os
 import sys
 from collections.abc import Callable
+from dataclasses import dataclass
 from importlib import resources as _pkg_resources
 from pathlib import Path
 from typing import Any
@@ -304,6 +305,112 @@ def get_logs_partial_streaming() -> bool:
     return _load_validated().logs.partial_streaming
 
 
+def get_logs_persist() -> bool:
+    """Return whether task logs are tee'd to the host while tasks run (default True).
+
+    When disabled, logs are only captured when a task is deleted.
+
+    Global config (config.yml)::
+
+        logs:
+          persist: false  # no background log tee
+    """
+    return _load_validated().logs.persist
+
+
+def get_logs_segment_bytes() -> int:
+    """Return the size at which a task's live log is rotated (0 disables).
+
+    Rotated output is gzip-compressed into numbered segments.
+
+    Global config (config.yml)::
+
+        logs:
+          segment_mb: 16   # default
+    """
+    return _load_validated().logs.segment_mb * 1024 * 1024
+
+
+def get_logs_max_task_bytes() -> int:
+    """Return the per-task on-disk log cap, oldest segments dropped first (0 disables).
+
+    Global config (config.yml)::
+
+        logs:
+          max_task_mb: 512   # default
+    """
+    return _load_validated().logs.max_task_mb * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ArchiveRetention:
+    """Retention rules for task archives and deleted-project tarballs (0 = no limit)."""
+
+    max_age_days: int = 0
+    max_total_mb: int = 0
+    keep_last: int = 0
+    bundle_after_days: int = 30
+    gc_on_start: bool = False
+
+
+def get_archive_retention() -> ArchiveRetention:
+    """Return the rules ``terokctl archive gc`` enforces.
+
+    Global config (config.yml)::
+
+        archive:
+          max_age_days: 180       # remove archives older than this (0 = keep)
+          max_total_mb: 2048      # per project; oldest removed first (0 = unlimited)
+          keep_last: 200          # newest archives kept per project (0 = unlimited)
+          bundle_after_days: 30   # pack older task archives into monthly bundles (0 = never)
+          gc_on_start: false      # also collect garbage when the TUI starts
+    """
+    a = _load_validated().archive
+    return ArchiveRetention(
+        max_age_days=a.max_age_days,
+        max_total_mb=a.max_total_mb,
+        keep_last=a.keep_last,
+        bundle_after_days=a.bundle_after_days,
+        gc_on_start=a.gc_on_start,
+    )
+
+
+@dataclass(frozen=True)
+class QueueLimits:
+    """Capacity limits applied when draining the headless task queue (0 = unlimited)."""
+
+    max_running: int = 0
+    max_running_per_project: int = 0
+    max_cpus: float = 0.0
+    max_memory_mb: int = 0
+    task_cpus: float = 1.0
+    task_memory_mb: int = 2048
+
+
+def get_queue_limits() -> QueueLimits:
+    """Return the limits and default per-task requests for queued headless tasks.
+
+    Global config (config.yml)::
+
+        queue:
+          max_running: 8               # all terok task containers (0 = unlimited)
+          max_running_per_project: 3   # per project (0 = unlimited)
+          max_cpus: 16                 # CPU budget of queue-launched tasks (0 = unlimited)
+          max_memory_mb: 32768         # memory budget of queue-launched tasks (0 = unlimited)
+          task_cpus: 1                 # default CPUs requested per queued task
+          task_memory_mb: 2048         # default memory requested per queued task
+    """
+    q = _load_validated().queue
+    return QueueLimits(
+        max_running=q.max_running,
+        max_running_per_project=q.max_running_per_project,
+        max_cpus=q.max_cpus,
+        max_memory_mb=q.max_memory_mb,
+        task_cpus=q.task_cpus,
+        task_memory_mb=q.task_memory_mb,
+    )
+
+
 def get_task_name_categories() -> list[str] | None:
     """Return ``tasks.name_categories`` from global config, or ``None`` if unset.
 
@@ -374,6 +481,11 @@ def get_global_hooks() -> tuple[str | None, str | None, str | None, str | None]:
     return h.pre_start, h.post_start, h.post_ready, h.post_stop
 
 
+def get_global_background_hooks() -> list[str]:
+    """Return the hook names the global config runs in the background."""
+    return list(_load_validated().hooks.background or [])
+
+
 def get_global_agent_config() -> dict[str, Any]:
     """Return the ``agent:`` section from the global config, or ``{}``."""
     return get_global_section("agent")
@@ -20,6 +20,23 @@ from typing import Any
 from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 
+class ResourceLimits(BaseModel):
+    """cgroup limits for a task container; ``None`` leaves podman's default."""
+
+    model_config = ConfigDict(frozen=True)
+
+    cpus: float | None = None
+    cpuset: str | None = None
+    memory: str | None = None
+    memory_swap: str | None = None
+    pids_limit: int | None = None
+    blkio_weight: int | None = None
+
+
+RESOURCE_LIMIT_KEYS: tuple[str, ...] = tuple(ResourceLimits.model_fields)
+"""Keys of ``run.resources`` (and of a preset's ``resources:``)."""
+
+
 class ProjectConfig(BaseModel):
     """Resolved project configuration loaded from ``project.yml``.
 
@@ -57,13 +74,19 @@ class ProjectConfig(BaseModel):
     default_login: str | None = None
     agent_config: dict[str, Any] = Field(default_factory=dict)
     shutdown_timeout: int = 10
+    warm_pool_size: int = 0
+    idle_timeout: int = 0  # seconds; 0 = never stop idle tasks
+    idle_cpu_percent: float = 1.0
+    resources: ResourceLimits = Field(default_factory=ResourceLimits)  # run.resources
     task_name_categories: list[str] | None = None
+    workspace_seed: str = "off"  # "off" | "full" | "shallow" | "template"
     shield_drop_on_task_start: bool = True
     # Lifecycle hooks (host-side commands)
     hook_pre_start: str | None = None
     hook_post_start: str | None = None
     hook_post_ready: str | None = None
     hook_post_stop: str | None = None
+    hook_background: list[str] = Field(default_factory=list)  # hook names run asynchronously
     # Docker configuration (flattened from docker: section)
     docker_base_image: str = "ubuntu:24.04"
     docker_snippet_inline: str | None = None
@@ -18,6 +18,7 @@ from .config import (
     bundled_presets_dir,
     config_root,
     gate_base_dir,
+    get_global_background_hooks,
     get_global_default_agent,
     get_global_default_login,
     get_global_hooks,
@@ -28,12 +29,14 @@ from .config import (
 )
 from .git_authorship import normalize_git_authorship
 from .project_model import (  # noqa: F401 — re-exported public API
+    RESOURCE_LIMIT_KEYS,
     PresetInfo,
     ProjectConfig,
+    ResourceLimits,
     effective_ssh_key_name,
     validate_project_id,
 )
-from .yaml_schema import RawGlobalGitSection, RawProjectYaml
+from .yaml_schema import RawGlobalGitSection, RawProjectYaml, RawResourcesSection
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +148,9 @@ def _build_project_config(
 
     # Hooks: project run.hooks overrides global hooks
     g_pre_start, g_post_start, g_post_ready, g_post_stop = get_global_hooks()
+    background = raw.run.hooks.background
+    if background is None:
+        background = get_global_background_hooks()
 
     return ProjectConfig(
         id=pid,
@@ -172,12 +178,18 @@ def _build_project_config(
         default_login=default_login,
         agent_config=agent_cfg,
         shutdown_timeout=raw.run.shutdown_timeout,
+        warm_pool_size=raw.run.warm_pool,
+        idle_timeout=raw.run.idle_timeout,
+        idle_cpu_percent=raw.run.idle_cpu_percent,
+        resources=ResourceLimits(**raw.run.resources.model_dump()),
         task_name_categories=raw.tasks.name_categories,
+        workspace_seed=raw.tasks.workspace_seed,
         shield_drop_on_task_start=raw.shield.drop_on_task_start,
         hook_pre_start=raw.run.hooks.pre_start or g_pre_start,
         hook_post_start=raw.run.hooks.post_start or g_post_start,
         hook_post_ready=raw.run.hooks.post_ready or g_post_ready,
         hook_post_stop=raw.run.hooks.post_stop or g_post_stop,
+        hook_background=list(background),
         docker_base_image=raw.docker.base_image,
         docker_snippet_inline=raw.docker.user_snippet_inline,
         docker_snippet_file=raw.docker.user_snippet_file,
@@ -241,6 +253,38 @@ def load_preset(project_id: str, preset_name: str) -> tuple[dict[str, Any], Path
     return data, path
 
 
+def parse_resource_limits(data: Any, source: str) -> ResourceLimits:
+    """Validate a ``resources`` mapping read from *source* (named in errors)."""
+    try:
+        raw = RawResourcesSection.model_validate(data)
+    except ValidationError as exc:
+        details = "; ".join(
+            f"{' → '.join(str(p) for p in err['loc']) or 'resources'}: {err['msg']}"
+            for err in exc.errors()
+        )
+        raise SystemExit(f"Invalid resources in {source}: {details}")
+    return ResourceLimits(**raw.model_dump())
+
+
+def resolve_resource_limits(
+    project: ProjectConfig, preset: str | None = None, override: ResourceLimits | None = None
+) -> ResourceLimits:
+    """Return the container limits of a run: ``run.resources`` → preset → *override*.
+
+    Each layer replaces only the limits it sets.  A preset sets limits with
+    a ``resources:`` mapping of the same keys as ``run.resources``.
+    """
+    limits = project.resources.model_dump(exclude_none=True)
+    if preset:
+        data, path = load_preset(project.id, preset)
+        if data.get("resources") is not None:
+            layer = parse_resource_limits(data["resources"], f"preset '{preset}' ({path})")
+            limits.update(layer.model_dump(exclude_none=True))
+    if override is not None:
+        limits.update(override.model_dump(exclude_none=True))
+    return ResourceLimits(**limits)
+
+
 def derive_project(source_id: str, new_id: str) -> Path:
     """Create a new project config derived from an existing one.
 
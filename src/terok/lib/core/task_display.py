@@ -31,6 +31,7 @@ class TaskState:
     exit_code: int | None = None
     deleting: bool = False
     initialized: bool = False
+    queued: bool = False
 
 
 @dataclass(frozen=True)
@@ -59,6 +60,7 @@ STATUS_DISPLAY: dict[str, StatusInfo] = {
     "created": StatusInfo(label="created", emoji="\U0001f195", color="yellow"),
     "not found": StatusInfo(label="not found", emoji="\u2753", color="yellow"),
     "deleting": StatusInfo(label="deleting", emoji="\U0001f9f9", color="yellow"),
+    "queued": StatusInfo(label="queued", emoji="\u23f3", color="yellow"),
 }
 
 MODE_DISPLAY: dict[str | None, ModeInfo] = {
@@ -126,8 +128,9 @@ def effective_status(task: TaskState) -> str:
     - ``exit_code`` (int | None): process exit code, or None
     - ``deleting`` (bool): persisted to YAML before deletion starts
     - ``initialized`` (bool): True once the runner has written mode to YAML
+    - ``queued`` (bool): True while the task waits in the headless task queue
 
-    Returns one of: ``"deleting"``, ``"running"``, ``"init"``,
+    Returns one of: ``"deleting"``, ``"queued"``, ``"running"``, ``"init"``,
     ``"stopped"``, ``"completed"``, ``"failed"``, ``"created"``,
     ``"not found"``.
     """
@@ -136,6 +139,9 @@ def effective_status(task: TaskState) -> str:
 
     cs = task.container_state
 
+    if task.queued and cs is None:
+        return "queued"
+
     if cs == "running":
         return "running" if task.initialized else "init"
 
@@ -11,7 +11,7 @@ companion modules :mod:`~terok.lib.core.projects` and
 
 from __future__ import annotations
 
-from typing import Annotated, Any, ClassVar
+from typing import Annotated, Any, ClassVar, Literal
 
 from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator, model_validator
 
@@ -132,6 +132,16 @@ class RawTasksSection(BaseModel):
 
     root: str | None = None
     name_categories: NameCategories = None
+    workspace_seed: str = "off"
+
+    @field_validator("workspace_seed")
+    @classmethod
+    def _validate_workspace_seed(cls, v: str) -> str:
+        """Normalize and validate the workspace seeding mode."""
+        v = v.strip().lower()
+        if v not in ("off", "full", "shallow", "template"):
+            raise ValueError(f"must be 'off', 'full', 'shallow' or 'template', got {v!r}")
+        return v
 
 
 class RawGateSection(BaseModel):
@@ -190,6 +200,21 @@ class RawHooksSection(BaseModel):
     post_start: str | None = None
     post_ready: str | None = None
     post_stop: str | None = None
+    # pre_start must finish before the container starts, so it never runs in the background
+    background: list[Literal["post_start", "post_ready", "post_stop"]] | None = None
+
+
+class RawResourcesSection(BaseModel):
+    """cgroup limits for task containers (``run.resources`` or a preset's ``resources:``)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    cpus: float | None = Field(default=None, gt=0)
+    cpuset: str | None = Field(default=None, pattern=r"^\d+(-\d+)?(,\d+(-\d+)?)*$")
+    memory: str | None = Field(default=None, pattern=r"(?i)^\d+(\.\d+)?[bkmg]?$")
+    memory_swap: str | None = Field(default=None, pattern=r"(?i)^(-1|\d+(\.\d+)?[bkmg]?)$")
+    pids_limit: int | None = Field(default=None, ge=-1)
+    blkio_weight: int | None = Field(default=None, ge=10, le=1000)
 
 
 class RawRunSection(BaseModel):
@@ -199,6 +224,10 @@ class RawRunSection(BaseModel):
 
     shutdown_timeout: int = 10
     gpus: str | bool | None = None
+    warm_pool: int = Field(default=0, ge=0)
+    idle_timeout: int = Field(default=0, ge=0)
+    idle_cpu_percent: float = Field(default=1.0, ge=0)
+    resources: RawResourcesSection = Field(default_factory=RawResourcesSection)
     hooks: RawHooksSection = Field(default_factory=RawHooksSection)
 
     @model_validator(mode="before")
@@ -206,7 +235,7 @@ class RawRunSection(BaseModel):
     def _coerce_none_subsections(cls, data: Any) -> Any:
         """Coerce None sub-sections to empty dicts."""
         if isinstance(data, dict):
-            for key in ("hooks",):
+            for key in ("hooks", "resources"):
                 if data.get(key) is None:
                     data[key] = {}
         return data
@@ -321,6 +350,34 @@ class RawLogsSection(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     partial_streaming: bool = True
+    persist: bool = True
+    segment_mb: int = Field(default=16, ge=0)
+    max_task_mb: int = Field(default=512, ge=0)
+
+
+class RawArchiveSection(BaseModel):
+    """Global ``archive:`` section (retention of task archives and deleted projects)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_age_days: int = Field(default=0, ge=0)
+    max_total_mb: int = Field(default=0, ge=0)
+    keep_last: int = Field(default=0, ge=0)
+    bundle_after_days: int = Field(default=30, ge=0)
+    gc_on_start: bool = False
+
+
+class RawQueueSection(BaseModel):
+    """Global ``queue:`` section (capacity limits for queued headless tasks)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_running: int = Field(default=0, ge=0)
+    max_running_per_project: int = Field(default=0, ge=0)
+    max_cpus: float = Field(default=0, ge=0)
+    max_memory_mb: int = Field(default=0, ge=0)
+    task_cpus: float = Field(default=1.0, ge=0)
+    task_memory_mb: int = Field(default=2048, ge=0)
 
 
 class RawShieldGlobalSection(BaseModel):
@@ -374,6 +431,8 @@ class RawGlobalConfig(BaseModel):
     paths: RawPathsSection = Field(default_factory=RawPathsSection)
     tui: RawTUISection = Field(default_factory=RawTUISection)
     logs: RawLogsSection = Field(default_factory=RawLogsSection)
+    archive: RawArchiveSection = Field(default_factory=RawArchiveSection)
+    queue: RawQueueSection = Field(default_factory=RawQueueSection)
     shield: RawShieldGlobalSection = Field(default_factory=RawShieldGlobalSection)
     credential_proxy: RawCredentialProxySection = Field(default_factory=RawCredentialProxySection)
     gate_server: RawGateServerSection = Field(default_factory=RawGateServerSection)
@@ -391,6 +450,8 @@ class RawGlobalConfig(BaseModel):
             "paths",
             "tui",
             "logs",
+            "archive",
+            "queue",
             "shield",
             "credential_proxy",
             "gate_server",
@@ -0,0 +1,383 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Batch fan-out of headless runs with a bounded number of live containers.
+
+A batch file lists many prompts, each optionally with its own provider,
+preset, model and limits::
+
+    defaults:
+      provider: claude
+      preset: review
+    tasks:
+      - prompt: "Fix the flaky test in tests/test_io.py"
+        name: fix-flaky-io
+      - prompt: "Add type hints to utils/"
+        model: sonnet
+      - "Bump the copyright year in all headers"
+
+A top-level list without ``defaults`` is accepted as well.  Entries are
+started through :func:`~terok.lib.orchestration.task_runners.task_run_headless`
+by at most *jobs* workers, so no more than *jobs* task containers run at
+once.  Launches are serialised (task creation allocates IDs), while waiting
+is shared through the process-wide exit watcher.
+
+Agent configuration is resolved once per distinct set of configuration
+inputs and reused for every entry that shares them.  A cost is reported
+when the provider's final ``result`` record includes one (Claude).
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import TextIO
+
+from ..orchestration.autopilot import wait_for_container_exit
+from ..orchestration.task_runners import (
+    HeadlessPlan,
+    HeadlessRunRequest,
+    headless_plan_key,
+    resolve_headless_plan,
+    task_run_headless,
+)
+from ..orchestration.tasks import container_name
+from ..util.k8s_log import read_k8s_log
+from ..util.yaml import load as _yaml_load
+from .task_logs import container_log_path
+
+_RESULT_TAIL = 50
+"""Log lines scanned backwards for the provider's final ``result`` record."""
+
+
+@dataclass(frozen=True)
+class BatchEntry:
+    """One headless run of a batch; unset fields fall back to the defaults."""
+
+    prompt: str
+    name: str | None = None
+    provider: str | None = None
+    preset: str | None = None
+    model: str | None = None
+    max_turns: int | None = None
+    timeout: int | None = None
+    agents: list[str] | None = None
+    config: str | None = None
+    unrestricted: bool | None = None
+
+    def to_request(self, project_id: str) -> HeadlessRunRequest:
+        """Build the detached :class:`HeadlessRunRequest` for this entry."""
+        return HeadlessRunRequest(
+            project_id=project_id,
+            prompt=self.prompt,
+            config_path=self.config,
+            model=self.model,
+            max_turns=self.max_turns,
+            timeout=self.timeout,
+            follow=False,
+            quiet=True,
+            agents=self.agents,
+            preset=self.preset,
+            name=self.name,
+            provider=self.provider,
+            unrestricted=self.unrestricted,
+        )
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch entry."""
+
+    index: int
+    name: str | None
+    task_id: str | None = None
+    exit_code: int | None = None
+    duration_s: float | None = None
+    cost_usd: float | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the entry ran and exited with code 0."""
+        return self.error is None and self.exit_code == 0
+
+
+_ENTRY_KEYS = frozenset(f.name for f in fields(BatchEntry))
+
+
+def load_batch_file(path: Path, defaults: dict | None = None) -> list[BatchEntry]:
+    """Parse the batch file at *path* into entries.
+
+    *defaults* (e.g. from command-line flags) apply below the file's own
+    ``defaults`` section, which in turn applies below each entry.
+    """
+    if not path.is_file():
+        raise SystemExit(f"Batch file not found: {path}")
+    try:
+        data = _yaml_load(path.read_text(encoding="utf-8"))
+    except Exception as exc:
+        raise SystemExit(f"Failed to parse batch file {path}: {exc}") from exc
+
+    base = {k: v for k, v in (defaults or {}).items() if v is not None}
+    if isinstance(data, dict):
+        file_defaults = data.get("defaults") or {}
+        if not isinstance(file_defaults, dict):
+            raise SystemExit(f"{path}: 'defaults' must be a mapping")
+        _check_keys(path, "defaults", file_defaults, allow_prompt=False)
+        base.update(file_defaults)
+        items = data.get("tasks")
+    else:
+        items = data
+    if not isinstance(items, list) or not items:
+        raise SystemExit(f"{path}: expected a non-empty list of tasks")
+
+    entries: list[BatchEntry] = []
+    for i, item in enumerate(items, start=1):
+        if isinstance(item, str):
+            item = {"prompt": item}
+        if not isinstance(item, dict):
+            raise SystemExit(f"{path}: task #{i} must be a prompt string or a mapping")
+        _check_keys(path, f"task #{i}", item, allow_prompt=True)
+        merged = {**base, **item}
+        prompt = merged.get("prompt")
+        if not isinstance(prompt, str) or not prompt.strip():
+            raise SystemExit(f"{path}: task #{i} has no prompt")
+        if isinstance(merged.get("agents"), str):
+            merged["agents"] = [merged["agents"]]
+        entries.append(BatchEntry(**merged))
+    return entries
+
+
+def _check_keys(path: Path, where: str, item: dict, *, allow_prompt: bool) -> None:
+    """Reject unknown keys in one batch-file mapping."""
+    allowed = _ENTRY_KEYS if allow_prompt else _ENTRY_KEYS - {"prompt", "name"}
+    unknown = sorted(set(item) - allowed)
+    if unknown:
+        raise SystemExit(f"{path}: unknown key(s) in {where}: {', '.join(unknown)}")
+
+
+def _result_cost(cname: str) -> float | None:
+    """Return the cost reported in the container's final ``result`` record, if any."""
+    path = container_log_path(cname)
+    if path is not None:
+        try:
+            lines = [ln.decode("utf-8", "replace") for ln in read_k8s_log(path, tail=_RESULT_TAIL)]
+        except OSError:
+            lines = []
+    else:
+        try:
+            proc = subprocess.run(
+                ["podman", "logs", "--tail", str(_RESULT_TAIL), cname],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        lines = proc.stdout.splitlines()
+    for line in reversed(lines):
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get("type") == "result":
+            cost = data.get("total_cost_usd", data.get("cost_usd"))
+            return float(cost) if isinstance(cost, int | float) else None
+    return None
+
+
+class _BatchScheduler:
+    """Worker pool that keeps at most *jobs* batch containers alive."""
+
+    def __init__(self, project_id: str, entries: list[BatchEntry], jobs: int) -> None:
+        """Prepare the queue; nothing starts until :meth:`run`."""
+        self.project_id = project_id
+        self.entries = entries
+        self.jobs = max(1, min(jobs, len(entries)))
+        self.results = [BatchResult(i, e.name) for i, e in enumerate(entries, start=1)]
+        self._plans: dict[tuple, HeadlessPlan] = {}
+        self._queue = deque(range(len(entries)))
+        self._lock = threading.Lock()
+        self._launch_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._running = 0
+        self._finished = 0
+
+    def resolve_plans(self) -> None:
+        """Resolve agent config once per distinct set of configuration inputs."""
+        for entry in self.entries:
+            request = entry.to_request(self.project_id)
+            key = headless_plan_key(request)
+            if key not in self._plans:
+                self._plans[key] = resolve_headless_plan(request)
+
+    def run(self) -> list[BatchResult]:
+        """Run every queued entry and return the results in batch order."""
+        workers = [
+            threading.Thread(target=self._worker, name=f"terok-batch-{n}", daemon=True)
+            for n in range(self.jobs)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(0.5)
+        except KeyboardInterrupt:
+            self._stopping.set()
+            print("\nInterrupted — no further tasks will be started; running ones continue.")
+            raise
+        return self.results
+
+    def _say(self, message: str) -> None:
+        """Print one progress line without interleaving with a launch."""
+        with self._launch_lock:
+            print(message, flush=True)
+
+    def _progress(self) -> str:
+        """Return the aggregate ``[done/total, running, queued]`` prefix."""
+        with self._lock:
+            return (
+                f"[{self._finished}/{len(self.entries)} done, "
+                f"{self._running} running, {len(self._queue)} queued]"
+            )
+
+    def _worker(self) -> None:
+        """Take entries off the queue until it is empty or the batch is stopped."""
+        while not self._stopping.is_set():
+            with self._lock:
+                if not self._queue:
+                    return
+                idx = self._queue.popleft()
+                self._running += 1
+            try:
+                self._run_one(idx)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._finished += 1
+            self._report(idx)
+
+    def _run_one(self, idx: int) -> None:
+        """Launch entry *idx*, wait for its container and record the outcome."""
+        entry = self.entries[idx]
+        result = self.results[idx]
+        request = entry.to_request(self.project_id)
+        started = time.monotonic()
+        try:
+            with self._launch_lock:
+                result.task_id = task_run_headless(
+                    request, plan=self._plans.get(headless_plan_key(request))
+                )
+        except (SystemExit, Exception) as exc:
+            result.error = str(exc) or type(exc).__name__
+            return
+        self._say(f"{self._progress()} started task {result.task_id} ({_label(result)})")
+        cname = container_name(self.project_id, "run", result.task_id)
+        result.exit_code, result.error = wait_for_container_exit(
+            cname, self.project_id, result.task_id, timeout=None
+        )
+        result.duration_s = round(time.monotonic() - started, 1)
+        result.cost_usd = _result_cost(cname)
+
+    def _report(self, idx: int) -> None:
+        """Print the aggregate progress line for a finished entry."""
+        result = self.results[idx]
+        if result.task_id is None:
+            outcome = f"failed to start: {result.error}"
+        elif result.error:
+            outcome = f"error: {result.error}"
+        else:
+            outcome = f"exited {result.exit_code} after {_fmt_duration(result.duration_s)}"
+        self._say(f"{self._progress()} task {result.task_id or '-'} ({_label(result)}) {outcome}")
+
+
+def _label(result: BatchResult) -> str:
+    """Return a short human label for a batch entry."""
+    return result.name or f"#{result.index}"
+
+
+def _fmt_duration(seconds: float | None) -> str:
+    """Format *seconds* as ``1h02m``, ``3m05s`` or ``12.3s``."""
+    if seconds is None:
+        return "-"
+    if seconds >= 3600:
+        return f"{int(seconds // 3600)}h{int(seconds % 3600 // 60):02d}m"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m{int(seconds % 60):02d}s"
+    return f"{seconds:.1f}s"
+
+
+def run_batch(
+    project_id: str,
+    entries: list[BatchEntry],
+    *,
+    jobs: int = 4,
+    summary_path: Path | None = None,
+) -> list[BatchResult]:
+    """Run *entries* as headless tasks with at most *jobs* running at once.
+
+    Prints aggregate progress and a summary table; with *summary_path* the
+    results are also written there as JSON.  Returns the results in batch
+    order.
+    """
+    if not entries:
+        return []
+    scheduler = _BatchScheduler(project_id, entries, jobs)
+    scheduler.resolve_plans()
+    print(f"Running {len(entries)} headless task(s) for {project_id}, {scheduler.jobs} at a time")
+    try:
+        results = scheduler.run()
+    finally:
+        if summary_path is not None:
+            write_batch_summary(summary_path, project_id, scheduler.results)
+    print_batch_summary(results)
+    return results
+
+
+def write_batch_summary(path: Path, project_id: str, results: list[BatchResult]) -> None:
+    """Write *results* to *path* as JSON."""
+    payload = {
+        "project_id": project_id,
+        "total": len(results),
+        "succeeded": sum(r.ok for r in results),
+        "cost_usd": _total_cost(results),
+        "tasks": [asdict(r) for r in results],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def _total_cost(results: list[BatchResult]) -> float | None:
+    """Sum the known costs, or ``None`` when no entry reported one."""
+    costs = [r.cost_usd for r in results if r.cost_usd is not None]
+    return round(sum(costs), 4) if costs else None
+
+
+def print_batch_summary(results: list[BatchResult], out: TextIO | None = None) -> None:
+    """Print a per-task table of exit codes, durations and costs."""
+    out = out or sys.stdout
+    print("\n── Batch summary ─────────────────────────", file=out)
+    print(f"{'#':>3}  {'TASK':<6} {'EXIT':>4}  {'DURATION':>8}  {'COST':>8}  NAME", file=out)
+    for r in results:
+        exit_col = "-" if r.exit_code is None else str(r.exit_code)
+        cost_col = "-" if r.cost_usd is None else f"${r.cost_usd:.4f}"
+        line = (
+            f"{r.index:>3}  {r.task_id or '-':<6} {exit_col:>4}  "
+            f"{_fmt_duration(r.duration_s):>8}  {cost_col:>8}  {r.name or ''}"
+        )
+        if r.error:
+            line += f"  ({r.error})"
+        print(line, file=out)
+    total = _total_cost(results)
+    ok = sum(r.ok for r in results)
+    tail = f", total cost ${total:.4f}" if total is not None else ""
+    print(f"{ok}/{len(results)} succeeded{tail}", file=out)
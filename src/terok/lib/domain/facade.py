@@ -35,33 +35,103 @@ from terok_agent import (
 
 from ..core.config import get_envs_base_dir
 from ..core.images import project_cli_image
-from ..core.projects import load_project
+from ..core.projects import (  # noqa: F401 — re-exported public API
+    RESOURCE_LIMIT_KEYS,
+    ResourceLimits,
+    load_project,
+    parse_resource_limits,
+)
+from ..orchestration.archive_gc import (  # noqa: F401 — re-exported public API
+    GcReport,
+    gc_archives,
+)
 from ..orchestration.docker import build_images, generate_dockerfiles
+from ..orchestration.environment import clear_credential_proxy_caches
+from ..orchestration.idle import (  # noqa: F401 — re-exported public API
+    IdleTask,
+    stop_idle_tasks,
+)
+from ..orchestration.resource_monitor import (  # noqa: F401 — re-exported public API
+    STATS_INTERVAL,
+    ResourceMonitor,
+    TaskResources,
+    resource_monitor,
+    task_top,
+)
+from ..orchestration.task_queue import (  # noqa: F401 — re-exported public API
+    QueuedTask,
+    cancel_queued,
+    enqueue_headless,
+    is_queue_drainer_running,
+    list_queue,
+    resume_queue_drainer,
+    run_queue_drainer,
+    start_queue_drainer,
+)
 from ..orchestration.task_runners import (  # noqa: F401 — re-exported public API
     HeadlessRunRequest,
+    fill_warm_pool,
     task_followup_headless,
     task_restart,
     task_run_cli,
     task_run_headless,
     task_run_toad,
 )
+from ..orchestration.task_usage import (  # noqa: F401 — re-exported public API
+    TaskUsage,
+    scan_task_usage,
+)
 from ..orchestration.tasks import (  # noqa: F401 — re-exported public API
+    DU_SORT_KEYS,
+    BulkOutcome,
     get_tasks,
+    select_tasks,
     task_archive_list,
     task_archive_logs,
     task_delete,
+    task_delete_many,
+    task_du,
     task_list,
     task_login,
     task_new,
     task_rename,
     task_status,
     task_stop,
+    task_stop_many,
+)
+from ..orchestration.trash import (  # noqa: F401 — re-exported public API
+    reap_trash,
+    resume_trash_reaper,
+)
+from ..orchestration.warm_pool import (  # noqa: F401 — re-exported public API
+    WarmTask,
+    drain_warm_pool,
+    get_warm_pool,
+)
+from ..orchestration.workspace_seed import (  # noqa: F401 — re-exported public API
+    refresh_workspace_template,
+)
+from .batch_runs import (  # noqa: F401 — re-exported public API
+    BatchEntry,
+    BatchResult,
+    load_batch_file,
+    run_batch,
 )
 from .image_cleanup import (  # noqa: F401 — re-exported public API
     cleanup_images,
     find_orphaned_images,
     list_images,
 )
+from .log_multiplex import (  # noqa: F401 — re-exported public API
+    FollowAllOptions,
+    follow_project_logs,
+)
+from .log_search import (  # noqa: F401 — re-exported public API
+    LogSearchOptions,
+    compile_text_pattern,
+    find_line,
+    search_task_logs,
+)
 from .project import (  # noqa: F401 — re-exported public API
     DeleteProjectResult,
     Project,
@@ -72,7 +142,12 @@ from .project import (  # noqa: F401 — re-exported public API
 )
 from .project_state import get_project_state, is_task_image_old
 from .task import Task  # noqa: F401 — re-exported public API
-from .task_logs import LogViewOptions, task_logs  # noqa: F401 — re-exported public API
+from .task_logs import (  # noqa: F401 — re-exported public API
+    LogViewOptions,
+    container_log_path,
+    iter_container_log_text,
+    task_logs,
+)
 
 # ---------------------------------------------------------------------------
 # Project factory functions
@@ -132,6 +207,8 @@ def authenticate(project_id: str, provider: str) -> None:
         envs_base_dir=get_envs_base_dir(),
         image=project_cli_image(project_id),
     )
+    # Let launches in this process see the new credential right away
+    clear_credential_proxy_caches()
 
 
 __all__ = [
@@ -142,6 +219,10 @@ __all__ = [
     # Rich domain objects
     "Project",
     "Task",
+    # Container resource limits
+    "ResourceLimits",
+    "RESOURCE_LIMIT_KEYS",
+    "parse_resource_limits",
     # Docker / image management
     "generate_dockerfiles",
     "build_images",
@@ -163,6 +244,11 @@ __all__ = [
     "task_archive_list",
     "task_archive_logs",
     "get_tasks",
+    # Bulk task operations
+    "select_tasks",
+    "task_delete_many",
+    "task_stop_many",
+    "BulkOutcome",
     # Task runners
     "task_run_cli",
     "task_run_toad",
@@ -170,9 +256,59 @@ __all__ = [
     "HeadlessRunRequest",
     "task_restart",
     "task_followup_headless",
+    # Batch headless runs
+    "run_batch",
+    "load_batch_file",
+    "BatchEntry",
+    "BatchResult",
+    # Task queue
+    "enqueue_headless",
+    "list_queue",
+    "cancel_queued",
+    "run_queue_drainer",
+    "start_queue_drainer",
+    "resume_queue_drainer",
+    "is_queue_drainer_running",
+    "QueuedTask",
+    # Idle tasks
+    "stop_idle_tasks",
+    "IdleTask",
+    # Task disk usage
+    "task_du",
+    "DU_SORT_KEYS",
+    "scan_task_usage",
+    "TaskUsage",
+    # Live resource monitor
+    "task_top",
+    "resource_monitor",
+    "ResourceMonitor",
+    "TaskResources",
+    "STATS_INTERVAL",
+    # Archive retention
+    "GcReport",
+    "gc_archives",
+    # Trash reaper
+    "reap_trash",
+    "resume_trash_reaper",
+    # Warm pool
+    "fill_warm_pool",
+    "get_warm_pool",
+    "drain_warm_pool",
+    "WarmTask",
+    # Workspace seeding
+    "refresh_workspace_template",
     # Task logs
     "task_logs",
     "LogViewOptions",
+    "container_log_path",
+    "iter_container_log_text",
+    "follow_project_logs",
+    "FollowAllOptions",
+    # Log search
+    "search_task_logs",
+    "LogSearchOptions",
+    "compile_text_pattern",
+    "find_line",
     # Security setup
     "make_ssh_manager",
     "make_git_gate",
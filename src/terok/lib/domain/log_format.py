@@ -15,7 +15,7 @@ from __future__ import annotations
 import json
 import sys
 from enum import Enum, auto
-from typing import Protocol
+from typing import Protocol, TextIO
 
 from ..util.ansi import blue, green, red, supports_color, yellow
 
@@ -42,11 +42,19 @@ class AgentLogFormatter(Protocol):
 
 
 class PlainTextFormatter:
-    """Pass-through formatter that prints lines unchanged."""
+    """Pass-through formatter that prints lines unchanged.
+
+    Args:
+        out: Stream to write to (defaults to the current ``sys.stdout``).
+    """
+
+    def __init__(self, *, out: TextIO | None = None) -> None:
+        """Initialise the formatter with an optional output stream."""
+        self._out = out
 
     def feed_line(self, line: str) -> None:
         """Print *line* as-is."""
-        print(line, flush=True)
+        print(line, file=self._out or sys.stdout, flush=True)
 
     def finish(self) -> None:
         """No-op; plain text has no summary."""
@@ -76,11 +84,20 @@ class ClaudeStreamJsonFormatter:
     Args:
         streaming: Enable partial streaming (typewriter text deltas).
         color: Enable ANSI colors (auto-detected from terminal if None).
+        out: Stream for all output, including the result summary.  Defaults
+            to the current ``sys.stdout`` (summary on ``sys.stderr``).
     """
 
-    def __init__(self, *, streaming: bool = True, color: bool | None = None) -> None:
-        """Initialise formatter with streaming and color preferences."""
+    def __init__(
+        self,
+        *,
+        streaming: bool = True,
+        color: bool | None = None,
+        out: TextIO | None = None,
+    ) -> None:
+        """Initialise formatter with streaming, color, and output preferences."""
         self._streaming = streaming
+        self._out = out
         self._color = color if color is not None else supports_color()
         self._state = _StreamState.IDLE
         self._tool_input_buf: list[str] = []
@@ -90,6 +107,11 @@ class ClaudeStreamJsonFormatter:
 
     # -- helpers --
 
+    def _print(self, *args: object, end: str = "\n", summary: bool = False) -> None:
+        """Write to the configured stream (stderr for the summary by default)."""
+        default = sys.stderr if summary else sys.stdout
+        print(*args, end=end, file=self._out or default, flush=True)
+
     def _blue(self, text: str) -> str:
         """Wrap *text* in blue ANSI if color is enabled."""
         return blue(text, self._color)
@@ -117,7 +139,7 @@ class ClaudeStreamJsonFormatter:
             data = json.loads(stripped)
         except (json.JSONDecodeError, ValueError):
             # Not JSON — print as plain text, preserving leading whitespace
-            print(line.rstrip("\r\n"), flush=True)
+            self._print(line.rstrip("\r\n"))
             return
 
         msg_type = data.get("type", "")
@@ -151,7 +173,7 @@ class ClaudeStreamJsonFormatter:
             if tools:
                 parts.append(f"{len(tools)} tools available")
             if parts:
-                print(self._blue(f"[system] {', '.join(parts)}"), flush=True)
+                self._print(self._blue(f"[system] {', '.join(parts)}"))
 
     def _handle_assistant(self, data: dict) -> None:
         """Handle coalesced assistant messages (used in non-streaming mode)."""
@@ -162,11 +184,11 @@ class ClaudeStreamJsonFormatter:
             if block_type == "text":
                 text = block.get("text", "")
                 if text.strip():
-                    print(text, flush=True)
+                    self._print(text)
             elif block_type == "tool_use":
                 name = block.get("name", "unknown")
                 tool_input = block.get("input", {})
-                print(self._blue(f"[tool] {name}"), flush=True)
+                self._print(self._blue(f"[tool] {name}"))
                 self._print_tool_input(tool_input)
 
     def _handle_user(self, data: dict) -> None:
@@ -193,11 +215,11 @@ class ClaudeStreamJsonFormatter:
                 if len(text) > 500:
                     text = text[:497] + "..."
                 if tool_id:
-                    print(color_fn(f"{label} ({tool_id[:8]}...)"), flush=True)
+                    self._print(color_fn(f"{label} ({tool_id[:8]}...)"))
                 else:
-                    print(color_fn(label), flush=True)
+                    self._print(color_fn(label))
                 if text.strip():
-                    print(f"  {text}", flush=True)
+                    self._print(f"  {text}")
 
     def _handle_result(self, data: dict) -> None:
         """Handle final result message (cost, summary)."""
@@ -215,7 +237,7 @@ class ClaudeStreamJsonFormatter:
             self._state = _StreamState.TOOL_USE_BLOCK
             self._current_tool_name = content_block.get("name", "unknown")
             self._tool_input_buf.clear()
-            print(self._blue(f"[tool] {self._current_tool_name}"), flush=True)
+            self._print(self._blue(f"[tool] {self._current_tool_name}"))
 
     def _handle_block_delta(self, data: dict) -> None:
         """Process an incremental text or tool-input delta."""
@@ -224,7 +246,7 @@ class ClaudeStreamJsonFormatter:
         if self._state == _StreamState.TEXT_BLOCK and delta_type == "text_delta":
             text = delta.get("text", "")
             if text:
-                print(text, end="", flush=True)
+                self._print(text, end="")
         elif self._state == _StreamState.TOOL_USE_BLOCK and delta_type == "input_json_delta":
             partial = delta.get("partial_json", "")
             if partial:
@@ -233,7 +255,7 @@ class ClaudeStreamJsonFormatter:
     def _handle_block_stop(self, _data: dict) -> None:
         """Finalise the current streaming block and flush output."""
         if self._state == _StreamState.TEXT_BLOCK:
-            print(flush=True)  # newline after streamed text
+            self._print()  # newline after streamed text
         elif self._state == _StreamState.TOOL_USE_BLOCK:
             accumulated = "".join(self._tool_input_buf)
             if accumulated:
@@ -241,7 +263,7 @@ class ClaudeStreamJsonFormatter:
                     parsed = json.loads(accumulated)
                     self._print_tool_input(parsed)
                 except (json.JSONDecodeError, ValueError):
-                    print(self._yellow(f"  {accumulated}"), flush=True)
+                    self._print(self._yellow(f"  {accumulated}"))
             self._tool_input_buf.clear()
         self._state = _StreamState.IDLE
 
@@ -254,9 +276,9 @@ class ClaudeStreamJsonFormatter:
                 val_str = str(v)
                 if len(val_str) > 200:
                     val_str = val_str[:197] + "..."
-                print(self._yellow(f"  {k}: {val_str}"), flush=True)
+                self._print(self._yellow(f"  {k}: {val_str}"))
         elif tool_input:
-            print(self._yellow(f"  {tool_input}"), flush=True)
+            self._print(self._yellow(f"  {tool_input}"))
 
     # -- finish --
 
@@ -264,11 +286,11 @@ class ClaudeStreamJsonFormatter:
         """Flush pending output and print the result summary if available."""
         # Flush any in-progress streaming block
         if self._state == _StreamState.TEXT_BLOCK:
-            print(flush=True)
+            self._print()
         elif self._state == _StreamState.TOOL_USE_BLOCK:
             accumulated = "".join(self._tool_input_buf)
             if accumulated:
-                print(self._yellow(f"  {accumulated}"), flush=True)
+                self._print(self._yellow(f"  {accumulated}"))
         self._state = _StreamState.IDLE
 
         if self._result:
@@ -304,8 +326,8 @@ class ClaudeStreamJsonFormatter:
 
         if parts:
             summary = ", ".join(parts)
-            print(file=sys.stderr)
-            print(self._yellow(f"[result] {summary}"), file=sys.stderr, flush=True)
+            self._print(summary=True)
+            self._print(self._yellow(f"[result] {summary}"), summary=True)
 
 
 # ---------------------------------------------------------------------------
@@ -319,6 +341,7 @@ def auto_detect_formatter(
     streaming: bool = True,
     color: bool | None = None,
     provider: str | None = None,
+    out: TextIO | None = None,
 ) -> AgentLogFormatter:
     """Return the appropriate formatter for a task's mode and provider.
 
@@ -329,10 +352,11 @@ def auto_detect_formatter(
         provider: Headless provider name.  When mode is ``"run"`` and
             provider is ``"claude"`` (or ``None``), returns the Claude
             stream-json formatter.  Other providers get plain text.
+        out: Stream to write to instead of ``sys.stdout``/``sys.stderr``.
     """
     if mode == "run":
         effective_provider = provider or "claude"
         if effective_provider == "claude":
-            return ClaudeStreamJsonFormatter(streaming=streaming, color=color)
-        return PlainTextFormatter()
-    return PlainTextFormatter()
+            return ClaudeStreamJsonFormatter(streaming=streaming, color=color, out=out)
+        return PlainTextFormatter(out=out)
+    return PlainTextFormatter(out=out)
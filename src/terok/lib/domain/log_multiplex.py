@@ -0,0 +1,255 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Multiplexed log following for every running task of a project.
+
+A single asyncio event loop reads all ``podman logs -f`` streams of a
+project concurrently, feeds each through its own agent log formatter, and
+prefixes every output line with the task it came from.  The running-task
+set is re-discovered periodically so newly started tasks attach without
+restarting the follower.
+
+Per-stream memory is bounded by the stream reader limit: over-long lines
+are truncated rather than buffered, and formatters always run in
+non-streaming mode so partial typewriter output never interleaves across
+tasks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TextIO
+
+from ..core.projects import load_project
+from ..orchestration.tasks import container_name, get_all_task_states, get_tasks
+from ..util.ansi import color as _ansi, supports_color
+from .log_format import auto_detect_formatter
+
+_STREAM_LIMIT = 256 * 1024
+"""Maximum bytes buffered per stream for a single log line."""
+
+_TRUNCATED_MARKER = b" ... [line truncated]"
+
+_PREFIX_COLORS = ("36", "35", "33", "32", "34", "96", "95", "93", "92", "94")
+"""ANSI codes cycled through so adjacent tasks are easy to tell apart."""
+
+_LABEL_NAME_MAX = 24
+
+
+@dataclass(frozen=True)
+class FollowAllOptions:
+    """Options for :func:`follow_project_logs`."""
+
+    tail: int | None = 20
+    """Lines of history to replay for tasks already running at start."""
+
+    rescan_interval: float = 5.0
+    """Seconds between checks for newly started tasks."""
+
+    color: bool | None = None
+    """Force prefix/formatter colour on or off (``None`` auto-detects)."""
+
+
+class _PrefixWriter(io.TextIOBase):
+    """Text stream that prefixes each completed line and writes it atomically.
+
+    Formatters may emit a line in several ``write`` calls; buffering until
+    the newline keeps lines from different tasks from interleaving.
+    """
+
+    def __init__(self, prefix: str, target: TextIO | None = None) -> None:
+        """Wrap *target* (default: current ``sys.stdout``) with *prefix*."""
+        super().__init__()
+        self._prefix = prefix
+        self._target = target
+        self._partial = ""
+
+    def writable(self) -> bool:
+        """Report the stream as writable for ``print(file=...)``."""
+        return True
+
+    def write(self, s: str) -> int:
+        """Buffer *s* and emit every complete line with the prefix."""
+        data = self._partial + s
+        *lines, self._partial = data.split("\n")
+        if lines:
+            target = self._target or sys.stdout
+            target.write("".join(f"{self._prefix}{line}\n" for line in lines))
+        return len(s)
+
+    def flush(self) -> None:
+        """Flush the underlying stream (partial lines stay buffered)."""
+        (self._target or sys.stdout).flush()
+
+    def close_line(self) -> None:
+        """Emit any buffered partial line."""
+        if self._partial:
+            self.write("\n")
+
+
+@dataclass
+class _Stream:
+    """Book-keeping for one followed container."""
+
+    label: str
+    writer: _PrefixWriter
+    task: asyncio.Task | None = None
+    ended_at: str | None = None
+
+
+async def read_bounded_line(reader: asyncio.StreamReader, limit: int = _STREAM_LIMIT) -> bytes:
+    """Read one line from *reader*, keeping at most *limit* bytes of it.
+
+    Over-long lines are cut at *limit* and the remainder is discarded up to
+    the next newline.  Returns ``b""`` at EOF.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as exc:
+        return exc.partial
+    except asyncio.LimitOverrunError as exc:
+        head = (await reader.read(exc.consumed))[:limit]
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            break
+        except asyncio.IncompleteReadError:
+            break
+        except asyncio.LimitOverrunError as exc:
+            await reader.read(exc.consumed)
+    return head + _TRUNCATED_MARKER + b"\n"
+
+
+async def _follow_one(
+    cname: str,
+    stream: _Stream,
+    *,
+    mode: str,
+    provider: str | None,
+    tail: int | None,
+    since: str | None,
+    color: bool,
+) -> None:
+    """Follow a single container's log until its ``podman logs`` exits."""
+    cmd = ["podman", "logs", "-f"]
+    if since:
+        cmd.extend(["--since", since])
+    elif tail is not None:
+        cmd.extend(["--tail", str(tail)])
+    cmd.append(cname)
+    formatter = auto_detect_formatter(
+        mode, streaming=False, color=color, provider=provider, out=stream.writer
+    )
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=_STREAM_LIMIT,
+        )
+    except OSError as exc:
+        stream.writer.write(f"Error launching podman logs: {exc}\n")
+        return
+    try:
+        assert proc.stdout is not None
+        while True:
+            raw = await read_bounded_line(proc.stdout)
+            if not raw:
+                break
+            formatter.feed_line(raw.decode("utf-8", errors="replace").rstrip("\n"))
+        formatter.finish()
+        stream.writer.close_line()
+        stream.writer.write("--- log stream ended ---\n")
+    finally:
+        if proc.returncode is None:
+            proc.terminate()
+        await proc.wait()
+        stream.ended_at = datetime.now(UTC).isoformat()
+
+
+def _make_label(task_id: str, name: str) -> str:
+    """Build the per-line task label (``[3 fix-auth]``)."""
+    if len(name) > _LABEL_NAME_MAX:
+        name = name[: _LABEL_NAME_MAX - 1] + "…"
+    return f"[{task_id} {name}]" if name else f"[{task_id}]"
+
+
+def _running_tasks(project_id: str) -> list[tuple[str, str, str, str | None]]:
+    """Return ``(task_id, name, mode, provider)`` for tasks with running containers."""
+    tasks = [t for t in get_tasks(project_id) if t.mode]
+    if not tasks:
+        return []
+    states = get_all_task_states(project_id, tasks)
+    return [
+        (t.task_id, t.name, t.mode, t.provider) for t in tasks if states.get(t.task_id) == "running"
+    ]
+
+
+async def _follow_all(
+    project_id: str, options: FollowAllOptions, stop: asyncio.Event | None = None
+) -> None:
+    """Discover running tasks, attach followers, and repeat until cancelled."""
+    use_color = supports_color() if options.color is None else options.color
+    streams: dict[str, _Stream] = {}
+    first_scan = True
+    stop = stop or asyncio.Event()
+
+    while not stop.is_set():
+        running = await asyncio.to_thread(_running_tasks, project_id)
+        if first_scan and not running:
+            print("No running tasks; waiting for tasks to start (Ctrl+C to stop)...")
+        for task_id, name, mode, provider in running:
+            cname = container_name(project_id, mode, task_id)
+            stream = streams.get(cname)
+            if stream is not None and stream.task is not None and not stream.task.done():
+                continue
+            if stream is None:
+                label = _make_label(task_id, name)
+                code = _PREFIX_COLORS[len(streams) % len(_PREFIX_COLORS)]
+                stream = _Stream(
+                    label=label,
+                    writer=_PrefixWriter(_ansi(label, code, use_color) + " "),
+                )
+                streams[cname] = stream
+            stream.task = asyncio.create_task(
+                _follow_one(
+                    cname,
+                    stream,
+                    mode=mode,
+                    provider=provider,
+                    # Tasks found at start replay a short tail; tasks that start
+                    # later are shown from the beginning; restarted ones resume.
+                    tail=options.tail if first_scan else None,
+                    since=stream.ended_at,
+                    color=use_color,
+                )
+            )
+        first_scan = False
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=options.rescan_interval)
+        except TimeoutError:
+            pass
+
+    for stream in streams.values():
+        if stream.task is not None and not stream.task.done():
+            stream.task.cancel()
+    await asyncio.gather(
+        *(s.task for s in streams.values() if s.task is not None), return_exceptions=True
+    )
+
+
+def follow_project_logs(project_id: str, options: FollowAllOptions | None = None) -> None:
+    """Follow the logs of all running tasks in a project until Ctrl+C.
+
+    Lines are prefixed with ``[<task_id> <name>]``; tasks started after the
+    follower attaches automatically.
+    """
+    project = load_project(project_id)
+    try:
+        asyncio.run(_follow_all(project.id, options or FollowAllOptions()))
+    except KeyboardInterrupt:
+        print()
@@ -0,0 +1,464 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pattern search over task container logs.
+
+Scans raw log bytes with a compiled regular expression instead of pushing
+whole logs through the formatters.  Persisted logs are memory-mapped and
+their sidecar line index (see :mod:`terok.lib.util.line_index`) turns
+match offsets into line numbers, while rotated gzip segments are
+decompressed one at a time; live containers are read once via
+``podman logs``.  Several tasks — or a whole project archive — are
+searched concurrently, and only the matching lines plus their context are
+handed to the agent log formatter.
+
+The :func:`find_line` helper exposes the same matching rules to the TUI
+log viewer for incremental find-next over already-rendered output.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mmap
+import re
+import subprocess
+import tarfile
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from ..core.projects import load_project
+from ..orchestration.tasks import (
+    archived_task_log_file,
+    container_name,
+    get_all_task_states,
+    get_tasks,
+    list_archived_tasks,
+)
+from ..util.ansi import blue, supports_color
+from ..util.line_index import LineIndex, count_newlines, update_line_index
+from ..util.log_store import has_log, log_segments
+from .log_format import auto_detect_formatter
+
+_MAX_WORKERS = 8
+"""Upper bound on concurrently searched log sources."""
+
+_PODMAN_LOGS_TIMEOUT = 60
+"""Seconds to wait for ``podman logs`` when reading a live container."""
+
+_TIMESTAMP_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}T[0-9:.]+(?:Z|[+-]\d{2}:\d{2}) ")
+"""RFC 3339 prefix written by ``podman logs --timestamps`` into persisted logs."""
+
+
+@dataclass(frozen=True)
+class LogSearchOptions:
+    """What to look for and how much surrounding output to show."""
+
+    pattern: str
+    """Regular expression (or literal string with ``fixed``)."""
+
+    ignore_case: bool = False
+    """Match case-insensitively (``-i``)."""
+
+    fixed: bool = False
+    """Treat *pattern* as a literal string (``-F``)."""
+
+    context: int = 0
+    """Lines of context to show before and after each match (``-C``)."""
+
+    max_matches: int | None = None
+    """Stop after this many matching lines per source."""
+
+
+@dataclass(frozen=True)
+class LogSource:
+    """One searchable log: a persisted file or a live container."""
+
+    label: str
+    """Human-readable origin shown in result headers (task or archive ID)."""
+
+    path: Path | None = None
+    """Persisted log file on the host, if any."""
+
+    cname: str | None = None
+    """Container to read via ``podman logs`` when no file is available."""
+
+    mode: str | None = None
+    """Task mode, used to pick the formatter."""
+
+    provider: str | None = None
+    """Headless provider, used to pick the formatter."""
+
+
+@dataclass(frozen=True)
+class LogMatch:
+    """A matching line with its (non-overlapping) context."""
+
+    line_no: int
+    """1-based line number of the matching line."""
+
+    line: str
+    """The matching line, decoded."""
+
+    before: tuple[str, ...] = ()
+    """Context lines preceding the match."""
+
+    after: tuple[str, ...] = ()
+    """Context lines following the match."""
+
+
+@dataclass
+class LogSearchResult:
+    """All matches found in one :class:`LogSource`."""
+
+    source: LogSource
+    matches: list[LogMatch] = field(default_factory=list)
+    error: str | None = None
+
+
+def compile_pattern(options: LogSearchOptions) -> re.Pattern[bytes]:
+    """Compile *options* into a bytes pattern for raw log scanning."""
+    return _compile(options, text=False)
+
+
+def compile_text_pattern(options: LogSearchOptions) -> re.Pattern[str]:
+    """Compile *options* into a str pattern for already-decoded lines."""
+    return _compile(options, text=True)
+
+
+def _compile(options: LogSearchOptions, *, text: bool) -> re.Pattern:
+    """Compile the search pattern, raising ``SystemExit`` on invalid syntax."""
+    source = re.escape(options.pattern) if options.fixed else options.pattern
+    flags = re.MULTILINE | (re.IGNORECASE if options.ignore_case else 0)
+    try:
+        return re.compile(source if text else source.encode("utf-8"), flags)
+    except re.error as exc:
+        raise SystemExit(f"Invalid search pattern {options.pattern!r}: {exc}") from exc
+
+
+def find_line(
+    lines: Sequence[str],
+    pattern: re.Pattern[str],
+    start: int,
+    *,
+    backwards: bool = False,
+) -> int | None:
+    """Return the index of the next line matching *pattern*, wrapping around.
+
+    Searching begins just after *start* (or just before it when
+    *backwards*), so repeated calls step through successive matches.
+    """
+    count = len(lines)
+    if not count:
+        return None
+    step = -1 if backwards else 1
+    for i in range(1, count + 1):
+        idx = (start + step * i) % count
+        if pattern.search(lines[idx]):
+            return idx
+    return None
+
+
+def _decode(raw: bytes) -> str:
+    """Decode one raw log line, dropping a trailing carriage return."""
+    return raw.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def search_bytes(
+    data: bytes | mmap.mmap,
+    pattern: re.Pattern[bytes],
+    *,
+    context: int = 0,
+    max_matches: int | None = None,
+    index: LineIndex | None = None,
+) -> list[LogMatch]:
+    """Find lines in *data* matching *pattern*.
+
+    Each matching line is reported once, even with several hits.  Context
+    lines are clipped so that neighbouring matches never repeat output.
+    When *index* is given, line numbers are resolved through it instead of
+    counting newlines from the previous match.
+    """
+    size = len(data)
+    spans: list[tuple[int, int, int]] = []  # (line_start, line_end, line_no)
+    pos = 0
+    last_start, last_no = 0, 0
+    while pos <= size:
+        m = pattern.search(data, pos)
+        if m is None:
+            break
+        start = data.rfind(b"\n", 0, m.start()) + 1
+        end = data.find(b"\n", m.start())
+        if end < 0:
+            end = size
+        if index is not None and start <= index.indexed_size:
+            line_no = index.line_at(data, start)
+        else:
+            line_no = last_no + count_newlines(data, last_start, start)
+        last_start, last_no = start, line_no
+        spans.append((start, end, line_no))
+        if max_matches is not None and len(spans) >= max_matches:
+            break
+        pos = end + 1
+
+    matches: list[LogMatch] = []
+    floor = 0
+    for i, (start, end, line_no) in enumerate(spans):
+        before: list[str] = []
+        cur = start
+        while len(before) < context and cur > floor:
+            prev = data.rfind(b"\n", 0, cur - 1) + 1
+            before.append(_decode(data[prev : cur - 1]))
+            cur = prev
+        before.reverse()
+
+        ceiling = spans[i + 1][0] if i + 1 < len(spans) else size
+        after: list[str] = []
+        cur = end + 1
+        while len(after) < context and cur < ceiling:
+            nxt = data.find(b"\n", cur)
+            if nxt < 0:
+                nxt = size
+            after.append(_decode(data[cur:nxt]))
+            cur = nxt + 1
+        floor = cur
+
+        matches.append(
+            LogMatch(
+                line_no=line_no + 1,
+                line=_decode(data[start:end]),
+                before=tuple(before),
+                after=tuple(after),
+            )
+        )
+    return matches
+
+
+def search_file(path: Path, options: LogSearchOptions) -> list[LogMatch]:
+    """Search a persisted log, including its rotated compressed segments.
+
+    Segments are decompressed one at a time and searched in memory (a
+    damaged one only up to the damage); the live file is memory-mapped.  Line numbers run continuously across the
+    whole log.  Context lines do not cross segment boundaries.
+    """
+    pattern = compile_pattern(options)
+    matches: list[LogMatch] = []
+    offset = 0
+    segments = log_segments(path)
+    for seg in segments:
+        remaining = _remaining(options, matches)
+        if remaining == 0:
+            return matches
+        data = _read_segment(seg)
+        found = search_bytes(data, pattern, context=options.context, max_matches=remaining)
+        matches.extend(replace(m, line_no=m.line_no + offset) for m in found)
+        offset += count_newlines(data, 0, len(data))
+
+    remaining = _remaining(options, matches)
+    if remaining == 0 or (segments and not path.is_file()):
+        return matches
+    index = update_line_index(path)
+    with path.open("rb") as f:
+        if f.seek(0, 2) == 0:
+            return matches
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            found = search_bytes(
+                mm,
+                pattern,
+                context=options.context,
+                max_matches=remaining,
+                index=index,
+            )
+    matches.extend(replace(m, line_no=m.line_no + offset) for m in found)
+    return matches
+
+
+def _read_segment(seg: Path) -> bytes:
+    """Return the decompressed lines of a rotated log segment.
+
+    A segment truncated by a crash mid-rotation yields the complete lines
+    before the damage, as :func:`~terok.lib.util.log_store.iter_log_lines`
+    does, instead of failing the whole search.
+    """
+    lines: list[bytes] = []
+    try:
+        with gzip.open(seg, "rb") as f:
+            for line in f:
+                lines.append(line)
+    except (OSError, EOFError):
+        pass
+    return b"".join(lines)
+
+
+def _remaining(options: LogSearchOptions, matches: list[LogMatch]) -> int | None:
+    """Return how many more matches may be collected (``None`` = unlimited)."""
+    if options.max_matches is None:
+        return None
+    return max(options.max_matches - len(matches), 0)
+
+
+def _search_source(source: LogSource, options: LogSearchOptions) -> LogSearchResult:
+    """Search a single source, capturing errors instead of raising."""
+    result = LogSearchResult(source=source)
+    try:
+        if source.path is not None:
+            result.matches = search_file(source.path, options)
+        elif source.cname is not None:
+            proc = subprocess.run(
+                ["podman", "logs", source.cname],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=_PODMAN_LOGS_TIMEOUT,
+            )
+            result.matches = search_bytes(
+                proc.stdout,
+                compile_pattern(options),
+                context=options.context,
+                max_matches=options.max_matches,
+            )
+    except (OSError, EOFError, ValueError, subprocess.TimeoutExpired) as exc:
+        result.error = str(exc)
+    return result
+
+
+def search_sources(
+    sources: Sequence[LogSource],
+    options: LogSearchOptions,
+    *,
+    max_workers: int | None = None,
+) -> list[LogSearchResult]:
+    """Search *sources* concurrently; results keep the order of *sources*."""
+    compile_pattern(options)  # fail fast on a bad pattern
+    if len(sources) <= 1:
+        return [_search_source(s, options) for s in sources]
+    workers = max_workers or min(_MAX_WORKERS, len(sources))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="log-search") as pool:
+        return list(pool.map(lambda s: _search_source(s, options), sources))
+
+
+def task_log_sources(project_id: str, task_ids: Sequence[str] | None = None) -> list[LogSource]:
+    """Return searchable log sources for a project's tasks.
+
+    Tasks whose container still exists are read live; otherwise the
+    persisted ``logs/container.log`` is used.  Tasks that never ran or have
+    no logs anywhere are skipped.  *task_ids* restricts the selection.
+    """
+    project = load_project(project_id)
+    tasks = [t for t in get_tasks(project.id) if t.mode]
+    if task_ids is not None:
+        wanted = {str(t) for t in task_ids}
+        unknown = wanted - {t.task_id for t in tasks}
+        if unknown:
+            raise SystemExit(f"Unknown or never-run task(s): {', '.join(sorted(unknown))}")
+        tasks = [t for t in tasks if t.task_id in wanted]
+    states = get_all_task_states(project.id, tasks) if tasks else {}
+
+    sources: list[LogSource] = []
+    for t in tasks:
+        label = f"task {t.task_id}" + (f" ({t.name})" if t.name else "")
+        log_file = project.tasks_root / t.task_id / "logs" / "container.log"
+        if states.get(t.task_id) is not None:
+            sources.append(
+                LogSource(
+                    label=label,
+                    cname=container_name(project.id, t.mode, t.task_id),
+                    mode=t.mode,
+                    provider=t.provider,
+                )
+            )
+        elif has_log(log_file):
+            sources.append(LogSource(label=label, path=log_file, mode=t.mode, provider=t.provider))
+    return sources
+
+
+def archive_log_sources(project_id: str) -> list[LogSource]:
+    """Return searchable log sources for every archived task of a project.
+
+    Logs of archives packed into monthly bundles are unpacked first.
+    """
+    sources: list[LogSource] = []
+    for a in list_archived_tasks(project_id):
+        try:
+            log_file = archived_task_log_file(a)
+        except (OSError, tarfile.TarError):
+            continue
+        if has_log(log_file):
+            sources.append(
+                LogSource(
+                    label=f"{a.archived_at} #{a.task_id}" + (f" ({a.name})" if a.name else ""),
+                    path=log_file,
+                    mode=a.mode,
+                )
+            )
+    return sources
+
+
+def strip_log_timestamp(line: str) -> str:
+    """Remove a leading ``podman logs --timestamps`` prefix from *line*."""
+    return _TIMESTAMP_PREFIX.sub("", line, count=1)
+
+
+def print_search_results(
+    results: Sequence[LogSearchResult],
+    *,
+    raw: bool = False,
+    color: bool | None = None,
+) -> int:
+    """Print matches grouped by source and return the total match count.
+
+    Each match is rendered through a fresh formatter for its source (in
+    non-streaming mode) so structured agent output stays readable; *raw*
+    prints the matching lines verbatim instead.
+    """
+    use_color = supports_color() if color is None else color
+    total = 0
+    for result in results:
+        if result.error:
+            print(f"Warning: could not search {result.source.label}: {result.error}")
+            continue
+        if not result.matches:
+            continue
+        total += len(result.matches)
+        print(blue(f"== {result.source.label} ({len(result.matches)} matches) ==", use_color))
+        for match in result.matches:
+            print(blue(f"-- line {match.line_no} --", use_color), flush=True)
+            lines = [*match.before, match.line, *match.after]
+            if raw:
+                for line in lines:
+                    print(line)
+                continue
+            formatter = auto_detect_formatter(
+                result.source.mode,
+                streaming=False,
+                color=use_color,
+                provider=result.source.provider,
+            )
+            for line in lines:
+                formatter.feed_line(strip_log_timestamp(line))
+            formatter.finish()
+    return total
+
+
+def search_task_logs(
+    project_id: str,
+    options: LogSearchOptions,
+    *,
+    task_ids: Sequence[str] | None = None,
+    archived: bool = False,
+    raw: bool = False,
+) -> int:
+    """Search task logs (or the project archive) and print the matches.
+
+    Returns the number of matching lines found across all sources.
+    """
+    sources = (
+        archive_log_sources(project_id) if archived else task_log_sources(project_id, task_ids)
+    )
+    if not sources:
+        print("No logs to search")
+        return 0
+    total = print_search_results(search_sources(sources, options), raw=raw)
+    if not total:
+        print("No matches found")
+    return total
@@ -43,8 +43,12 @@ See Also:
 from __future__ import annotations
 
 import logging
+import os
 import shutil
+import stat
 import tarfile
+import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TypedDict
 
@@ -60,6 +64,7 @@ from ..core.config import (
 )
 from ..core.project_model import ProjectConfig
 from ..core.projects import list_presets, load_project
+from ..orchestration.archive_index import UNBUNDLED_DIRNAME
 from ..orchestration.docker import build_images, generate_dockerfiles
 from ..orchestration.task_runners import HeadlessRunRequest, task_run_headless
 from ..orchestration.tasks import (
@@ -70,7 +75,8 @@ from ..orchestration.tasks import (
     task_delete,
     task_new,
 )
-from ..util.fs import archive_timestamp, create_archive_file
+from ..util.compress import compressed_suffix, compressed_writer
+from ..util.fs import archive_timestamp, create_archive_file, format_size
 from .agent_config import resolve_agent_config
 from .project_state import get_project_state, is_task_image_old
 from .task import Task
@@ -203,24 +209,48 @@ class DeleteProjectResult(TypedDict):
     archive: str | None
 
 
-def _archive_project(project_id: str) -> str | None:
+ArchiveProgress = Callable[[int, int], None]
+"""Callback receiving ``(bytes_archived, bytes_total)`` while a project is archived."""
+
+# Regenerable state left out of project archives: line indexes of logs and
+# logs unpacked from archive bundles.
+_ARCHIVE_SKIP_DIRS = frozenset({UNBUNDLED_DIRNAME})
+_ARCHIVE_SKIP_SUFFIXES = (".idx",)
+
+
+def _archive_files(prefix: str, root: Path) -> Iterator[tuple[str, Path, int]]:
+    """Yield ``(arcname, path, size)`` of the regular files below *root*."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _ARCHIVE_SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(_ARCHIVE_SKIP_SUFFIXES):
+                continue
+            path = Path(dirpath, name)
+            try:
+                st = path.lstat()
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                yield f"{prefix}/{path.relative_to(root)}", path, st.st_size
+
+
+def _archive_project(project_id: str, progress: ArchiveProgress | None = None) -> str | None:
     """Create a compressed archive of project data before deletion.
 
-    Collects project config, task metadata/archives, and build artifacts
-    into a ``.tar.gz`` file under ``deleted_projects_dir()``.  SSH
-    credentials and git gate contents are excluded for security.
+    Streams project config and task metadata/archives into a ``.tar.zst``
+    (with the optional ``zstandard`` package) or ``.tar.gz`` file under
+    ``deleted_projects_dir()``, compressing on several threads
+    (:mod:`~terok.lib.util.compress`).  Build artifacts, which ``generate``
+    recreates, are left out, as are SSH credentials and git gate contents
+    for security.  *progress* is called after every file.
 
     Returns the archive file path as a string, or ``None`` on failure.
     """
+    archive_path: Path | None = None
     try:
         project = load_project(project_id)
         pid = project.id
 
-        archive_root = deleted_projects_dir()
-        ts = archive_timestamp()
-        base_name = f"{ts}_{pid}"
-        archive_path = create_archive_file(archive_root, base_name)
-
         # Directories to include: (arcname_prefix, source_path)
         sources: list[tuple[str, Path]] = []
 
@@ -233,26 +263,44 @@ def _archive_project(project_id: str) -> str | None:
         if project_state.is_dir():
             sources.append(("state", project_state))
 
-        # Build artifacts
-        build_dir = build_root() / pid
-        if build_dir.is_dir():
-            sources.append(("build", build_dir))
-
         if not sources:
             _logger.debug("_archive_project: nothing to archive for %s", pid)
             return None
 
-        with tarfile.open(archive_path, "w:gz") as tar:
-            for prefix, src_dir in sources:
-                for item in src_dir.rglob("*"):
-                    if item.is_file():
-                        arcname = f"{prefix}/{item.relative_to(src_dir)}"
-                        tar.add(str(item), arcname=arcname)
+        files = [f for prefix, src_dir in sources for f in _archive_files(prefix, src_dir)]
+        total = sum(size for _, _, size in files)
 
-        _logger.debug("_archive_project: archived %s to %s", pid, archive_path)
+        archive_root = deleted_projects_dir()
+        base_name = f"{archive_timestamp()}_{pid}"
+        archive_path = create_archive_file(archive_root, base_name, f".tar{compressed_suffix()}")
+
+        start = time.monotonic()
+        done = 0
+        with (
+            archive_path.open("wb") as fh,
+            compressed_writer(fh) as stream,
+            tarfile.open(fileobj=stream, mode="w|") as tar,
+        ):
+            for arcname, path, size in files:
+                tar.add(str(path), arcname=arcname, recursive=False)
+                done += size
+                if progress is not None:
+                    progress(done, total)
+
+        elapsed = time.monotonic() - start
+        _logger.debug(
+            "_archive_project: archived %s to %s: %s in %.1fs (%s/s)",
+            pid,
+            archive_path,
+            format_size(total),
+            elapsed,
+            format_size(total / elapsed if elapsed > 0 else total),
+        )
         return str(archive_path)
     except Exception as exc:
         _logger.warning("_archive_project: failed to archive %s: %s", project_id, exc)
+        if archive_path is not None:
+            archive_path.unlink(missing_ok=True)
         return None
 
 
@@ -272,14 +320,17 @@ def _rmtree_managed(path: Path, label: str, deleted: list[str], skipped: list[st
     deleted.append(str(path))
 
 
-def delete_project(project_id: str) -> DeleteProjectResult:
+def delete_project(
+    project_id: str, *, progress: ArchiveProgress | None = None
+) -> DeleteProjectResult:
     """Delete a project and all its associated data.
 
     Removes task workspaces, task metadata, build artifacts, SSH credentials,
     the git gate (if not shared with other projects), and the project config
-    directory.
+    directory.  The project is archived first; *progress* follows the
+    archiving (see :func:`_archive_project`).
     """
-    archive_path = _archive_project(project_id)
+    archive_path = _archive_project(project_id, progress)
     if archive_path is None:
         raise SystemExit(
             f"Project archiving failed for '{project_id}'; aborting deletion to prevent data loss."
@@ -478,9 +529,9 @@ class Project:
 
     # --- Project lifecycle ---
 
-    def delete(self) -> DeleteProjectResult:
+    def delete(self, *, progress: ArchiveProgress | None = None) -> DeleteProjectResult:
         """Delete the project and all associated data."""
-        return delete_project(self._config.id)
+        return delete_project(self._config.id, progress=progress)
 
     # --- Infrastructure ---
 
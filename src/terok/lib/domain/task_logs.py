@@ -4,6 +4,8 @@
 """Task log viewing and streaming.
 
 Provides the ``task_logs`` function for viewing formatted container logs.
+Exited containers that use podman's ``k8s-file`` log driver are read
+directly from their log file; everything else goes through ``podman logs``.
 Split from ``tasks.py`` to isolate log streaming, signal handling, and
 formatter selection from task metadata management.
 """
@@ -12,6 +14,8 @@ from __future__ import annotations
 
 import os
 import subprocess
+import sys
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -19,6 +23,8 @@ from terok_sandbox import get_container_state
 
 from ..core.projects import load_project
 from ..orchestration.tasks import container_name, tasks_meta_dir
+from ..util.k8s_log import read_k8s_log
+from ..util.log_store import has_log, iter_log_text
 from ..util.yaml import load as _yaml_load
 from .log_format import auto_detect_formatter
 
@@ -85,7 +91,7 @@ def task_logs(
         # Fall back to persisted log files on the host
         task_dir = project.tasks_root / str(task_id)
         log_file = task_dir / "logs" / "container.log"
-        if log_file.is_file():
+        if has_log(log_file):
             _show_persisted_logs(
                 log_file,
                 tail=options.tail,
@@ -99,6 +105,13 @@ def task_logs(
             f"Run 'terokctl task restart {project_id} {task_id}' first."
         )
 
+    # Exited containers using the k8s-file driver are read straight from disk
+    if state != "running":
+        direct = container_log_path(cname)
+        if direct is not None:
+            _show_direct_logs(direct, options, mode=mode, provider=meta.get("provider"))
+            return
+
     # Build podman logs command
     cmd = ["podman", "logs"]
     if options.follow:
@@ -196,6 +209,64 @@ def task_logs(
         print()
 
 
+def container_log_path(cname: str) -> Path | None:
+    """Return the on-disk log of *cname* if podman stores it as a readable k8s-file.
+
+    Returns ``None`` for other log drivers (e.g. ``journald``), missing
+    containers, or unreadable files — callers then fall back to
+    ``podman logs``.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "podman",
+                "container",
+                "inspect",
+                "--format",
+                "{{.HostConfig.LogConfig.Type}}\t{{.HostConfig.LogConfig.Path}}",
+                cname,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    driver, _, raw_path = result.stdout.strip().partition("\t")
+    if driver != "k8s-file" or not raw_path:
+        return None
+    path = Path(raw_path)
+    return path if os.access(path, os.R_OK) else None
+
+
+def iter_container_log_text(path: Path, *, tail: int | None = None) -> Iterator[str]:
+    """Yield decoded lines (newline stripped) of a k8s-file container log."""
+    for raw in read_k8s_log(path, tail=tail):
+        yield raw.decode("utf-8", errors="replace").rstrip("\n")
+
+
+def _show_direct_logs(
+    path: Path,
+    options: LogViewOptions,
+    *,
+    mode: str | None = None,
+    provider: str | None = None,
+) -> None:
+    """Display an exited container's k8s-file log without spawning podman."""
+    if options.raw:
+        out = sys.stdout.buffer
+        for raw in read_k8s_log(path, tail=options.tail):
+            out.write(raw)
+        out.flush()
+        return
+    formatter = auto_detect_formatter(mode, streaming=options.streaming, provider=provider)
+    for line in iter_container_log_text(path, tail=options.tail):
+        formatter.feed_line(line)
+    formatter.finish()
+
+
 def _show_persisted_logs(
     log_file: Path,
     *,
@@ -208,19 +279,20 @@ def _show_persisted_logs(
 
     Applies the same formatter pipeline as live container logs so output
     is consistent whether reading from podman or from the host filesystem.
-    Streams the file line-by-line to avoid loading the entire log into memory.
+    Streams the log line-by-line — decompressing rotated segments on the
+    fly — to avoid loading the entire log into memory.
     """
     from collections import deque
 
     formatter = auto_detect_formatter(mode, streaming=streaming, provider=provider)
 
-    with log_file.open("r", encoding="utf-8", errors="replace") as f:
-        if tail is not None and tail > 0:
-            for line in deque((ln.rstrip("\n") for ln in f), maxlen=tail):
-                formatter.feed_line(line)
-        elif tail == 0:
-            pass  # tail=0 means show nothing
-        else:
-            for line in f:
-                formatter.feed_line(line.rstrip("\n"))
+    lines = iter_log_text(log_file)
+    if tail is not None and tail > 0:
+        for line in deque(lines, maxlen=tail):
+            formatter.feed_line(line)
+    elif tail == 0:
+        pass  # tail=0 means show nothing
+    else:
+        for line in lines:
+            formatter.feed_line(line)
     formatter.finish()
@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Retention and compaction of task archives and deleted-project tarballs.
+
+``terokctl archive gc`` (and, with ``archive.gc_on_start``, the TUI) applies
+the ``archive:`` rules of the global config:
+
+- ``max_age_days`` — archives older than this are removed;
+- ``keep_last`` — only the newest N archives of each project are kept;
+- ``max_total_mb`` — the oldest archives of a project are removed until the
+  rest fit (for deleted-project tarballs: until all tarballs fit);
+- ``bundle_after_days`` — surviving task archives older than this are packed
+  into monthly bundles, which stay listed and searchable through the
+  archive index (:mod:`~terok.lib.orchestration.archive_index`).
+
+Archive sizes are measured with a parallel ``os.scandir`` walker.  Only one
+collection runs at a time (non-blocking ``flock``).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import shutil
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from ..core.config import ArchiveRetention, deleted_projects_dir, get_archive_retention, state_root
+from ..util.fs import disk_usages, ensure_dir, parse_archive_timestamp
+from ..util.logging_utils import _log_debug
+from .archive_index import (
+    UNBUNDLED_DIRNAME,
+    ArchiveIndexEntry,
+    bundle_archives,
+    read_archive_index,
+    remove_archives,
+)
+from .tasks import tasks_archive_dir
+
+GC_WORKERS = 8
+"""Archive directories measured at once."""
+
+_GC_LOCK_FILENAME = "archive-gc.lock"
+
+
+@dataclass
+class GcReport:
+    """What an archive collection removed and packed (or would, on a dry run)."""
+
+    removed: list[str] = field(default_factory=list)
+    """Labels of removed task archives and deleted-project tarballs."""
+    freed_bytes: int = 0
+    bundled: int = 0
+    """Task archives packed into monthly bundles."""
+
+
+@dataclass(frozen=True)
+class _Item:
+    """One archive under retention: what it is, when it was made, its size."""
+
+    ref: ArchiveIndexEntry | Path
+    label: str
+    when: datetime | None
+    size: int
+
+
+def _expired(items: list[_Item], policy: ArchiveRetention, now: datetime) -> list[_Item]:
+    """Return the *items* (sorted oldest first) that *policy* does not retain."""
+    max_age = timedelta(days=policy.max_age_days)
+    expired: list[_Item] = []
+    kept: list[_Item] = []
+    for idx, item in enumerate(items):
+        too_old = bool(policy.max_age_days) and item.when is not None and now - item.when > max_age
+        beyond_last = bool(policy.keep_last) and idx < len(items) - policy.keep_last
+        (expired if too_old or beyond_last else kept).append(item)
+    if policy.max_total_mb:
+        total = sum(i.size for i in kept)
+        for item in kept:
+            if total <= policy.max_total_mb * 1024 * 1024:
+                break
+            expired.append(item)
+            total -= item.size
+    return expired
+
+
+def _clear_unbundled(archive_root: Path) -> None:
+    """Drop logs unpacked from bundles; they are unpacked again on demand."""
+    cache = archive_root / UNBUNDLED_DIRNAME
+    if cache.is_dir():
+        for child in cache.iterdir():
+            shutil.rmtree(child, ignore_errors=True)
+
+
+def gc_task_archive(
+    project_id: str, policy: ArchiveRetention, now: datetime, *, dry_run: bool = False
+) -> GcReport:
+    """Apply *policy* to the task archive of *project_id*."""
+    report = GcReport()
+    archive_root = tasks_archive_dir(project_id)
+    entries = read_archive_index(archive_root)
+    if not entries:
+        return report
+    unpacked = [e for e in entries if not e.bundle]
+    sizes = dict(
+        zip(
+            (e.dir_name for e in unpacked),
+            disk_usages([archive_root / e.dir_name for e in unpacked], workers=GC_WORKERS),
+            strict=True,
+        )
+    )
+    items = [
+        _Item(
+            ref=e,
+            label=f"{project_id} {e.dir_name}",
+            when=parse_archive_timestamp(e.archived_at),
+            size=sizes.get(e.dir_name, e.log_size),
+        )
+        for e in entries
+    ]
+    expired = _expired(items, policy, now)
+    report.removed += [i.label for i in expired]
+    report.freed_bytes += sum(i.size for i in expired)
+    if expired and not dry_run:
+        remove_archives(archive_root, [i.ref for i in expired])
+
+    months: dict[str, list[ArchiveIndexEntry]] = {}
+    if policy.bundle_after_days:
+        cutoff = now - timedelta(days=policy.bundle_after_days)
+        gone = {i.label for i in expired}
+        for item in items:
+            if item.label in gone or item.ref.bundle or item.when is None or item.when >= cutoff:
+                continue
+            months.setdefault(f"{item.when:%Y-%m}.tar", []).append(item.ref)
+    for bundle_name, group in sorted(months.items()):
+        report.bundled += len(group)
+        if not dry_run:
+            bundle_archives(archive_root, group, bundle_name)
+    if not dry_run:
+        _clear_unbundled(archive_root)
+    return report
+
+
+def gc_deleted_projects(
+    policy: ArchiveRetention, now: datetime, *, dry_run: bool = False
+) -> GcReport:
+    """Apply *policy* to the tarballs of deleted projects.
+
+    Age and ``keep_last`` apply per project; ``max_total_mb`` to all
+    tarballs together.
+    """
+    report = GcReport()
+    root = deleted_projects_dir()
+    if not root.is_dir():
+        return report
+    by_project: dict[str, list[_Item]] = {}
+    for path in sorted(root.glob("*.tar.*")):
+        stem = path.name.removesuffix(".tar.gz").removesuffix(".tar.zst")
+        ts, _, rest = stem.partition("_")
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        item = _Item(ref=path, label=path.name, when=parse_archive_timestamp(ts), size=size)
+        by_project.setdefault(rest, []).append(item)
+    per_project = replace(policy, max_total_mb=0)
+    expired = [i for items in by_project.values() for i in _expired(items, per_project, now)]
+    remaining = sorted(
+        (i for items in by_project.values() for i in items if i not in expired),
+        key=lambda i: i.label,
+    )
+    expired += _expired(remaining, replace(policy, max_age_days=0, keep_last=0), now)
+    for item in expired:
+        report.removed.append(item.label)
+        report.freed_bytes += item.size
+        if not dry_run:
+            item.ref.unlink(missing_ok=True)
+    return report
+
+
+def _try_lock(path: Path) -> int | None:
+    """Take a non-blocking exclusive lock on *path*; returns the fd or ``None``."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _archived_project_ids() -> list[str]:
+    """Return the IDs of projects that have a task archive."""
+    root = state_root() / "projects"
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if (p / "archive").is_dir())
+
+
+def gc_archives(
+    project_id: str | None = None,
+    *,
+    dry_run: bool = False,
+    policy: ArchiveRetention | None = None,
+) -> GcReport | None:
+    """Enforce the archive retention rules; returns ``None`` if a collection is running.
+
+    With *project_id*, only that project's task archive is collected;
+    otherwise every project's, plus the deleted-project tarballs.  *policy*
+    defaults to the ``archive:`` section of the global config.
+    """
+    policy = policy or get_archive_retention()
+    now = datetime.now(tz=UTC)
+    ensure_dir(state_root())
+    fd = _try_lock(state_root() / _GC_LOCK_FILENAME)
+    if fd is None:
+        return None
+    try:
+        report = GcReport()
+        for pid in [project_id] if project_id else _archived_project_ids():
+            part = gc_task_archive(pid, policy, now, dry_run=dry_run)
+            report.removed += part.removed
+            report.freed_bytes += part.freed_bytes
+            report.bundled += part.bundled
+        if project_id is None:
+            part = gc_deleted_projects(policy, now, dry_run=dry_run)
+            report.removed += part.removed
+            report.freed_bytes += part.freed_bytes
+        _log_debug(
+            f"archive_gc: removed {len(report.removed)}, bundled {report.bundled}"
+            f"{' (dry run)' if dry_run else ''}"
+        )
+        return report
+    finally:
+        os.close(fd)
@@ -0,0 +1,366 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Append-only index of a project's task archive.
+
+Every archived task is recorded as one JSON line in
+``<archive_root>/../archive-index.jsonl`` — its archive directory name,
+archival timestamp, task ID, name, mode, exit code and log size — so that
+listing the archive reads one file instead of parsing every ``task.yml``.
+Archive directory names start with the archival timestamp, so the index
+sorted by directory name is also sorted by time, and a prefix lookup is a
+binary search.
+
+The index lives beside the archive root rather than inside it, so that the
+root's mtime changes only when archive entries are added or removed.  An
+index older than the root (missing, or written by a version that did not
+maintain it) is rebuilt from the archive directories on the next access.
+
+Old entries can be packed into monthly bundles,
+``<archive_root>/.bundles/<YYYY-MM>.tar``: an uncompressed tar of the
+entries' directories (archived logs already are gzip segments).  A bundled
+entry stays in the index with its bundle's name; its logs are unpacked into
+``<archive_root>/.unbundled/`` on demand (:func:`entry_log_file`).
+"""
+
+from __future__ import annotations
+
+import bisect
+import fcntl
+import json
+import os
+import shutil
+import tarfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+
+from ..util.fs import disk_usage, ensure_dir
+from ..util.logging_utils import _log_debug
+from ..util.yaml import load as _yaml_load
+
+INDEX_FILENAME = "archive-index.jsonl"
+"""Name of the index file, a sibling of the archive root."""
+
+BUNDLES_DIRNAME = ".bundles"
+"""Directory of monthly bundles inside the archive root."""
+
+UNBUNDLED_DIRNAME = ".unbundled"
+"""Cache of logs unpacked from bundles, inside the archive root."""
+
+_LOG_FILENAME = "container.log"
+
+
+@dataclass(frozen=True)
+class ArchiveIndexEntry:
+    """One index line: an archived task."""
+
+    dir_name: str
+    archived_at: str
+    task_id: str
+    name: str
+    mode: str | None = None
+    exit_code: int | None = None
+    log_size: int = 0
+    """Bytes allocated on disk by the archived logs."""
+    bundle: str | None = None
+    """File name of the bundle holding the entry, if it was packed."""
+
+
+_FIELDS = frozenset(f.name for f in fields(ArchiveIndexEntry))
+
+# archive root → ((index mtime_ns, index size), entries sorted by dir_name)
+_cache: dict[Path, tuple[tuple[int, int], list[ArchiveIndexEntry]]] = {}
+
+
+def index_path(archive_root: Path) -> Path:
+    """Return the index file of *archive_root*."""
+    return archive_root.parent / INDEX_FILENAME
+
+
+@contextmanager
+def _index_lock(archive_root: Path) -> Iterator[None]:
+    """Hold the exclusive index lock for the duration of the block."""
+    ensure_dir(archive_root.parent)
+    with index_path(archive_root).with_suffix(".lock").open("a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _entry(
+    dir_name: str, meta: dict, log_size: int, bundle: str | None = None
+) -> ArchiveIndexEntry:
+    """Build the index entry of archive *dir_name* from its metadata."""
+    parts = dir_name.split("_", 2)
+    return ArchiveIndexEntry(
+        dir_name=dir_name,
+        archived_at=parts[0],
+        task_id=str(meta.get("task_id", parts[1] if len(parts) > 1 else "")),
+        name=meta.get("name") or "",
+        mode=meta.get("mode"),
+        exit_code=meta.get("exit_code"),
+        log_size=log_size,
+        bundle=bundle,
+    )
+
+
+def entry_for_dir(archive_dir: Path) -> ArchiveIndexEntry:
+    """Build the index entry of *archive_dir* from its ``task.yml`` and logs.
+
+    Directories without readable metadata (e.g. archives of tasks whose
+    metadata was lost) still get an entry, with the task ID parsed from the
+    directory name ``<timestamp>_<task_id>[_<name>]``.
+    """
+    try:
+        meta = _yaml_load((archive_dir / "task.yml").read_text()) or {}
+    except Exception:
+        meta = {}
+    logs_dir = archive_dir / "logs"
+    return _entry(archive_dir.name, meta, disk_usage(logs_dir) if logs_dir.is_dir() else 0)
+
+
+def index_is_current(archive_root: Path) -> bool:
+    """Return whether the index reflects every entry of *archive_root*.
+
+    True when the index was written after the root last changed, or when
+    there is no archive yet.
+    """
+    try:
+        root_mtime = archive_root.stat().st_mtime_ns
+    except OSError:
+        return True
+    try:
+        return index_path(archive_root).stat().st_mtime_ns >= root_mtime
+    except OSError:
+        return False
+
+
+def _bundle_entries(bundle: Path) -> list[ArchiveIndexEntry]:
+    """Rebuild the index entries of every archive packed in *bundle*."""
+    metas: dict[str, dict] = {}
+    log_sizes: dict[str, int] = {}
+    with tarfile.open(bundle) as tar:
+        for member in tar:
+            dir_name, _, rest = member.name.partition("/")
+            if rest == "task.yml":
+                fh = tar.extractfile(member)
+                metas[dir_name] = (_yaml_load(fh.read().decode()) if fh else None) or {}
+            elif rest.startswith("logs/") and member.isfile():
+                log_sizes[dir_name] = log_sizes.get(dir_name, 0) + member.size
+            else:
+                metas.setdefault(dir_name, {})
+    return [
+        _entry(dir_name, meta, log_sizes.get(dir_name, 0), bundle=bundle.name)
+        for dir_name, meta in metas.items()
+    ]
+
+
+def _scan_entries(archive_root: Path) -> list[ArchiveIndexEntry]:
+    """Build the entries of every archive directory and bundle of *archive_root*."""
+    by_dir: dict[str, ArchiveIndexEntry] = {}
+    bundles = archive_root / BUNDLES_DIRNAME
+    for bundle in sorted(bundles.glob("*.tar")) if bundles.is_dir() else ():
+        try:
+            by_dir.update((e.dir_name, e) for e in _bundle_entries(bundle))
+        except (OSError, tarfile.TarError) as exc:
+            _log_debug(f"archive_index: unreadable bundle {bundle}: {exc}")
+    # An unpacked directory wins over a bundled copy (packing was interrupted).
+    for d in archive_root.iterdir():
+        if d.is_dir() and not d.name.startswith("."):
+            by_dir[d.name] = entry_for_dir(d)
+    return sorted(by_dir.values(), key=_dir_name)
+
+
+def _write(archive_root: Path, entries: Iterable[ArchiveIndexEntry]) -> None:
+    """Atomically replace the index with *entries* (caller holds the lock)."""
+    path = index_path(archive_root)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text("".join(json.dumps(asdict(e)) + "\n" for e in entries), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _rebuild(archive_root: Path) -> None:
+    """Rewrite the index from the archive directories (caller holds the lock)."""
+    entries = _scan_entries(archive_root)
+    _write(archive_root, entries)
+    _log_debug(f"archive_index: rebuilt {index_path(archive_root)} ({len(entries)} entries)")
+
+
+def record_archive(archive_dir: Path, *, rebuild: bool = False) -> None:
+    """Add the freshly created *archive_dir* to its index (best-effort).
+
+    Pass *rebuild* when the index was not current before *archive_dir* was
+    created (see :func:`index_is_current`); the whole index is then rebuilt
+    from the archive directories, *archive_dir* included.
+    """
+    archive_root = archive_dir.parent
+    try:
+        with _index_lock(archive_root):
+            if rebuild:
+                _rebuild(archive_root)
+                return
+            with index_path(archive_root).open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(asdict(entry_for_dir(archive_dir))) + "\n")
+    except OSError as exc:
+        _log_debug(f"archive_index: failed to record {archive_dir.name}: {exc}")
+
+
+def rewrite_archive_index(archive_root: Path) -> None:
+    """Rebuild the index of *archive_root* from its directories."""
+    with _index_lock(archive_root):
+        _rebuild(archive_root)
+
+
+def _parse(line: str) -> ArchiveIndexEntry | None:
+    """Parse one index line; ``None`` for blank, torn or foreign lines."""
+    try:
+        data = json.loads(line)
+        return ArchiveIndexEntry(**{k: v for k, v in data.items() if k in _FIELDS})
+    except (ValueError, TypeError):
+        return None
+
+
+def read_archive_index(archive_root: Path) -> list[ArchiveIndexEntry]:
+    """Return the archive's entries sorted oldest-first by directory name.
+
+    Rebuilds a stale or missing index first; the parsed index is cached
+    until the file changes.
+    """
+    if not archive_root.is_dir():
+        return []
+    path = index_path(archive_root)
+    if not index_is_current(archive_root):
+        try:
+            with _index_lock(archive_root):
+                if not index_is_current(archive_root):
+                    _rebuild(archive_root)
+        except OSError as exc:
+            _log_debug(f"archive_index: failed to rebuild {path}: {exc}")
+            return _scan_entries(archive_root)
+    return _load_index(archive_root)
+
+
+def _load_index(archive_root: Path) -> list[ArchiveIndexEntry]:
+    """Parse the index file of *archive_root*, cached until the file changes."""
+    path = index_path(archive_root)
+    try:
+        st = path.stat()
+    except OSError:
+        return []
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(archive_root)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    by_dir: dict[str, ArchiveIndexEntry] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if (entry := _parse(line)) is not None:
+            by_dir[entry.dir_name] = entry  # a later line for the same entry wins
+    entries = sorted(by_dir.values(), key=_dir_name)
+    _cache[archive_root] = (key, entries)
+    return entries
+
+
+def _current_entries(archive_root: Path) -> list[ArchiveIndexEntry]:
+    """Return the index entries, scanning the archive if the index is stale (lock held)."""
+    return (
+        _load_index(archive_root) if index_is_current(archive_root) else _scan_entries(archive_root)
+    )
+
+
+def _dir_name(entry: ArchiveIndexEntry) -> str:
+    """Sort key of index entries."""
+    return entry.dir_name
+
+
+def find_archives(archive_root: Path, prefix: str) -> list[ArchiveIndexEntry]:
+    """Return the entries whose directory name starts with *prefix*, newest first."""
+    entries = read_archive_index(archive_root)
+    lo = bisect.bisect_left(entries, prefix, key=_dir_name)
+    hi = lo
+    while hi < len(entries) and entries[hi].dir_name.startswith(prefix):
+        hi += 1
+    return entries[lo:hi][::-1]
+
+
+def archives_since(entries: list[ArchiveIndexEntry], since: str) -> list[ArchiveIndexEntry]:
+    """Return the entries of the sorted *entries* archived at or after *since*.
+
+    *since* is an archive timestamp (``YYYYmmddTHHMMSSffffffZ``) or a prefix
+    of one.
+    """
+    return entries[bisect.bisect_left(entries, since, key=_dir_name) :]
+
+
+def bundle_archives(archive_root: Path, entries: list[ArchiveIndexEntry], bundle_name: str) -> None:
+    """Pack the unpacked archive *entries* into bundle *bundle_name* (``YYYY-MM.tar``).
+
+    The directories are appended to the bundle before they are removed, so
+    an interruption never loses an archive; the index is rewritten last.
+    """
+    packed = {e.dir_name for e in entries}
+    with _index_lock(archive_root):
+        current = _current_entries(archive_root)
+        bundles = archive_root / BUNDLES_DIRNAME
+        ensure_dir(bundles)
+        with tarfile.open(bundles / bundle_name, "a") as tar:
+            for entry in entries:
+                tar.add(archive_root / entry.dir_name, arcname=entry.dir_name)
+        for entry in entries:
+            shutil.rmtree(archive_root / entry.dir_name, ignore_errors=True)
+        _write(
+            archive_root,
+            (replace(e, bundle=bundle_name) if e.dir_name in packed else e for e in current),
+        )
+
+
+def _drop_from_bundle(bundle: Path, dir_names: set[str]) -> None:
+    """Rewrite *bundle* without the archives *dir_names* (remove it if empty)."""
+    with tarfile.open(bundle) as tar:
+        keep = [m for m in tar.getmembers() if m.name.partition("/")[0] not in dir_names]
+        if not keep:
+            bundle.unlink()
+            return
+        tmp = bundle.with_suffix(".tmp")
+        with tarfile.open(tmp, "w") as out:
+            for member in keep:
+                out.addfile(member, tar.extractfile(member) if member.isfile() else None)
+    os.replace(tmp, bundle)
+
+
+def remove_archives(archive_root: Path, entries: list[ArchiveIndexEntry]) -> None:
+    """Remove the archive *entries*, unpacked or bundled, and update the index."""
+    drop = {e.dir_name for e in entries}
+    by_bundle: dict[str, set[str]] = {}
+    for entry in entries:
+        if entry.bundle:
+            by_bundle.setdefault(entry.bundle, set()).add(entry.dir_name)
+    with _index_lock(archive_root):
+        current = _current_entries(archive_root)
+        for entry in entries:
+            shutil.rmtree(archive_root / entry.dir_name, ignore_errors=True)
+            shutil.rmtree(archive_root / UNBUNDLED_DIRNAME / entry.dir_name, ignore_errors=True)
+        for bundle_name, dir_names in by_bundle.items():
+            try:
+                _drop_from_bundle(archive_root / BUNDLES_DIRNAME / bundle_name, dir_names)
+            except (OSError, tarfile.TarError) as exc:
+                _log_debug(f"archive_index: failed to prune bundle {bundle_name}: {exc}")
+        _write(archive_root, (e for e in current if e.dir_name not in drop))
+
+
+def entry_log_file(archive_root: Path, entry: ArchiveIndexEntry) -> Path:
+    """Return the logical log file of archive *entry*, unpacking a bundled one first."""
+    if not entry.bundle:
+        return archive_root / entry.dir_name / "logs" / _LOG_FILENAME
+    target = archive_root / UNBUNDLED_DIRNAME / entry.dir_name
+    if not target.is_dir():
+        tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+        with tarfile.open(archive_root / BUNDLES_DIRNAME / entry.bundle) as tar:
+            members = [m for m in tar.getmembers() if m.name.partition("/")[0] == entry.dir_name]
+            tar.extractall(tmp, members=members, filter="data")
+        os.replace(tmp / entry.dir_name, target)
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target / "logs" / _LOG_FILENAME
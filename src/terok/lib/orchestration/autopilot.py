@@ -7,44 +7,40 @@ Encapsulates the podman-level operations for headless/autopilot containers
 so that the TUI (presentation layer) doesn't need raw subprocess calls.
 """
 
-import subprocess
-
-from .tasks import update_task_exit_code
+from .exit_watcher import ExitCallback, get_exit_watcher
 
 
 def wait_for_container_exit(
     container_name: str,
     project_id: str,
     task_id: str,
-    timeout: int = 7200,
+    timeout: float | None = 7200,
 ) -> tuple[int | None, str | None]:
     """Wait for a container to exit and update task metadata.
 
-    Returns ``(exit_code, error_message)``.  On success *error_message* is
-    ``None``; on failure *exit_code* is ``None``.
+    Blocks on the shared :class:`~.exit_watcher.ExitWatcher` rather than a
+    dedicated ``podman wait`` process.  Returns ``(exit_code, error_message)``.
+    On success *error_message* is ``None``; on failure *exit_code* is ``None``.
     """
-    try:
-        result = subprocess.run(
-            ["podman", "wait", container_name],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        if result.returncode != 0:
-            err = (result.stderr or result.stdout or "").strip()
-            return None, f"podman wait failed: {err}"
-
-        try:
-            exit_code = int(result.stdout.strip())
-        except ValueError:
-            return None, f"podman wait returned non-integer: {result.stdout.strip()!r}"
-
-        update_task_exit_code(project_id, task_id, exit_code)
-        return exit_code, None
-    except subprocess.TimeoutExpired:
+    result = get_exit_watcher().wait(container_name, project_id, task_id, timeout=timeout)
+    if result is None:
         return None, "Watcher timed out"
-    except Exception as e:
-        return None, str(e)
+    return result.exit_code, result.error
+
+
+def watch_container_exit(
+    container_name: str,
+    project_id: str,
+    task_id: str,
+    callback: ExitCallback,
+) -> None:
+    """Register *callback* to run once *container_name* exits.
+
+    Task metadata is updated before *callback* receives the
+    :class:`~.exit_watcher.ContainerExit`.  The callback runs on the shared
+    watcher thread, so it must hand work off rather than block.
+    """
+    get_exit_watcher().watch(container_name, project_id, task_id, callback)
 
 
 def follow_container_logs_cmd(container_name: str) -> list[str]:
@@ -12,8 +12,13 @@ task container.
 from __future__ import annotations
 
 import os
+import threading
+import time
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 from terok_agent import collect_opencode_provider_env
 from terok_sandbox import (
@@ -47,13 +52,17 @@ class SharedMount:
     """Mount point inside the container (e.g. ``"/home/dev/.codex"``)."""
 
 
-def _build_shared_mounts() -> tuple[SharedMount, ...]:
-    """Derive shared mounts from the agent registry.
+@lru_cache(maxsize=1)
+def get_shared_mounts() -> tuple[SharedMount, ...]:
+    """Return the shared mounts derived from the agent registry.
 
     The YAML agent registry is the single source of truth for all shared
     mounts — auth dirs, OpenCode state dirs, and Toad config.  Each entry's
     ``auth:`` section and ``mounts:`` section contribute mount definitions,
     deduplicated by ``host_dir`` in the registry.
+
+    Parsed on first use and cached, so importing this module (task listings,
+    shell completion, TUI start-up) does not load the registry.
     """
     from terok_agent import get_registry
 
@@ -63,22 +72,38 @@ def _build_shared_mounts() -> tuple[SharedMount, ...]:
     )
 
 
-SHARED_MOUNTS: tuple[SharedMount, ...] = _build_shared_mounts()
+_verified_dirs: dict[Path, tuple[int, ...]] = {}
+
+
+def _dir_identity(path: Path) -> tuple[int, ...] | None:
+    """Return what a writability verdict for directory *path* depends on, or ``None``."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mode, st.st_uid, st.st_gid)
 
 
 def _ensure_shared_dirs(envs_base: Path) -> dict[str, Path]:
-    """Ensure shared config directories exist and return key→host_path mapping."""
+    """Ensure shared config directories exist and return key→host_path mapping.
+
+    A directory verified by an earlier launch is not probed again while its
+    identity, mode and ownership are unchanged.
+    """
     dirs = {}
-    for m in SHARED_MOUNTS:
+    for m in get_shared_mounts():
         path = envs_base / m.host_dir_suffix
-        ensure_dir_writable(path, m.label)
+        identity = _dir_identity(path)
+        if identity is None or _verified_dirs.get(path) != identity:
+            ensure_dir_writable(path, m.label)
+            _verified_dirs[path] = _dir_identity(path)
         dirs[m.key] = path
     return dirs
 
 
 def _shared_volume_mounts(host_dirs: dict[str, Path]) -> list[str]:
     """Return volume mount strings for all shared config directories."""
-    return [f"{host_dirs[m.key]}:{m.container_path}:z" for m in SHARED_MOUNTS]
+    return [f"{host_dirs[m.key]}:{m.container_path}:z" for m in get_shared_mounts()]
 
 
 def _gate_url(gate_repo: Path, port: int, token: str) -> str:
@@ -223,6 +248,125 @@ def apply_git_identity_env(
 
 # ---------- Credential proxy ----------
 
+CACHE_TTL_SECONDS = 30.0
+"""How long the agent registry and stored credential sets are reused."""
+
+PROXY_CHECK_TTL_SECONDS = 10.0
+"""How long a successful proxy reachability check is trusted."""
+
+_DEFAULT_CREDENTIAL_SET = "default"
+
+_cache_lock = threading.Lock()
+_registry_cache: tuple[float, Any] | None = None
+_proxy_checked_at: float | None = None
+_credential_sets: dict[tuple[str, str], tuple[float, frozenset[str]]] = {}
+
+
+def clear_credential_proxy_caches() -> None:
+    """Forget the cached registry, proxy reachability and credential sets."""
+    global _registry_cache, _proxy_checked_at
+    with _cache_lock:
+        _registry_cache = None
+        _proxy_checked_at = None
+        _credential_sets.clear()
+
+
+def _fresh(stamp: float | None, ttl: float) -> bool:
+    """Return whether a cache entry taken at monotonic time *stamp* is still valid."""
+    return stamp is not None and time.monotonic() - stamp < ttl
+
+
+def _cached_registry() -> Any:
+    """Return the agent registry, reloading it at most every ``CACHE_TTL_SECONDS``."""
+    global _registry_cache
+    from terok_agent import get_registry
+
+    with _cache_lock:
+        cached = _registry_cache
+    if cached is not None and _fresh(cached[0], CACHE_TTL_SECONDS):
+        return cached[1]
+    registry = get_registry()
+    with _cache_lock:
+        _registry_cache = (time.monotonic(), registry)
+    return registry
+
+
+def _ensure_proxy_reachable_cached() -> None:
+    """Check the proxy is reachable unless it passed within ``PROXY_CHECK_TTL_SECONDS``.
+
+    Failures are never cached: an unreachable proxy raises ``SystemExit``
+    every time.
+    """
+    global _proxy_checked_at
+    from terok_sandbox import ensure_proxy_reachable
+
+    with _cache_lock:
+        if _fresh(_proxy_checked_at, PROXY_CHECK_TTL_SECONDS):
+            return
+    ensure_proxy_reachable()
+    with _cache_lock:
+        _proxy_checked_at = time.monotonic()
+
+
+def _open_credential_db(db_path: Path) -> Any:
+    """Open the credential proxy DB at *db_path*."""
+    from terok_sandbox import CredentialDB
+
+    return CredentialDB(db_path)
+
+
+def _stored_providers(db_path: Path, credential_set: str) -> frozenset[str]:
+    """Return the providers with credentials in *credential_set*.
+
+    Memoized per process for ``CACHE_TTL_SECONDS``, so a batch of launches
+    lists the credential set once; a newly stored credential is picked up
+    by launches after the TTL (or immediately in a new process).
+    """
+    key = (str(db_path), credential_set)
+    with _cache_lock:
+        cached = _credential_sets.get(key)
+    if cached is not None and _fresh(cached[0], CACHE_TTL_SECONDS):
+        return cached[1]
+    db = _open_credential_db(db_path)
+    try:
+        providers = frozenset(db.list_credentials(credential_set))
+    finally:
+        db.close()
+    with _cache_lock:
+        _credential_sets[key] = (time.monotonic(), providers)
+    return providers
+
+
+def mint_proxy_tokens(
+    project_id: str,
+    task_id: str,
+    providers: Iterable[str],
+    *,
+    db_path: Path | None = None,
+    credential_set: str = _DEFAULT_CREDENTIAL_SET,
+) -> dict[str, str]:
+    """Mint phantom proxy tokens for every provider of a task in one DB session.
+
+    Returns ``{provider: token}``.  The credential DB (at *db_path*,
+    default: the sandbox's proxy DB) is opened once for all providers
+    instead of once per token, and not at all when nothing is routed.
+    """
+    provider_list = sorted(set(providers))
+    if not provider_list:
+        return {}
+    if db_path is None:
+        from terok_sandbox import SandboxConfig
+
+        db_path = SandboxConfig().proxy_db_path
+    db = _open_credential_db(db_path)
+    try:
+        return {
+            name: db.create_proxy_token(project_id, task_id, credential_set, name)
+            for name in provider_list
+        }
+    finally:
+        db.close()
+
 
 def _credential_proxy_env_and_volumes(
     project: ProjectConfig, task_id: str
@@ -241,31 +385,17 @@ def _credential_proxy_env_and_volumes(
     if get_credential_proxy_bypass():
         return {}, []
 
-    from terok_agent import get_registry
-    from terok_sandbox import (
-        CredentialDB,
-        SandboxConfig,
-        ensure_proxy_reachable,
-        get_proxy_port,
-    )
+    from terok_sandbox import SandboxConfig, get_proxy_port
 
     cfg = SandboxConfig()
-    ensure_proxy_reachable()
+    _ensure_proxy_reachable_cached()
 
-    registry = get_registry()
+    registry = _cached_registry()
     proxy_routes = registry.proxy_routes
 
-    db = CredentialDB(cfg.proxy_db_path)
-    try:
-        credential_set = "default"
-        stored_providers = set(db.list_credentials(credential_set))
-        routed = stored_providers & proxy_routes.keys()
-        tokens = {
-            name: db.create_proxy_token(project.id, task_id, credential_set, name)
-            for name in routed
-        }
-    finally:
-        db.close()
+    stored = _stored_providers(cfg.proxy_db_path, _DEFAULT_CREDENTIAL_SET)
+    routed = stored & proxy_routes.keys()
+    tokens = mint_proxy_tokens(project.id, task_id, routed, db_path=cfg.proxy_db_path)
 
     port = get_proxy_port(cfg)
     proxy_base = f"http://host.containers.internal:{port}"
@@ -301,7 +431,7 @@ def build_task_env_and_volumes(project: ProjectConfig, task_id: str) -> tuple[di
     """Compose environment and volume mounts for a task container.
 
     - Mount per-task workspace subdir to /workspace (host-explorable).
-    - Mount all shared config dirs from ``SHARED_MOUNTS`` (read-write).
+    - Mount all shared config dirs from :func:`get_shared_mounts` (read-write).
     - Optionally mount per-project SSH config dir to /home/dev/.ssh (read-write).
     - Provide REPO_ROOT and git info for the init script.
     """
@@ -0,0 +1,370 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Single event-driven watcher for task container exits.
+
+Instead of one thread blocked in ``podman wait`` per headless task, one
+:class:`ExitWatcher` per process follows ``podman events`` for ``died``
+events of all watched containers.  A low-frequency reconciliation pass
+(``podman ps -a``) catches containers that exited before they were watched,
+events lost while the stream was restarting, and containers that were
+removed outright.  When ``podman events`` is unavailable the watcher
+degrades to reconciliation polling at a shorter interval.
+
+On exit, the task's exit code is recorded via
+:func:`~terok.lib.orchestration.tasks.update_task_exit_code` and a
+:class:`ContainerExit` is delivered to the per-container callbacks, to every
+subscriber, and to threads blocked in :meth:`ExitWatcher.wait`.  Callbacks run
+on the watcher thread and must not block.
+
+The watcher thread and its ``podman events`` process exist only while at
+least one container is watched.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import select
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from ..util.logging_utils import _log_debug
+from .tasks import update_task_exit_code
+
+RECONCILE_INTERVAL = 30.0
+"""Seconds between reconciliation passes while the event stream is healthy."""
+
+POLL_INTERVAL = 5.0
+"""Seconds between reconciliation passes when ``podman events`` is unavailable."""
+
+_EXITED_STATES = frozenset({"exited", "stopped"})
+
+
+@dataclass(frozen=True)
+class ContainerExit:
+    """Outcome of watching one task container."""
+
+    cname: str
+    project_id: str
+    task_id: str
+    exit_code: int | None
+    error: str | None = None
+
+
+ExitCallback = Callable[[ContainerExit], None]
+
+
+@dataclass
+class _Watch:
+    """Book-keeping for one watched container."""
+
+    project_id: str
+    task_id: str
+    callbacks: list[ExitCallback] = field(default_factory=list)
+    done: threading.Event = field(default_factory=threading.Event)
+    result: ContainerExit | None = None
+    pinned: bool = False
+    """Registered through :meth:`ExitWatcher.watch`, so kept until the exit."""
+    waiters: int = 0
+    """Threads blocked in :meth:`ExitWatcher.wait` on this container."""
+
+
+class ExitWatcher:
+    """Track exits of many task containers with one ``podman events`` stream."""
+
+    def __init__(
+        self,
+        *,
+        reconcile_interval: float = RECONCILE_INTERVAL,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        """Create an idle watcher; the thread starts with the first :meth:`watch`."""
+        self.reconcile_interval = reconcile_interval
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._watches: dict[str, _Watch] = {}
+        self._subscribers: list[ExitCallback] = []
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._reconcile_pending = False
+        self._wake_r, self._wake_w = os.pipe()
+
+    # ── Public API ──
+
+    def watch(
+        self,
+        cname: str,
+        project_id: str,
+        task_id: str,
+        callback: ExitCallback | None = None,
+    ) -> None:
+        """Start watching *cname*; *callback* is invoked once when it exits.
+
+        Watching an already-watched container only adds the callback.  A
+        reconciliation pass is scheduled right away, so a container that
+        exited before this call is still reported.
+        """
+        self._add_watch(cname, project_id, task_id, callback)
+
+    def _add_watch(
+        self,
+        cname: str,
+        project_id: str,
+        task_id: str,
+        callback: ExitCallback | None,
+        *,
+        waiter: bool = False,
+    ) -> _Watch:
+        """Register *cname* (thread-safe), start the thread, and return its entry."""
+        with self._lock:
+            entry = self._watches.get(cname)
+            if entry is None:
+                entry = self._watches[cname] = _Watch(project_id, task_id)
+            if waiter:
+                entry.waiters += 1
+            else:
+                entry.pinned = True
+            if callback is not None:
+                entry.callbacks.append(callback)
+            self._reconcile_pending = True
+            self._stopping = False
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="terok-exit-watcher", daemon=True
+                )
+                self._thread.start()
+        self._wake()
+        return entry
+
+    def wait(
+        self,
+        cname: str,
+        project_id: str,
+        task_id: str,
+        timeout: float | None = None,
+    ) -> ContainerExit | None:
+        """Watch *cname* and block until it exits; ``None`` on *timeout*.
+
+        On timeout the container stops being watched unless someone else
+        still waits for it or registered it through :meth:`watch`.
+        """
+        entry = self._add_watch(cname, project_id, task_id, None, waiter=True)
+        if entry.done.wait(timeout):
+            return entry.result
+        with self._lock:
+            entry.waiters -= 1
+            if entry.done.is_set():
+                return entry.result
+            if not entry.waiters and not entry.pinned and self._watches.get(cname) is entry:
+                del self._watches[cname]
+        self._wake()  # Let the thread exit if nothing is left to watch
+        return None
+
+    def subscribe(self, callback: ExitCallback) -> Callable[[], None]:
+        """Invoke *callback* for every watched exit; returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def _unsubscribe() -> None:
+            """Remove *callback* from the subscriber list."""
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return _unsubscribe
+
+    def watched(self) -> list[str]:
+        """Return the names of the currently watched containers."""
+        with self._lock:
+            return sorted(self._watches)
+
+    def stop(self) -> None:
+        """Stop the watcher thread; pending watches stay registered."""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        self._wake()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+
+    # ── Resolution ──
+
+    def _resolve(self, cname: str, exit_code: int | None, error: str | None = None) -> None:
+        """Record the exit of *cname* and notify everyone waiting for it."""
+        with self._lock:
+            entry = self._watches.pop(cname, None)
+            subscribers = list(self._subscribers)
+        if entry is None:
+            return
+        if error is None:
+            try:
+                update_task_exit_code(entry.project_id, entry.task_id, exit_code)
+            except Exception as exc:
+                error = f"failed to record exit code: {exc}"
+        result = ContainerExit(cname, entry.project_id, entry.task_id, exit_code, error)
+        entry.result = result
+        entry.done.set()
+        for callback in [*entry.callbacks, *subscribers]:
+            try:
+                callback(result)
+            except Exception as exc:
+                _log_debug(f"exit_watcher: callback for {cname} failed: {exc}")
+
+    def _handle_event(self, line: bytes) -> None:
+        """Resolve the container named in one ``podman events`` JSON line."""
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(event, dict) or event.get("Status") not in ("died", "die"):
+            return
+        cname = event.get("Name")
+        with self._lock:
+            if cname not in self._watches:
+                return
+        code = event.get("ContainerExitCode")
+        if isinstance(code, int):
+            self._resolve(cname, code)
+        else:
+            # Older podman omits the exit code — let reconciliation read it.
+            with self._lock:
+                self._reconcile_pending = True
+
+    def _reconcile(self) -> bool:
+        """Resolve watched containers that have exited or disappeared.
+
+        Returns ``False`` when podman could not be queried.
+        """
+        with self._lock:
+            names = set(self._watches)
+        if not names:
+            return True
+        try:
+            result = subprocess.run(
+                ["podman", "ps", "-a", "--format", "{{.Names}}\t{{.State}}\t{{.ExitCode}}"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            _log_debug(f"exit_watcher: reconcile failed: {exc}")
+            return False
+        if result.returncode != 0:
+            _log_debug(f"exit_watcher: podman ps failed: {result.stderr.strip()}")
+            return False
+        seen: set[str] = set()
+        for row in result.stdout.splitlines():
+            name, _, rest = row.partition("\t")
+            state, _, code = rest.partition("\t")
+            if name not in names:
+                continue
+            seen.add(name)
+            if state.strip().lower() in _EXITED_STATES:
+                try:
+                    self._resolve(name, int(code.strip()))
+                except ValueError:
+                    self._resolve(name, None, f"unexpected exit code {code.strip()!r}")
+        for name in names - seen:
+            self._resolve(name, None, "container not found")
+        return True
+
+    # ── Thread ──
+
+    def _wake(self) -> None:
+        """Interrupt the watcher thread's ``select``."""
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    def _open_events(self) -> subprocess.Popen[bytes] | None:
+        """Start ``podman events`` for container ``died`` events, or ``None``."""
+        try:
+            return subprocess.Popen(
+                [
+                    "podman",
+                    "events",
+                    "--filter",
+                    "type=container",
+                    "--filter",
+                    "event=died",
+                    "--format",
+                    "json",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exc:
+            _log_debug(f"exit_watcher: podman events unavailable: {exc}")
+            return None
+
+    def _should_exit(self) -> bool:
+        """Detach the thread when stopping or nothing is watched (under the lock)."""
+        with self._lock:
+            if self._stopping or not self._watches:
+                self._thread = None
+                return True
+            return False
+
+    def _run(self) -> None:
+        """Thread body: pump events, reconcile periodically, exit when idle."""
+        proc = self._open_events()
+        buf = b""
+        next_reconcile = 0.0
+        try:
+            while not self._should_exit():
+                with self._lock:
+                    if self._reconcile_pending:
+                        self._reconcile_pending = False
+                        next_reconcile = 0.0
+                now = time.monotonic()
+                if now >= next_reconcile:
+                    self._reconcile()
+                    interval = self.reconcile_interval if proc else self.poll_interval
+                    next_reconcile = time.monotonic() + interval
+                    continue
+                fds = [self._wake_r]
+                if proc is not None and proc.stdout is not None:
+                    fds.append(proc.stdout.fileno())
+                ready, _, _ = select.select(fds, [], [], max(0.0, next_reconcile - now))
+                if self._wake_r in ready:
+                    os.read(self._wake_r, 4096)
+                if proc is None or proc.stdout is None or proc.stdout.fileno() not in ready:
+                    continue
+                chunk = os.read(proc.stdout.fileno(), 65536)
+                if not chunk:
+                    _log_debug("exit_watcher: podman events ended; falling back to polling")
+                    proc.wait()
+                    proc = None
+                    next_reconcile = 0.0
+                    continue
+                *lines, buf = (buf + chunk).split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        self._handle_event(line)
+        finally:
+            if proc is not None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+
+_watcher: ExitWatcher | None = None
+_watcher_lock = threading.Lock()
+
+
+def get_exit_watcher() -> ExitWatcher:
+    """Return the process-wide :class:`ExitWatcher`, creating it on first use."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ExitWatcher()
+            atexit.register(_watcher.stop)
+        return _watcher
@@ -0,0 +1,208 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Durable journal of lifecycle hook runs.
+
+Every hook point a task reaches is appended as one JSON line to
+``<state_root>/hooks/<project_id>.jsonl``.  A run dispatched to the
+background runner is first recorded as ``queued`` and then again, under the
+same run ID, with its outcome; a run whose latest record is still
+``queued`` is pending.  Sickbay reads this journal instead of every task's
+metadata to find tasks that stopped without their ``post_stop`` hook.
+
+Appends and compaction serialise on a per-project ``flock``.  Once a
+journal grows beyond :data:`COMPACT_BYTES`, it is rewritten keeping pending
+runs and the latest finished run of each hook of each task.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+
+from ..core.config import state_root
+from ..util.fs import ensure_dir
+from ..util.logging_utils import _log_debug
+
+QUEUED = "queued"
+"""State of a background run that has not finished yet."""
+
+FINISHED_STATES = frozenset({"ok", "failed", "timeout", "none"})
+"""Outcomes of a run; ``none`` marks a hook point with no command configured."""
+
+COMPACT_BYTES = 256 * 1024
+"""Journal size above which an append compacts the journal."""
+
+
+@dataclass(frozen=True)
+class HookRecord:
+    """One journal line: a hook run of a task and its state."""
+
+    run_id: str
+    project_id: str
+    task_id: str
+    hook: str
+    mode: str
+    cname: str
+    state: str
+    ts: float
+    command: str | None = None
+    web_port: int | None = None
+    task_dir: str | None = None
+    detail: str | None = None
+    """Exit code or error of a finished run."""
+
+    def finished(self, state: str, detail: str | None = None) -> HookRecord:
+        """Return the record of this run having finished with *state*."""
+        return replace(self, state=state, detail=detail, ts=time.time())
+
+
+def new_hook_record(
+    hook: str,
+    command: str | None,
+    *,
+    project_id: str,
+    task_id: str,
+    mode: str,
+    cname: str,
+    state: str,
+    web_port: int | None = None,
+    task_dir: Path | None = None,
+) -> HookRecord:
+    """Create the first record of a new hook run."""
+    return HookRecord(
+        run_id=uuid.uuid4().hex,
+        project_id=project_id,
+        task_id=str(task_id),
+        hook=hook,
+        mode=mode,
+        cname=cname,
+        state=state,
+        ts=time.time(),
+        command=command or None,
+        web_port=web_port,
+        task_dir=str(task_dir) if task_dir is not None else None,
+    )
+
+
+def hooks_dir() -> Path:
+    """Return the directory holding hook journals and the runner lock."""
+    return state_root() / "hooks"
+
+
+def journal_path(project_id: str) -> Path:
+    """Return the journal file of *project_id*."""
+    return hooks_dir() / f"{project_id}.jsonl"
+
+
+@contextmanager
+def _journal_lock(project_id: str) -> Iterator[None]:
+    """Hold the project's exclusive journal lock for the duration of the block."""
+    ensure_dir(hooks_dir())
+    with (hooks_dir() / f"{project_id}.lock").open("a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+_FIELDS = frozenset(f.name for f in fields(HookRecord))
+
+
+def _parse(line: str) -> HookRecord | None:
+    """Parse one journal line; ``None`` for blank, torn or foreign lines."""
+    try:
+        data = json.loads(line)
+        return HookRecord(**{k: v for k, v in data.items() if k in _FIELDS})
+    except (ValueError, TypeError):
+        return None
+
+
+def read_hook_journal(project_id: str) -> list[HookRecord]:
+    """Return every readable record of the project's journal, oldest first."""
+    try:
+        text = journal_path(project_id).read_text(encoding="utf-8")
+    except OSError:
+        return []
+    return [rec for line in text.splitlines() if (rec := _parse(line)) is not None]
+
+
+def _latest_runs(records: list[HookRecord]) -> dict[str, HookRecord]:
+    """Return the latest record of each run ID, in journal order of those records."""
+    latest: dict[str, HookRecord] = {}
+    for rec in records:
+        latest.pop(rec.run_id, None)
+        latest[rec.run_id] = rec
+    return latest
+
+
+def _compacted(records: list[HookRecord]) -> list[HookRecord]:
+    """Keep pending runs and the latest finished run per task and hook."""
+    keep: dict[tuple[str, str], HookRecord] = {}
+    pending: list[HookRecord] = []
+    for rec in _latest_runs(records).values():
+        if rec.state == QUEUED:
+            pending.append(rec)
+        else:
+            keep.pop((rec.task_id, rec.hook), None)
+            keep[(rec.task_id, rec.hook)] = rec
+    return sorted([*keep.values(), *pending], key=lambda r: r.ts)
+
+
+def _write_lines(path: Path, records: list[HookRecord]) -> None:
+    """Atomically replace *path* with *records*."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text("".join(json.dumps(asdict(r)) + "\n" for r in records), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def append_hook_record(record: HookRecord) -> None:
+    """Append *record* to its project's journal (best-effort, never raises)."""
+    try:
+        with _journal_lock(record.project_id):
+            path = journal_path(record.project_id)
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(asdict(record)) + "\n")
+            if path.stat().st_size > COMPACT_BYTES:
+                _write_lines(path, _compacted(read_hook_journal(record.project_id)))
+    except OSError as exc:
+        _log_debug(f"hook_journal: failed to record {record.hook} of {record.task_id}: {exc}")
+
+
+def journal_project_ids() -> list[str]:
+    """Return the IDs of projects that have a hook journal."""
+    root = hooks_dir()
+    if not root.is_dir():
+        return []
+    return sorted(p.stem for p in root.glob("*.jsonl"))
+
+
+def pending_hook_runs(project_id: str | None = None) -> list[HookRecord]:
+    """Return queued runs whose outcome is not recorded yet, oldest first."""
+    ids = [project_id] if project_id else journal_project_ids()
+    pending = [
+        rec
+        for pid in ids
+        for rec in _latest_runs(read_hook_journal(pid)).values()
+        if rec.state == QUEUED
+    ]
+    return sorted(pending, key=lambda r: r.ts)
+
+
+def last_hooks_by_task(project_id: str) -> dict[str, dict[str, HookRecord]]:
+    """Map each task of the project to ``{hook: latest record}``."""
+    tasks: dict[str, dict[str, HookRecord]] = {}
+    for rec in _latest_runs(read_hook_journal(project_id)).values():
+        hooks = tasks.setdefault(rec.task_id, {})
+        prev = hooks.get(rec.hook)
+        if prev is None or rec.ts >= prev.ts:
+            hooks[rec.hook] = rec
+    return tasks
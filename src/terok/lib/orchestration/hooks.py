@@ -4,19 +4,41 @@
 """Task lifecycle hook execution and tracking.
 
 Runs user-configured shell commands at task lifecycle points on the host.
-Hook commands receive task context via environment variables.  Tracks
-which hooks have fired in task metadata so sickbay can detect and
+Hook commands receive task context via environment variables.  Every hook
+point reached is recorded in the hook journal
+(:mod:`~terok.lib.orchestration.hook_journal`) so sickbay can detect and
 reconcile missed hooks (e.g. post_stop after an unclean shutdown).
+
+Hooks listed in ``run.hooks.background`` do not block the caller: they are
+journaled as queued and run by a detached runner process, at most
+:data:`BACKGROUND_HOOK_CONCURRENCY` at a time.
 """
 
 from __future__ import annotations
 
+import fcntl
 import logging
 import os
 import subprocess  # nosec B404 — hooks execute user-configured commands by design
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..util.fs import ensure_dir
+from ..util.logging_utils import _log_debug
+from ..util.timings import span
+from .hook_journal import (
+    QUEUED,
+    HookRecord,
+    append_hook_record,
+    hooks_dir,
+    new_hook_record,
+    pending_hook_runs,
+)
 
-from ..util.yaml import dump as _yaml_dump, load as _yaml_load
+if TYPE_CHECKING:
+    from ..core.project_model import ProjectConfig
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +48,11 @@ _STOP_HOOK_TIMEOUT = 30  # seconds for post_stop
 #: Hooks that fire during the task lifecycle.
 HOOK_NAMES = ("pre_start", "post_start", "post_ready", "post_stop")
 
+BACKGROUND_HOOK_CONCURRENCY = 4
+"""Maximum number of background hooks the runner executes at once."""
+
+_RUNNER_LOCK_FILENAME = "runner.lock"
+
 
 def _build_hook_env(
     project_id: str,
@@ -53,19 +80,44 @@ def _build_hook_env(
     return env
 
 
-def _record_hook(meta_path: Path, hook_name: str) -> None:
-    """Append *hook_name* to the ``hooks_fired`` list in task metadata."""
-    if not meta_path.is_file():
-        return
+def _execute(record: HookRecord) -> tuple[str, str | None]:
+    """Run the hook command of *record*; returns its journal state and detail."""
+    env = _build_hook_env(
+        record.project_id,
+        record.task_id,
+        record.mode,
+        record.cname,
+        record.hook,
+        web_port=record.web_port,
+        task_dir=Path(record.task_dir) if record.task_dir else None,
+    )
+
+    logger.debug("hook %s: running %r", record.hook, record.command)
+
+    timeout = _STOP_HOOK_TIMEOUT if record.hook == "post_stop" else _STARTUP_HOOK_TIMEOUT
     try:
-        meta = _yaml_load(meta_path.read_text()) or {}
-        fired = meta.get("hooks_fired") or []
-        if hook_name not in fired:
-            fired.append(hook_name)
-        meta["hooks_fired"] = fired
-        meta_path.write_text(_yaml_dump(meta))
-    except Exception:
-        logger.warning("failed to record hook %s in %s", hook_name, meta_path, exc_info=True)
+        with span(f"hook:{record.hook}"):
+            result = subprocess.run(  # nosec B603 B607
+                ["sh", "-c", record.command or ""],
+                env=env,
+                timeout=timeout,
+                check=False,
+                capture_output=True,
+                text=True,
+            )
+        if result.stdout:
+            logger.debug("hook %s stdout: %s", record.hook, result.stdout.rstrip())
+        if result.stderr:
+            logger.debug("hook %s stderr: %s", record.hook, result.stderr.rstrip())
+    except subprocess.TimeoutExpired:
+        logger.warning("hook %s timed out after %ds", record.hook, timeout)
+        return "timeout", f"timed out after {timeout}s"
+    except Exception as exc:
+        logger.warning("hook %s failed", record.hook, exc_info=True)
+        return "failed", str(exc)
+    if result.returncode != 0:
+        return "failed", f"exit code {result.returncode}"
+    return "ok", None
 
 
 def run_hook(
@@ -78,7 +130,7 @@ def run_hook(
     cname: str,
     web_port: int | None = None,
     task_dir: Path | None = None,
-    meta_path: Path | None = None,
+    background: bool = False,
 ) -> None:
     """Execute a lifecycle hook command if configured.
 
@@ -86,44 +138,134 @@ def run_hook(
     variables.  Errors are logged as warnings — hooks must not break the
     task lifecycle.
 
-    If *meta_path* is provided, the hook name is recorded in the task's
-    ``hooks_fired`` metadata list (even when *command* is None — the hook
-    point was reached, so it counts as "fired").
+    Every call is recorded in the hook journal, even when *command* is
+    None — the hook point was reached, so it counts as "fired".  With
+    *background*, the run is journaled as queued and handed to the
+    background hook runner instead of blocking the caller.
     """
-    # Always record that this hook point was reached, even if no command
-    if meta_path:
-        _record_hook(meta_path, hook_name)
-
+    record = new_hook_record(
+        hook_name,
+        command,
+        project_id=project_id,
+        task_id=task_id,
+        mode=mode,
+        cname=cname,
+        state=QUEUED if background and command else "none",
+        web_port=web_port,
+        task_dir=task_dir,
+    )
     if not command:
+        append_hook_record(record)
         return
+    if background:
+        append_hook_record(record)
+        start_hook_runner()
+        return
+    append_hook_record(record.finished(*_execute(record)))
 
-    env = _build_hook_env(
-        project_id,
-        task_id,
-        mode,
-        cname,
+
+def run_project_hook(
+    project: ProjectConfig,
+    hook_name: str,
+    *,
+    task_id: str,
+    mode: str,
+    cname: str,
+    web_port: int | None = None,
+) -> None:
+    """Run the project's configured *hook_name* hook for a task.
+
+    Resolves the command and the background setting (``run.hooks.background``)
+    from *project*; see :func:`run_hook`.
+    """
+    run_hook(
         hook_name,
+        getattr(project, f"hook_{hook_name}"),
+        project_id=project.id,
+        task_id=task_id,
+        mode=mode,
+        cname=cname,
         web_port=web_port,
-        task_dir=task_dir,
+        task_dir=project.tasks_root / str(task_id),
+        background=hook_name in project.hook_background,
     )
 
-    logger.debug("hook %s: running %r", hook_name, command)
 
-    timeout = _STOP_HOOK_TIMEOUT if hook_name == "post_stop" else _STARTUP_HOOK_TIMEOUT
+# ── Background runner ──
+
+
+def _try_lock(path: Path) -> int | None:
+    """Take a non-blocking exclusive lock on *path*; returns the fd or ``None``."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
     try:
-        result = subprocess.run(  # nosec B603 B607
-            ["sh", "-c", command],
-            env=env,
-            timeout=timeout,
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        if result.stdout:
-            logger.debug("hook %s stdout: %s", hook_name, result.stdout.rstrip())
-        if result.stderr:
-            logger.debug("hook %s stderr: %s", hook_name, result.stderr.rstrip())
-    except subprocess.TimeoutExpired:
-        logger.warning("hook %s timed out after %ds", hook_name, timeout)
-    except Exception:
-        logger.warning("hook %s failed", hook_name, exc_info=True)
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _complete(record: HookRecord) -> None:
+    """Run a queued hook and journal its outcome."""
+    append_hook_record(record.finished(*_execute(record)))
+
+
+def run_pending_hooks(max_workers: int = BACKGROUND_HOOK_CONCURRENCY) -> int:
+    """Run queued hooks, *max_workers* at a time, until none is left.
+
+    Returns the number of hooks run, or ``0`` at once if another runner
+    holds the runner lock.  A run interrupted before its outcome is
+    journaled stays queued and is retried by the next runner, so background
+    hooks run at least once.
+    """
+    attempted: set[str] = set()
+
+    def _unattempted() -> list[HookRecord]:
+        """Return pending runs this runner has not tried yet."""
+        return [r for r in pending_hook_runs() if r.run_id not in attempted]
+
+    while True:
+        ensure_dir(hooks_dir())
+        fd = _try_lock(hooks_dir() / _RUNNER_LOCK_FILENAME)
+        if fd is None:
+            return len(attempted)
+        try:
+            while pending := _unattempted():
+                attempted.update(r.run_id for r in pending)
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    list(pool.map(_complete, pending))
+        finally:
+            os.close(fd)
+        # A hook queued after the last scan found the lock still held; pick it up.
+        if not _unattempted():
+            return len(attempted)
+
+
+def start_hook_runner() -> bool:
+    """Spawn a detached background hook runner; returns ``True`` if spawned.
+
+    The runner exits at once when another one is already running.
+    """
+    ensure_dir(hooks_dir())
+    try:
+        with (hooks_dir() / "runner.log").open("ab") as log:
+            subprocess.Popen(  # nosec B603
+                [sys.executable, "-m", "terok.lib.orchestration.hooks"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    except OSError as exc:
+        _log_debug(f"hooks: failed to spawn hook runner: {exc}")
+        return False
+    return True
+
+
+def main() -> None:
+    """Entry point of the background hook runner process."""
+    run_pending_hooks()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Idle-task detection and automatic stop.
+
+With ``run.idle_timeout`` set in ``project.yml``, a running task counts as
+idle when its container uses less than ``run.idle_cpu_percent`` of a core
+and either
+
+- its agent has reported ``done``, ``blocked`` or ``error`` in
+  ``work-status.yml`` for at least the timeout, or
+- it has written no log output for at least the timeout.
+
+Idle tasks are stopped through the regular stop path (``post_stop`` hooks
+included) and the reason is recorded in their metadata.  Logging in starts
+such a task again transparently, as do ``task restart`` and ``task
+followup``.  ``terokctl task idle`` runs a sweep; the TUI sweeps every
+:data:`IDLE_SWEEP_INTERVAL` seconds.
+
+CPU use is sampled twice, :data:`CPU_SAMPLE_SECONDS` apart, with ``podman
+stats``.  Where podman cannot report it (e.g. rootless cgroups v1), the
+status and output rules decide alone.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from terok_sandbox import get_project_container_states
+
+from ..core.projects import ProjectConfig, list_projects, load_project
+from ..core.work_status import STATUS_FILE_NAME
+from ..util.logging_utils import _log_debug
+from .log_tee import LOG_FILENAME, is_log_tee_running, line_timestamp, timestamp_key
+from .tasks import TaskMeta, container_name, get_tasks, mark_idle_stopped, task_stop_many
+
+IDLE_WORK_STATUSES = frozenset({"done", "blocked", "error"})
+"""Work statuses in which an agent waits for a human."""
+
+CPU_SAMPLE_SECONDS = 2.0
+"""Interval over which container CPU use is measured."""
+
+IDLE_SWEEP_INTERVAL = 300
+"""Seconds between idle sweeps in the TUI."""
+
+
+@dataclass(frozen=True)
+class IdleTask:
+    """A running task found idle, and why."""
+
+    project_id: str
+    task_id: str
+    cname: str
+    reason: str
+
+
+def _fmt_age(seconds: float) -> str:
+    """Format *seconds* as a short age (``2h 5m``, ``45m``)."""
+    minutes = int(seconds // 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
+
+
+def _started_at() -> dict[str, float]:
+    """Return the start time (epoch seconds) of every running container, by name."""
+    try:
+        result = subprocess.run(
+            ["podman", "ps", "--format", "{{.Names}}\t{{.StartedAt}}"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log_debug(f"idle: podman ps failed: {exc}")
+        return {}
+    started: dict[str, float] = {}
+    for row in result.stdout.splitlines():
+        name, _, when = row.partition("\t")
+        try:
+            started[name] = float(when)
+        except ValueError:
+            continue
+    return started
+
+
+def _last_output(cname: str, logs_dir: Path) -> float | None:
+    """Return when *cname* last wrote log output (epoch seconds), if known.
+
+    Uses the host-side log while the log tee keeps it current, otherwise the
+    timestamp of the last line ``podman logs`` reports.
+    """
+    if is_log_tee_running(logs_dir):
+        try:
+            return (logs_dir / LOG_FILENAME).stat().st_mtime
+        except OSError:
+            pass
+    try:
+        result = subprocess.run(
+            ["podman", "logs", "--timestamps", "--tail", "1", cname],
+            capture_output=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log_debug(f"idle: podman logs failed for {cname}: {exc}")
+        return None
+    for line in reversed((result.stdout + result.stderr).splitlines()):
+        ts = line_timestamp(line)
+        key = timestamp_key(ts) if ts else None
+        if key is not None:
+            return float(key[0])
+    return None
+
+
+def _quiet_reason(
+    project: ProjectConfig, task: TaskMeta, cname: str, started: float, now: float
+) -> str | None:
+    """Return why *task* looks idle by its work status and output, or ``None``."""
+    timeout = project.idle_timeout
+    task_dir = project.tasks_root / task.task_id
+    if task.work_status in IDLE_WORK_STATUSES:
+        try:
+            since = max((task_dir / "agent-config" / STATUS_FILE_NAME).stat().st_mtime, started)
+        except OSError:
+            since = started
+        if now - since >= timeout:
+            return f"work status {task.work_status!r} for {_fmt_age(now - since)}"
+    last = max(_last_output(cname, task_dir / "logs") or 0.0, started)
+    if now - last >= timeout:
+        return f"no output for {_fmt_age(now - last)}"
+    return None
+
+
+def _cpu_nanos(cnames: list[str]) -> dict[str, int]:
+    """Return the cumulative CPU time (ns) of the running containers *cnames*."""
+    try:
+        result = subprocess.run(
+            ["podman", "stats", "--no-stream", "--format", "{{.Name}}\t{{.CPUNano}}", *cnames],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log_debug(f"idle: podman stats failed: {exc}")
+        return {}
+    if result.returncode != 0:
+        _log_debug(f"idle: podman stats failed: {result.stderr.strip()}")
+        return {}
+    nanos: dict[str, int] = {}
+    for row in result.stdout.splitlines():
+        name, _, value = row.partition("\t")
+        try:
+            nanos[name] = int(value)
+        except ValueError:
+            continue
+    return nanos
+
+
+def cpu_percent(cnames: list[str], *, interval: float = CPU_SAMPLE_SECONDS) -> dict[str, float]:
+    """Return the CPU use of *cnames* over *interval* seconds, in % of one core.
+
+    Containers podman reports no usage for are missing from the result.
+    """
+    if not cnames:
+        return {}
+    before = _cpu_nanos(cnames)
+    start = time.monotonic()
+    if not before:
+        return {}
+    time.sleep(interval)
+    after = _cpu_nanos(cnames)
+    elapsed = time.monotonic() - start
+    return {
+        name: (after[name] - before[name]) / (elapsed * 1e9) * 100
+        for name in before
+        if name in after
+    }
+
+
+def find_idle_tasks(project_id: str | None = None, *, now: float | None = None) -> list[IdleTask]:
+    """Return the idle tasks of *project_id* (all projects if ``None``).
+
+    Projects without ``run.idle_timeout`` are skipped.
+    """
+    now = time.time() if now is None else now
+    projects = [load_project(project_id)] if project_id else list_projects()
+    projects = [p for p in projects if p.idle_timeout > 0]
+    if not projects:
+        return []
+    started = _started_at()
+    candidates: list[tuple[ProjectConfig, IdleTask]] = []
+    for project in projects:
+        for task in get_tasks(project.id):
+            if not task.mode or task.deleting:
+                continue
+            cname = container_name(project.id, task.mode, task.task_id)
+            if cname not in started:
+                continue
+            reason = _quiet_reason(project, task, cname, started[cname], now)
+            if reason is not None:
+                candidates.append((project, IdleTask(project.id, task.task_id, cname, reason)))
+
+    usage = cpu_percent([c.cname for _, c in candidates])
+    idle: list[IdleTask] = []
+    for project, cand in candidates:
+        cpu = usage.get(cand.cname)
+        if cpu is not None and cpu >= project.idle_cpu_percent:
+            continue
+        cpu_note = f", CPU {cpu:.1f}%" if cpu is not None else ""
+        idle.append(IdleTask(cand.project_id, cand.task_id, cand.cname, cand.reason + cpu_note))
+    return idle
+
+
+def stop_idle_tasks(project_id: str | None = None, *, dry_run: bool = False) -> list[IdleTask]:
+    """Stop the idle tasks of *project_id* (all projects if ``None``).
+
+    Returns the tasks that were stopped (with *dry_run*, that would be).
+    Each stopped task records the reason in its metadata.
+    """
+    idle = find_idle_tasks(project_id)
+    if dry_run or not idle:
+        return idle
+    by_project: dict[str, list[IdleTask]] = {}
+    for task in idle:
+        by_project.setdefault(task.project_id, []).append(task)
+    stopped: list[IdleTask] = []
+    for pid, tasks in by_project.items():
+        outcomes = task_stop_many(pid, [t.task_id for t in tasks])
+        states = None
+        for task, outcome in zip(tasks, outcomes, strict=True):
+            if outcome.status == "skipped":
+                continue
+            if outcome.status == "failed":
+                # A failed post_stop hook still leaves the container stopped.
+                states = states if states is not None else get_project_container_states(pid)
+                if states.get(task.cname) in ("running", "paused"):
+                    _log_debug(f"idle: failed to stop {task.cname}: {outcome.detail}")
+                    continue
+            mark_idle_stopped(pid, task.task_id, task.reason)
+            _log_debug(f"idle: stopped {task.cname} ({task.reason})")
+            stopped.append(task)
+    return stopped
@@ -0,0 +1,352 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Continuous host-side persistence of task container logs.
+
+A detached *log tee* process follows ``podman logs --timestamps -f`` for a
+task container and appends every line to ``<task_dir>/logs/container.log``
+as it arrives.  The timestamp of the last persisted line is recorded in a
+cursor file next to the log, so a tee started after a container restart
+(or after a crash of the tee itself) resumes with ``--since <cursor>`` and
+skips lines that are already on disk.
+
+The live log is bounded: once it reaches ``logs.segment_mb`` it is rotated
+into a gzip-compressed segment (see :mod:`terok.lib.util.log_store`) and the
+oldest segments are dropped when the task exceeds ``logs.max_task_mb``.
+
+Only one tee runs per task: it holds an exclusive ``flock`` on
+``logs/.tee.lock`` for its lifetime and records its PID in
+``logs/.tee.pid`` so :func:`stop_log_tee` can signal it.  The tee exits by
+itself when the container stops; runners start a fresh one on every start.
+
+Run as ``python -m terok.lib.orchestration.log_tee <container> <logs_dir>``.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from ..core.config import get_logs_max_task_bytes, get_logs_persist, get_logs_segment_bytes
+from ..util.fs import ensure_dir
+from ..util.log_store import prune_log, rotate_log
+from ..util.logging_utils import _log_debug
+
+LOG_FILENAME = "container.log"
+CURSOR_FILENAME = "container.log.cursor"
+_LOCK_FILENAME = ".tee.lock"
+_PID_FILENAME = ".tee.pid"
+
+_CURSOR_FLUSH_INTERVAL = 2.0
+"""Seconds between cursor writes while lines keep arriving."""
+
+_STOP_WAIT = 3.0
+"""Seconds :func:`stop_log_tee` waits for the tee to release its lock."""
+
+_TAIL_PROBE = 64 * 1024
+"""Bytes read from the end of an existing log to recover its last timestamp."""
+
+_TS_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d{1,9}))?(Z|[+-]\d{2}:\d{2})$")
+
+
+# ---------------------------------------------------------------------------
+# Timestamps and cursor
+# ---------------------------------------------------------------------------
+
+
+def timestamp_key(ts: str) -> tuple[int, int] | None:
+    """Return a sortable ``(epoch_seconds, nanoseconds)`` key for an RFC 3339 *ts*.
+
+    Podman prints nanosecond timestamps with trailing zeros trimmed and the
+    local UTC offset, so the strings themselves do not sort reliably.
+    Returns ``None`` if *ts* is not a timestamp.
+    """
+    m = _TS_RE.match(ts)
+    if m is None:
+        return None
+    base, frac, zone = m.groups()
+    if zone == "Z":
+        zone = "+00:00"
+    try:
+        seconds = int(datetime.fromisoformat(base + zone).timestamp())
+    except ValueError:
+        return None
+    return seconds, int((frac or "").ljust(9, "0"))
+
+
+def line_timestamp(line: bytes) -> str | None:
+    """Return the leading ``--timestamps`` prefix of a log *line*, if any."""
+    head, sep, _ = line[:48].partition(b" ")
+    if not sep:
+        head = line[:48].rstrip(b"\r\n")
+    text = head.decode("ascii", errors="replace")
+    return text if timestamp_key(text) is not None else None
+
+
+def read_cursor(logs_dir: Path) -> str | None:
+    """Return the persisted resume cursor in *logs_dir*, or ``None``."""
+    try:
+        value = (logs_dir / CURSOR_FILENAME).read_text(encoding="ascii").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    return value if timestamp_key(value) is not None else None
+
+
+def write_cursor(logs_dir: Path, ts: str) -> None:
+    """Atomically record *ts* as the resume cursor (best-effort)."""
+    target = logs_dir / CURSOR_FILENAME
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        tmp.write_text(ts + "\n", encoding="ascii")
+        os.replace(tmp, target)
+    except OSError as exc:
+        _log_debug(f"log_tee: failed to write cursor {target}: {exc}")
+        tmp.unlink(missing_ok=True)
+
+
+def last_logged_timestamp(log_file: Path) -> str | None:
+    """Return the timestamp of the last complete line in *log_file*, if any."""
+    try:
+        with log_file.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - _TAIL_PROBE, 0))
+            tail = f.read()
+    except OSError:
+        return None
+    for line in reversed(tail.splitlines()):
+        ts = line_timestamp(line)
+        if ts is not None:
+            return ts
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Appending
+# ---------------------------------------------------------------------------
+
+
+class LogAppender:
+    """Append timestamped log lines to a task log, skipping already-seen ones.
+
+    The effective cursor is the later of the cursor file and the last
+    timestamp found in the log itself, so lines written after the last
+    cursor flush are still de-duplicated after a crash.
+    """
+
+    def __init__(self, logs_dir: Path, *, segment_bytes: int = 0, max_total_bytes: int = 0) -> None:
+        """Open (or create) ``container.log`` in *logs_dir* for appending.
+
+        When *segment_bytes* is positive the live file is rotated into a
+        compressed segment once it reaches that size; *max_total_bytes*
+        then caps the whole log by dropping the oldest segments.
+        """
+        self.logs_dir = logs_dir
+        self.log_file = logs_dir / LOG_FILENAME
+        self.segment_bytes = segment_bytes
+        self.max_total_bytes = max_total_bytes
+        self.cursor: str | None = None
+        self._cursor_key: tuple[int, int] | None = None
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        for candidate in (read_cursor(logs_dir), last_logged_timestamp(self.log_file)):
+            self._advance(candidate)
+        self._dirty = False
+        self._fh: BinaryIO = self.log_file.open("ab")
+        self._size = self._fh.tell()
+
+    def _advance(self, ts: str | None) -> None:
+        """Move the cursor to *ts* if it is later than the current one."""
+        key = timestamp_key(ts) if ts else None
+        if key is not None and (self._cursor_key is None or key > self._cursor_key):
+            self.cursor, self._cursor_key = ts, key
+            self._dirty = True
+
+    def feed(self, line: bytes) -> bool:
+        """Append *line* unless it is not newer than the cursor.
+
+        Lines without a timestamp (continuations of partial lines) are
+        always appended.  Returns ``True`` if the line was written.
+        """
+        ts = line_timestamp(line)
+        key = timestamp_key(ts) if ts else None
+        if key is not None and self._cursor_key is not None and key <= self._cursor_key:
+            return False
+        self._fh.write(line)
+        self._size += len(line)
+        self._advance(ts)
+        if self.segment_bytes > 0 and self._size >= self.segment_bytes and line.endswith(b"\n"):
+            self._rotate()
+        return True
+
+    def _rotate(self) -> None:
+        """Seal the live file into a compressed segment and enforce the cap."""
+        self._fh.close()
+        try:
+            rotate_log(self.log_file)
+            prune_log(self.log_file, self.max_total_bytes)
+        except OSError as exc:
+            _log_debug(f"log_tee: rotating {self.log_file} failed: {exc}")
+        finally:
+            self._fh = self.log_file.open("ab")
+            self._size = self._fh.tell()
+        # The live file may now be empty; make sure the cursor survives.
+        self.flush(force=True)
+
+    def feed_all(self, lines: Iterable[bytes]) -> int:
+        """Append every new line of *lines*; return how many were written."""
+        return sum(1 for line in lines if self.feed(line))
+
+    def flush(self, *, force: bool = False) -> None:
+        """Flush the log and persist the cursor (rate-limited unless *force*)."""
+        self._fh.flush()
+        now = time.monotonic()
+        if not force and now - self._last_flush < _CURSOR_FLUSH_INTERVAL:
+            return
+        if self._dirty and self.cursor:
+            write_cursor(self.logs_dir, self.cursor)
+            self._dirty = False
+        self._last_flush = now
+
+    def close(self) -> None:
+        """Flush everything and close the log file."""
+        self.flush(force=True)
+        self._fh.close()
+
+
+# ---------------------------------------------------------------------------
+# Tee process
+# ---------------------------------------------------------------------------
+
+
+def _try_lock(logs_dir: Path) -> int | None:
+    """Return a locked file descriptor for *logs_dir*, or ``None`` if held."""
+    fd = os.open(logs_dir / _LOCK_FILENAME, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def is_log_tee_running(logs_dir: Path) -> bool:
+    """Return whether a tee currently holds the lock for *logs_dir*."""
+    if not (logs_dir / _LOCK_FILENAME).exists():
+        return False
+    fd = _try_lock(logs_dir)
+    if fd is None:
+        return True
+    os.close(fd)
+    return False
+
+
+def run_log_tee(cname: str, logs_dir: Path) -> int:
+    """Follow *cname* and append its log to *logs_dir* until the stream ends.
+
+    Returns immediately (exit status 0) if another tee already owns
+    *logs_dir*.  ``SIGTERM`` stops following and flushes the cursor.
+    """
+    ensure_dir(logs_dir)
+    lock_fd = _try_lock(logs_dir)
+    if lock_fd is None:
+        return 0
+    pid_file = logs_dir / _PID_FILENAME
+    appender = LogAppender(
+        logs_dir,
+        segment_bytes=get_logs_segment_bytes(),
+        max_total_bytes=get_logs_max_task_bytes(),
+    )
+    try:
+        pid_file.write_text(f"{os.getpid()}\n")
+        cmd = ["podman", "logs", "--timestamps", "-f"]
+        if appender.cursor:
+            cmd.extend(["--since", appender.cursor])
+        cmd.append(cname)
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError as exc:
+            _log_debug(f"log_tee: cannot launch podman logs for {cname}: {exc}")
+            return 1
+
+        def _terminate(_signum: int, _frame: object) -> None:
+            """Stop the ``podman logs`` child; the read loop then drains and exits."""
+            proc.terminate()
+
+        previous = signal.signal(signal.SIGTERM, _terminate)
+        try:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                appender.feed(line)
+                appender.flush()
+            return proc.wait()
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+    finally:
+        appender.close()
+        pid_file.unlink(missing_ok=True)
+        os.close(lock_fd)
+
+
+def start_log_tee(cname: str, task_dir: Path) -> bool:
+    """Spawn a detached tee persisting *cname*'s log under ``task_dir/logs``.
+
+    Best-effort: returns ``False`` (and logs why) if persistence is disabled
+    in the global config, a tee is already running, or spawning fails.
+    The tee outlives the calling CLI or TUI process.
+    """
+    if not get_logs_persist():
+        return False
+    logs_dir = task_dir / "logs"
+    try:
+        ensure_dir(logs_dir)
+        if is_log_tee_running(logs_dir):
+            return False
+        subprocess.Popen(
+            [sys.executable, "-m", __name__, cname, str(logs_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError as exc:
+        _log_debug(f"log_tee: failed to start tee for {cname}: {exc}")
+        return False
+    return True
+
+
+def stop_log_tee(logs_dir: Path, *, wait: float = _STOP_WAIT) -> None:
+    """Signal the tee owning *logs_dir* to stop and wait for its lock release."""
+    try:
+        pid = int((logs_dir / _PID_FILENAME).read_text().strip())
+    except (OSError, ValueError):
+        return
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        return
+    deadline = time.monotonic() + wait
+    while is_log_tee_running(logs_dir) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the detached tee process."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2:
+        print("usage: python -m terok.lib.orchestration.log_tee <container> <logs_dir>")
+        return 2
+    return run_log_tee(args[0], Path(args[1]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Live CPU, memory and I/O of task containers.
+
+A :class:`ResourceMonitor` runs one ``podman stats --format json`` stream
+for all running containers and keeps the last :data:`HISTORY_LEN` samples
+of each task container, mapped back to project and task IDs by
+:func:`~.tasks.container_name`.  :func:`resource_monitor` returns the
+process-wide instance, so the TUI and ``terokctl task top`` never run more
+than one stream however many tasks they show.
+
+podman reports sizes as human-readable strings (``1.5MB / 8.2GB``); they
+are parsed back to bytes, so values are approximate to podman's rounding.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from ..util.fs import format_size
+from ..util.logging_utils import _log_debug
+from .tasks import CONTAINER_MODES, container_name
+
+STATS_INTERVAL = 2
+"""Seconds between samples."""
+
+HISTORY_LEN = 30
+"""Samples kept per container (one minute at the default interval)."""
+
+_RESTART_DELAY = 10
+"""Seconds to wait before restarting a stream that ended."""
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+_SIZE_RE = re.compile(r"^\s*([0-9.]+)\s*([a-zA-Z]*)\s*$")
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+_SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """One ``podman stats`` sample of a container."""
+
+    at: float
+    cpu_percent: float
+    mem_bytes: int
+    mem_limit: int
+    net_rx: int
+    net_tx: int
+    block_read: int
+    block_write: int
+    pids: int
+
+
+@dataclass(frozen=True)
+class TaskResources:
+    """The recent resource use of one task container, oldest sample first."""
+
+    project_id: str
+    task_id: str
+    mode: str
+    cname: str
+    history: tuple[ResourceSample, ...]
+
+    @property
+    def latest(self) -> ResourceSample:
+        """Return the most recent sample."""
+        return self.history[-1]
+
+
+def parse_task_container(name: str) -> tuple[str, str, str] | None:
+    """Return ``(project_id, mode, task_id)`` for a task container name, else ``None``."""
+    parts = name.rsplit("-", 2)
+    if len(parts) != 3:
+        return None
+    project_id, mode, task_id = parts
+    if not project_id or mode not in CONTAINER_MODES or not task_id.isdigit():
+        return None
+    if container_name(project_id, mode, task_id) != name:
+        return None
+    return project_id, mode, task_id
+
+
+def _parse_size(text: str) -> int:
+    """Parse a podman size (``1.5MB``, ``512KiB``) to bytes; 0 if unknown."""
+    m = _SIZE_RE.match(text)
+    if not m:
+        return 0
+    factor = _SIZE_UNITS.get(m.group(2).lower())
+    if factor is None:
+        return 0
+    try:
+        return int(float(m.group(1)) * factor)
+    except ValueError:
+        return 0
+
+
+def _parse_pair(text: str) -> tuple[int, int]:
+    """Parse a podman ``used / total`` (or ``in / out``) pair to bytes."""
+    first, _, second = str(text).partition("/")
+    return _parse_size(first), _parse_size(second)
+
+
+def _parse_sample(entry: dict, at: float) -> ResourceSample:
+    """Build a :class:`ResourceSample` from one ``podman stats`` JSON entry."""
+    try:
+        cpu = float(str(entry.get("cpu_percent", "")).rstrip("%"))
+    except ValueError:
+        cpu = 0.0
+    try:
+        pids = int(entry.get("pids", 0))
+    except (TypeError, ValueError):
+        pids = 0
+    mem, limit = _parse_pair(entry.get("mem_usage", ""))
+    rx, tx = _parse_pair(entry.get("net_io", ""))
+    read, write = _parse_pair(entry.get("block_io", ""))
+    return ResourceSample(at, cpu, mem, limit, rx, tx, read, write, pids)
+
+
+def read_frames(lines: Iterable[str]) -> Iterator[list[dict]]:
+    """Yield each JSON array in a ``podman stats --format json`` stream.
+
+    Terminal control sequences podman writes between frames are dropped;
+    a frame that does not parse is skipped.
+    """
+    buf: list[str] = []
+    for raw in lines:
+        line = _ANSI_RE.sub("", raw).rstrip("\n")
+        if not buf and line.strip() == "null":
+            yield []  # no containers running
+            continue
+        if not buf and not line.lstrip().startswith("["):
+            continue
+        buf.append(line)
+        stripped = line.strip()
+        if stripped in ("]", "[]") or (len(buf) == 1 and stripped.endswith("]")):
+            try:
+                frame = json.loads("\n".join(buf))
+            except ValueError as exc:
+                _log_debug(f"resource_monitor: bad stats frame: {exc}")
+                frame = None
+            buf = []
+            if isinstance(frame, list):
+                yield [e for e in frame if isinstance(e, dict)]
+
+
+def sparkline(values: Iterable[float], ceiling: float = 100.0) -> str:
+    """Render *values* (0..*ceiling*) as a one-line bar chart."""
+    top = len(_SPARK_CHARS) - 1
+    return "".join(
+        _SPARK_CHARS[max(0, min(top, round(v / ceiling * top)))] if ceiling > 0 else _SPARK_CHARS[0]
+        for v in values
+    )
+
+
+class ResourceMonitor:
+    """One ``podman stats`` stream, sampled into a per-task rolling history."""
+
+    def __init__(self, *, interval: int = STATS_INTERVAL, history: int = HISTORY_LEN) -> None:
+        """Create a stopped monitor; :meth:`start` runs the stream."""
+        self.interval = interval
+        self._history_len = history
+        self._history: dict[str, deque[ResourceSample]] = {}
+        self._tasks: dict[str, tuple[str, str, str]] = {}  # cname -> (project, mode, task)
+        self._cond = threading.Condition()
+        self._frames = 0
+        self._proc: subprocess.Popen[str] | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self.error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return whether the stream thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stopped(self) -> bool:
+        """Return whether the stream was stopped or cannot run; no more frames will come."""
+        return self._stopping.is_set()
+
+    def start(self) -> None:
+        """Start the stream in a daemon thread (no-op if already running)."""
+        with self._cond:
+            if self.running:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="terok-resource-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the stream and wait for its thread to end."""
+        self._stopping.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait_frame(self, seen: int = 0, timeout: float | None = None) -> int:
+        """Block until more than *seen* frames arrived (or *timeout*); return the count."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._frames > seen or self._stopping.is_set(), timeout=timeout
+            )
+            return self._frames
+
+    def snapshot(self, project_id: str | None = None) -> list[TaskResources]:
+        """Return the history of every task container (of *project_id*, if given)."""
+        items: list[TaskResources] = []
+        with self._cond:
+            for cname, hist in self._history.items():
+                pid, mode, task_id = self._tasks[cname]
+                if hist and (project_id is None or pid == project_id):
+                    items.append(TaskResources(pid, task_id, mode, cname, tuple(hist)))
+        return sorted(items, key=lambda r: (r.project_id, int(r.task_id)))
+
+    def task(self, project_id: str, task_id: str) -> TaskResources | None:
+        """Return the history of one task's container, if it is being sampled."""
+        for res in self.snapshot(project_id):
+            if res.task_id == task_id:
+                return res
+        return None
+
+    def feed(self, frame: list[dict], at: float | None = None) -> None:
+        """Record one frame; task containers missing from it are dropped."""
+        at = time.time() if at is None else at
+        with self._cond:
+            present: set[str] = set()
+            for entry in frame:
+                cname = str(entry.get("name", ""))
+                task = self._tasks.get(cname) or parse_task_container(cname)
+                if task is None:
+                    continue
+                self._tasks[cname] = task
+                hist = self._history.get(cname)
+                if hist is None:
+                    hist = self._history[cname] = deque(maxlen=self._history_len)
+                hist.append(_parse_sample(entry, at))
+                present.add(cname)
+            for cname in set(self._history) - present:
+                del self._history[cname]
+                self._tasks.pop(cname, None)
+            self._frames += 1
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        """Read the stream, restarting it if podman exits, until stopped."""
+        cmd = ["podman", "stats", "--format", "json", "--interval", str(self.interval)]
+        while not self._stopping.is_set():
+            try:
+                self._proc = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+                )
+            except OSError as exc:
+                self.error = f"cannot run podman stats: {exc}"
+                _log_debug(f"resource_monitor: {self.error}")
+                self._stopping.set()
+                break
+            assert self._proc.stdout is not None
+            for frame in read_frames(self._proc.stdout):
+                self.error = None
+                self.feed(frame)
+            rc = self._proc.wait()
+            if self._stopping.is_set():
+                break
+            err = self._proc.stderr.read().strip() if self._proc.stderr else ""
+            self.error = f"podman stats exited with {rc}" + (f": {err}" if err else "")
+            _log_debug(f"resource_monitor: {self.error}")
+            self._stopping.wait(_RESTART_DELAY)
+        with self._cond:
+            self._cond.notify_all()
+
+
+_monitor: ResourceMonitor | None = None
+_monitor_lock = threading.Lock()
+
+
+def resource_monitor() -> ResourceMonitor:
+    """Return the process-wide :class:`ResourceMonitor`, started."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ResourceMonitor()
+        _monitor.start()
+        return _monitor
+
+
+def format_top(rows: list[TaskResources]) -> list[str]:
+    """Render *rows* as the ``task top`` table, busiest first."""
+    rows = sorted(rows, key=lambda r: r.latest.cpu_percent, reverse=True)
+    header = (
+        f"{'PROJECT':<20} {'TASK':>5} {'MODE':<5} {'CPU%':>7} {'HISTORY':<{HISTORY_LEN}} "
+        f"{'MEM':>10} {'NET IN/OUT':>21} {'BLOCK R/W':>21} {'PIDS':>5}"
+    )
+    lines = [header]
+    for r in rows:
+        s = r.latest
+        history = sparkline(x.cpu_percent for x in r.history)
+        lines.append(
+            f"{r.project_id:<20} {r.task_id:>5} {r.mode:<5} {s.cpu_percent:>7.1f} "
+            f"{history:<{HISTORY_LEN}} {format_size(s.mem_bytes):>10} "
+            f"{format_size(s.net_rx) + ' / ' + format_size(s.net_tx):>21} "
+            f"{format_size(s.block_read) + ' / ' + format_size(s.block_write):>21} "
+            f"{s.pids:>5}"
+        )
+    return lines
+
+
+def task_top(project_id: str | None = None, *, once: bool = False) -> None:
+    """Show live resource use of running tasks until interrupted.
+
+    With *once*, print a single table after the first sample and return.
+    """
+    monitor = resource_monitor()
+    clear = sys.stdout.isatty() and not once
+    seen = 0
+    try:
+        while True:
+            seen = monitor.wait_frame(seen, timeout=monitor.interval * 5)
+            if seen == 0 and monitor.stopped:
+                raise SystemExit(monitor.error or "podman stats is not available")
+            rows = monitor.snapshot(project_id)
+            if clear:
+                print("\x1b[H\x1b[2J", end="")
+            if rows:
+                print("\n".join(format_top(rows)))
+            else:
+                print("No running tasks" + (f" in project {project_id}" if project_id else ""))
+            if monitor.error:
+                print(f"Warning: {monitor.error}")
+            if once:
+                return
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop()
@@ -0,0 +1,462 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Durable queue of headless tasks waiting for capacity.
+
+Submitting a headless run through :func:`enqueue_headless` creates the task
+right away (so it shows up with status ``queued``) and records the launch
+request as a JSON file under ``<state_root>/queue/pending/``.  The queue is
+drained by :func:`drain_queue`, which launches entries in submission order
+for as long as the ``queue:`` limits of the global config allow:
+
+- ``max_running`` — running terok task containers across all projects
+- ``max_running_per_project`` — running task containers of one project
+- ``max_cpus`` / ``max_memory_mb`` — budgets shared by the tasks the queue
+  launched; each entry requests ``task_cpus`` / ``task_memory_mb`` unless
+  overridden at submission
+
+Every drain holds an exclusive ``flock`` on ``queue/queue.lock`` while it
+counts running containers and launches, so concurrent submitters and
+drainers never overshoot a limit.  Tasks launched by the queue are recorded
+in ``queue/running/`` until their container stops, which is how the
+resource budgets are accounted.
+
+Because entries live on disk, the queue survives restarts of terok and of
+the host.  A detached *drainer* process (one per user, guarded by its own
+lock) keeps draining while entries are pending and exits when the queue is
+empty; :func:`start_queue_drainer` spawns it after each submission, and
+:func:`resume_queue_drainer` (called at TUI start-up and by ``task queue
+list``) restarts it when entries are pending but no drainer runs.
+
+Run as ``python -m terok.lib.orchestration.task_queue`` to drain in the
+foreground.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+
+from ..core.config import QueueLimits, get_queue_limits, state_root
+from ..core.projects import ResourceLimits
+from ..util.fs import ensure_dir
+from ..util.logging_utils import _log_debug
+from ..util.yaml import dump as _yaml_dump, load as _yaml_load
+from .exit_watcher import get_exit_watcher
+from .task_runners import HeadlessRunRequest, task_run_headless
+from .tasks import container_name, task_new, tasks_meta_dir
+from .warm_pool import is_warm_task
+
+_LOCK_FILENAME = "queue.lock"
+_DRAINER_LOCK_FILENAME = "drainer.lock"
+
+DRAIN_POLL_INTERVAL = 15.0
+"""Seconds the drainer waits between passes when no watched task exits."""
+
+_LAUNCH_FAILED_EXIT_CODE = 125
+"""Exit code recorded for a queued task that could not be started (as podman uses)."""
+
+_TASK_CONTAINER_RE = re.compile(r"^(?P<project>.+)-(?:cli|run|toad)-(?P<task>[^-]+)$")
+
+
+@dataclass(frozen=True)
+class QueuedTask:
+    """One pending launch in the queue."""
+
+    project_id: str
+    task_id: str
+    request: dict = field(default_factory=dict)
+    """Keyword arguments for :class:`HeadlessRunRequest` (minus ``task_id``)."""
+    cpus: float = 0.0
+    memory_mb: int = 0
+    submitted_at: float = 0.0
+
+    @property
+    def cname(self) -> str:
+        """Return the container name the task will run in."""
+        return container_name(self.project_id, "run", self.task_id)
+
+
+def queue_dir() -> Path:
+    """Return the root directory of the headless task queue."""
+    return state_root() / "queue"
+
+
+def _pending_dir() -> Path:
+    """Return the directory holding pending queue entries."""
+    return queue_dir() / "pending"
+
+
+def _running_dir() -> Path:
+    """Return the directory recording tasks the queue has launched."""
+    return queue_dir() / "running"
+
+
+def _entry_name(entry: QueuedTask) -> str:
+    """Return the file name of *entry*; names sort in submission order."""
+    return f"{int(entry.submitted_at * 1e6):019d}-{entry.project_id}-{entry.task_id}.json"
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Atomically write *data* to *path* as JSON."""
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_entry(path: Path) -> QueuedTask | None:
+    """Parse one queue entry file, or ``None`` if it is unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        known = {f.name for f in fields(QueuedTask)}
+        return QueuedTask(**{k: v for k, v in data.items() if k in known})
+    except (OSError, ValueError, TypeError) as exc:
+        _log_debug(f"task_queue: skipping unreadable entry {path}: {exc}")
+        return None
+
+
+@contextmanager
+def _queue_lock() -> Iterator[None]:
+    """Hold the exclusive queue lock for the duration of the block."""
+    ensure_dir(queue_dir())
+    with (queue_dir() / _LOCK_FILENAME).open("a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _record_launch_failure(project_id: str, task_id: str, error: str) -> None:
+    """Mark a queued task whose launch failed as a failed headless run."""
+    meta_path = tasks_meta_dir(project_id) / f"{task_id}.yml"
+    try:
+        meta = _yaml_load(meta_path.read_text()) or {}
+        meta.pop("queued", None)
+        meta.setdefault("mode", "run")
+        meta["exit_code"] = _LAUNCH_FAILED_EXIT_CODE
+        meta["launch_error"] = error
+        meta_path.write_text(_yaml_dump(meta))
+    except OSError as exc:
+        _log_debug(f"task_queue: recording launch failure of {project_id}/{task_id}: {exc}")
+
+
+def _set_queued_flag(project_id: str, task_id: str, queued: bool) -> bool:
+    """Set or clear ``queued`` in the task's metadata; ``False`` if the task is gone."""
+    meta_path = tasks_meta_dir(project_id) / f"{task_id}.yml"
+    if not meta_path.is_file():
+        return False
+    meta = _yaml_load(meta_path.read_text()) or {}
+    if meta.get("deleting"):
+        return False
+    if queued:
+        meta["queued"] = True
+    else:
+        meta.pop("queued", None)
+    meta_path.write_text(_yaml_dump(meta))
+    return True
+
+
+# ── Submission and inspection ──
+
+
+def enqueue_headless(
+    request: HeadlessRunRequest,
+    *,
+    cpus: float | None = None,
+    memory_mb: int | None = None,
+) -> str:
+    """Create a task for *request* and queue its launch; returns the task ID.
+
+    *cpus* and *memory_mb* are the resources the task is accounted for
+    against the queue budgets (defaults: ``queue.task_cpus`` /
+    ``queue.task_memory_mb``).  Raises ``SystemExit`` if they exceed
+    ``queue.max_cpus`` / ``queue.max_memory_mb``, since such an entry
+    could never start.  The request always runs detached.
+    """
+    limits = get_queue_limits()
+    cpus = limits.task_cpus if cpus is None else cpus
+    memory_mb = limits.task_memory_mb if memory_mb is None else memory_mb
+    if limits.max_cpus and cpus > limits.max_cpus:
+        raise SystemExit(f"Task requests {cpus:g} CPUs but queue.max_cpus is {limits.max_cpus:g}")
+    if limits.max_memory_mb and memory_mb > limits.max_memory_mb:
+        raise SystemExit(
+            f"Task requests {memory_mb} MB but queue.max_memory_mb is {limits.max_memory_mb}"
+        )
+    task_id = task_new(request.project_id, name=request.name)
+    _set_queued_flag(request.project_id, task_id, True)
+    kwargs = {k: v for k, v in asdict(request).items() if k not in ("task_id", "follow")}
+    if request.resources is not None:
+        kwargs["resources"] = request.resources.model_dump(exclude_none=True)
+    if request.config_path:
+        # The drainer runs in whatever directory its spawner happened to be in
+        kwargs["config_path"] = str(Path(request.config_path).resolve())
+    entry = QueuedTask(
+        project_id=request.project_id,
+        task_id=task_id,
+        request=kwargs,
+        cpus=cpus,
+        memory_mb=memory_mb,
+        submitted_at=time.time(),
+    )
+    with _queue_lock():
+        _write_json(_pending_dir() / _entry_name(entry), asdict(entry))
+    return task_id
+
+
+def list_queue(project_id: str | None = None) -> list[QueuedTask]:
+    """Return pending entries in submission order, optionally for one project."""
+    pending = _pending_dir()
+    if not pending.is_dir():
+        return []
+    entries = [_read_entry(p) for p in sorted(pending.glob("*.json"))]
+    return [e for e in entries if e and (project_id is None or e.project_id == project_id)]
+
+
+def cancel_queued(project_id: str, task_id: str) -> bool:
+    """Remove a pending entry; the task stays behind with status ``created``.
+
+    Returns ``False`` if the task was not queued.
+    """
+    with _queue_lock():
+        for path in sorted(_pending_dir().glob("*.json")):
+            entry = _read_entry(path)
+            if entry and entry.project_id == project_id and entry.task_id == task_id:
+                path.unlink(missing_ok=True)
+                _set_queued_flag(project_id, task_id, False)
+                return True
+    return False
+
+
+# ── Draining ──
+
+
+@dataclass
+class _Usage:
+    """Capacity in use while a drain pass decides what to launch."""
+
+    running: int = 0
+    per_project: dict[str, int] = field(default_factory=dict)
+    cpus: float = 0.0
+    memory_mb: int = 0
+
+    def fits(self, entry: QueuedTask, limits: QueueLimits) -> bool:
+        """Return whether launching *entry* keeps every limit."""
+        if limits.max_running and self.running + 1 > limits.max_running:
+            return False
+        per_project = self.per_project.get(entry.project_id, 0)
+        if limits.max_running_per_project and per_project + 1 > limits.max_running_per_project:
+            return False
+        if limits.max_cpus and self.cpus + entry.cpus > limits.max_cpus:
+            return False
+        return not (
+            limits.max_memory_mb and self.memory_mb + entry.memory_mb > limits.max_memory_mb
+        )
+
+    def add(self, entry: QueuedTask) -> None:
+        """Account for a launched (or still running) queue task."""
+        self.running += 1
+        self.per_project[entry.project_id] = self.per_project.get(entry.project_id, 0) + 1
+        self.cpus += entry.cpus
+        self.memory_mb += entry.memory_mb
+
+
+def _running_task_containers() -> list[str] | None:
+    """Return names of busy terok task containers, or ``None`` if podman fails.
+
+    Unclaimed warm-pool containers are left out: they hold no task work.
+    """
+    try:
+        result = subprocess.run(
+            ["podman", "ps", "--format", "{{.Names}}"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log_debug(f"task_queue: podman ps failed: {exc}")
+        return None
+    if result.returncode != 0:
+        return None
+    names = []
+    for name in result.stdout.split():
+        match = _TASK_CONTAINER_RE.match(name)
+        # Idle warm-pool containers are not doing work; keep them off the count
+        if match and not is_warm_task(match["project"], match["task"]):
+            names.append(name)
+    return names
+
+
+def _current_usage(running_names: list[str], projects: set[str]) -> _Usage:
+    """Measure running containers and prune finished entries from the running ledger."""
+    usage = _Usage(running=len(running_names))
+    for pid in projects:
+        prefix = re.compile(rf"^{re.escape(pid)}-(?:cli|run|toad)-[^-]+$")
+        usage.per_project[pid] = sum(1 for n in running_names if prefix.match(n))
+    alive = set(running_names)
+    running = _running_dir()
+    for path in sorted(running.glob("*.json")):
+        entry = _read_entry(path)
+        if entry is None or entry.cname not in alive:
+            path.unlink(missing_ok=True)
+            continue
+        usage.cpus += entry.cpus
+        usage.memory_mb += entry.memory_mb
+    return usage
+
+
+def drain_queue(
+    *, launch: Callable[[HeadlessRunRequest], str] = task_run_headless
+) -> list[QueuedTask]:
+    """Launch as many pending entries as the configured limits allow.
+
+    Entries are considered in submission order; one that does not fit is
+    skipped so smaller or other-project entries behind it can still start.
+    Entries whose task has been deleted are dropped.  An entry leaves the
+    queue only once its launch has been attempted; a failed launch is
+    recorded in the task metadata (``launch_error``, status ``failed``).
+    Returns the launched entries.
+    """
+    limits = get_queue_limits()
+    launched: list[QueuedTask] = []
+    with _queue_lock():
+        pending = [(p, _read_entry(p)) for p in sorted(_pending_dir().glob("*.json"))]
+        pending = [(p, e) for p, e in pending if e is not None]
+        if not pending:
+            return launched
+        names = _running_task_containers()
+        if names is None:
+            if limits.max_running or limits.max_running_per_project:
+                return launched
+            names = []
+        usage = _current_usage(names, {e.project_id for _, e in pending})
+        for path, entry in pending:
+            if not usage.fits(entry, limits):
+                continue
+            if not _set_queued_flag(entry.project_id, entry.task_id, False):
+                path.unlink(missing_ok=True)
+                continue  # Task deleted while waiting
+            kwargs = {**entry.request, "follow": False, "task_id": entry.task_id}
+            if kwargs.get("resources") is not None:
+                kwargs["resources"] = ResourceLimits(**kwargs["resources"])
+            request = HeadlessRunRequest(**kwargs)
+            try:
+                launch(request)
+            except (SystemExit, Exception) as exc:
+                print(f"Queued task {entry.project_id}/{entry.task_id} failed to start: {exc}")
+                _record_launch_failure(entry.project_id, entry.task_id, str(exc))
+                path.unlink(missing_ok=True)
+                continue
+            path.unlink(missing_ok=True)
+            _write_json(_running_dir() / f"{entry.project_id}-{entry.task_id}.json", asdict(entry))
+            usage.add(entry)
+            launched.append(entry)
+    return launched
+
+
+# ── Drainer process ──
+
+
+def _try_lock(path: Path) -> int | None:
+    """Take a non-blocking exclusive lock on *path*; returns the fd or ``None``."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def is_queue_drainer_running() -> bool:
+    """Return whether a drainer process currently holds the drainer lock."""
+    path = queue_dir() / _DRAINER_LOCK_FILENAME
+    if not path.exists():
+        return False
+    fd = _try_lock(path)
+    if fd is None:
+        return True
+    os.close(fd)
+    return False
+
+
+def run_queue_drainer(poll_interval: float = DRAIN_POLL_INTERVAL) -> int:
+    """Drain until the queue is empty; returns the number of launched tasks.
+
+    Returns immediately (``0``) if another drainer is already running.
+    Launched tasks are registered with the exit watcher, so each exit
+    triggers the next pass without waiting for *poll_interval*, and the
+    drainer stays until they have exited so their exit codes are recorded.
+    """
+    ensure_dir(queue_dir())
+    fd = _try_lock(queue_dir() / _DRAINER_LOCK_FILENAME)
+    if fd is None:
+        return 0
+    watcher = get_exit_watcher()
+    wake = threading.Event()
+    unsubscribe = watcher.subscribe(lambda _result: wake.set())
+    total = 0
+    try:
+        while True:
+            wake.clear()
+            for entry in drain_queue():
+                watcher.watch(entry.cname, entry.project_id, entry.task_id)
+                total += 1
+            if not list_queue() and not watcher.watched():
+                return total
+            wake.wait(poll_interval)
+    finally:
+        unsubscribe()
+        os.close(fd)
+
+
+def start_queue_drainer() -> bool:
+    """Spawn a detached drainer unless one is running; returns ``True`` if spawned."""
+    if is_queue_drainer_running():
+        return False
+    ensure_dir(queue_dir())
+    log_path = queue_dir() / "drainer.log"
+    try:
+        with log_path.open("ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "terok.lib.orchestration.task_queue"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    except OSError as exc:
+        _log_debug(f"task_queue: failed to spawn drainer: {exc}")
+        return False
+    return True
+
+
+def resume_queue_drainer() -> bool:
+    """Restart draining after a reboot or a crashed drainer.
+
+    Spawns a drainer if entries are pending and none is running; returns
+    ``True`` if one was spawned.
+    """
+    if not list_queue():
+        return False
+    return start_queue_drainer()
+
+
+def main() -> None:
+    """Entry point of the drainer process."""
+    run_queue_drainer()
+
+
+if __name__ == "__main__":
+    main()
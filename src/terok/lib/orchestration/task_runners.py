@@ -8,7 +8,7 @@ from __future__ import annotations
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from terok_agent import (
     AgentConfigSpec,
@@ -25,7 +25,6 @@ from terok_sandbox import (
     get_container_state,
     is_container_running,
     stream_initial_logs,
-    wait_for_exit,
 )
 
 from ..core.config import (
@@ -35,7 +34,7 @@ from ..core.config import (
     get_shield_bypass_firewall_no_protection,
 )
 from ..core.images import project_cli_image
-from ..core.projects import load_project
+from ..core.projects import load_project, resolve_resource_limits
 from ..core.task_display import has_gpu
 from ..domain.agent_config import resolve_agent_config
 from ..util.ansi import (
@@ -45,20 +44,35 @@ from ..util.ansi import (
     supports_color as _supports_color,
     yellow as _yellow,
 )
+from ..util.timings import mark_first_call, span
 from ..util.yaml import dump as _yaml_dump, load as _yaml_load
+from .autopilot import wait_for_container_exit
 from .container_exec import container_git_diff
 from .environment import build_task_env_and_volumes
-from .hooks import run_hook
+from .hooks import run_project_hook
+from .log_tee import start_log_tee
 from .ports import assign_web_port
 from .tasks import (
+    IDLE_STOP_KEY,
     container_name,
     load_task_meta,
+    sanitize_task_name,
     task_new,
-    update_task_exit_code,
+    validate_task_name,
+)
+from .warm_pool import (
+    claim_warm_task,
+    current_image_id,
+    evict_warm_task,
+    mark_warm_started,
+    release_warm_task,
+    reserve_warm_task,
+    start_pool_refill,
+    warm_command,
 )
 
 if TYPE_CHECKING:
-    from ..core.project_model import ProjectConfig
+    from ..core.project_model import ProjectConfig, ResourceLimits
 
 _LOCALHOST = "127.0.0.1"
 _LOOPBACK_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
@@ -106,6 +120,12 @@ class HeadlessRunRequest:
     provider: str | None = None
     instructions: str | None = None
     unrestricted: bool | None = None
+    task_id: str | None = None
+    """Run in this existing task (e.g. one created by the queue) instead of a new one."""
+    quiet: bool = False
+    """Skip the detached-run summary (callers that report progress themselves)."""
+    resources: ResourceLimits | None = None
+    """Container limits overriding those of ``run.resources`` and the preset."""
 
 
 @dataclass(frozen=True)
@@ -135,40 +155,43 @@ def _prepare_agent_config(
     prepare sequence.  *provider_name* overrides the auto-detected provider
     (e.g. explicit provider selection).
     """
-    effective = resolve_agent_config(
-        project_id,
-        agent_config=project.agent_config,
-        project_root=project.root,
-        preset=preset,
-    )
-    subagents = list(effective.get("subagents") or [])
     from terok_agent import get_provider as _get_provider
 
-    resolved = _get_provider(provider_name, default_agent=project.default_agent)
-    instr_text = resolve_instructions(effective, resolved.name, project_root=project.root)
-    return prepare_agent_config_dir(
-        AgentConfigSpec(
-            tasks_root=project.tasks_root,
-            task_id=task_id,
-            subagents=subagents,
-            selected_agents=agents,
-            provider=resolved.name,
-            instructions=instr_text,
-            default_agent=project.default_agent,
-            envs_base_dir=get_envs_base_dir(),
+    with span("resolve_agent_config"):
+        effective = resolve_agent_config(
+            project_id,
+            agent_config=project.agent_config,
+            project_root=project.root,
+            preset=preset,
+        )
+        subagents = list(effective.get("subagents") or [])
+        resolved = _get_provider(provider_name, default_agent=project.default_agent)
+        instr_text = resolve_instructions(effective, resolved.name, project_root=project.root)
+    with span("prepare_agent_config_dir"):
+        return prepare_agent_config_dir(
+            AgentConfigSpec(
+                tasks_root=project.tasks_root,
+                task_id=task_id,
+                subagents=subagents,
+                selected_agents=agents,
+                provider=resolved.name,
+                instructions=instr_text,
+                default_agent=project.default_agent,
+                envs_base_dir=get_envs_base_dir(),
+            )
         )
-    )
 
 
 def _podman_start(cname: str) -> None:
     """Start an existing container, raising SystemExit on failure."""
     try:
-        subprocess.run(
-            ["podman", "start", cname],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.PIPE,
-        )
+        with span("podman_start"):
+            subprocess.run(
+                ["podman", "start", cname],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
     except FileNotFoundError:
         raise SystemExit("podman not found; please install podman")
     except subprocess.CalledProcessError as exc:
@@ -213,7 +236,8 @@ def _maybe_drop_shield(project: ProjectConfig, cname: str, task_dir: Path) -> No
     if get_shield_bypass_firewall_no_protection():
         return
     try:
-        _shield_down_impl(cname, task_dir)
+        with span("drop_shield"):
+            _shield_down_impl(cname, task_dir)
         audit_path = task_dir / "shield" / "audit.jsonl"
         print(f"Shield dropped (bypass mode). Audit log: {audit_path}")
         print(SHIELD_SECURITY_HINT)
@@ -223,6 +247,19 @@ def _maybe_drop_shield(project: ProjectConfig, cname: str, task_dir: Path) -> No
         warnings.warn(f"shield.drop_on_task_start: failed to drop shield: {exc}", stacklevel=2)
 
 
+def _resource_args(limits: ResourceLimits) -> list[str]:
+    """Return the ``podman run`` flags applying *limits*."""
+    flags = (
+        ("--cpus", limits.cpus),
+        ("--cpuset-cpus", limits.cpuset),
+        ("--memory", limits.memory),
+        ("--memory-swap", limits.memory_swap),
+        ("--pids-limit", limits.pids_limit),
+        ("--blkio-weight", limits.blkio_weight),
+    )
+    return [f"{flag}={value}" for flag, value in flags if value is not None]
+
+
 def _run_container(
     *,
     cname: str,
@@ -234,6 +271,7 @@ def _run_container(
     extra_args: list[str] | None = None,
     command: list[str] | None = None,
     hooks: LifecycleHooks | None = None,
+    resources: ResourceLimits | None = None,
 ) -> None:
     """Launch a detached container via :meth:`Sandbox.run`.
 
@@ -252,7 +290,10 @@ def _run_container(
             args (e.g. ``["-p", "127.0.0.1:8080:7860"]``).
         command: Optional command + args appended after the image name.
         hooks: Optional lifecycle callbacks fired around the launch.
+        resources: cgroup limits of the container; defaults to the
+            project's ``run.resources``.
     """
+    limits = project.resources if resources is None else resources
     spec = RunSpec(
         container_name=cname,
         image=image,
@@ -261,13 +302,14 @@ def _run_container(
         command=tuple(command or ()),
         task_dir=task_dir,
         gpu_enabled=has_gpu(project),
-        extra_args=tuple(extra_args or ()),
+        extra_args=(*_resource_args(limits), *(extra_args or ())),
         unrestricted="TEROK_UNRESTRICTED" in env,
         bypass_shield=get_shield_bypass_firewall_no_protection(),
     )
 
     try:
-        _sandbox().run(spec, hooks=hooks)
+        with span("podman_run"):
+            _sandbox().run(spec, hooks=hooks)
     except GpuConfigError as exc:
         raise SystemExit(str(exc)) from exc
 
@@ -290,7 +332,8 @@ def task_run_cli(
     CLI access.  After the container reports ready the task metadata is
     marked ``running`` and the user is shown login instructions.
     """
-    project = load_project(project_id)
+    with span("load_project"):
+        project = load_project(project_id)
     meta, meta_path = load_task_meta(project.id, task_id, "cli")
 
     cname = container_name(project.id, "cli", task_id)
@@ -307,15 +350,13 @@ def task_run_cli(
         print(f"Starting existing container {_green(cname, color_enabled)}...")
         _podman_start(cname)
         _assert_running(cname)
-        run_hook(
+        start_log_tee(cname, project.tasks_root / str(task_id))
+        run_project_hook(
+            project,
             "post_start",
-            project.hook_post_start,
-            project_id=project.id,
             task_id=task_id,
             mode="cli",
             cname=cname,
-            task_dir=project.tasks_root / str(task_id),
-            meta_path=meta_path,
         )
         meta["mode"] = "cli"
         meta_path.write_text(_yaml_dump(meta))
@@ -323,7 +364,8 @@ def task_run_cli(
         _print_login_instructions(project.id, task_id, cname, color_enabled)
         return
 
-    env, volumes = build_task_env_and_volumes(project, task_id)
+    with span("build_task_env_and_volumes"):
+        env, volumes = build_task_env_and_volumes(project, task_id)
 
     # Resolve layered agent config (global → project → preset → CLI overrides)
     agent_config_dir = _prepare_agent_config(project, project_id, task_id, agents, preset)
@@ -331,32 +373,31 @@ def task_run_cli(
 
     # Resolve unrestricted mode: CLI flag → config → default (True)
     if unrestricted is None:
-        _effective = resolve_agent_config(
-            project_id,
-            agent_config=project.agent_config,
-            project_root=project.root,
-            preset=preset,
-        )
+        with span("resolve_unrestricted"):
+            _effective = resolve_agent_config(
+                project_id,
+                agent_config=project.agent_config,
+                project_root=project.root,
+                preset=preset,
+            )
         _cfg_val = resolve_provider_value(
             "unrestricted", _effective, project.default_agent or "claude"
         )
         unrestricted = _cfg_val is None or _str_to_bool(_cfg_val)
     if unrestricted:
         _apply_unrestricted_env(env)
+    resources = resolve_resource_limits(project, preset)
 
     # Run detached and keep the container alive so users can exec into it later
     # Note: We intentionally do NOT use --rm so containers persist after stopping.
     # This allows `task restart` to quickly resume stopped containers.
     task_dir = project.tasks_root / str(task_id)
-    run_hook(
+    run_project_hook(
+        project,
         "pre_start",
-        project.hook_pre_start,
-        project_id=project.id,
         task_id=task_id,
         mode="cli",
         cname=cname,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
     _run_container(
         cname=cname,
@@ -368,37 +409,37 @@ def task_run_cli(
         # Ensure init runs and then keep the container alive even without a TTY
         # init-ssh-and-repo.sh now prints a readiness marker we can watch for
         command=["bash", "-lc", "init-ssh-and-repo.sh && echo __CLI_READY__; tail -f /dev/null"],
+        resources=resources,
     )
     _maybe_drop_shield(project, cname, task_dir)
-    run_hook(
+    start_log_tee(cname, task_dir)
+    run_project_hook(
+        project,
         "post_start",
-        project.hook_post_start,
-        project_id=project.id,
         task_id=task_id,
         mode="cli",
         cname=cname,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
 
     # Stream initial logs until ready marker is seen (or timeout), then detach
-    stream_initial_logs(
-        container_name=cname,
-        timeout_sec=60.0,
-        ready_check=lambda line: "__CLI_READY__" in line or ">> init complete" in line,
-    )
+    with span("wait_ready"):
+        stream_initial_logs(
+            container_name=cname,
+            timeout_sec=60.0,
+            ready_check=mark_first_call(
+                "first_log_line",
+                lambda line: "__CLI_READY__" in line or ">> init complete" in line,
+            ),
+        )
 
     # Verify the container is still alive after log streaming
     _assert_running(cname)
-    run_hook(
+    run_project_hook(
+        project,
         "post_ready",
-        project.hook_post_ready,
-        project_id=project.id,
         task_id=task_id,
         mode="cli",
         cname=cname,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
 
     meta["mode"] = "cli"
@@ -427,7 +468,8 @@ def task_run_toad(
     Uses the same CLI image as interactive tasks but with ``toad --serve``
     as the entrypoint and a forwarded port for browser access.
     """
-    project = load_project(project_id)
+    with span("load_project"):
+        project = load_project(project_id)
     meta, meta_path = load_task_meta(project.id, task_id, "toad")
 
     port = meta.get("web_port")
@@ -450,40 +492,41 @@ def task_run_toad(
         print(f"Starting existing container {_green(cname, color_enabled)}...")
         _podman_start(cname)
         _assert_running(cname)
-        run_hook(
+        start_log_tee(cname, project.tasks_root / str(task_id))
+        run_project_hook(
+            project,
             "post_start",
-            project.hook_post_start,
-            project_id=project.id,
             task_id=task_id,
             mode="toad",
             cname=cname,
             web_port=port,
-            task_dir=project.tasks_root / str(task_id),
-            meta_path=meta_path,
         )
         print("Container started.")
         print(f"Toad: {_blue(url, color_enabled)}")
         return
 
-    env, volumes = build_task_env_and_volumes(project, task_id)
+    with span("build_task_env_and_volumes"):
+        env, volumes = build_task_env_and_volumes(project, task_id)
 
     agent_config_dir = _prepare_agent_config(project, project_id, task_id, agents, preset)
     volumes.append(f"{agent_config_dir}:/home/dev/.terok:Z")
 
     # Resolve unrestricted mode: CLI flag → config → default (True)
     if unrestricted is None:
-        _effective = resolve_agent_config(
-            project_id,
-            agent_config=project.agent_config,
-            project_root=project.root,
-            preset=preset,
-        )
+        with span("resolve_unrestricted"):
+            _effective = resolve_agent_config(
+                project_id,
+                agent_config=project.agent_config,
+                project_root=project.root,
+                preset=preset,
+            )
         _cfg_val = resolve_provider_value(
             "unrestricted", _effective, project.default_agent or "claude"
         )
         unrestricted = _cfg_val is None or _str_to_bool(_cfg_val)
     if unrestricted:
         _apply_unrestricted_env(env)
+    resources = resolve_resource_limits(project, preset)
 
     meta["mode"] = "toad"
     meta["unrestricted"] = unrestricted
@@ -501,16 +544,13 @@ def task_run_toad(
         f" --public-url http://{pub_host}:{port}"
         f" /workspace"
     )
-    run_hook(
+    run_project_hook(
+        project,
         "pre_start",
-        project.hook_pre_start,
-        project_id=project.id,
         task_id=task_id,
         mode="toad",
         cname=cname,
         web_port=port,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
     _run_container(
         cname=cname,
@@ -521,44 +561,41 @@ def task_run_toad(
         task_dir=task_dir,
         extra_args=["-p", f"{bind_addr}:{port}:{_TOAD_CONTAINER_PORT}"],
         command=["bash", "-lc", toad_cmd],
+        resources=resources,
     )
     _maybe_drop_shield(project, cname, task_dir)
-    run_hook(
+    start_log_tee(cname, task_dir)
+    run_project_hook(
+        project,
         "post_start",
-        project.hook_post_start,
-        project_id=project.id,
         task_id=task_id,
         mode="toad",
         cname=cname,
         web_port=port,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
 
     def _toad_ready(line: str) -> bool:
         """Return True when textual-serve reports it is serving."""
         return "Serving " in line
 
-    ready = stream_initial_logs(
-        container_name=cname,
-        timeout_sec=None,
-        ready_check=_toad_ready,
-    )
+    with span("wait_ready"):
+        ready = stream_initial_logs(
+            container_name=cname,
+            timeout_sec=None,
+            ready_check=mark_first_call("first_log_line", _toad_ready),
+        )
 
     if not ready or not is_container_running(cname):
         print(f"Toad failed to start. Check logs: podman logs {cname}")
         raise SystemExit(1)
 
-    run_hook(
+    run_project_hook(
+        project,
         "post_ready",
-        project.hook_post_ready,
-        project_id=project.id,
         task_id=task_id,
         mode="toad",
         cname=cname,
         web_port=port,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
 
     color_enabled = _supports_color()
@@ -589,26 +626,46 @@ def _print_run_summary(project_id: str, task_id: str, mode: str, workspace: Path
     print(f"  Workspace: {workspace}")
 
 
-def task_run_headless(request: HeadlessRunRequest) -> str:
-    """Run an agent headlessly (autopilot mode) in a new task container.
+@dataclass(frozen=True)
+class HeadlessPlan:
+    """Agent configuration resolved for a headless run.
 
-    Creates a new task, prepares the agent-config directory with the provider's
-    wrapper function and filtered subagents, then launches a detached container
-    that runs init-ssh-and-repo.sh followed by the agent command.
+    Depends only on the request's configuration inputs (see
+    :func:`headless_plan_key`), so batch runs resolve it once and share it
+    across every task with the same inputs.
+    """
 
-    Args:
-        request: All per-run options bundled in a :class:`HeadlessRunRequest`.
+    provider: Any
+    effective: dict
+    instructions: str | None
+    provider_config: Any
 
-    Returns the task_id.
-    """
-    from terok_agent import (
-        CLIOverrides,
-        apply_provider_config,
-        build_headless_command,
-        get_provider,
+
+def headless_plan_key(request: HeadlessRunRequest) -> tuple:
+    """Return the inputs of *request* that determine its :class:`HeadlessPlan`."""
+    return (
+        request.project_id,
+        request.provider,
+        request.config_path,
+        request.preset,
+        request.model,
+        request.max_turns,
+        request.timeout,
+        request.instructions,
     )
 
-    project = load_project(request.project_id)
+
+def resolve_headless_plan(
+    request: HeadlessRunRequest, project: ProjectConfig | None = None
+) -> HeadlessPlan:
+    """Resolve provider, layered agent config and instructions for *request*.
+
+    Prints warnings about provider features that cannot be honoured.
+    """
+    from terok_agent import CLIOverrides, apply_provider_config, get_provider
+
+    if project is None:
+        project = load_project(request.project_id)
     resolved = get_provider(request.provider, default_agent=project.default_agent)
 
     # Build CLI overrides from --config file and explicit flags
@@ -654,48 +711,85 @@ def task_run_headless(request: HeadlessRunRequest) -> str:
     for warning in pcfg.warnings:
         print(f"Warning: {warning}")
 
+    return HeadlessPlan(
+        provider=resolved, effective=effective, instructions=instr_text, provider_config=pcfg
+    )
+
+
+def task_run_headless(request: HeadlessRunRequest, *, plan: HeadlessPlan | None = None) -> str:
+    """Run an agent headlessly (autopilot mode) in a new task container.
+
+    Creates a new task, prepares the agent-config directory with the provider's
+    wrapper function and filtered subagents, then launches a detached container
+    that runs init-ssh-and-repo.sh followed by the agent command.
+
+    Args:
+        request: All per-run options bundled in a :class:`HeadlessRunRequest`.
+        plan: A :class:`HeadlessPlan` already resolved for *request*'s
+            configuration inputs; resolved from scratch when omitted.
+
+    Returns the task_id.
+    """
+    from terok_agent import build_headless_command
+
+    with span("load_project"):
+        project = load_project(request.project_id)
+    if plan is None:
+        with span("resolve_agent_config"):
+            plan = resolve_headless_plan(request, project)
+    resolved = plan.provider
+    effective = plan.effective
+    instr_text = plan.instructions
+    pcfg = plan.provider_config
+
     # Augment prompt with best-effort feature analogues (e.g. max-turns guidance)
     effective_prompt = request.prompt
     if pcfg.prompt_extra:
         effective_prompt = f"{request.prompt}\n\n{pcfg.prompt_extra}"
 
-    # Create a new task
-    task_id = task_new(request.project_id, name=request.name)
-
-    # Collect subagents from resolved config
-    subagents = list(effective.get("subagents") or [])
-
-    # Prepare agent-config dir with wrapper, agents.json, prompt.txt, instructions.md
-    task_dir = project.tasks_root / str(task_id)
-    agent_config_dir = prepare_agent_config_dir(
-        AgentConfigSpec(
-            tasks_root=project.tasks_root,
-            task_id=task_id,
-            subagents=subagents,
-            selected_agents=request.agents,
-            prompt=effective_prompt,
-            provider=resolved.name,
-            instructions=instr_text,
-            default_agent=project.default_agent,
-            envs_base_dir=get_envs_base_dir(),
-        )
-    )
-
     # Resolve unrestricted mode: CLI flag → config → default (True)
     unrestricted = request.unrestricted
     if unrestricted is None:
         cfg_val = resolve_provider_value("unrestricted", effective, resolved.name)
         unrestricted = _str_to_bool(cfg_val) if cfg_val is not None else True
+    resources = resolve_resource_limits(project, request.preset, request.resources)
+
+    # Create a new task unless the caller (e.g. the queue) already did; with a
+    # warm pool, take over a pre-initialised container instead (warm containers
+    # run with the project's limits, so runs with other limits start cold)
+    image = project_cli_image(project.id)
+    warm_id = None
+    if request.task_id is None and project.warm_pool_size > 0 and resources == project.resources:
+        if request.name:
+            _checked_task_name(request.name)  # Fail before claiming a warm task
+        with span("claim_warm_task"):
+            image_id = current_image_id(image)
+            if image_id:
+                warm_id = claim_warm_task(project, image_id=image_id, unrestricted=unrestricted)
+    task_id = request.task_id or warm_id
+    if task_id is None:
+        with span("task_new"):
+            task_id = task_new(request.project_id, name=request.name)
 
-    # Build env and volumes
-    env, volumes = build_task_env_and_volumes(project, task_id)
-
-    # Set TEROK_UNRESTRICTED for the wrapper functions inside the container
-    if unrestricted:
-        _apply_unrestricted_env(env)
+    # Collect subagents from resolved config
+    subagents = list(effective.get("subagents") or [])
 
-    # Mount agent-config dir to /home/dev/.terok
-    volumes.append(f"{agent_config_dir}:/home/dev/.terok:Z")
+    # Prepare agent-config dir with wrapper, agents.json, prompt.txt, instructions.md
+    task_dir = project.tasks_root / str(task_id)
+    with span("prepare_agent_config_dir"):
+        agent_config_dir = prepare_agent_config_dir(
+            AgentConfigSpec(
+                tasks_root=project.tasks_root,
+                task_id=task_id,
+                subagents=subagents,
+                selected_agents=request.agents,
+                prompt=effective_prompt,
+                provider=resolved.name,
+                instructions=instr_text,
+                default_agent=project.default_agent,
+                envs_base_dir=get_envs_base_dir(),
+            )
+        )
 
     # Build headless command via provider registry
     headless_cmd = build_headless_command(
@@ -709,41 +803,54 @@ def task_run_headless(request: HeadlessRunRequest) -> str:
     cname = container_name(project.id, "run", task_id)
 
     meta, meta_path = load_task_meta(project.id, task_id)
-    run_hook(
+    run_project_hook(
+        project,
         "pre_start",
-        project.hook_pre_start,
-        project_id=project.id,
         task_id=task_id,
         mode="run",
         cname=cname,
-        task_dir=task_dir,
-        meta_path=meta_path,
-    )
-    _run_container(
-        cname=cname,
-        image=project_cli_image(project.id),
-        env=env,
-        volumes=volumes,
-        project=project,
-        task_dir=task_dir,
-        command=["bash", "-lc", headless_cmd],
     )
+    if warm_id:
+        # The warm container mounts the same agent-config dir and is waiting
+        # for its start script; the pool is topped up in the background.
+        with span("release_warm_task"):
+            release_warm_task(agent_config_dir, headless_cmd)
+            start_pool_refill(project.id)
+    else:
+        with span("build_task_env_and_volumes"):
+            env, volumes = build_task_env_and_volumes(project, task_id)
+        # Set TEROK_UNRESTRICTED for the wrapper functions inside the container
+        if unrestricted:
+            _apply_unrestricted_env(env)
+        # Mount agent-config dir to /home/dev/.terok
+        volumes.append(f"{agent_config_dir}:/home/dev/.terok:Z")
+        _run_container(
+            cname=cname,
+            image=image,
+            env=env,
+            volumes=volumes,
+            project=project,
+            task_dir=task_dir,
+            command=["bash", "-lc", headless_cmd],
+            resources=resources,
+        )
     _maybe_drop_shield(project, cname, task_dir)
-    run_hook(
+    start_log_tee(cname, task_dir)
+    run_project_hook(
+        project,
         "post_start",
-        project.hook_post_start,
-        project_id=project.id,
         task_id=task_id,
         mode="run",
         cname=cname,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
 
     # Update task metadata
     meta["mode"] = "run"
     meta["provider"] = resolved.name
     meta["unrestricted"] = unrestricted
+    meta.pop("queued", None)
+    if warm_id and request.name:
+        meta["name"] = _checked_task_name(request.name)
     if request.preset:
         meta["preset"] = request.preset
     meta_path.write_text(_yaml_dump(meta))
@@ -751,14 +858,17 @@ def task_run_headless(request: HeadlessRunRequest) -> str:
     color_enabled = _supports_color()
 
     if request.follow:
-        exit_code = wait_for_exit(cname)
+        # The shared exit watcher records the exit code in task metadata.
+        with span("wait_for_exit"):
+            exit_code, error = wait_for_container_exit(cname, project.id, task_id, timeout=None)
         _print_run_summary(project.id, task_id, "run", task_dir / "workspace-dangerous")
 
-        update_task_exit_code(project.id, task_id, exit_code)
+        if error:
+            print(f"\nWarning: could not determine exit status of {cname}: {error}")
 
-        if exit_code != 0:
+        elif exit_code != 0:
             print(f"\n{resolved.label} exited with code {_red(str(exit_code), color_enabled)}")
-    else:
+    elif not request.quiet:
         _print_detached_summary(
             DetachedSummary(
                 label=f"Headless {resolved.label} task started (detached).",
@@ -773,6 +883,71 @@ def task_run_headless(request: HeadlessRunRequest) -> str:
     return task_id
 
 
+def _checked_task_name(name: str) -> str:
+    """Sanitize and validate a task *name*, raising SystemExit if it is invalid."""
+    sanitized = sanitize_task_name(name)
+    if sanitized is None:
+        raise SystemExit(f"Invalid task name: {name!r}")
+    err = validate_task_name(sanitized)
+    if err:
+        raise SystemExit(f"Invalid task name: {err}")
+    return sanitized
+
+
+def _default_unrestricted(project: ProjectConfig) -> bool:
+    """Resolve the restriction mode of a run without preset or CLI override."""
+    effective = resolve_agent_config(
+        project.id, agent_config=project.agent_config, project_root=project.root
+    )
+    cfg_val = resolve_provider_value("unrestricted", effective, project.default_agent or "claude")
+    return _str_to_bool(cfg_val) if cfg_val is not None else True
+
+
+def fill_warm_pool(project_id: str) -> int:
+    """Top up the project's warm pool to ``run.warm_pool``; returns containers started.
+
+    Warm containers use the project's default agent config, restriction
+    mode and ``run.resources`` limits; runs that resolve to a different
+    restriction mode or different limits start cold.
+    Dead warm containers and those built from an outdated image are
+    replaced.
+    """
+    project = load_project(project_id)
+    if project.warm_pool_size <= 0:
+        return 0
+    image = project_cli_image(project.id)
+    image_id = current_image_id(image)
+    if image_id is None:
+        raise SystemExit(f"Image {image} not found; build it with: terokctl build {project.id}")
+    unrestricted = _default_unrestricted(project)
+    started = 0
+    for _ in range(project.warm_pool_size):
+        task_id = reserve_warm_task(project, image_id=image_id, unrestricted=unrestricted)
+        if task_id is None:
+            break
+        try:
+            agent_config_dir = _prepare_agent_config(project, project.id, task_id, None, None)
+            env, volumes = build_task_env_and_volumes(project, task_id)
+            if unrestricted:
+                _apply_unrestricted_env(env)
+            volumes.append(f"{agent_config_dir}:/home/dev/.terok:Z")
+            _run_container(
+                cname=container_name(project.id, "run", task_id),
+                image=image,
+                env=env,
+                volumes=volumes,
+                project=project,
+                task_dir=project.tasks_root / task_id,
+                command=warm_command(),
+            )
+        except BaseException:
+            evict_warm_task(project, task_id)
+            raise
+        mark_warm_started(project, task_id)
+        started += 1
+    return started
+
+
 def task_followup_headless(
     project_id: str,
     task_id: str,
@@ -860,30 +1035,31 @@ def task_followup_headless(
     # which reads prompt.txt and session files from the volume)
     _podman_start(cname)
     _assert_running(cname)
-    run_hook(
+    start_log_tee(cname, task_dir)
+    run_project_hook(
+        project,
         "post_start",
-        project.hook_post_start,
-        project_id=project.id,
         task_id=task_id,
         mode="run",
         cname=cname,
-        task_dir=task_dir,
-        meta_path=meta_path,
     )
 
     # Clear previous exit_code so effective_status shows "running" until new exit
     meta["exit_code"] = None
+    meta.pop(IDLE_STOP_KEY, None)
     meta_path.write_text(_yaml_dump(meta))
 
     color_enabled = _supports_color()
 
     if follow:
-        exit_code = wait_for_exit(cname)
+        # The shared exit watcher records the exit code in task metadata.
+        exit_code, error = wait_for_container_exit(cname, project.id, task_id, timeout=None)
         _print_run_summary(project.id, task_id, "run", task_dir / "workspace-dangerous")
 
-        update_task_exit_code(project.id, task_id, exit_code)
+        if error:
+            print(f"\nWarning: could not determine exit status of {cname}: {error}")
 
-        if exit_code != 0:
+        elif exit_code != 0:
             print(f"\n{label} exited with code {_red(str(exit_code), color_enabled)}")
     else:
         _print_detached_summary(
@@ -913,7 +1089,8 @@ def task_restart(project_id: str, task_id: str) -> None:
         Re-run headless tasks manually via ``terokctl run`` with the original
         prompt instead.
     """
-    project = load_project(project_id)
+    with span("load_project"):
+        project = load_project(project_id)
     meta, meta_path = load_task_meta(project.id, task_id)
 
     mode = meta.get("mode")
@@ -928,40 +1105,38 @@ def task_restart(project_id: str, task_id: str) -> None:
     if container_state == "running":
         # Container is running - stop it first, then start it again
         try:
-            subprocess.run(
-                ["podman", "stop", "--time", str(project.shutdown_timeout), cname],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            with span("podman_stop"):
+                subprocess.run(
+                    ["podman", "stop", "--time", str(project.shutdown_timeout), cname],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
         except FileNotFoundError:
             raise SystemExit("podman not found; please install podman")
         except subprocess.CalledProcessError as e:
             raise SystemExit(f"Failed to stop container: {e}")
-        run_hook(
+        run_project_hook(
+            project,
             "post_stop",
-            project.hook_post_stop,
-            project_id=project_id,
             task_id=task_id,
             mode=mode,
             cname=cname,
-            task_dir=project.tasks_root / str(task_id),
-            meta_path=meta_path,
         )
 
     if container_state is not None:
         # Container exists (stopped/exited, or just stopped above) - start it
         _podman_start(cname)
         _assert_running(cname)
-        run_hook(
+        if meta.pop(IDLE_STOP_KEY, None) is not None:
+            meta_path.write_text(_yaml_dump(meta))
+        start_log_tee(cname, project.tasks_root / str(task_id))
+        run_project_hook(
+            project,
             "post_start",
-            project.hook_post_start,
-            project_id=project_id,
             task_id=task_id,
             mode=mode,
             cname=cname,
-            task_dir=project.tasks_root / str(task_id),
-            meta_path=meta_path,
         )
 
         color_enabled = _supports_color()
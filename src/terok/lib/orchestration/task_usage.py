@@ -0,0 +1,224 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per-task disk usage with a directory-mtime cache.
+
+Each task directory (``<tasks_root>/<task_id>/``) is measured by category:
+the workspace, captured logs, the agent-config directory and everything
+else.  The top-level subtrees of all tasks are walked with ``os.scandir``
+on a thread pool.
+
+Usage is counted in allocated blocks, like ``du``.  For every directory
+walked, its mtime, the bytes of its own files and the names of its
+subdirectories are cached in ``<state>/projects/<id>/usage-cache.json``.
+A directory whose mtime is unchanged on the next scan is not listed or
+stat'ed again; only its subdirectories are checked.  A file rewritten in
+place does not change its directory's mtime, so the ``logs`` subtree (whose
+log grows by appending, and which stays small) is always walked in full;
+``rescan=True`` ignores the cache everywhere.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..core.config import state_root
+from ..core.projects import load_project
+from ..util.fs import ensure_dir
+from ..util.host_cmd import WORKSPACE_DANGEROUS_DIRNAME
+from ..util.logging_utils import _log_debug
+
+USAGE_WORKERS = 8
+"""Task subtrees measured at once."""
+
+_CACHE_VERSION = 1
+
+# Top-level entries of a task directory with a category of their own.
+_CATEGORIES = {
+    WORKSPACE_DANGEROUS_DIRNAME: "workspace",
+    "logs": "logs",
+    "agent-config": "agent_config",
+}
+_UNCACHED = frozenset({"logs"})
+
+# Cached state of one directory: [mtime_ns, bytes of its own entries, subdirectory names].
+_DirRecord = list
+
+
+@dataclass(frozen=True)
+class TaskUsage:
+    """Disk space used by one task, in bytes, by category."""
+
+    task_id: str
+    workspace: int = 0
+    logs: int = 0
+    agent_config: int = 0
+    other: int = 0
+
+    @property
+    def total(self) -> int:
+        """Return the bytes used by the whole task directory."""
+        return self.workspace + self.logs + self.agent_config + self.other
+
+
+def usage_cache_path(project_id: str) -> Path:
+    """Return the usage cache file of *project_id*."""
+    return state_root() / "projects" / project_id / "usage-cache.json"
+
+
+def _load_cache(project_id: str) -> dict[str, dict[str, _DirRecord]]:
+    """Return the cached directory records of each task (empty if unreadable)."""
+    try:
+        data = json.loads(usage_cache_path(project_id).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+        return {}
+    tasks = data.get("tasks")
+    return tasks if isinstance(tasks, dict) else {}
+
+
+def _save_cache(project_id: str, tasks: dict[str, dict[str, _DirRecord]]) -> None:
+    """Atomically write the directory records of each task (best-effort)."""
+    path = usage_cache_path(project_id)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        ensure_dir(path.parent)
+        tmp.write_text(json.dumps({"version": _CACHE_VERSION, "tasks": tasks}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        _log_debug(f"task_usage: cannot write {path}: {exc}")
+        tmp.unlink(missing_ok=True)
+
+
+def _tree_usage(
+    task_dir: str, rel: str, cache: dict[str, _DirRecord] | None
+) -> tuple[int, dict[str, _DirRecord]]:
+    """Measure the subtree *rel* of *task_dir*; returns its bytes and fresh records.
+
+    Records in *cache* (keyed by path relative to *task_dir*) are reused
+    for directories whose mtime has not changed; ``None`` walks everything.
+    """
+    fresh: dict[str, _DirRecord] = {}
+    try:
+        st = os.lstat(os.path.join(task_dir, rel))
+    except OSError:
+        return 0, fresh
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_blocks * 512, fresh
+    total = 0
+    seen: set[tuple[int, int]] = set()
+    stack = [(rel, st)]
+    while stack:
+        rel_dir, dir_st = stack.pop()
+        record = cache.get(rel_dir) if cache is not None else None
+        if record is None or record[0] != dir_st.st_mtime_ns:
+            record = _scan_dir(os.path.join(task_dir, rel_dir), dir_st, seen)
+        fresh[rel_dir] = record
+        total += record[1]
+        for name in record[2]:
+            sub = os.path.join(rel_dir, name)
+            try:
+                sub_st = os.lstat(os.path.join(task_dir, sub))
+            except OSError:
+                continue
+            if stat.S_ISDIR(sub_st.st_mode):
+                stack.append((sub, sub_st))
+    return total, fresh
+
+
+def _scan_dir(path: str, dir_st: os.stat_result, seen: set[tuple[int, int]]) -> _DirRecord:
+    """List directory *path*: its own bytes (itself and its files) and subdirectories."""
+    own = dir_st.st_blocks * 512
+    subdirs: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        entries = []
+    for entry in entries:
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            subdirs.append(entry.name)
+            continue
+        if st.st_nlink > 1:
+            key = (st.st_dev, st.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+        own += st.st_blocks * 512
+    return [dir_st.st_mtime_ns, own, sorted(subdirs)]
+
+
+def _task_ids(tasks_root: Path) -> list[str]:
+    """Return the task directories under *tasks_root* (skipping the trash)."""
+    try:
+        return sorted(
+            (p.name for p in tasks_root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+            key=lambda tid: (not tid.isdigit(), int(tid) if tid.isdigit() else 0, tid),
+        )
+    except OSError:
+        return []
+
+
+def scan_task_usage(
+    project_id: str,
+    task_ids: Iterable[str] | None = None,
+    *,
+    rescan: bool = False,
+    workers: int = USAGE_WORKERS,
+) -> dict[str, TaskUsage]:
+    """Measure the disk usage of tasks of *project_id*, keyed by task ID.
+
+    *task_ids* defaults to every task directory of the project.  The cache
+    is updated with what was walked; with *rescan*, cached records are
+    ignored (but still refreshed).
+    """
+    tasks_root = load_project(project_id).tasks_root
+    ids = list(task_ids) if task_ids is not None else _task_ids(tasks_root)
+    cache = _load_cache(project_id)
+
+    jobs: list[tuple[str, str, str]] = []
+    for tid in ids:
+        try:
+            with os.scandir(tasks_root / tid) as it:
+                jobs += [(tid, entry.name, _CATEGORIES.get(entry.name, "other")) for entry in it]
+        except OSError:
+            continue
+        jobs.append((tid, os.curdir, "other"))
+
+    def _measure(job: tuple[str, str, str]) -> tuple[int, dict[str, _DirRecord]]:
+        """Measure one top-level entry of a task directory."""
+        tid, rel, _category = job
+        task_dir = str(tasks_root / tid)
+        if rel == os.curdir:
+            try:
+                return os.lstat(task_dir).st_blocks * 512, {}
+            except OSError:
+                return 0, {}
+        use_cache = not rescan and rel not in _UNCACHED
+        return _tree_usage(task_dir, rel, cache.get(tid, {}) if use_cache else None)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs) or 1))) as pool:
+        results = list(pool.map(_measure, jobs))
+
+    sizes: dict[str, dict[str, int]] = {tid: {} for tid in ids}
+    records: dict[str, dict[str, _DirRecord]] = {tid: {} for tid in ids}
+    for (tid, _rel, category), (size, fresh) in zip(jobs, results, strict=True):
+        sizes[tid][category] = sizes[tid].get(category, 0) + size
+        records[tid].update(fresh)
+
+    if task_ids is None:
+        cache = {}
+    cache.update({tid: recs for tid, recs in records.items() if recs})
+    _save_cache(project_id, cache)
+    return {tid: TaskUsage(task_id=tid, **sizes[tid]) for tid in ids if (tasks_root / tid).is_dir()}
@@ -16,7 +16,12 @@ import os
 import re
 import shutil
 import subprocess
+import tarfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 
 from terok_sandbox import (
@@ -25,8 +30,8 @@ from terok_sandbox import (
     stop_task_containers,
 )
 
-from ..core.config import state_root
-from ..core.projects import ProjectConfig, load_project
+from ..core.config import get_logs_max_task_bytes, get_logs_segment_bytes, state_root
+from ..core.projects import ProjectConfig, list_projects, load_project
 from ..core.task_display import (
     STATUS_DISPLAY,
     TaskState,
@@ -41,11 +46,32 @@ from ..util.ansi import (
     yellow as _yellow,
 )
 from ..util.emoji import render_emoji
-from ..util.fs import archive_timestamp, create_archive_dir, ensure_dir
+from ..util.fs import archive_timestamp, create_archive_dir, ensure_dir, format_size
 from ..util.host_cmd import WORKSPACE_DANGEROUS_DIRNAME
+from ..util.log_store import has_log, log_segments, seal_log
 from ..util.logging_utils import _log_debug
 from ..util.yaml import dump as _yaml_dump, load as _yaml_load
+from .archive_index import (
+    ArchiveIndexEntry,
+    archives_since,
+    entry_log_file,
+    find_archives,
+    index_is_current,
+    read_archive_index,
+    record_archive,
+)
 from .container_exec import container_git_diff
+from .log_tee import (
+    CURSOR_FILENAME,
+    LOG_FILENAME,
+    LogAppender,
+    read_cursor,
+    start_log_tee,
+    stop_log_tee,
+)
+from .task_usage import TaskUsage, scan_task_usage
+from .trash import move_to_trash, start_trash_reaper
+from .workspace_seed import seed_workspace
 
 # ---------- Container naming (orchestration policy) ----------
 
@@ -85,6 +111,10 @@ class TaskMeta(TaskState):
     work_status: str | None = None
     work_message: str | None = None
     shield_state: str | None = None
+    usage: TaskUsage | None = None
+    """Disk usage of the task directory, when measured (:mod:`.task_usage`)."""
+    idle_reason: str | None = None
+    """Why the task was stopped while idle, until it is started again (:mod:`.idle`)."""
 
     @property
     def status(self) -> str:
@@ -220,11 +250,13 @@ def get_task_meta(project_id: str, task_id: str) -> TaskMeta:
         container_state=live_state,
         exit_code=raw.get("exit_code"),
         deleting=bool(raw.get("deleting")),
+        queued=bool(raw.get("queued")),
         initialized=mode is not None,
         preset=raw.get("preset"),
         name=raw["name"],
         provider=raw.get("provider"),
         unrestricted=raw.get("unrestricted"),
+        idle_reason=_idle_reason(raw),
         work_status=ws_status,
         work_message=ws_message,
     )
@@ -276,6 +308,26 @@ def tasks_archive_dir(project_id: str) -> Path:
     return state_root() / "projects" / project_id / "archive"
 
 
+IDLE_STOP_KEY = "idle_stop"
+"""Task metadata key recording an automatic stop of an idle task."""
+
+
+def _idle_reason(meta: dict) -> str | None:
+    """Return the recorded reason of an idle stop in *meta*, if any."""
+    record = meta.get(IDLE_STOP_KEY)
+    return record.get("reason") if isinstance(record, dict) else None
+
+
+def mark_idle_stopped(project_id: str, task_id: str, reason: str) -> None:
+    """Record in the task's metadata that it was stopped while idle, and why."""
+    meta_path = tasks_meta_dir(project_id) / f"{task_id}.yml"
+    if not meta_path.is_file():
+        return
+    meta = _yaml_load(meta_path.read_text()) or {}
+    meta[IDLE_STOP_KEY] = {"at": datetime.now().astimezone().isoformat(), "reason": reason}
+    meta_path.write_text(_yaml_dump(meta))
+
+
 def update_task_exit_code(project_id: str, task_id: str, exit_code: int | None) -> None:
     """Update task metadata with exit code and final status.
 
@@ -351,6 +403,7 @@ def _task_new(project: ProjectConfig, *, name: str | None = None) -> str:
     )
 
     _write_task_readme(ws)
+    seed = seed_workspace(project, workspace_dir)
 
     meta = {
         "task_id": next_id,
@@ -359,6 +412,13 @@ def _task_new(project: ProjectConfig, *, name: str | None = None) -> str:
         "workspace": str(ws),
         "web_port": None,
     }
+    if seed is not None:
+        meta["workspace_seed"] = seed.as_meta()
+        print(
+            f"Seeded workspace from gate ({seed.mode}) in {seed.seconds:.1f}s: "
+            f"{format_size(seed.bytes)} on disk, {format_size(seed.saved_bytes)} "
+            "less than a full copy"
+        )
     (meta_dir / f"{next_id}.yml").write_text(_yaml_dump(meta))
     print(f"Created task {next_id} ({task_name}) in {ws}")
     return next_id
@@ -395,6 +455,11 @@ def task_new(project_id: str, *, name: str | None = None) -> str:
     This handles edge cases like:
     - Stale workspace from incompletely deleted previous task with same ID
     - Ensuring new tasks always start with latest code
+
+    With ``tasks.workspace_seed`` enabled, the workspace additionally gets
+    a host-side clone of the git gate (see
+    :mod:`~terok.lib.orchestration.workspace_seed`), so the init script
+    only fetches the difference instead of cloning from scratch.
     """
     return _task_new(load_project(project_id), name=name)
 
@@ -440,6 +505,8 @@ def _get_tasks(project_id: str, reverse: bool = False) -> list[TaskMeta]:
     for f in meta_dir.glob("*.yml"):
         try:
             meta = _yaml_load(f.read_text()) or {}
+            if meta.get("warm"):
+                continue  # Unclaimed warm-pool task (see warm_pool)
             tid = str(meta.get("task_id", ""))
             ws_status = None
             ws_message = None
@@ -458,6 +525,7 @@ def _get_tasks(project_id: str, reverse: bool = False) -> list[TaskMeta]:
                     backend=meta.get("backend"),
                     exit_code=meta.get("exit_code"),
                     deleting=bool(meta.get("deleting")),
+                    queued=bool(meta.get("queued")),
                     initialized=mode is not None,
                     preset=meta.get("preset"),
                     name=meta["name"],
@@ -465,6 +533,7 @@ def _get_tasks(project_id: str, reverse: bool = False) -> list[TaskMeta]:
                     unrestricted=meta.get("unrestricted"),
                     work_status=ws_status,
                     work_message=ws_message,
+                    idle_reason=_idle_reason(meta),
                 )
             )
         except Exception:
@@ -510,6 +579,33 @@ def get_all_task_states(
     return result
 
 
+def get_container_states() -> dict[str, str] | None:
+    """Map every podman container name to its state via a single ``podman ps -a``.
+
+    Unlike :func:`get_all_task_states` this covers all projects at once.
+    Returns ``None`` when podman could not be queried.
+    """
+    try:
+        result = subprocess.run(
+            ["podman", "ps", "-a", "--format", "{{.Names}}\t{{.State}}"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log_debug(f"get_container_states: podman ps failed: {exc}")
+        return None
+    if result.returncode != 0:
+        _log_debug(f"get_container_states: podman ps failed: {result.stderr.strip()}")
+        return None
+    states: dict[str, str] = {}
+    for row in result.stdout.splitlines():
+        name, _, state = row.partition("\t")
+        if name:
+            states[name] = state.strip().lower()
+    return states
+
+
 def task_list(
     project_id: str,
     *,
@@ -546,6 +642,7 @@ def task_list(
         print("No tasks found")
         return
 
+    usage = scan_task_usage(project_id, [t.task_id for t in tasks])
     for t in tasks:
         t_status = effective_status(t)
         extra = []
@@ -555,10 +652,58 @@ def task_list(
             extra.append(f"port={t.web_port}")
         if t.work_status:
             extra.append(f"work={t.work_status}")
+        if t.idle_reason and t_status != "running":
+            extra.append("idle-stopped")
+        if t.task_id in usage:
+            extra.append(f"disk={format_size(usage[t.task_id].total)}")
         extra_s = f" [{'; '.join(extra)}]" if extra else ""
         print(f"- {t.task_id:>3}: {t.name} {t_status}{extra_s}")
 
 
+DU_SORT_KEYS = ("id", "size")
+"""Orderings accepted by :func:`task_du`."""
+
+
+def task_du(project_id: str | None = None, *, sort: str = "id", rescan: bool = False) -> None:
+    """Print the disk usage of each task of *project_id* (all projects if ``None``).
+
+    *sort* is ``"id"`` (by project, then task ID) or ``"size"`` (largest
+    first).  With *rescan*, the usage cache is bypassed.
+    """
+    if sort not in DU_SORT_KEYS:
+        raise SystemExit(f"Unknown sort key {sort!r}; use one of: {', '.join(DU_SORT_KEYS)}")
+    project_ids = [project_id] if project_id else [p.id for p in list_projects()]
+    rows: list[tuple[str, TaskMeta, TaskUsage]] = []
+    for pid in project_ids:
+        tasks = {t.task_id: t for t in get_tasks(pid)}
+        usage = scan_task_usage(pid, tasks, rescan=rescan)
+        rows += [(pid, tasks[tid], u) for tid, u in usage.items()]
+    if not rows:
+        print("No tasks found")
+        return
+    if sort == "size":
+        rows.sort(key=lambda r: r[2].total, reverse=True)
+
+    header = ("PROJECT", "TASK", "WORKSPACE", "LOGS", "AGENT-CFG", "OTHER", "TOTAL", "NAME")
+    table = [
+        (
+            pid,
+            t.task_id,
+            *(format_size(n) for n in (u.workspace, u.logs, u.agent_config, u.other, u.total)),
+            t.name,
+        )
+        for pid, t, u in rows
+    ]
+    width = max(len(r[0]) for r in [header, *table])
+    for r in [header, *table]:
+        print(
+            f"{r[0]:<{width}}  {r[1]:>4}  {r[2]:>9}  {r[3]:>9}  {r[4]:>9}  {r[5]:>9}"
+            f"  {r[6]:>9}  {r[7]}"
+        )
+    total = sum(u.total for _, _, u in rows)
+    print(f"Total: {format_size(total)} in {len(rows)} task(s)")
+
+
 def _check_mode(meta: dict, expected: str) -> None:
     """Raise SystemExit if the task's mode conflicts with *expected*."""
     mode = meta.get("mode")
@@ -599,12 +744,17 @@ def mark_task_deleting(project_id: str, task_id: str) -> None:
 
 
 def capture_task_logs(project: ProjectConfig | str, task_id: str, mode: str) -> Path | None:
-    """Capture container logs to the task's ``logs/`` directory on the host.
+    """Bring the task's host-side ``logs/container.log`` up to date.
+
+    When a resume cursor exists (the log was kept current by the background
+    log tee, see :mod:`.log_tee`), only output newer than the cursor is
+    fetched with ``podman logs --since`` and appended.  Otherwise the full
+    ``podman logs`` output replaces the log.  Either way the output is
+    rotated into compressed segments under the configured size caps, and
+    an existing log is never discarded when podman fails.
 
-    Writes stdout/stderr from ``podman logs`` to
-    ``<tasks_root>/<task_id>/logs/container.log``.  Returns the log file
-    path on success, or ``None`` if the container doesn't exist or podman
-    fails.
+    Returns the log file path, or ``None`` if there is no log (the
+    container doesn't exist or podman failed on a first capture).
 
     *project* may be a :class:`ProjectConfig` or a project-ID string
     (the string form loads the config internally for backward compat).
@@ -614,25 +764,39 @@ def capture_task_logs(project: ProjectConfig | str, task_id: str, mode: str) ->
     task_dir = project.tasks_root / str(task_id)
     logs_dir = task_dir / "logs"
     ensure_dir(logs_dir)
-    log_file = logs_dir / "container.log"
-
-    cname = container_name(project.id, mode, task_id)
+    log_file = logs_dir / LOG_FILENAME
+    part_file = logs_dir / f"{LOG_FILENAME}.part"
+
+    cursor = read_cursor(logs_dir) if has_log(log_file) else None
+    cmd = ["podman", "logs", "--timestamps"]
+    if cursor:
+        cmd.extend(["--since", cursor])
+    cmd.append(container_name(project.id, mode, task_id))
     try:
-        with log_file.open("wb") as f:
-            result = subprocess.run(
-                ["podman", "logs", "--timestamps", cname],
-                stdout=f,
-                stderr=subprocess.PIPE,
-                timeout=60,
-            )
+        with part_file.open("wb") as f:
+            result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, timeout=60)
     except (FileNotFoundError, subprocess.TimeoutExpired):
-        log_file.unlink(missing_ok=True)
-        return None
-
-    if result.returncode != 0:
-        log_file.unlink(missing_ok=True)
-        return None
-
+        result = None
+
+    if result is None or result.returncode != 0:
+        part_file.unlink(missing_ok=True)
+        return log_file if has_log(log_file) else None
+
+    if not cursor:
+        # Full capture replaces whatever was there before.
+        for stale in (*log_segments(log_file), log_file, logs_dir / CURSOR_FILENAME):
+            stale.unlink(missing_ok=True)
+    appender = LogAppender(
+        logs_dir,
+        segment_bytes=get_logs_segment_bytes(),
+        max_total_bytes=get_logs_max_task_bytes(),
+    )
+    try:
+        with part_file.open("rb") as f:
+            appender.feed_all(f)
+    finally:
+        appender.close()
+        part_file.unlink(missing_ok=True)
     return log_file
 
 
@@ -647,6 +811,9 @@ def _archive_task(project: ProjectConfig, task_id: str, meta: dict) -> Path | No
     identifier because task numbers and names are not globally unique —
     they can be reused when tasks are deleted and recreated.
 
+    The entry is then appended to the archive index (see
+    :mod:`~terok.lib.orchestration.archive_index`).
+
     Returns the archive directory path, or ``None`` if archiving failed.
     """
     try:
@@ -658,18 +825,25 @@ def _archive_task(project: ProjectConfig, task_id: str, meta: dict) -> Path | No
             dir_name = f"{dir_name}_{task_name}"
 
         archive_root = tasks_archive_dir(project.id)
+        index_current = index_is_current(archive_root)
         archive_dir = create_archive_dir(archive_root, dir_name)
 
         # Save metadata snapshot
         (archive_dir / "task.yml").write_text(_yaml_dump(meta))
 
-        # Copy logs if they exist
+        # Move logs if they exist (the workspace is about to be removed, so
+        # a rename is enough and stays O(1) regardless of log size)
         task_dir = project.tasks_root / str(task_id)
         logs_dir = task_dir / "logs"
         if logs_dir.is_dir():
+            for stale in (".tee.lock", ".tee.pid", f"{LOG_FILENAME}.part"):
+                (logs_dir / stale).unlink(missing_ok=True)
             archive_logs_dir = archive_dir / "logs"
-            shutil.copytree(logs_dir, archive_logs_dir, dirs_exist_ok=True)
+            shutil.move(str(logs_dir), str(archive_logs_dir))
+            # Archived logs are read-only: compress the live remainder too
+            seal_log(archive_logs_dir / LOG_FILENAME)
 
+        record_archive(archive_dir, rebuild=not index_current)
         _log_debug(f"_archive_task: archived task {task_id} to {archive_dir}")
         return archive_dir
     except Exception as e:
@@ -677,13 +851,10 @@ def _archive_task(project: ProjectConfig, task_id: str, meta: dict) -> Path | No
         return None
 
 
-def _task_delete(project: ProjectConfig, task_id: str) -> None:
-    """Delete a task's workspace, metadata, and associated containers."""
-    _log_debug(f"task_delete: start project_id={project.id} task_id={task_id}")
-
+def _delete_prepare(project: ProjectConfig, task_id: str) -> str | None:
+    """Capture logs and archive a task about to be deleted; returns its mode."""
     workspace = project.tasks_root / str(task_id)
-    meta_dir = tasks_meta_dir(project.id)
-    meta_path = meta_dir / f"{task_id}.yml"
+    meta_path = tasks_meta_dir(project.id) / f"{task_id}.yml"
     _log_debug(f"task_delete: workspace={workspace} meta_path={meta_path}")
 
     meta = {}
@@ -692,40 +863,61 @@ def _task_delete(project: ProjectConfig, task_id: str) -> None:
 
     mode = meta.get("mode")
     if mode:
-        _log_debug("task_delete: capturing container logs")
+        _log_debug("task_delete: stopping log tee and capturing container logs")
+        stop_log_tee(workspace / "logs")
         capture_task_logs(project, task_id, mode)
 
-    if meta:
+    if meta and not meta.get("warm"):
         _log_debug("task_delete: archiving task")
         _archive_task(project, task_id, meta)
+    return mode
+
 
+def _revoke_task_tokens(project_id: str, task_ids: list[str]) -> None:
+    """Revoke the gate tokens of *task_ids* (best-effort)."""
     _log_debug("task_delete: revoking gate tokens")
     from terok_sandbox import revoke_token_for_task
 
-    try:
-        revoke_token_for_task(project.id, task_id)
-    except Exception as exc:
-        _log_debug(f"task_delete: token revoke failed: {exc}")
+    for task_id in task_ids:
+        try:
+            revoke_token_for_task(project_id, task_id)
+        except Exception as exc:
+            _log_debug(f"task_delete: token revoke failed for {task_id}: {exc}")
+
 
+def _stop_containers_of(project_id: str, task_ids: list[str]) -> None:
+    """Stop and remove every possible container of *task_ids* in one call."""
     _log_debug("task_delete: calling _stop_task_containers")
-    names = [container_name(project.id, mode, str(task_id)) for mode in CONTAINER_MODES]
+    names = [
+        container_name(project_id, mode, str(tid)) for tid in task_ids for mode in CONTAINER_MODES
+    ]
     stop_task_containers(names)
     _log_debug("task_delete: _stop_task_containers returned")
 
+
+def _delete_finish(project: ProjectConfig, task_id: str, mode: str | None) -> None:
+    """Run the post_stop hook, then trash the task's workspace and metadata.
+
+    The trash is reclaimed by the reaper (see :mod:`.trash`); a workspace
+    that cannot be renamed is removed inline instead.
+    """
     if mode:
-        from .hooks import run_hook
+        from .hooks import run_project_hook
 
-        run_hook(
+        run_project_hook(
+            project,
             "post_stop",
-            project.hook_post_stop,
-            project_id=project.id,
             task_id=task_id,
             mode=mode,
             cname=container_name(project.id, mode, task_id),
-            task_dir=workspace,
-            meta_path=meta_path,
         )
 
+    meta_path = tasks_meta_dir(project.id) / f"{task_id}.yml"
+    _log_debug("task_delete: moving workspace and metadata to trash")
+    if move_to_trash(project, task_id, meta_path) is not None:
+        return
+
+    workspace = project.tasks_root / str(task_id)
     if workspace.is_dir():
         _log_debug("task_delete: removing workspace directory")
         shutil.rmtree(workspace)
@@ -736,6 +928,15 @@ def _task_delete(project: ProjectConfig, task_id: str) -> None:
         meta_path.unlink()
         _log_debug("task_delete: metadata file removed")
 
+
+def _task_delete(project: ProjectConfig, task_id: str) -> None:
+    """Delete a task's workspace, metadata, and associated containers."""
+    _log_debug(f"task_delete: start project_id={project.id} task_id={task_id}")
+    mode = _delete_prepare(project, task_id)
+    _revoke_task_tokens(project.id, [task_id])
+    _stop_containers_of(project.id, [task_id])
+    _delete_finish(project, task_id, mode)
+    start_trash_reaper()
     _log_debug("task_delete: finished")
 
 
@@ -776,6 +977,9 @@ def _validate_login(project: ProjectConfig, task_id: str) -> tuple[str, str]:
 
     cname = container_name(project.id, mode, task_id)
     state = get_container_state(cname)
+    if state is not None and state != "running" and _idle_reason(meta):
+        _resume_idle_task(project, task_id, meta, meta_path, cname)
+        state = get_container_state(cname)
     if state is None:
         raise SystemExit(
             f"Container {cname} does not exist. "
@@ -789,6 +993,31 @@ def _validate_login(project: ProjectConfig, task_id: str) -> tuple[str, str]:
     return cname, mode
 
 
+def _resume_idle_task(
+    project: ProjectConfig, task_id: str, meta: dict, meta_path: Path, cname: str
+) -> None:
+    """Start again the container of a task that was stopped while idle."""
+    print(f"Resuming task {task_id} (stopped while idle: {_idle_reason(meta)})...")
+    try:
+        subprocess.run(
+            ["podman", "start", cname],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        raise SystemExit("podman not found; please install podman")
+    except subprocess.CalledProcessError as e:
+        raise SystemExit(f"Failed to start container: {e}")
+    meta.pop(IDLE_STOP_KEY, None)
+    meta_path.write_text(_yaml_dump(meta))
+    start_log_tee(cname, project.tasks_root / str(task_id))
+
+    from .hooks import run_project_hook
+
+    run_project_hook(project, "post_start", task_id=task_id, mode=meta["mode"], cname=cname)
+
+
 def _get_login_command(project: ProjectConfig, task_id: str) -> list[str]:
     """Return the podman exec command to log into a task container."""
     cname, _mode = _validate_login(project, task_id)
@@ -849,17 +1078,14 @@ def _task_stop(project: ProjectConfig, task_id: str, *, timeout: int | None = No
     except subprocess.CalledProcessError as e:
         raise SystemExit(f"Failed to stop container: {e}")
 
-    from .hooks import run_hook
+    from .hooks import run_project_hook
 
-    run_hook(
+    run_project_hook(
+        project,
         "post_stop",
-        project.hook_post_stop,
-        project_id=project.id,
         task_id=task_id,
         mode=mode,
         cname=cname,
-        task_dir=project.tasks_root / str(task_id),
-        meta_path=meta_path,
     )
 
     color_enabled = _supports_color()
@@ -887,6 +1113,201 @@ def task_stop(project_id: str, task_id: str, *, timeout: int | None = None) -> N
     _task_stop(load_project(project_id), task_id, timeout=timeout)
 
 
+# ---------- Bulk operations ----------
+
+BULK_WORKERS = 8
+"""Tasks processed at once by :func:`task_delete_many` and :func:`task_stop_many`."""
+
+
+@dataclass(frozen=True)
+class BulkOutcome:
+    """Result of a bulk operation on one task."""
+
+    task_id: str
+    status: str = "ok"
+    """``ok``, ``failed`` or ``skipped``."""
+    detail: str = ""
+
+
+def _meta_mtime(path: Path) -> float:
+    """Return the modification time of *path*, or infinity if it is gone."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return float("inf")
+
+
+def select_tasks(
+    project_id: str, *, status: str | None = None, older_than: float | None = None
+) -> list[TaskMeta]:
+    """Return the project's tasks matching every given selector.
+
+    *status* is compared with the live effective status (one podman query
+    for all tasks); *older_than* selects tasks whose metadata has not
+    changed for that many seconds.  Without selectors every task matches.
+    """
+    tasks = get_tasks(project_id)
+    if older_than is not None:
+        cutoff = time.time() - older_than
+        meta_dir = tasks_meta_dir(project_id)
+        tasks = [t for t in tasks if _meta_mtime(meta_dir / f"{t.task_id}.yml") < cutoff]
+    if status and tasks:
+        live_states = get_all_task_states(project_id, tasks)
+        for t in tasks:
+            t.container_state = live_states.get(t.task_id)
+        tasks = [t for t in tasks if effective_status(t) == status]
+    return tasks
+
+
+def _run_bulk(
+    fn: Callable[[str], None],
+    task_ids: list[str],
+    *,
+    workers: int,
+    progress: Callable[[BulkOutcome], None] | None = None,
+) -> list[BulkOutcome]:
+    """Run *fn* for each task in a thread pool and collect the outcomes.
+
+    A raised exception (including ``SystemExit``) fails only its own task.
+    *progress* is called from the worker threads as each task finishes.
+    """
+
+    def _one(task_id: str) -> BulkOutcome:
+        """Run *fn* for one task and report its outcome."""
+        try:
+            fn(task_id)
+            outcome = BulkOutcome(task_id)
+        except (Exception, SystemExit) as exc:
+            outcome = BulkOutcome(task_id, "failed", str(exc) or type(exc).__name__)
+        if progress is not None:
+            progress(outcome)
+        return outcome
+
+    if not task_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_one, task_ids))
+
+
+def task_delete_many(
+    project_id: str,
+    task_ids: list[str],
+    *,
+    workers: int = BULK_WORKERS,
+    progress: Callable[[BulkOutcome], None] | None = None,
+) -> list[BulkOutcome]:
+    """Delete several tasks like :func:`task_delete`, *workers* at a time.
+
+    Logs are captured and tasks archived in parallel; gate tokens are then
+    revoked in one pass and every task container is stopped with a single
+    call, before hooks and workspace removal run in parallel again.  Returns
+    one outcome per task, in the order of *task_ids*.
+    """
+    project = load_project(project_id)
+    modes: dict[str, str | None] = {}
+
+    def _prepare(task_id: str) -> None:
+        """Archive one task, remembering its mode."""
+        modes[task_id] = _delete_prepare(project, task_id)
+
+    prepared = _run_bulk(_prepare, task_ids, workers=workers)
+    outcomes = {o.task_id: o for o in prepared if o.status != "ok"}
+    if progress is not None:
+        for outcome in outcomes.values():
+            progress(outcome)
+
+    ready = [o.task_id for o in prepared if o.status == "ok"]
+    if ready:
+        _revoke_task_tokens(project.id, ready)
+        try:
+            _stop_containers_of(project.id, ready)
+        except Exception as exc:
+            for task_id in ready:
+                outcomes[task_id] = BulkOutcome(task_id, "failed", f"container stop failed: {exc}")
+                if progress is not None:
+                    progress(outcomes[task_id])
+            ready = []
+
+    for outcome in _run_bulk(
+        lambda tid: _delete_finish(project, tid, modes[tid]),
+        ready,
+        workers=workers,
+        progress=progress,
+    ):
+        outcomes[outcome.task_id] = outcome
+    if ready:
+        start_trash_reaper()
+    return [outcomes[tid] for tid in task_ids]
+
+
+def task_stop_many(
+    project_id: str,
+    task_ids: list[str],
+    *,
+    timeout: int | None = None,
+    workers: int = BULK_WORKERS,
+    progress: Callable[[BulkOutcome], None] | None = None,
+) -> list[BulkOutcome]:
+    """Gracefully stop several task containers like :func:`task_stop`.
+
+    All running containers are stopped by one ``podman stop`` call; their
+    ``post_stop`` hooks then run *workers* at a time.  Tasks that are not
+    running are skipped.  Returns one outcome per task, in the order of
+    *task_ids*.
+    """
+    project = load_project(project_id)
+    effective_timeout = timeout if timeout is not None else project.shutdown_timeout
+    states = get_project_container_states(project_id)
+    outcomes: dict[str, BulkOutcome] = {}
+    targets: dict[str, tuple[str, str]] = {}
+    for task_id in task_ids:
+        try:
+            meta, _ = load_task_meta(project_id, task_id)
+        except (Exception, SystemExit) as exc:
+            outcomes[task_id] = BulkOutcome(task_id, "failed", str(exc))
+            continue
+        mode = meta.get("mode")
+        cname = container_name(project_id, mode, task_id) if mode else ""
+        state = states.get(cname) if mode else None
+        if state in ("running", "paused"):
+            targets[task_id] = (mode, cname)
+        else:
+            outcomes[task_id] = BulkOutcome(task_id, "skipped", f"not running (state: {state})")
+
+    if targets:
+        try:
+            result = subprocess.run(
+                ["podman", "stop", "--time", str(effective_timeout)]
+                + [cname for _, cname in targets.values()],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            raise SystemExit("podman not found; please install podman")
+        if result.returncode != 0:
+            # podman stops what it can; find out which containers are still up
+            states = get_project_container_states(project_id)
+            for task_id, (_, cname) in list(targets.items()):
+                if states.get(cname) in ("running", "paused"):
+                    outcomes[task_id] = BulkOutcome(task_id, "failed", "podman stop failed")
+                    del targets[task_id]
+
+    if progress is not None:
+        for outcome in outcomes.values():
+            progress(outcome)
+
+    from .hooks import run_project_hook
+
+    def _post_stop(task_id: str) -> None:
+        """Run the post_stop hook of a stopped task."""
+        mode, cname = targets[task_id]
+        run_project_hook(project, "post_stop", task_id=task_id, mode=mode, cname=cname)
+
+    for outcome in _run_bulk(_post_stop, list(targets), workers=workers, progress=progress):
+        outcomes[outcome.task_id] = outcome
+    return [outcomes[tid] for tid in task_ids]
+
+
 def task_status(project_id: str, task_id: str) -> None:
     """Show live task status with container state diagnostics."""
     project = load_project(project_id)
@@ -918,6 +1339,7 @@ def task_status(project_id: str, task_id: str) -> None:
         backend=meta.get("backend"),
         exit_code=exit_code,
         deleting=bool(meta.get("deleting")),
+        queued=bool(meta.get("queued")),
         initialized=mode is not None,
         container_state=cs,
         name=meta["name"],
@@ -972,43 +1394,60 @@ class ArchivedTask:
     name: str
     mode: str | None
     exit_code: int | None
+    log_size: int = 0
+    bundle: str | None = None
+    """Monthly bundle the archive was packed into, if any."""
+
+
+def _archived_task(archive_root: Path, entry: ArchiveIndexEntry) -> ArchivedTask:
+    """Convert an archive index entry into an :class:`ArchivedTask`."""
+    return ArchivedTask(
+        archive_dir=archive_root / entry.dir_name,
+        archived_at=entry.archived_at,
+        task_id=entry.task_id,
+        name=entry.name,
+        mode=entry.mode,
+        exit_code=entry.exit_code,
+        log_size=entry.log_size,
+        bundle=entry.bundle,
+    )
+
+
+def archived_task_log_file(archived: ArchivedTask) -> Path:
+    """Return the logical log file of *archived*, unpacking it from its bundle if needed."""
+    entry = ArchiveIndexEntry(
+        dir_name=archived.archive_dir.name,
+        archived_at=archived.archived_at,
+        task_id=archived.task_id,
+        name=archived.name,
+        bundle=archived.bundle,
+    )
+    return entry_log_file(archived.archive_dir.parent, entry)
+
 
+def list_archived_tasks(
+    project_id: str, *, limit: int | None = None, since: datetime | None = None
+) -> list[ArchivedTask]:
+    """Return archived tasks for *project_id*, sorted newest-first.
 
-def list_archived_tasks(project_id: str) -> list[ArchivedTask]:
-    """Return archived tasks for *project_id*, sorted newest-first."""
+    Reads the archive index rather than every entry's ``task.yml``.  *since*
+    keeps tasks archived at or after that time; *limit* keeps the newest
+    *limit* of those.
+    """
     archive_root = tasks_archive_dir(project_id)
-    if not archive_root.is_dir():
-        return []
-    results: list[ArchivedTask] = []
-    for entry in sorted(archive_root.iterdir(), reverse=True):
-        if not entry.is_dir():
-            continue
-        meta_path = entry / "task.yml"
-        if not meta_path.is_file():
-            continue
-        try:
-            meta = _yaml_load(meta_path.read_text()) or {}
-        except Exception:
-            continue
-        # Parse archive timestamp from directory name: <timestamp>_<task_id>[_<name>]
-        parts = entry.name.split("_", 2)
-        archived_at = parts[0] if parts else entry.name
-        results.append(
-            ArchivedTask(
-                archive_dir=entry,
-                archived_at=archived_at,
-                task_id=str(meta.get("task_id", "")),
-                name=meta.get("name", ""),
-                mode=meta.get("mode"),
-                exit_code=meta.get("exit_code"),
-            )
-        )
-    return results
+    entries = read_archive_index(archive_root)
+    if since is not None:
+        entries = archives_since(entries, archive_timestamp(since))
+    if limit is not None:
+        entries = entries[-limit:] if limit > 0 else []
+    return [_archived_task(archive_root, e) for e in reversed(entries)]
 
 
-def task_archive_list(project_id: str) -> None:
-    """Print archived tasks for *project_id*."""
-    archived = list_archived_tasks(project_id)
+def task_archive_list(
+    project_id: str, *, limit: int | None = None, since: datetime | None = None
+) -> None:
+    """Print archived tasks for *project_id* (see :func:`list_archived_tasks`)."""
+    archived = list_archived_tasks(project_id, limit=limit, since=since)
     if not archived:
         print("No archived tasks found")
         return
@@ -1018,6 +1457,8 @@ def task_archive_list(project_id: str) -> None:
             extra.append(f"mode={a.mode}")
         if a.exit_code is not None:
             extra.append(f"exit={a.exit_code}")
+        if a.log_size:
+            extra.append(f"logs={format_size(a.log_size)}")
         extra_s = f" [{'; '.join(extra)}]" if extra else ""
         print(f"- {a.archived_at} #{a.task_id}: {a.name}{extra_s}")
 
@@ -1025,15 +1466,19 @@ def task_archive_list(project_id: str) -> None:
 def task_archive_logs(project_id: str, archive_id: str) -> Path | None:
     """Return the log file path for an archived task identified by *archive_id*.
 
-    *archive_id* is matched against archive directory names (prefix match).
-    Returns the log file path if found, or ``None``.
+    *archive_id* is matched against archive directory names (prefix match,
+    a binary search over the archive index); the newest match with logs
+    wins; a bundled archive is unpacked first.  Returns the logical log
+    path if found, or ``None``.  Archived logs are stored as compressed
+    segments; read them with :func:`~terok.lib.util.log_store.iter_log_lines`.
     """
     archive_root = tasks_archive_dir(project_id)
-    if not archive_root.is_dir():
-        return None
-    for entry in sorted(archive_root.iterdir(), reverse=True):
-        if entry.is_dir() and entry.name.startswith(archive_id):
-            log_file = entry / "logs" / "container.log"
-            if log_file.is_file():
-                return log_file
+    for entry in find_archives(archive_root, archive_id):
+        try:
+            log_file = entry_log_file(archive_root, entry)
+        except (OSError, tarfile.TarError) as exc:
+            _log_debug(f"task_archive_logs: cannot unpack {entry.dir_name}: {exc}")
+            continue
+        if has_log(log_file):
+            return log_file
     return None
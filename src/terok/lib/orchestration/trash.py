@@ -0,0 +1,259 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Instant task deletion: per-project trash plus a background reaper.
+
+Deleting a task renames its workspace and metadata into
+``<tasks_root>/.trash/<task_id>-<suffix>/`` — one ``rename`` each, so the
+task disappears at once however large its workspace is.  A detached reaper
+process (``python -m terok.lib.orchestration.trash``) then reclaims the
+space with a parallel ``os.scandir``-based remover.
+
+Only one reaper runs at a time (non-blocking ``flock``).  Trash left behind
+by a crash or an interrupted reaper is reclaimed by the next reaper, which
+is started after every deletion and on TUI start
+(:func:`resume_trash_reaper`).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import stat
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..core.config import state_root
+from ..core.projects import list_projects
+from ..util.fs import ensure_dir
+from ..util.logging_utils import _log_debug
+
+if TYPE_CHECKING:
+    from ..core.project_model import ProjectConfig
+
+TRASH_DIRNAME = ".trash"
+"""Name of the trash directory inside a project's tasks root."""
+
+REAPER_WORKERS = 8
+"""Subtrees of one trash entry removed at once."""
+
+_REAPER_LOCK_FILENAME = "reaper.lock"
+
+
+def trash_dir(project: ProjectConfig) -> Path:
+    """Return the trash directory of *project*."""
+    return project.tasks_root / TRASH_DIRNAME
+
+
+def _reaper_dir() -> Path:
+    """Return the directory holding the reaper lock and log."""
+    return state_root() / "trash"
+
+
+def move_to_trash(project: ProjectConfig, task_id: str, meta_path: Path) -> Path | None:
+    """Move a task's workspace and metadata file into the project trash.
+
+    Returns the trash entry, or ``None`` if the workspace could not be
+    renamed (e.g. it is a mount point); the caller then removes it inline.
+    Metadata that cannot be renamed (another filesystem) is unlinked.
+    """
+    entry = trash_dir(project) / f"{task_id}-{uuid.uuid4().hex[:8]}"
+    workspace = project.tasks_root / str(task_id)
+    try:
+        ensure_dir(entry)
+        if workspace.is_dir():
+            os.rename(workspace, entry / "workspace")
+    except OSError as exc:
+        _log_debug(f"trash: cannot move {workspace} to trash: {exc}")
+        try:
+            entry.rmdir()
+        except OSError:
+            pass
+        return None
+    if meta_path.is_file():
+        try:
+            os.rename(meta_path, entry / meta_path.name)
+        except OSError:
+            meta_path.unlink(missing_ok=True)
+    return entry
+
+
+def _make_writable(path: str) -> None:
+    """Grant the owner full access to directory *path* (best-effort)."""
+    try:
+        mode = os.lstat(path).st_mode
+        os.chmod(path, stat.S_IMODE(mode) | stat.S_IRWXU)
+    except OSError:
+        pass
+
+
+def _scan(path: str) -> list[os.DirEntry[str]]:
+    """List directory *path*, fixing up missing owner permissions once."""
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except PermissionError:
+        _make_writable(path)
+        with os.scandir(path) as it:
+            return list(it)
+
+
+def _unlink(entry: os.DirEntry[str], parent: str) -> None:
+    """Remove the non-directory *entry* of directory *parent*."""
+    try:
+        os.unlink(entry.path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        _make_writable(parent)
+        os.unlink(entry.path)
+
+
+def _remove(path: str) -> None:
+    """Remove the directory tree at *path* without following symlinks."""
+    _make_writable(path)
+    for entry in _scan(path):
+        if entry.is_dir(follow_symlinks=False):
+            _remove(entry.path)
+        else:
+            _unlink(entry, path)
+    os.rmdir(path)
+
+
+def remove_tree(root: Path, *, workers: int = REAPER_WORKERS) -> None:
+    """Remove the directory tree at *root*, its subtrees in parallel.
+
+    Walks breadth-first until there are about *workers* subtrees, removes
+    those concurrently, then the directories above them.  Symlinks are
+    removed, never followed; directories lacking owner permissions are
+    fixed up as they are met.
+    """
+    if not root.is_dir() or root.is_symlink():
+        root.unlink(missing_ok=True)
+        return
+    upper: list[str] = []
+    frontier = [str(root)]
+    for _ in range(3):
+        if len(frontier) >= workers:
+            break
+        upper += frontier
+        subdirs: list[str] = []
+        for path in frontier:
+            _make_writable(path)
+            for entry in _scan(path):
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    _unlink(entry, path)
+        frontier = subdirs
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_remove, frontier))
+    for path in reversed(upper):
+        os.rmdir(path)
+
+
+def _try_lock(path: Path) -> int | None:
+    """Take a non-blocking exclusive lock on *path*; returns the fd or ``None``."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _trash_entries(trash_dirs: list[Path]) -> list[Path]:
+    """Return every entry of *trash_dirs*."""
+    entries: list[Path] = []
+    for d in trash_dirs:
+        try:
+            entries += sorted(d.iterdir())
+        except OSError:
+            continue
+    return entries
+
+
+def _all_trash_dirs() -> list[Path]:
+    """Return the trash directories of all projects."""
+    return [trash_dir(p) for p in list_projects()]
+
+
+def reap_trash(trash_dirs: list[Path] | None = None, *, workers: int = REAPER_WORKERS) -> int:
+    """Remove every trash entry; returns the number of entries removed.
+
+    *trash_dirs* defaults to those of all projects.  Returns ``0`` at once
+    if another reaper holds the reaper lock.  An entry that cannot be
+    removed is logged and left for the next reaper.
+    """
+    dirs = trash_dirs if trash_dirs is not None else _all_trash_dirs()
+    attempted: set[Path] = set()
+    removed = 0
+
+    def _unattempted() -> list[Path]:
+        """Return trash entries this reaper has not tried yet."""
+        return [e for e in _trash_entries(dirs) if e not in attempted]
+
+    while True:
+        ensure_dir(_reaper_dir())
+        fd = _try_lock(_reaper_dir() / _REAPER_LOCK_FILENAME)
+        if fd is None:
+            return removed
+        try:
+            while pending := _unattempted():
+                for entry in pending:
+                    attempted.add(entry)
+                    try:
+                        remove_tree(entry, workers=workers)
+                        removed += 1
+                    except OSError as exc:
+                        _log_debug(f"trash: failed to remove {entry}: {exc}")
+        finally:
+            os.close(fd)
+        # An entry trashed after the last scan found the lock still held; pick it up.
+        if not _unattempted():
+            return removed
+
+
+def start_trash_reaper() -> bool:
+    """Spawn a detached trash reaper; returns ``True`` if spawned.
+
+    The reaper exits at once when another one is already running.
+    """
+    ensure_dir(_reaper_dir())
+    try:
+        with (_reaper_dir() / "reaper.log").open("ab") as log:
+            subprocess.Popen(  # nosec B603
+                [sys.executable, "-m", "terok.lib.orchestration.trash"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    except OSError as exc:
+        _log_debug(f"trash: failed to spawn reaper: {exc}")
+        return False
+    return True
+
+
+def resume_trash_reaper() -> bool:
+    """Reclaim trash left behind by a crash or an interrupted reaper.
+
+    Spawns a reaper if any project has trash; returns ``True`` if spawned.
+    """
+    if not _trash_entries(_all_trash_dirs()):
+        return False
+    return start_trash_reaper()
+
+
+def main() -> None:
+    """Entry point of the reaper process."""
+    reap_trash()
+
+
+if __name__ == "__main__":
+    main()
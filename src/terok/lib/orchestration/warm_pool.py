@@ -0,0 +1,334 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pool of pre-created headless task containers (``run.warm_pool``).
+
+A cold headless start pays for task creation, token minting, ``podman run``
+and the in-container clone/fetch of ``init-ssh-and-repo.sh`` before the agent
+sees its prompt.  With ``run.warm_pool: N`` in ``project.yml``, up to *N* task
+containers per project are started ahead of time: they run the init script
+and then wait for ``warm-start.sh`` to appear in the mounted agent-config
+directory.  :func:`~terok.lib.orchestration.task_runners.task_run_headless`
+claims one, rewrites the agent config with the prompt, and drops in the
+start script, so the agent starts within a fraction of a second.
+
+A warm task is an ordinary task whose metadata carries a ``warm`` mapping
+(image ID and restriction mode of its container); task listings hide it
+until it is claimed.  Claims and refills serialise on a per-project
+``flock``; a refill first reserves its slots under the lock and only then
+starts containers, so concurrent refills never overfill the pool.  Warm
+containers built from an outdated L2 image, or whose container died, are
+evicted on the next claim or refill.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..core.config import state_root
+from ..core.projects import ProjectConfig, load_project
+from ..util.fs import ensure_dir
+from ..util.host_cmd import WORKSPACE_DANGEROUS_DIRNAME
+from ..util.logging_utils import _log_debug
+from ..util.yaml import dump as _yaml_dump, load as _yaml_load
+from .tasks import container_name, task_delete, task_new, tasks_meta_dir
+
+WARM_START_SCRIPT = "warm-start.sh"
+"""Start script whose appearance releases a waiting warm container."""
+
+WARM_READY_MARKER = "warm-ready"
+"""File the warm container creates once its init script has finished."""
+
+CREATE_GRACE_SECONDS = 600.0
+"""How long a reserved slot may wait for its container before it is evicted."""
+
+_AGENT_DIR = "/home/dev/.terok"
+
+
+@dataclass(frozen=True)
+class WarmTask:
+    """One task held in a project's warm pool."""
+
+    task_id: str
+    cname: str
+    image_id: str
+    unrestricted: bool
+    created_at: float
+    started: bool
+    """Whether the container has been launched (``False`` while reserved)."""
+    ready: bool
+    """Whether the container's init script has completed."""
+
+
+def warm_command() -> list[str]:
+    """Return the container command of a warm task.
+
+    Runs the init script, marks readiness, then waits for the start script
+    written at claim time and hands the container over to it.
+    """
+    start = f"{_AGENT_DIR}/{WARM_START_SCRIPT}"
+    return [
+        "bash",
+        "-lc",
+        f"init-ssh-and-repo.sh && touch {_AGENT_DIR}/{WARM_READY_MARKER}; "
+        f"while [ ! -f {start} ]; do sleep 0.2; done; exec bash -l {start}",
+    ]
+
+
+def _pool_dir() -> Path:
+    """Return the directory holding warm-pool locks and refill logs."""
+    return state_root() / "pool"
+
+
+@contextmanager
+def _pool_lock(project_id: str) -> Iterator[None]:
+    """Hold the project's exclusive warm-pool lock for the duration of the block."""
+    ensure_dir(_pool_dir())
+    with (_pool_dir() / f"{project_id}.lock").open("a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def current_image_id(image: str) -> str | None:
+    """Return the ID of the local *image*, or ``None`` if it cannot be inspected."""
+    try:
+        result = subprocess.run(
+            ["podman", "image", "inspect", "--format", "{{.Id}}", image],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _container_states(project_id: str) -> dict[str, tuple[str, str]] | None:
+    """Map the project's ``run`` containers to ``(state, image ID)``; ``None`` on error."""
+    try:
+        result = subprocess.run(
+            [
+                "podman",
+                "ps",
+                "-a",
+                "--filter",
+                f"name=^{project_id}-run-",
+                "--format",
+                "{{.Names}}\t{{.State}}\t{{.ImageID}}",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log_debug(f"warm_pool: podman ps failed: {exc}")
+        return None
+    if result.returncode != 0:
+        return None
+    states: dict[str, tuple[str, str]] = {}
+    for row in result.stdout.splitlines():
+        name, _, rest = row.partition("\t")
+        state, _, image_id = rest.partition("\t")
+        states[name] = (state.strip().lower(), image_id.strip())
+    return states
+
+
+def list_warm_tasks(project: ProjectConfig) -> list[WarmTask]:
+    """Return the project's warm tasks, oldest first."""
+    meta_dir = tasks_meta_dir(project.id)
+    if not meta_dir.is_dir():
+        return []
+    pool: list[WarmTask] = []
+    for path in meta_dir.glob("*.yml"):
+        try:
+            meta = _yaml_load(path.read_text()) or {}
+        except Exception as exc:
+            _log_debug(f"warm_pool: skipping unreadable {path}: {exc}")
+            continue
+        warm = meta.get("warm")
+        if not isinstance(warm, dict):
+            continue
+        tid = str(meta.get("task_id", path.stem))
+        agent_dir = project.tasks_root / tid / "agent-config"
+        pool.append(
+            WarmTask(
+                task_id=tid,
+                cname=container_name(project.id, "run", tid),
+                image_id=str(warm.get("image_id") or ""),
+                unrestricted=bool(warm.get("unrestricted")),
+                created_at=float(warm.get("created_at") or 0.0),
+                started=bool(warm.get("started")),
+                ready=(agent_dir / WARM_READY_MARKER).is_file(),
+            )
+        )
+    pool.sort(key=lambda w: w.created_at)
+    return pool
+
+
+def is_warm_task(project_id: str, task_id: str) -> bool:
+    """Return whether the task is an unclaimed warm-pool task."""
+    meta_path = tasks_meta_dir(project_id) / f"{task_id}.yml"
+    try:
+        meta = _yaml_load(meta_path.read_text()) or {}
+    except Exception:
+        return False
+    return isinstance(meta.get("warm"), dict)
+
+
+def _update_warm_meta(project: ProjectConfig, task_id: str, changes: dict | None) -> None:
+    """Merge *changes* into the task's ``warm`` mapping, or drop it when ``None``."""
+    meta_path = tasks_meta_dir(project.id) / f"{task_id}.yml"
+    meta = _yaml_load(meta_path.read_text()) or {}
+    if changes is None:
+        meta.pop("warm", None)
+    else:
+        meta["warm"] = {**(meta.get("warm") or {}), **changes}
+    meta_path.write_text(_yaml_dump(meta))
+
+
+def evict_warm_task(project: ProjectConfig, task_id: str) -> None:
+    """Remove a warm task together with its container and workspace."""
+    _log_debug(f"warm_pool: evicting {project.id}/{task_id}")
+    try:
+        task_delete(project.id, task_id)
+    except (SystemExit, Exception) as exc:
+        _log_debug(f"warm_pool: evicting {project.id}/{task_id} failed: {exc}")
+
+
+def _prune(project: ProjectConfig, image_id: str | None) -> list[WarmTask] | None:
+    """Evict dead, stale and abandoned warm tasks; return the healthy ones.
+
+    Must be called with the pool lock held.  Returns ``None`` (and evicts
+    nothing) when podman cannot be queried.
+    """
+    pool = list_warm_tasks(project)
+    if not pool:
+        return []
+    states = _container_states(project.id)
+    if states is None:
+        return None
+    healthy: list[WarmTask] = []
+    now = time.time()
+    for warm in pool:
+        state, container_image = states.get(warm.cname, ("", ""))
+        if not warm.started:
+            if now - warm.created_at < CREATE_GRACE_SECONDS:
+                healthy.append(warm)
+                continue
+        elif state == "running" and (image_id is None or container_image == image_id):
+            healthy.append(warm)
+            continue
+        evict_warm_task(project, warm.task_id)
+    return healthy
+
+
+def reserve_warm_task(project: ProjectConfig, *, image_id: str, unrestricted: bool) -> str | None:
+    """Create a warm task if the pool has room; returns its ID or ``None`` when full."""
+    with _pool_lock(project.id):
+        healthy = _prune(project, image_id)
+        if healthy is None or len(healthy) >= project.warm_pool_size:
+            return None
+        task_id = task_new(project.id)
+        _update_warm_meta(
+            project,
+            task_id,
+            {
+                "image_id": image_id,
+                "unrestricted": unrestricted,
+                "created_at": time.time(),
+                "started": False,
+            },
+        )
+        return task_id
+
+
+def mark_warm_started(project: ProjectConfig, task_id: str) -> None:
+    """Record that a reserved warm task's container is up and claimable."""
+    with _pool_lock(project.id):
+        _update_warm_meta(project, task_id, {"started": True})
+
+
+def claim_warm_task(project: ProjectConfig, *, image_id: str, unrestricted: bool) -> str | None:
+    """Take a warm task out of the pool; returns its ID or ``None`` if none fits.
+
+    Only running containers built from *image_id* with the same
+    restriction mode qualify; ready ones are preferred over those still
+    initialising.  The claimed task's workspace gets a fresh
+    ``.new-task-marker``; the start script written by
+    :func:`release_warm_task` re-runs the init script, which then resets the
+    workspace to the latest upstream HEAD, exactly as a cold start would.
+    """
+    with _pool_lock(project.id):
+        healthy = _prune(project, image_id) or []
+        candidates = [w for w in healthy if w.started and w.unrestricted == unrestricted]
+        if not candidates:
+            return None
+        warm = min(candidates, key=lambda w: (not w.ready, w.created_at))
+        _update_warm_meta(project, warm.task_id, None)
+    workspace = project.tasks_root / warm.task_id / WORKSPACE_DANGEROUS_DIRNAME
+    (workspace / ".new-task-marker").write_text(
+        "# Recreated when a warm-pool task is claimed: reset to the latest remote HEAD.\n",
+        encoding="utf-8",
+    )
+    return warm.task_id
+
+
+def release_warm_task(agent_config_dir: Path, command: str) -> None:
+    """Hand a claimed warm container *command* by writing its start script.
+
+    The init script ran when the container was warmed, possibly long ago, so
+    the start script runs it again first: it sees the marker recreated by
+    :func:`claim_warm_task` and resets the workspace to the current upstream
+    HEAD (an incremental fetch, not a clone).
+    """
+    script = agent_config_dir / WARM_START_SCRIPT
+    tmp = script.with_suffix(".tmp")
+    if "init-ssh-and-repo.sh" not in command:
+        command = f"init-ssh-and-repo.sh || exit $?\n{command}"
+    tmp.write_text(f"{command}\n", encoding="utf-8")
+    tmp.replace(script)
+
+
+def get_warm_pool(project_id: str) -> list[WarmTask]:
+    """Return the warm tasks of *project_id*, oldest first."""
+    return list_warm_tasks(load_project(project_id))
+
+
+def drain_warm_pool(project_id: str) -> int:
+    """Evict every warm task of *project_id*; returns the number evicted."""
+    project = load_project(project_id)
+    with _pool_lock(project.id):
+        pool = list_warm_tasks(project)
+        for warm in pool:
+            evict_warm_task(project, warm.task_id)
+    return len(pool)
+
+
+def start_pool_refill(project_id: str) -> bool:
+    """Spawn a detached ``terokctl task pool fill``; returns ``True`` if spawned."""
+    ensure_dir(_pool_dir())
+    try:
+        with (_pool_dir() / f"{project_id}-refill.log").open("ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "terok.cli", "task", "pool", "fill", project_id],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    except OSError as exc:
+        _log_debug(f"warm_pool: failed to spawn refill for {project_id}: {exc}")
+        return False
+    return True
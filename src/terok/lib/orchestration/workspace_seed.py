@@ -0,0 +1,265 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Host-side seeding of new task workspaces from the project's git gate.
+
+Without seeding, every new task's ``init-ssh-and-repo.sh`` clones the whole
+repository over the network (or over the gate server's HTTP endpoint).
+With ``tasks.workspace_seed`` set, :func:`seed_workspace` prepares the
+repository on the host while the task is created, from the bare mirror at
+``gate.path``:
+
+- ``full`` — a complete local copy (``git clone --no-hardlinks``); same
+  result as a network clone, minus the network
+- ``shallow`` — only the tip of the default branch
+  (``git clone --depth 1``); far less disk per task, run
+  ``git fetch --unshallow`` inside the task if history is needed
+- ``template`` — a copy of a pristine, checked-out per-project template
+  workspace (``<tasks_root>/.workspace-template``).  On btrfs, XFS and
+  other reflink-capable filesystems every file is cloned with ``FICLONE``,
+  so a new workspace takes well under a second and shares its data with
+  the template until written; elsewhere the files are copied.  The
+  template is brought up to date with the gate whenever the gate's
+  default branch has moved since the last refresh (after a gate sync or
+  a push through the gate), and readers and the refresh serialise on a
+  ``flock``.
+
+Clones are made with ``--no-checkout``.  The task's ``.new-task-marker``
+stays in place, so the init script still points ``origin`` at the right
+remote for the security mode, fetches, and resets the workspace to the
+latest upstream HEAD.  Only the bulk of the objects is already there.
+
+Objects are copied, never hard-linked, and no ``alternates`` file is
+written.  The workspace is writable from inside the container, and it
+must not share inodes with the gate or depend on a host path the
+container cannot see.
+"""
+
+from __future__ import annotations
+
+import errno
+import fcntl
+import os
+import shutil
+import subprocess
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from ..core.projects import ProjectConfig
+from ..util.fs import disk_usage, reflink_file
+from ..util.logging_utils import _log_debug
+
+WORKSPACE_SEED_MODES = ("off", "full", "shallow", "template")
+"""Accepted values of ``tasks.workspace_seed``."""
+
+_SEED_TIMEOUT = 1800
+_TEMPLATE_DIRNAME = ".workspace-template"
+_TEMPLATE_STAMP = "terok-template-rev"
+
+# Errors meaning "this filesystem cannot reflink", as opposed to real I/O errors
+_NO_REFLINK_ERRNOS = frozenset({errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY})
+
+
+@dataclass(frozen=True)
+class SeedResult:
+    """Outcome of seeding one task workspace."""
+
+    mode: str
+    seconds: float
+    """Wall-clock time of the host-side clone."""
+    bytes: int
+    """Disk used by the seeded ``.git`` directory."""
+    saved_bytes: int
+    """Disk saved compared with a full copy of the gate (or of the template)."""
+
+    def as_meta(self) -> dict:
+        """Return the result as a task-metadata mapping."""
+        return asdict(self)
+
+
+def _is_bare_repo(path: Path) -> bool:
+    """Return whether *path* looks like a bare git repository."""
+    return (path / "objects").is_dir() and (path / "HEAD").is_file()
+
+
+def _git(*args: str) -> str:
+    """Run a non-interactive git command and return its stdout.
+
+    Raises ``CalledProcessError`` on failure.
+    """
+    return subprocess.run(
+        ["git", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=_SEED_TIMEOUT,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    ).stdout.strip()
+
+
+# ── Template workspaces ──
+
+
+def template_path(project: ProjectConfig) -> Path:
+    """Return the project's pristine template workspace."""
+    return project.tasks_root / _TEMPLATE_DIRNAME
+
+
+@contextmanager
+def _template_lock(project: ProjectConfig, *, exclusive: bool) -> Iterator[None]:
+    """Hold the template lock: shared while copying, exclusive while refreshing."""
+    project.tasks_root.mkdir(parents=True, exist_ok=True)
+    with (project.tasks_root / f"{_TEMPLATE_DIRNAME}.lock").open("a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _gate_rev(project: ProjectConfig) -> str:
+    """Return the commit the gate's default branch (or ``HEAD``) points to."""
+    ref = project.default_branch or "HEAD"
+    return _git("-C", str(project.gate_path), "rev-parse", "--verify", f"{ref}^{{commit}}")
+
+
+def refresh_workspace_template(project: ProjectConfig) -> bool:
+    """Bring the template workspace in line with the gate; returns ``True`` if it changed.
+
+    Creates the template on first use.  A no-op while the gate's default
+    branch has not moved since the last refresh.  Raises ``SystemExit`` if
+    git fails.
+    """
+    try:
+        return _refresh_template(project)
+    except subprocess.CalledProcessError as exc:
+        detail = (exc.stderr or "").strip() or f"exit code {exc.returncode}"
+        raise SystemExit(f"Refreshing the workspace template of {project.id} failed: {detail}")
+
+
+def _refresh_template(project: ProjectConfig) -> bool:
+    """Refresh the template under its exclusive lock (see :func:`refresh_workspace_template`)."""
+    template = template_path(project)
+    with _template_lock(project, exclusive=True):
+        rev = _gate_rev(project)
+        stamp = template / ".git" / _TEMPLATE_STAMP
+        if stamp.is_file() and stamp.read_text().strip() == rev:
+            return False
+        if not (template / ".git").is_dir():
+            shutil.rmtree(template, ignore_errors=True)
+            _git("clone", "--quiet", "--no-hardlinks", str(project.gate_path), str(template))
+        else:
+            _git("-C", str(template), "fetch", "--quiet", "--prune", "origin")
+        target = f"origin/{project.default_branch}" if project.default_branch else "origin/HEAD"
+        if project.default_branch:
+            _git("-C", str(template), "checkout", "--quiet", "-B", project.default_branch, target)
+        else:
+            _git("-C", str(template), "checkout", "--quiet", "--detach", target)
+        _git("-C", str(template), "reset", "--quiet", "--hard", target)
+        _git("-C", str(template), "clean", "-qffdx")
+        stamp.write_text(f"{rev}\n")
+    return True
+
+
+class _TreeCloner:
+    """``copytree`` copy function that reflinks files while the filesystem allows."""
+
+    def __init__(self) -> None:
+        """Start out trying reflinks."""
+        self.reflink = True
+        self.shared_bytes = 0
+
+    def __call__(self, src: str, dst: str) -> str:
+        """Clone or copy one file, keeping its mode."""
+        if self.reflink:
+            try:
+                reflink_file(Path(src), Path(dst))
+            except OSError as exc:
+                if exc.errno not in _NO_REFLINK_ERRNOS:
+                    raise
+                self.reflink = False
+            else:
+                shutil.copymode(src, dst)
+                self.shared_bytes += os.stat(dst).st_size
+                return dst
+        return shutil.copy2(src, dst)
+
+
+def _seed_from_template(project: ProjectConfig, staging: Path) -> int:
+    """Copy the (refreshed) template into *staging*; returns the reflinked bytes."""
+    refresh_workspace_template(project)
+    cloner = _TreeCloner()
+    with _template_lock(project, exclusive=False):
+        shutil.copytree(template_path(project), staging, symlinks=True, copy_function=cloner)
+    (staging / ".git" / _TEMPLATE_STAMP).unlink(missing_ok=True)
+    return cloner.shared_bytes
+
+
+def seed_workspace(project: ProjectConfig, workspace_dir: Path) -> SeedResult | None:
+    """Seed *workspace_dir* from the project's gate (or its template workspace).
+
+    Returns ``None`` (leaving the workspace to the in-container clone) when
+    seeding is off, the gate has not been synced yet, the workspace is
+    already a repository, or seeding fails.
+    """
+    mode = project.workspace_seed
+    gate = project.gate_path
+    if mode == "off" or not _is_bare_repo(gate) or (workspace_dir / ".git").exists():
+        return None
+    staging = workspace_dir.with_name(f".{workspace_dir.name}.seed")
+    shutil.rmtree(staging, ignore_errors=True)
+    started = time.monotonic()
+    shared = 0
+    try:
+        if mode == "template":
+            shared = _seed_from_template(project, staging)
+        else:
+            cmd = ["clone", "--quiet", "--no-checkout"]
+            if mode == "shallow":
+                cmd += ["--depth", "1"]
+                if project.default_branch:
+                    cmd += ["--branch", project.default_branch]
+                source = gate.as_uri()  # --depth is ignored for plain local paths
+            else:
+                cmd.append("--no-hardlinks")
+                source = str(gate)
+            _git(*cmd, source, str(staging))
+        if project.security_class != "gatekeeping" and project.upstream_url:
+            _git("-C", str(staging), "remote", "set-url", "origin", project.upstream_url)
+        _install(staging, workspace_dir)
+    except (OSError, subprocess.SubprocessError, SystemExit) as exc:
+        _log_debug(f"workspace_seed: seeding {workspace_dir} ({mode}) failed: {exc}")
+        return None
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    seconds = round(time.monotonic() - started, 2)
+    if mode == "template":
+        # Reflinked extents stay shared with the template until written
+        used = max(0, disk_usage(workspace_dir) - shared)
+        saved = shared
+    else:
+        used = disk_usage(workspace_dir / ".git")
+        saved = max(0, disk_usage(gate) - used)
+    return SeedResult(mode=mode, seconds=seconds, bytes=used, saved_bytes=saved)
+
+
+def _install(staging: Path, workspace_dir: Path) -> None:
+    """Move the seeded repository from *staging* into *workspace_dir*.
+
+    A clone only carries ``.git``; a template copy brings the checked-out
+    tree as well, which then replaces the still-empty workspace directory
+    (keeping its ``.new-task-marker`` and permissions).
+    """
+    entries = {p.name for p in staging.iterdir()}
+    if entries == {".git"}:
+        os.replace(staging / ".git", workspace_dir / ".git")
+        return
+    for leftover in workspace_dir.iterdir():
+        shutil.move(str(leftover), staging / leftover.name)
+    mode = workspace_dir.stat().st_mode & 0o7777
+    workspace_dir.rmdir()
+    os.replace(staging, workspace_dir)
+    workspace_dir.chmod(mode)
@@ -1,9 +1,12 @@
 # SPDX-FileCopyrightText: 2025 Jiri Vyskocil
 # SPDX-License-Identifier: Apache-2.0
 
-"""Filesystem helpers for directory creation and writability checks."""
+"""Filesystem helpers for directory creation, writability checks and disk usage."""
 
 import os
+import stat
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -31,9 +34,24 @@ def ensure_dir_writable(path: Path, label: str) -> None:
         )
 
 
-def archive_timestamp() -> str:
-    """Generate a UTC timestamp string suitable for archive filenames."""
-    return datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%S%fZ")
+def archive_timestamp(when: datetime | None = None) -> str:
+    """Generate a UTC timestamp string suitable for archive filenames.
+
+    Formats *when* (default: now); archive names sort by this timestamp.
+    """
+    return (when or datetime.now(tz=UTC)).astimezone(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def parse_archive_timestamp(text: str) -> datetime | None:
+    """Parse the timestamp that starts an archive name; ``None`` if there is none.
+
+    Accepts both :func:`archive_timestamp` output and the older form
+    without microseconds (``20260301T100000Z``).
+    """
+    try:
+        return datetime.strptime(text[:15], "%Y%m%dT%H%M%S").replace(tzinfo=UTC)
+    except ValueError:
+        return None
 
 
 def unique_archive_path(root: Path, base_name: str, suffix: str = "") -> Path:
@@ -92,3 +110,81 @@ def create_archive_file(root: Path, base_name: str, suffix: str = ".tar.gz") ->
             return candidate
         except FileExistsError:
             continue
+
+
+def disk_usage(path: Path) -> int:
+    """Return the bytes allocated on disk for *path* and everything below it.
+
+    Counts allocated blocks (like ``du``), so hard-linked files are counted
+    once and sparse files by their real footprint.  Symlinks are not
+    followed; unreadable entries are skipped.  Walks with ``os.scandir``.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    total = st.st_blocks * 512
+    if not stat.S_ISDIR(st.st_mode):
+        return total
+    seen: set[tuple[int, int]] = set()
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if st.st_nlink > 1 and not stat.S_ISDIR(st.st_mode):
+                key = (st.st_dev, st.st_ino)
+                if key in seen:
+                    continue
+                seen.add(key)
+            total += st.st_blocks * 512
+            if stat.S_ISDIR(st.st_mode):
+                stack.append(entry.path)
+    return total
+
+
+def disk_usages(paths: Sequence[Path], *, workers: int = 8) -> list[int]:
+    """Return :func:`disk_usage` of each of *paths*, walking them in parallel."""
+    if len(paths) <= 1:
+        return [disk_usage(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(disk_usage, paths))
+
+
+def format_size(num_bytes: float) -> str:
+    """Format a byte count as a short human-readable string (``1.5 GB``)."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(num_bytes) < 1024 or unit == "TB":
+            break
+        num_bytes /= 1024
+    if unit == "B":
+        return f"{int(num_bytes)} B"
+    return f"{num_bytes:.1f} {unit}"
+
+
+_FICLONE = 0x40049409  # _IOW(0x94, 9, int) from <linux/fs.h>
+
+
+def reflink_file(src: Path, dst: Path) -> None:
+    """Create *dst* as a copy-on-write clone of *src* (``FICLONE``).
+
+    Both files then share their data extents until one of them is written.
+    Raises :class:`OSError` when the filesystem cannot clone (anything but
+    btrfs, XFS with reflink, bcachefs, …); *dst* is removed in that case.
+    """
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink(missing_ok=True)
+            raise
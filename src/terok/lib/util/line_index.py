@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Sparse line-offset index for append-only log files.
+
+Records the byte offset of every ``stride``-th line of a log in a small
+sidecar file (``<log>.idx``) so callers can translate a byte offset into a
+line number — or a line number into a seek position — without rescanning
+the whole log.  The index is extended incrementally as the log grows and
+rebuilt from scratch when the log shrinks (truncation or rotation).
+
+Sidecar layout (little-endian)::
+
+    magic "TLIX" | version u32 | stride u32 | indexed_size u64 | line_count u64
+    offsets u64[]   # byte offset of line 0, stride, 2*stride, ...
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_STRIDE = 256
+"""Lines between two recorded offsets."""
+
+_COUNT_CHUNK = 1 << 20
+"""Slice size used when counting newlines in a memory map."""
+
+_MAGIC = b"TLIX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIQQ")
+
+
+@dataclass
+class LineIndex:
+    """In-memory view of a log's sparse line-offset index."""
+
+    stride: int = DEFAULT_STRIDE
+    """Lines between two recorded offsets."""
+
+    offsets: array = field(default_factory=lambda: array("Q", [0]))
+    """Byte offset of every ``stride``-th line (line 0 is always at offset 0)."""
+
+    indexed_size: int = 0
+    """Byte position just past the last newline that has been indexed."""
+
+    line_count: int = 0
+    """Number of complete (newline-terminated) lines covered by the index."""
+
+    def line_at(self, data: bytes | mmap.mmap, offset: int) -> int:
+        """Return the 0-based line number containing byte *offset* in *data*.
+
+        Jumps to the nearest preceding checkpoint and counts the remaining
+        newlines, so the cost is bounded by ``stride`` lines regardless of
+        where in the file *offset* lies.
+        """
+        slot = bisect_right(self.offsets, offset) - 1
+        start = self.offsets[max(slot, 0)]
+        return max(slot, 0) * self.stride + count_newlines(data, start, offset)
+
+    def seek_line(self, lineno: int) -> tuple[int, int]:
+        """Return ``(offset, skip)`` for reaching 0-based line *lineno*.
+
+        *offset* is the closest indexed position at or before the line and
+        *skip* is how many newlines must still be consumed from there.
+        """
+        slot = min(max(lineno, 0) // self.stride, len(self.offsets) - 1)
+        return self.offsets[slot], max(lineno, 0) - slot * self.stride
+
+
+def count_newlines(data: bytes | mmap.mmap, start: int, end: int) -> int:
+    """Count ``\\n`` bytes in ``data[start:end]`` (``mmap`` has no ``count``)."""
+    if isinstance(data, bytes):
+        return data.count(b"\n", start, end)
+    total = 0
+    for pos in range(start, end, _COUNT_CHUNK):
+        total += data[pos : min(pos + _COUNT_CHUNK, end)].count(b"\n")
+    return total
+
+
+def index_path(log_path: Path) -> Path:
+    """Return the sidecar path holding the index for *log_path*."""
+    return log_path.with_name(log_path.name + ".idx")
+
+
+def load_line_index(log_path: Path) -> LineIndex | None:
+    """Load the sidecar index for *log_path*, or ``None`` if absent or unreadable."""
+    try:
+        raw = index_path(log_path).read_bytes()
+    except OSError:
+        return None
+    if len(raw) < _HEADER.size:
+        return None
+    magic, version, stride, indexed_size, line_count = _HEADER.unpack_from(raw)
+    if magic != _MAGIC or version != _VERSION or stride <= 0:
+        return None
+    body = raw[_HEADER.size :]
+    if len(body) % 8:
+        return None
+    offsets = array("Q")
+    offsets.frombytes(body)
+    if not offsets or offsets[0] != 0:
+        return None
+    return LineIndex(
+        stride=stride, offsets=offsets, indexed_size=indexed_size, line_count=line_count
+    )
+
+
+def _save_line_index(log_path: Path, index: LineIndex) -> None:
+    """Atomically write *index* next to *log_path* (best-effort)."""
+    target = index_path(log_path)
+    tmp = target.with_name(target.name + ".tmp")
+    header = _HEADER.pack(_MAGIC, _VERSION, index.stride, index.indexed_size, index.line_count)
+    try:
+        tmp.write_bytes(header + index.offsets.tobytes())
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def extend_line_index(index: LineIndex, data: bytes | mmap.mmap) -> bool:
+    """Index the newline-terminated lines in *data* past ``index.indexed_size``.
+
+    Returns ``True`` if the index changed.  A trailing partial line is left
+    unindexed until its newline arrives.
+    """
+    pos = index.indexed_size
+    end = len(data)
+    changed = False
+    while pos < end:
+        nl = data.find(b"\n", pos)
+        if nl < 0:
+            break
+        pos = nl + 1
+        index.line_count += 1
+        if index.line_count % index.stride == 0:
+            index.offsets.append(pos)
+        changed = True
+    index.indexed_size = pos
+    return changed
+
+
+def update_line_index(log_path: Path, *, stride: int = DEFAULT_STRIDE) -> LineIndex | None:
+    """Bring the sidecar index of *log_path* up to date and return it.
+
+    Reuses the existing index when the log has only grown, rebuilds it when
+    the log is shorter than what was indexed, and persists the result
+    best-effort (read-only locations still get a usable in-memory index).
+    Returns ``None`` if the log cannot be read.
+    """
+    try:
+        size = log_path.stat().st_size
+    except OSError:
+        return None
+
+    index = load_line_index(log_path)
+    if index is None or index.indexed_size > size or index.stride != stride:
+        index = LineIndex(stride=stride)
+    if index.indexed_size == size:
+        return index
+
+    try:
+        with log_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            changed = extend_line_index(index, mm)
+    except (OSError, ValueError):
+        return None
+    if changed:
+        _save_line_index(log_path, index)
+    return index
@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Size-bounded, rotating task log storage with gzip-compressed segments.
+
+A task log is addressed by its *logical* path (``logs/container.log``).
+On disk it consists of zero or more sealed, gzip-compressed segments
+followed by an optional uncompressed live file::
+
+    container.log.000001.gz   # oldest
+    container.log.000002.gz
+    container.log             # live, appended to by the log tee
+
+When the live file reaches the segment size it is renamed aside, compressed
+into the next segment, and replaced by a fresh live file; when the whole log exceeds its cap the oldest
+segments are dropped.  Archived logs are fully sealed (no live file).
+Readers go through :func:`iter_log_lines`, which stream-decompresses the
+segments in order, so callers never need to know how a log is stored.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import re
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+
+from .line_index import index_path
+
+DEFAULT_COMPRESS_LEVEL = 6
+"""gzip level for sealed segments (speed/ratio sweet spot for text logs)."""
+
+_COPY_CHUNK = 1 << 20
+
+
+def segment_path(log_file: Path, seq: int) -> Path:
+    """Return the path of compressed segment number *seq* of *log_file*."""
+    return log_file.with_name(f"{log_file.name}.{seq:06d}.gz")
+
+
+def log_segments(log_file: Path) -> list[Path]:
+    """Return the compressed segments of *log_file*, oldest first."""
+    pattern = re.compile(rf"^{re.escape(log_file.name)}\.(\d{{6}})\.gz$")
+    try:
+        entries = list(os.scandir(log_file.parent))
+    except OSError:
+        return []
+    found = [(int(m.group(1)), Path(e.path)) for e in entries if (m := pattern.match(e.name))]
+    return [p for _, p in sorted(found)]
+
+
+def has_log(log_file: Path) -> bool:
+    """Return whether *log_file* has any content on disk (live or sealed)."""
+    return log_file.is_file() or bool(log_segments(log_file))
+
+
+def log_disk_usage(log_file: Path) -> int:
+    """Return the bytes *log_file* occupies on disk, segments included."""
+    total = 0
+    for path in (*log_segments(log_file), log_file):
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def _compress_segment(src: Path, log_file: Path, level: int) -> Path:
+    """Compress *src* into the next segment of *log_file* and return it."""
+    segments = log_segments(log_file)
+    seq = int(segments[-1].name.rsplit(".", 2)[-2]) + 1 if segments else 1
+    target = segment_path(log_file, seq)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        with src.open("rb") as fh, gzip.open(tmp, "wb", compresslevel=level) as dst:
+            shutil.copyfileobj(fh, dst, _COPY_CHUNK)
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+    return target
+
+
+def rotate_log(log_file: Path, *, level: int = DEFAULT_COMPRESS_LEVEL) -> Path | None:
+    """Compress the live *log_file* into the next segment and start a new one.
+
+    The live file is renamed aside before compression rather than truncated
+    in place, so readers that still have it open or memory-mapped (e.g. a
+    running ``--grep`` search) keep a valid view of the old content.
+
+    Must only be called by the log's single writer (or while no writer
+    runs).  Returns the new segment, or ``None`` if the live file is empty
+    or missing.
+    """
+    pending = log_file.with_name(log_file.name + ".rotating")
+    if pending.is_file():
+        # Left behind by an interrupted rotation; it predates the live file.
+        _compress_segment(pending, log_file, level)
+        pending.unlink()
+    try:
+        if log_file.stat().st_size == 0:
+            return None
+    except OSError:
+        return None
+    os.replace(log_file, pending)
+    log_file.touch()
+    # Offsets in the line index no longer describe the new live file.
+    index_path(log_file).unlink(missing_ok=True)
+    try:
+        target = _compress_segment(pending, log_file, level)
+    except OSError:
+        # Put the content back; the new live file is still empty.
+        os.replace(pending, log_file)
+        raise
+    pending.unlink()
+    return target
+
+
+def prune_log(log_file: Path, max_bytes: int) -> list[Path]:
+    """Delete the oldest segments until *log_file* fits in *max_bytes*.
+
+    The live file is never touched.  Returns the removed segments.
+    """
+    removed: list[Path] = []
+    if max_bytes <= 0:
+        return removed
+    usage = log_disk_usage(log_file)
+    for seg in log_segments(log_file):
+        if usage <= max_bytes:
+            break
+        try:
+            size = seg.stat().st_size
+            seg.unlink()
+        except OSError:
+            continue
+        usage -= size
+        removed.append(seg)
+    return removed
+
+
+def seal_log(log_file: Path, *, level: int = DEFAULT_COMPRESS_LEVEL) -> None:
+    """Compress whatever remains in the live file and remove it.
+
+    Used when a log becomes read-only (archiving); afterwards the log
+    consists of compressed segments only.
+    """
+    rotate_log(log_file, level=level)
+    log_file.unlink(missing_ok=True)
+    index_path(log_file).unlink(missing_ok=True)
+
+
+def iter_log_lines(log_file: Path) -> Iterator[bytes]:
+    """Yield every line of *log_file* across segments, oldest first.
+
+    Compressed segments are decompressed as a stream, so memory use stays
+    bounded regardless of log size.  A segment that cannot be read (e.g.
+    truncated by a crash mid-rotation) ends its contribution early instead
+    of aborting the whole read.
+    """
+    for seg in log_segments(log_file):
+        try:
+            with gzip.open(seg, "rb") as f:
+                yield from f
+        except (OSError, EOFError):
+            continue
+    try:
+        with log_file.open("rb") as f:
+            yield from f
+    except FileNotFoundError:
+        return
+
+
+def iter_log_text(log_file: Path) -> Iterator[str]:
+    """Yield decoded lines of *log_file* (newline stripped, invalid UTF-8 replaced)."""
+    for raw in iter_log_lines(log_file):
+        yield raw.decode("utf-8", errors="replace").rstrip("\n")
@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Phase timing spans for task launches (``--timings`` and trace files).
+
+Runners wrap their phases in :func:`span` and record milestones with
+:func:`mark` or :func:`mark_first_call`; all of them are no-ops unless a
+:func:`launch_timings` block is active in the current context.  When it is,
+the block prints a per-phase summary on exit (``show=True``) and, if
+``TEROK_TRACE_DIR`` is set, writes the spans as Chrome trace-event JSON (loadable in ``chrome://tracing`` or
+Perfetto) to ``<dir>/<UTC timestamp>-<label>-<pid>.trace.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+TRACE_DIR_ENV = "TEROK_TRACE_DIR"
+"""Environment variable naming the directory that receives launch traces."""
+
+
+@dataclass(frozen=True)
+class TimingEvent:
+    """One recorded span, or a point-in-time milestone when *duration* is ``None``."""
+
+    name: str
+    start: float
+    """Seconds since the recording started."""
+    duration: float | None
+    depth: int
+
+
+@dataclass
+class TimingRecorder:
+    """Spans collected by one :func:`launch_timings` block."""
+
+    label: str
+    origin: float = field(default_factory=time.perf_counter)
+    wall_origin: float = field(default_factory=time.time)
+    events: list[TimingEvent] = field(default_factory=list)
+    depth: int = 0
+
+    def elapsed(self) -> float:
+        """Return the seconds since the recording started."""
+        return time.perf_counter() - self.origin
+
+
+_current: ContextVar[TimingRecorder | None] = ContextVar("terok_launch_timings", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the duration of the enclosed block as phase *name*.
+
+    Spans nest; a span is recorded even when its block raises.
+    """
+    rec = _current.get()
+    if rec is None:
+        yield
+        return
+    start = rec.elapsed()
+    depth = rec.depth
+    rec.depth += 1
+    try:
+        yield
+    finally:
+        rec.depth = depth
+        rec.events.append(TimingEvent(name, start, rec.elapsed() - start, depth))
+
+
+def mark(name: str) -> None:
+    """Record milestone *name* (e.g. the first log line) at the current time."""
+    rec = _current.get()
+    if rec is not None:
+        rec.events.append(TimingEvent(name, rec.elapsed(), None, rec.depth))
+
+
+def mark_first_call(name: str, fn: Callable[[str], bool]) -> Callable[[str], bool]:
+    """Wrap the line predicate *fn* so its first call records milestone *name*.
+
+    The active recording is captured here, so the wrapper may be called from
+    a log-streaming thread.
+    """
+    rec = _current.get()
+    if rec is None:
+        return fn
+    pending = [True]
+
+    def _wrapped(line: str) -> bool:
+        """Record the milestone on the first line, then defer to *fn*."""
+        if pending:
+            pending.clear()
+            rec.events.append(TimingEvent(name, rec.elapsed(), None, rec.depth))
+        return fn(line)
+
+    return _wrapped
+
+
+def trace_events(rec: TimingRecorder) -> list[dict]:
+    """Return *rec*'s events in Chrome trace-event format (microsecond timestamps)."""
+    pid, tid = os.getpid(), threading.get_native_id()
+    base = rec.wall_origin * 1e6
+    events: list[dict] = []
+    for ev in sorted(rec.events, key=lambda e: (e.start, e.depth)):
+        entry: dict = {
+            "name": ev.name,
+            "cat": rec.label,
+            "ts": round(base + ev.start * 1e6),
+            "pid": pid,
+            "tid": tid,
+        }
+        if ev.duration is None:
+            entry.update(ph="i", s="t")
+        else:
+            entry.update(ph="X", dur=round(ev.duration * 1e6))
+        events.append(entry)
+    return events
+
+
+def format_timings(rec: TimingRecorder, total: float) -> str:
+    """Render *rec* as an indented phase table ending with the *total* time."""
+    rows = []
+    for ev in sorted(rec.events, key=lambda e: (e.start, e.depth)):
+        name = "  " * ev.depth + ev.name
+        if ev.duration is None:
+            rows.append((name, f"@ {ev.start * 1000:.0f} ms"))
+        else:
+            rows.append((name, f"{ev.duration * 1000:.0f} ms"))
+    rows.append(("total", f"{total * 1000:.0f} ms"))
+    width = max(len(name) for name, _ in rows)
+    lines = [f"── Launch timings ({rec.label}) ──"]
+    lines += [f"  {name:<{width}}  {value:>10}" for name, value in rows]
+    return "\n".join(lines)
+
+
+def _write_trace(rec: TimingRecorder, trace_dir: Path) -> Path:
+    """Write *rec* as a Chrome trace file into *trace_dir* and return its path."""
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(rec.wall_origin))
+    path = trace_dir / f"{stamp}-{rec.label}-{os.getpid()}.trace.json"
+    payload = {"traceEvents": trace_events(rec), "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    return path
+
+
+@contextmanager
+def launch_timings(
+    label: str, *, show: bool = False, out: TextIO | None = None
+) -> Iterator[TimingRecorder | None]:
+    """Collect launch spans for the enclosed block.
+
+    Recording is active only when *show* is true or ``TEROK_TRACE_DIR`` is
+    set; otherwise the block runs untouched and ``None`` is yielded.  The
+    summary (to *out*, default stdout) and the trace file are produced even
+    when the block raises, so failed launches can be diagnosed too.
+    """
+    trace_dir = os.environ.get(TRACE_DIR_ENV, "").strip()
+    if not show and not trace_dir:
+        yield None
+        return
+    rec = TimingRecorder(label)
+    token = _current.set(rec)
+    try:
+        yield rec
+    finally:
+        _current.reset(token)
+        total = rec.elapsed()
+        if show:
+            print(f"\n{format_timings(rec, total)}", file=out or sys.stdout)
+        if trace_dir:
+            try:
+                _write_trace(rec, Path(trace_dir).expanduser())
+            except OSError as exc:
+                print(f"Warning: could not write launch trace: {exc}", file=sys.stderr)
@@ -57,6 +57,7 @@ if _HAS_TEXTUAL:
     from textual.worker import Worker, WorkerState
 
     from ..lib.core.config import (
+        get_archive_retention,
         get_tui_default_tmux,
         set_experimental,
         state_root,
@@ -69,8 +70,13 @@ if _HAS_TEXTUAL:
         short_version as _short_version,
     )
     from ..lib.domain.facade import (
+        TaskUsage,
+        gc_archives,
         get_project_state,
         is_task_image_old,
+        resume_queue_drainer,
+        resume_trash_reaper,
+        scan_task_usage,
     )
     from ..lib.orchestration.tasks import get_tasks
 
@@ -261,6 +267,11 @@ if _HAS_TEXTUAL:
             # Gate server polling state
             self._gate_server_timer = None
             self._last_gate_server_running: bool | None = None
+            # Idle task sweep
+            self._idle_sweep_timer = None
+            # Live resource monitor (started once a running task is selected)
+            self._resource_timer = None
+            self._resource_monitor = None
             self._last_gate_server_status: GateServerStatus | None = None
             self._last_shield_env: EnvironmentCheck | None = None
             self._last_proxy_status: CredentialProxyStatus | None = None
@@ -349,6 +360,35 @@ if _HAS_TEXTUAL:
             )
             # Start periodic gate server polling
             self._start_gate_server_polling()
+            # Stop tasks idle past their project's run.idle_timeout
+            self._start_idle_sweep()
+            # Refresh the selected task's CPU/memory/I/O from one shared stats stream
+            self._start_resource_refresh()
+            # Resume queued headless tasks left pending by a reboot or a crash
+            self.run_worker(
+                resume_queue_drainer,
+                name="queue-resume",
+                group="task-queue",
+                thread=True,
+                exit_on_error=False,
+            )
+            # Reclaim task trash left behind by a crash or an interrupted reaper
+            self.run_worker(
+                resume_trash_reaper,
+                name="trash-resume",
+                group="trash",
+                thread=True,
+                exit_on_error=False,
+            )
+            # Enforce archive retention when configured to run on start
+            if get_archive_retention().gc_on_start:
+                self.run_worker(
+                    gc_archives,
+                    name="archive-gc",
+                    group="archive",
+                    thread=True,
+                    exit_on_error=False,
+                )
 
         def _log_layout_debug(self) -> None:
             """Write a one-shot snapshot of key widget sizes to the state dir.
@@ -525,6 +565,7 @@ if _HAS_TEXTUAL:
             details.set_task(self.current_task)
             if not self.current_task.deleting:
                 self._queue_task_image_status(self.current_project_id, self.current_task)
+                self._queue_task_usage(self.current_project_id, self.current_task)
 
         # ---------- Status / notifications ----------
 
@@ -620,6 +661,28 @@ if _HAS_TEXTUAL:
             image_old = is_task_image_old(project_id, task)
             return project_id, task.task_id, image_old
 
+        def _queue_task_usage(self, project_id: str | None, task: TaskMeta) -> None:
+            """Schedule a background measurement of the task's disk usage."""
+            if not project_id:
+                return
+            task_id = task.task_id
+            self.run_worker(
+                lambda: self._load_task_usage(project_id, task_id),
+                name=f"task-usage:{project_id}:{task_id}",
+                group="task-usage",
+                exclusive=True,
+                thread=True,
+                exit_on_error=False,
+            )
+
+        @staticmethod
+        def _load_task_usage(project_id: str, task_id: str) -> tuple[str, TaskUsage | None]:
+            """Measure a task's disk usage (runs in thread)."""
+            try:
+                return project_id, scan_task_usage(project_id, [task_id]).get(task_id)
+            except Exception:
+                return project_id, None
+
         def _query_shield_state(self, project_id: str, task: TaskMeta) -> None:
             """Schedule a background worker to query shield state for a task."""
             if not task.mode:
@@ -737,6 +800,20 @@ if _HAS_TEXTUAL:
                 details.set_task(self.current_task, image_old=image_old)
                 return
 
+            if worker.group == "task-usage":
+                result = worker.result
+                if not result:
+                    return
+                project_id, usage = result
+                if usage is None or project_id != self.current_project_id:
+                    return
+                if not self.current_task or self.current_task.task_id != usage.task_id:
+                    return
+                self.current_task.usage = usage
+                details = self.query_one("#task-details", TaskDetails)
+                details.set_task(self.current_task, image_old=self._last_image_old)
+                return
+
             if worker.group == "container-state":
                 result = worker.result
                 if not result:
@@ -780,6 +857,20 @@ if _HAS_TEXTUAL:
                     return
                 await self.refresh_tasks()
 
+            if worker.group == "idle-sweep":
+                for idle in worker.result or []:
+                    self.notify(
+                        f"Stopped idle task {idle.project_id} {idle.task_id}: {idle.reason}"
+                    )
+                if worker.result:
+                    await self.refresh_tasks()
+                return
+
+            if worker.group == "project-delete":
+                if worker.result:
+                    await self._on_project_deleted(worker.result)
+                return
+
             if worker.group == "cli-launch":
                 result = worker.result
                 if not result:
@@ -819,21 +910,6 @@ if _HAS_TEXTUAL:
                     await self.refresh_tasks()
                 return
 
-            if worker.group == "autopilot-wait":
-                result = worker.result
-                if not result:
-                    return
-                project_id, task_id, exit_code, error = result
-                if error:
-                    self.notify(f"Autopilot watcher error for task {task_id}: {error}")
-                elif exit_code == 0:
-                    self.notify(f"Autopilot task {task_id} completed successfully")
-                else:
-                    self.notify(f"Autopilot task {task_id} failed (exit {exit_code})")
-                if project_id == self.current_project_id:
-                    await self.refresh_tasks()
-                return
-
             if worker.group == "followup-launch":
                 result = worker.result
                 if not result:
@@ -930,6 +1006,7 @@ if _HAS_TEXTUAL:
             self._stop_upstream_polling()
             self._stop_container_status_polling()
             self._stop_gate_server_polling()
+            self._stop_resource_refresh()
             self.exit()
 
         async def action_show_project_actions(self) -> None:
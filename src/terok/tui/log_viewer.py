@@ -15,17 +15,19 @@ produces Rich ``Text`` objects instead of ANSI ``print()`` calls.
 from __future__ import annotations
 
 import json
+import re
 import select
 import subprocess
 import threading
 from dataclasses import dataclass
 from enum import Enum, auto
+from pathlib import Path
 
 from rich.style import Style
 from rich.text import Text
 from textual import screen
 from textual.app import ComposeResult
-from textual.widgets import RichLog, Static
+from textual.widgets import Input, RichLog, Static
 
 from .screens import _modal_binding
 
@@ -332,6 +334,8 @@ class TaskContainerRef:
     mode: str
     container_name: str
     provider: str | None = None
+    log_file: Path | None = None
+    """Persisted log to show instead when the container no longer exists."""
 
 
 class LogViewerScreen(screen.Screen[None]):
@@ -341,6 +345,9 @@ class LogViewerScreen(screen.Screen[None]):
         _modal_binding("escape", "dismiss_screen", "Back"),
         _modal_binding("q", "dismiss_screen", "Back"),
         _modal_binding("f", "dismiss_screen", "Back"),
+        _modal_binding("slash", "start_search", "Find"),
+        _modal_binding("n", "find_next", "Next match"),
+        _modal_binding("N", "find_previous", "Previous match"),
     ]
 
     CSS = """
@@ -360,6 +367,14 @@ class LogViewerScreen(screen.Screen[None]):
         height: 1fr;
     }
 
+    #log-search {
+        display: none;
+    }
+
+    #log-search.-visible {
+        display: block;
+    }
+
     #log-footer {
         height: 1;
         background: $primary;
@@ -368,6 +383,8 @@ class LogViewerScreen(screen.Screen[None]):
     }
     """
 
+    _FOOTER_KEYS = " \\[Esc/q/f] Back  \\[/] Find  \\[n/N] Next/Prev"
+
     def __init__(
         self,
         ref: TaskContainerRef,
@@ -385,19 +402,22 @@ class LogViewerScreen(screen.Screen[None]):
         self.task_id = ref.task_id
         self.mode = ref.mode
         self.container_name = ref.container_name
-        self.follow = follow
+        self.follow = follow and ref.log_file is None
         self.provider = ref.provider
+        self.log_file = ref.log_file
         self._stop_event = threading.Event()
         self._process: subprocess.Popen | None = None
+        self._footer_state = ""
+        self._search_pattern: re.Pattern[str] | None = None
+        self._search_row: int | None = None
 
     def compose(self) -> ComposeResult:
         """Build the header, RichLog body, and keybinding footer."""
-        yield Static(
-            f" Task {self.task_id} ({self.mode}) | {self.container_name}",
-            id="log-header",
-        )
+        source = self.container_name if self.log_file is None else f"{self.log_file} (persisted)"
+        yield Static(f" Task {self.task_id} ({self.mode}) | {source}", id="log-header")
         yield RichLog(auto_scroll=self.follow, id="log-view")
-        yield Static(" \\[Esc/q/f] Back", id="log-footer")
+        yield Input(placeholder="Find (regex)", id="log-search")
+        yield Static(self._FOOTER_KEYS, id="log-footer")
 
     def on_mount(self) -> None:
         """Start the background log-streaming worker when the screen is mounted."""
@@ -417,6 +437,12 @@ class LogViewerScreen(screen.Screen[None]):
         else:
             formatter = _PlainTextTuiFormatter()
 
+        if self.log_file is not None:
+            self._stream_persisted(formatter)
+            return
+        if not self.follow and self._stream_direct(formatter):
+            return
+
         cmd = ["podman", "logs"]
         if self.follow:
             cmd.append("-f")
@@ -503,6 +529,51 @@ class LogViewerScreen(screen.Screen[None]):
         self._post_text(Text(status_msg, style=_STYLE_SYSTEM))
         self._update_footer_static()
 
+    def _stream_persisted(self, formatter: _TuiLogFormatter | _PlainTextTuiFormatter) -> None:
+        """Worker thread: render the persisted log, decompressing rotated segments."""
+        from ..lib.util.log_store import iter_log_text
+
+        assert self.log_file is not None
+        try:
+            for line in iter_log_text(self.log_file):
+                if self._stop_event.is_set():
+                    return
+                for t in formatter.feed_line(line):
+                    self._post_text(t)
+            for t in formatter.finish():
+                self._post_text(t)
+        except OSError as e:
+            self._post_text(Text(f"Error reading {self.log_file}: {e}", style=_STYLE_RESULT_ERR))
+            return
+        self._post_text(Text("--- End of persisted log ---", style=_STYLE_SYSTEM))
+        self._update_footer_static()
+
+    def _stream_direct(self, formatter: _TuiLogFormatter | _PlainTextTuiFormatter) -> bool:
+        """Worker thread: render an exited container's k8s-file log from disk.
+
+        Returns ``False`` (nothing rendered) when the container's log driver
+        has no readable file, so the caller falls back to ``podman logs``.
+        """
+        from ..lib.domain.facade import container_log_path, iter_container_log_text
+
+        path = container_log_path(self.container_name)
+        if path is None:
+            return False
+        try:
+            for line in iter_container_log_text(path):
+                if self._stop_event.is_set():
+                    return True
+                for t in formatter.feed_line(line):
+                    self._post_text(t)
+            for t in formatter.finish():
+                self._post_text(t)
+        except (OSError, ValueError) as e:
+            self._post_text(Text(f"Error reading {path}: {e}", style=_STYLE_RESULT_ERR))
+            return True
+        self._post_text(Text("--- End of container log ---", style=_STYLE_SYSTEM))
+        self._update_footer_static()
+        return True
+
     def _post_text(self, text: Text) -> None:
         """Thread-safe write to the RichLog widget."""
         self.app.call_from_thread(self._write_to_log, text)
@@ -521,8 +592,8 @@ class LogViewerScreen(screen.Screen[None]):
         def _update() -> None:
             """Switch footer text and disable auto-scroll on the main thread."""
             try:
-                footer = self.query_one("#log-footer", Static)
-                footer.update(" \\[Esc/q/f] Back  \\[STREAM ENDED]")
+                self._footer_state = "\\[STREAM ENDED]"
+                self._refresh_footer()
                 log_widget = self.query_one("#log-view", RichLog)
                 log_widget.auto_scroll = False
             except NoMatches:
@@ -530,6 +601,99 @@ class LogViewerScreen(screen.Screen[None]):
 
         self.app.call_from_thread(_update)
 
+    def _refresh_footer(self, message: str = "") -> None:
+        """Redraw the footer with key hints, stream state, and *message*."""
+        parts = [self._FOOTER_KEYS]
+        if self._footer_state:
+            parts.append(self._footer_state)
+        if message:
+            parts.append(message)
+        try:
+            self.query_one("#log-footer", Static).update("  ".join(parts))
+        except NoMatches:
+            pass
+
+    # -- search --
+
+    def _search_input_visible(self) -> bool:
+        """Return True while the find prompt is shown."""
+        try:
+            return self.query_one("#log-search", Input).has_class("-visible")
+        except NoMatches:
+            return False
+
+    def _hide_search_input(self) -> None:
+        """Hide the find prompt and return focus to the log."""
+        try:
+            self.query_one("#log-search", Input).remove_class("-visible")
+            self.query_one("#log-view", RichLog).focus()
+        except NoMatches:
+            pass
+
+    def action_start_search(self) -> None:
+        """Show the find prompt."""
+        try:
+            inp = self.query_one("#log-search", Input)
+        except NoMatches:
+            return
+        inp.add_class("-visible")
+        inp.focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Compile the submitted pattern and jump to its first match."""
+        if getattr(event.input, "id", None) != "log-search":
+            return
+        self._hide_search_input()
+        pattern = event.value.strip()
+        if not pattern:
+            self._search_pattern = None
+            self._refresh_footer()
+            return
+        from ..lib.domain.facade import LogSearchOptions, compile_text_pattern
+
+        try:
+            self._search_pattern = compile_text_pattern(
+                LogSearchOptions(pattern=pattern, ignore_case=pattern.islower())
+            )
+        except SystemExit as exc:
+            self._search_pattern = None
+            self._refresh_footer(str(exc))
+            return
+        self._search_row = None
+        self._find(backwards=False)
+
+    def action_find_next(self) -> None:
+        """Jump to the next match of the active pattern."""
+        self._find(backwards=False)
+
+    def action_find_previous(self) -> None:
+        """Jump to the previous match of the active pattern."""
+        self._find(backwards=True)
+
+    def _find(self, *, backwards: bool) -> None:
+        """Search the rendered log lines and scroll the next hit into view."""
+        if self._search_pattern is None:
+            self._refresh_footer("No search pattern — press / to find")
+            return
+        from ..lib.domain.facade import find_line
+
+        try:
+            log_widget = self.query_one("#log-view", RichLog)
+        except NoMatches:
+            return
+        lines = [strip.text for strip in log_widget.lines]
+        start = self._search_row
+        if start is None:
+            start = int(log_widget.scroll_y) - (0 if backwards else 1)
+        row = find_line(lines, self._search_pattern, start, backwards=backwards)
+        if row is None:
+            self._refresh_footer(f"/{self._search_pattern.pattern}: no match")
+            return
+        self._search_row = row
+        log_widget.auto_scroll = False
+        log_widget.scroll_to(y=row, animate=False)
+        self._refresh_footer(f"/{self._search_pattern.pattern}: line {row + 1}/{len(lines)}")
+
     # -- cleanup --
 
     def _cleanup_process(self) -> None:
@@ -541,7 +705,10 @@ class LogViewerScreen(screen.Screen[None]):
     # -- actions --
 
     def action_dismiss_screen(self) -> None:
-        """Stop the log stream and dismiss this screen."""
+        """Close the find prompt if open, otherwise stop streaming and dismiss."""
+        if self._search_input_visible():
+            self._hide_search_input()
+            return
         self._cleanup_process()
         self.dismiss(None)
 
@@ -24,6 +24,10 @@ class PollingMixin:
     - self._container_status_timer
     - self._gate_server_timer
     - self._last_gate_server_running: bool | None
+    - self._idle_sweep_timer
+    - self._resource_timer
+    - self._resource_monitor: ResourceMonitor | None
+    - self._last_image_old: bool | None
     - self.run_worker(...)
     - self.set_interval(...)
     - self.notify(...)
@@ -114,6 +118,65 @@ class PollingMixin:
             self._gate_server_timer.stop()
             self._gate_server_timer = None
 
+    # ---------- Idle task sweep ----------
+
+    def _start_idle_sweep(self) -> None:
+        """Stop idle tasks (``run.idle_timeout``) every few minutes in the background."""
+        from ..lib.orchestration.idle import IDLE_SWEEP_INTERVAL
+
+        if self._idle_sweep_timer is not None:
+            self._idle_sweep_timer.stop()
+        self._idle_sweep_timer = self.set_interval(
+            IDLE_SWEEP_INTERVAL, self._sweep_idle_tasks, name="idle_sweep"
+        )
+
+    def _sweep_idle_tasks(self) -> None:
+        """Stop idle tasks of all projects in a background worker."""
+        from ..lib.domain.facade import stop_idle_tasks
+
+        self.run_worker(
+            stop_idle_tasks,
+            name="idle-sweep",
+            group="idle-sweep",
+            exclusive=True,
+            thread=True,
+            exit_on_error=False,
+        )
+
+    # ---------- Live resource monitor ----------
+
+    def _start_resource_refresh(self) -> None:
+        """Re-render the selected running task's resource use every few seconds."""
+        from ..lib.domain.facade import STATS_INTERVAL
+
+        self._stop_resource_refresh()
+        self._resource_timer = self.set_interval(
+            STATS_INTERVAL, self._refresh_task_resources, name="resource_refresh"
+        )
+
+    def _stop_resource_refresh(self) -> None:
+        """Stop the refresh timer and the shared ``podman stats`` stream."""
+        if self._resource_timer is not None:
+            self._resource_timer.stop()
+            self._resource_timer = None
+        if self._resource_monitor is not None:
+            self._resource_monitor.stop()
+            self._resource_monitor = None
+
+    def _refresh_task_resources(self) -> None:
+        """Show the selected task's resource use, starting the monitor on first need."""
+        from .widgets import TaskDetails
+
+        task = self.current_task
+        if task is None or task.status != "running":
+            return
+        if self._resource_monitor is None:
+            from ..lib.domain.facade import resource_monitor
+
+            self._resource_monitor = resource_monitor()
+        details = self.query_one("#task-details", TaskDetails)
+        details.set_task(task, image_old=self._last_image_old)
+
     def _poll_gate_server(self) -> None:
         """Check gate server status in a background worker."""
         from terok_sandbox import get_server_status
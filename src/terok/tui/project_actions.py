@@ -12,6 +12,7 @@ import os
 import shlex
 import subprocess
 import sys
+import time
 from collections.abc import Callable
 
 from terok_sandbox import (
@@ -28,6 +29,7 @@ from terok_sandbox import (
 from ..lib.core.config import get_envs_base_dir
 from ..lib.core.projects import effective_ssh_key_name, load_project
 from ..lib.domain.facade import (
+    DeleteProjectResult,
     authenticate,
     build_images,
     delete_project,
@@ -483,7 +485,7 @@ class ProjectActionsMixin:
 
         archive_dir = deleted_projects_dir()
         lines.append("\nAll project data will be permanently deleted.")
-        lines.append("Project config, task data, and build artifacts will be archived at:")
+        lines.append("Project config and task data will be archived at:")
         lines.append(f"{archive_dir}")
 
         from .screens import ConfirmDeleteScreen
@@ -502,20 +504,44 @@ class ProjectActionsMixin:
             return
 
         pid = self.current_project_id
+        self.notify(f"Archiving and deleting project '{pid}'…")
+        self.run_worker(
+            lambda: self._delete_project(pid),
+            name=f"project-delete:{pid}",
+            group="project-delete",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _delete_project(
+        self, pid: str
+    ) -> tuple[str, DeleteProjectResult | None, float, str | None]:
+        """Delete a project and return ``(project_id, result, seconds, error_or_None)``."""
+        start = time.monotonic()
         try:
             result = delete_project(pid)
         except (SystemExit, Exception) as e:
-            self.notify(f"Delete failed: {e}")
+            return pid, None, time.monotonic() - start, str(e)
+        return pid, result, time.monotonic() - start, None
+
+    async def _on_project_deleted(
+        self, outcome: tuple[str, DeleteProjectResult | None, float, str | None]
+    ) -> None:
+        """Report a finished project deletion and refresh the project list."""
+        pid, result, seconds, error = outcome
+        if error or result is None:
+            self.notify(f"Delete failed: {error}")
             return
 
-        msg = f"Project '{pid}' deleted."
+        msg = f"Project '{pid}' deleted in {seconds:.1f}s."
         if result.get("archive"):
             msg += f" Archive: {result['archive']}"
         if result.get("skipped"):
             msg += f" ({len(result['skipped'])} item(s) skipped)"
         self.notify(msg)
 
-        self.current_project_id = None
+        if self.current_project_id == pid:
+            self.current_project_id = None
         await self.refresh_projects()
 
     # ---------- Gate server actions ----------
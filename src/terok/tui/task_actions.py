@@ -35,7 +35,8 @@ from ..lib.domain.facade import (
     task_run_toad,
     task_stop,
 )
-from ..lib.orchestration.autopilot import wait_for_container_exit
+from ..lib.orchestration.autopilot import watch_container_exit
+from ..lib.orchestration.exit_watcher import ContainerExit
 from ..lib.orchestration.tasks import (
     container_name,
     generate_task_name,
@@ -43,6 +44,7 @@ from ..lib.orchestration.tasks import (
     get_workspace_git_diff,
     mark_task_deleting,
 )
+from ..lib.util.log_store import has_log
 from .clipboard import copy_to_clipboard_detailed
 from .screens import (
     AgentSelectionScreen,
@@ -432,23 +434,31 @@ class TaskActionsMixin:
             return project_id, "", str(e)
 
     def _start_autopilot_watcher(self, project_id: str, task_id: str) -> None:
-        """Spawn a background worker that waits for the container to finish
-        and updates task metadata with the exit code."""
+        """Register the task's container with the shared exit watcher.
+
+        All autopilot tasks share one watcher thread; its callback hands the
+        result back to the event loop instead of blocking a worker per task.
+        """
         cname = container_name(project_id, "run", task_id)
-        self.run_worker(
-            lambda: self._autopilot_wait_worker(project_id, task_id, cname),
-            name=f"autopilot-wait:{project_id}:{task_id}",
-            group="autopilot-wait",
-            thread=True,
-            exit_on_error=False,
-        )
+        watch_container_exit(cname, project_id, task_id, self._post_autopilot_exit)
 
-    def _autopilot_wait_worker(
-        self, project_id: str, task_id: str, cname: str
-    ) -> tuple[str, str, int | None, str | None]:
-        """Background worker: wait for the container to exit and update metadata."""
-        exit_code, error = wait_for_container_exit(cname, project_id, task_id)
-        return project_id, task_id, exit_code, error
+    def _post_autopilot_exit(self, result: ContainerExit) -> None:
+        """Watcher-thread callback: schedule :meth:`_on_autopilot_exit` on the app loop."""
+        try:
+            self.call_from_thread(self._on_autopilot_exit, result)
+        except RuntimeError:
+            pass  # App is no longer running
+
+    def _on_autopilot_exit(self, result: ContainerExit) -> None:
+        """Notify about a finished autopilot task and refresh the task list."""
+        if result.error:
+            self.notify(f"Autopilot watcher error for task {result.task_id}: {result.error}")
+        elif result.exit_code == 0:
+            self.notify(f"Autopilot task {result.task_id} completed successfully")
+        else:
+            self.notify(f"Autopilot task {result.task_id} failed (exit {result.exit_code})")
+        if result.project_id == self.current_project_id:
+            self.call_later(self.refresh_tasks)
 
     # ── Follow-up on completed/failed autopilot tasks ──
 
@@ -509,9 +519,13 @@ class TaskActionsMixin:
         cname = container_name(pid, task.mode, tid)
 
         state = get_container_state(cname)
+        log_file = None
         if state is None:
-            self.notify(f"No container found for task {tid}.")
-            return
+            candidate = load_project(pid).tasks_root / str(tid) / "logs" / "container.log"
+            if not has_log(candidate):
+                self.notify(f"No container or persisted logs found for task {tid}.")
+                return
+            log_file = candidate
         follow = state == "running"
 
         from .log_viewer import LogViewerScreen, TaskContainerRef
@@ -525,6 +539,7 @@ class TaskActionsMixin:
                     mode=task.mode,
                     container_name=cname,
                     provider=provider,
+                    log_file=log_file,
                 ),
                 follow=follow,
             )
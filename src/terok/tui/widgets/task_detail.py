@@ -12,8 +12,10 @@ from textual.widgets import Static
 
 from ...lib.core.config import SHIELD_SECURITY_HINT, get_public_host
 from ...lib.core.task_display import STATUS_DISPLAY, mode_info
+from ...lib.orchestration.resource_monitor import TaskResources, sparkline
 from ...lib.orchestration.tasks import TaskMeta
 from ...lib.util.emoji import render_emoji
+from ...lib.util.fs import format_size
 
 
 def _get_css_variables(widget: Static) -> dict[str, str]:
@@ -34,6 +36,7 @@ def render_task_details(
     css_variables: dict[str, str] | None = None,
     show_workspace: bool = True,
     shield_hooks_ok: bool | None = None,
+    resources: TaskResources | None = None,
 ) -> Text:
     """Render task details as a Rich Text object."""
     if task is None:
@@ -64,6 +67,18 @@ def render_task_details(
         lines.append(Text(f"Work:      {work_text}"))
     if show_workspace:
         lines.append(Text(f"Workspace: {task.workspace}"))
+    if task.idle_reason and task.status != "running":
+        lines.append(Text(f"Idle stop: {task.idle_reason} (resumes on login)"))
+    if task.usage is not None:
+        u = task.usage
+        lines.append(
+            Text(
+                f"Disk:      {format_size(u.total)} (workspace {format_size(u.workspace)}, "
+                f"logs {format_size(u.logs)}, agent config {format_size(u.agent_config)})"
+            )
+        )
+    if task.status == "running" and resources is not None:
+        lines += _resource_lines(resources)
     if task.status == "running" and image_old:
         lines.append(Text.assemble("Image:     ", Text("old", style=warning_style)))
     if task.web_port:
@@ -133,6 +148,23 @@ def render_task_details(
     return Text("\n").join(lines)
 
 
+def _resource_lines(resources: TaskResources) -> list[Text]:
+    """Render the live CPU, memory and I/O lines of a running task."""
+    s = resources.latest
+    history = sparkline(x.cpu_percent for x in resources.history)
+    mem = format_size(s.mem_bytes)
+    if s.mem_limit:
+        mem += f" of {format_size(s.mem_limit)}"
+    return [
+        Text(f"CPU:       {s.cpu_percent:.1f}%  {history}"),
+        Text(f"Memory:    {mem} \u00b7 {s.pids} processes"),
+        Text(
+            f"I/O:       net {format_size(s.net_rx)} in, {format_size(s.net_tx)} out"
+            f" \u00b7 disk {format_size(s.block_read)} read, {format_size(s.block_write)} written"
+        ),
+    ]
+
+
 class TaskDetails(Static):
     """Panel showing details for the currently selected task."""
 
@@ -158,6 +190,12 @@ class TaskDetails(Static):
         else:
             self.current_project_id = self.app.current_project_id if self.app else None
 
+        # Live resource use, once the app has started the shared monitor.
+        resources = None
+        monitor = getattr(self.app, "_resource_monitor", None)
+        if task is not None and monitor is not None and self.current_project_id:
+            resources = monitor.task(self.current_project_id, task.task_id)
+
         # Determine shield hook health from the cached project-level env check.
         hooks_ok: bool | None = None
         try:
@@ -175,5 +213,6 @@ class TaskDetails(Static):
             _get_css_variables(self),
             show_workspace=False,
             shield_hooks_ok=hooks_ok,
+            resources=resources,
         )
         content.update(rendered)
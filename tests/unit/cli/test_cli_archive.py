@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the ``archive gc`` command."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration.archive_gc import GcReport
+from tests.testcli import run_cli
+
+
+def test_gc_dry_run_reports(capsys: pytest.CaptureFixture[str]) -> None:
+    """The dry run lists what would go and summarises sizes and bundling."""
+    report = GcReport(removed=["proj 20260101T000000Z_1"], freed_bytes=2048, bundled=3)
+    with patch("terok.cli.commands.archive.gc_archives", return_value=report) as gc:
+        run_cli("archive", "gc", "proj", "--dry-run")
+
+    gc.assert_called_once_with("proj", dry_run=True)
+    out = capsys.readouterr().out
+    assert "  - proj 20260101T000000Z_1" in out
+    assert "Would remove 1 archive(s), freeing 2.0 KB; would pack 3 task archive(s)" in out
+
+
+def test_gc_refuses_concurrent_run() -> None:
+    """A collection already in progress makes the command fail."""
+    with (
+        patch("terok.cli.commands.archive.gc_archives", return_value=None),
+        pytest.raises(SystemExit, match="already running"),
+    ):
+        run_cli("archive", "gc")
@@ -176,3 +176,122 @@ def test_task_run_commands_forward_selected_agents(
         run_cli(*argv)
 
     mock_run.assert_called_once_with(*expected_args, **expected_kwargs)
+
+
+def test_run_batch_dispatches_with_cli_defaults(tmp_path: Path) -> None:
+    """``run --batch`` loads the file with CLI flags as defaults and runs it."""
+    batch = tmp_path / "prompts.yml"
+    batch.write_text("- first\n- prompt: second\n  model: sonnet\n", encoding="utf-8")
+
+    with (
+        patch("terok.cli.commands.task.run_batch", return_value=[]) as mock_batch,
+        patch("terok.cli.commands.task.task_run_headless") as mock_single,
+    ):
+        run_cli("run", "myproject", "--batch", str(batch), "-j", "2", "--model", "opus")
+
+    mock_single.assert_not_called()
+    entries = mock_batch.call_args.args[1]
+    assert [(e.prompt, e.model) for e in entries] == [("first", "opus"), ("second", "sonnet")]
+    assert mock_batch.call_args.kwargs["jobs"] == 2
+
+
+@pytest.mark.parametrize(
+    ("extra_args", "message"),
+    [
+        pytest.param(["a prompt"], "not both", id="prompt-and-batch"),
+        pytest.param(["--no-follow"], "--no-follow", id="no-follow"),
+        pytest.param(["-j", "0"], "--jobs", id="zero-jobs"),
+    ],
+)
+def test_run_batch_rejects_invalid_invocations(
+    tmp_path: Path, extra_args: list[str], message: str
+) -> None:
+    """Incompatible flags are rejected before anything is launched."""
+    batch = tmp_path / "prompts.yml"
+    batch.write_text("- first\n", encoding="utf-8")
+    with patch("terok.cli.commands.task.run_batch") as mock_batch:
+        assert_cli_exit("run", "myproject", *extra_args, "--batch", str(batch), message=message)
+    mock_batch.assert_not_called()
+
+
+def test_run_requires_prompt_or_batch() -> None:
+    """Without a prompt, ``run`` needs ``--batch``."""
+    assert_cli_exit("run", "myproject", message="PROMPT or --batch")
+
+
+def test_run_queue_enqueues_and_starts_drainer() -> None:
+    """``run --queue`` submits a detached request instead of launching it."""
+    with (
+        patch("terok.cli.commands.task.enqueue_headless", return_value="5") as mock_enqueue,
+        patch("terok.cli.commands.task.start_queue_drainer") as mock_drainer,
+        patch("terok.cli.commands.task.task_run_headless") as mock_run,
+    ):
+        run_cli("run", "myproject", "do it", "--queue", "--cpus", "2")
+
+    mock_run.assert_not_called()
+    mock_drainer.assert_called_once_with()
+    request = mock_enqueue.call_args.args[0]
+    assert (request.prompt, request.follow) == ("do it", False)
+    assert mock_enqueue.call_args.kwargs == {"cpus": 2.0, "memory_mb": None}
+
+
+def test_run_queue_resource_flags_require_queue() -> None:
+    """``--cpus`` without ``--queue`` is rejected."""
+    assert_cli_exit("run", "myproject", "do it", "--cpus", "2", message="--queue")
+
+
+def test_run_limits_override_container_resources() -> None:
+    """``--limit`` sets per-run container limits (hyphenated keys accepted)."""
+    from terok.lib.core.project_model import ResourceLimits
+
+    request = capture_headless_request(
+        "run", "myproject", "do it", "--limit", "memory=4g", "--limit", "pids-limit=256"
+    )
+
+    assert request.resources == ResourceLimits(memory="4g", pids_limit=256)
+    assert capture_headless_request("run", "myproject", "do it").resources is None
+
+
+@pytest.mark.parametrize(
+    ("limit", "message"),
+    [
+        pytest.param("disk=4g", None, id="unknown-key"),
+        pytest.param("memory=lots", "Invalid resources in --limit", id="bad-value"),
+    ],
+)
+def test_run_rejects_invalid_limits(limit: str, message: str | None) -> None:
+    """Unknown keys and malformed values are rejected before launching."""
+    with patch("terok.cli.commands.task.task_run_headless") as mock_run:
+        assert_cli_exit("run", "myproject", "do it", "--limit", limit, message=message)
+    mock_run.assert_not_called()
+
+
+def test_run_limits_do_not_apply_to_batches(tmp_path: Path) -> None:
+    """Batch entries take their limits from presets, not ``--limit``."""
+    batch = tmp_path / "prompts.yml"
+    batch.write_text("- first\n", encoding="utf-8")
+    assert_cli_exit(
+        "run", "myproject", "--batch", str(batch), "--limit", "cpus=2", message="--limit"
+    )
+
+
+def test_task_queue_cancel_reports_unknown_task() -> None:
+    """Cancelling a task that is not queued exits with an error."""
+    with patch("terok.cli.commands.task.cancel_queued", return_value=False):
+        assert_cli_exit("task", "queue", "cancel", "myproject", "3", message="is not queued")
+
+
+def test_run_timings_prints_phase_summary(capsys: pytest.CaptureFixture[str]) -> None:
+    """``run --timings`` prints the spans recorded while launching."""
+    from terok.lib.util.timings import span
+
+    def fake_run(request: HeadlessRunRequest) -> str:
+        with span("podman_run"):
+            return "1"
+
+    with patch("terok.cli.commands.task.task_run_headless", side_effect=fake_run):
+        run_cli("run", "myproject", "do it", "--no-follow", "--timings")
+
+    out = capsys.readouterr().out
+    assert "Launch timings (run)" in out
+    assert "podman_run" in out
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for bulk ``task delete`` / ``task stop`` selectors."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration.tasks import BulkOutcome
+from tests.testcli import run_cli
+
+
+def _tasks(*ids: str) -> list[SimpleNamespace]:
+    """Build selected-task stand-ins with *ids*."""
+    return [SimpleNamespace(task_id=tid) for tid in ids]
+
+
+def _fake_delete(project_id, task_ids, *, progress):
+    """Fail task ``2`` and succeed the rest, reporting progress."""
+    outcomes = [BulkOutcome(t, "failed", "boom") if t == "2" else BulkOutcome(t) for t in task_ids]
+    for outcome in outcomes:
+        progress(outcome)
+    return outcomes
+
+
+def test_bulk_delete_reports_progress_and_failures(capsys: pytest.CaptureFixture[str]) -> None:
+    """Selectors pick the tasks; a failed task makes the command fail after the report."""
+    with (
+        patch("terok.cli.commands.task.select_tasks", return_value=_tasks("1", "2", "3")) as sel,
+        patch("terok.cli.commands.task.task_delete_many", side_effect=_fake_delete),
+        pytest.raises(SystemExit, match="Failed tasks: 2"),
+    ):
+        run_cli("task", "delete", "proj", "--status", "completed", "--older-than", "7d")
+
+    sel.assert_called_once_with("proj", status="completed", older_than=7 * 86400)
+    out = capsys.readouterr().out
+    assert "[1/3] task 1: ok" in out
+    assert "task 2: failed (boom)" in out
+    assert "Deleted 2 of 3 task(s); 0 skipped, 1 failed." in out
+
+
+def test_bulk_stop_all_forwards_timeout(capsys: pytest.CaptureFixture[str]) -> None:
+    """``--all`` selects every task and the timeout reaches the bulk stop."""
+    with (
+        patch("terok.cli.commands.task.select_tasks", return_value=_tasks("1")),
+        patch("terok.cli.commands.task.task_stop_many", return_value=[BulkOutcome("1")]) as stop,
+    ):
+        run_cli("task", "stop", "proj", "--all", "--timeout", "3")
+
+    assert stop.call_args.args == ("proj", ["1"])
+    assert stop.call_args.kwargs["timeout"] == 3
+    assert "Stopped 1 of 1 task(s)" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    ("argv", "message"),
+    [
+        pytest.param(("task", "delete", "proj"), "select tasks with --all", id="no-selector"),
+        pytest.param(("task", "stop", "proj", "1", "--all"), "not both", id="id-and-selector"),
+    ],
+)
+def test_bulk_selector_misuse_exits(argv: tuple[str, ...], message: str) -> None:
+    """A task ID and selectors are mutually exclusive, and one of them is required."""
+    with pytest.raises(SystemExit, match=message):
+        run_cli(*argv)
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the ``task du`` command."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from tests.testcli import run_cli
+
+
+def test_du_defaults_to_all_projects() -> None:
+    """Without ``--project`` every project is reported, ordered by task ID."""
+    with patch("terok.cli.commands.task.task_du") as du:
+        run_cli("task", "du")
+
+    du.assert_called_once_with(None, sort="id", rescan=False)
+
+
+def test_du_project_sort_and_rescan() -> None:
+    """Options are passed through to the report."""
+    with patch("terok.cli.commands.task.task_du") as du:
+        run_cli("task", "du", "--project", "proj", "--sort", "size", "--rescan")
+
+    du.assert_called_once_with("proj", sort="size", rescan=True)
+
+
+def test_du_rejects_unknown_sort() -> None:
+    """Only the known orderings are accepted."""
+    with pytest.raises(SystemExit):
+        run_cli("task", "du", "--sort", "name")
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the ``task idle`` command."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration.idle import IdleTask
+from tests.testcli import run_cli
+
+FOUND = [IdleTask("proj", "3", "proj-cli-3", "no output for 2h 5m")]
+
+
+def test_idle_lists_without_stopping(capsys: pytest.CaptureFixture[str]) -> None:
+    """Without ``--stop`` the sweep is a dry run."""
+    with patch("terok.cli.commands.task.stop_idle_tasks", return_value=FOUND) as sweep:
+        run_cli("task", "idle")
+
+    sweep.assert_called_once_with(None, dry_run=True)
+    out = capsys.readouterr().out
+    assert "proj/3: no output for 2h 5m" in out
+    assert "stop them with --stop" in out
+
+
+def test_idle_stop_for_project(capsys: pytest.CaptureFixture[str]) -> None:
+    """``--stop`` stops the idle tasks of the given project."""
+    with patch("terok.cli.commands.task.stop_idle_tasks", return_value=FOUND) as sweep:
+        run_cli("task", "idle", "--project", "proj", "--stop")
+
+    sweep.assert_called_once_with("proj", dry_run=False)
+    assert "Stopped 1 idle task(s)" in capsys.readouterr().out
+
+
+def test_idle_none_found(capsys: pytest.CaptureFixture[str]) -> None:
+    """An empty sweep says so."""
+    with patch("terok.cli.commands.task.stop_idle_tasks", return_value=[]):
+        run_cli("task", "idle")
+
+    assert "No idle tasks" in capsys.readouterr().out
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the ``task top`` command."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from tests.testcli import run_cli
+
+
+def test_top_defaults_to_all_projects() -> None:
+    """Without options every running task is shown live."""
+    with patch("terok.cli.commands.task.task_top") as top:
+        run_cli("task", "top")
+
+    top.assert_called_once_with(None, once=False)
+
+
+def test_top_project_once() -> None:
+    """``--project`` and ``--once`` are passed through."""
+    with patch("terok.cli.commands.task.task_top") as top:
+        run_cli("task", "top", "--project", "proj", "--once")
+
+    top.assert_called_once_with("proj", once=True)
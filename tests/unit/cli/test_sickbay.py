@@ -5,30 +5,47 @@
 
 from __future__ import annotations
 
+import json
+import time
 import unittest.mock
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
-from terok.cli.commands.sickbay import _check_task_hook, _reconcile_post_stop, _update_worst
-from terok.lib.util.yaml import dump as yaml_dump
+from terok.cli.commands.sickbay import (
+    _check_pending_hooks,
+    _check_task_hook,
+    _check_unfired_hooks,
+    _cmd_sickbay,
+    _reconcile_post_stop,
+    _update_worst,
+)
+from terok.lib.orchestration.hook_journal import HookRecord, append_hook_record, new_hook_record
+from terok.lib.orchestration.tasks import tasks_meta_dir
 
-MOCK_BASE = Path("/tmp/terok-testing")
 
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the hook journal at a temporary state directory."""
+    monkeypatch.setenv("TEROK_STATE_DIR", str(tmp_path / "state"))
+    return tmp_path / "state"
 
-@pytest.fixture()
-def task_meta_dir(tmp_path: Path) -> Path:
-    """Create a temporary task metadata directory."""
-    meta_dir = tmp_path / "tasks"
-    meta_dir.mkdir()
-    return meta_dir
 
+def _record(hook: str, ts: float, *, state: str = "ok") -> HookRecord:
+    """Build a journal record of task ``proj/1`` for *hook* at time *ts*."""
+    rec = new_hook_record(
+        hook, "cmd", project_id="proj", task_id="1", mode="cli", cname="proj-cli-1", state=state
+    )
+    return replace(rec, ts=ts)
 
-def _write_meta(meta_dir: Path, tid: str, meta: dict) -> Path:
-    """Write task metadata to a YAML file and return the path."""
-    p = meta_dir / f"{tid}.yml"
-    p.write_text(yaml_dump(meta))
-    return p
+
+def _project(tmp_path: Path) -> unittest.mock.MagicMock:
+    """Return a project stub with a post_stop hook."""
+    project = unittest.mock.MagicMock()
+    project.hook_post_stop = "echo cleanup"
+    project.tasks_root = tmp_path
+    return project
 
 
 class TestUpdateWorst:
@@ -49,116 +66,161 @@ class TestUpdateWorst:
 
 
 class TestCheckTaskHook:
-    def test_missing_meta_file_returns_none(self, tmp_path: Path) -> None:
-        project = unittest.mock.MagicMock()
-        with unittest.mock.patch(
-            "terok.cli.commands.sickbay.tasks_meta_dir", return_value=tmp_path
-        ):
-            assert _check_task_hook("proj", "99", project, fix=False) is None
+    def test_never_started_returns_none(self) -> None:
+        assert _check_task_hook({}, {}) is None
+
+    def test_running_container_returns_none(self) -> None:
+        hooks = {"post_start": _record("post_start", 1.0)}
+        assert _check_task_hook(hooks, {"proj-cli-1": "running"}) is None
+
+    def test_post_stop_after_start_returns_none(self) -> None:
+        hooks = {"post_start": _record("post_start", 1.0), "post_stop": _record("post_stop", 2.0)}
+        assert _check_task_hook(hooks, {"proj-cli-1": "exited"}) is None
+
+    def test_restart_after_post_stop_is_missed(self) -> None:
+        hooks = {
+            "post_stop": _record("post_stop", 1.0),
+            "pre_start": _record("pre_start", 2.0),
+            "post_start": _record("post_start", 3.0),
+        }
+        assert _check_task_hook(hooks, {"proj-cli-1": "exited"}) is hooks["post_start"]
+
 
-    def test_no_mode_returns_none(self, task_meta_dir: Path) -> None:
-        _write_meta(task_meta_dir, "1", {"status": "created"})
-        project = unittest.mock.MagicMock()
+class TestReconcilePostStop:
+    def test_success(self, tmp_path: Path) -> None:
+        with unittest.mock.patch("terok.cli.commands.sickbay.run_hook") as mock_hook:
+            result = _reconcile_post_stop(_project(tmp_path), _record("post_start", 1.0))
+        assert result == ("ok", "Task proj/1", "post_stop hook reconciled")
+        assert mock_hook.call_args.kwargs["cname"] == "proj-cli-1"
+        assert mock_hook.call_args.kwargs["task_dir"] == tmp_path / "1"
+
+    def test_failure(self, tmp_path: Path) -> None:
         with unittest.mock.patch(
-            "terok.cli.commands.sickbay.tasks_meta_dir", return_value=task_meta_dir
+            "terok.cli.commands.sickbay.run_hook", side_effect=RuntimeError("boom")
         ):
-            assert _check_task_hook("proj", "1", project, fix=False) is None
+            result = _reconcile_post_stop(_project(tmp_path), _record("post_start", 1.0))
+            assert result[0] == "error"
+            assert "boom" in result[2]
 
-    def test_running_container_returns_none(self, task_meta_dir: Path) -> None:
-        _write_meta(task_meta_dir, "1", {"mode": "cli"})
-        project = unittest.mock.MagicMock()
-        with (
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.tasks_meta_dir", return_value=task_meta_dir
-            ),
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.get_container_state", return_value="running"
-            ),
-        ):
-            assert _check_task_hook("proj", "1", project, fix=False) is None
 
-    def test_already_fired_returns_none(self, task_meta_dir: Path) -> None:
-        _write_meta(task_meta_dir, "1", {"mode": "cli", "hooks_fired": ["post_stop"]})
-        project = unittest.mock.MagicMock()
+class TestCheckUnfiredHooks:
+    @pytest.fixture()
+    def projects(self, tmp_path: Path) -> list[unittest.mock.MagicMock]:
+        """Two projects with one stopped task each, listed by ``list_projects``."""
+        projects = []
+        for pid in ("alpha", "beta"):
+            project = _project(tmp_path)
+            project.id = pid
+            rec = new_hook_record(
+                "post_start",
+                "x",
+                project_id=pid,
+                task_id="1",
+                mode="cli",
+                cname=f"{pid}-cli-1",
+                state="ok",
+            )
+            append_hook_record(rec)
+            projects.append(project)
+        with unittest.mock.patch("terok.cli.commands.sickbay.list_projects", return_value=projects):
+            yield projects
+
+    def test_one_podman_query_for_all_projects(self, projects) -> None:
+        with unittest.mock.patch(
+            "terok.cli.commands.sickbay.get_container_states",
+            return_value={"alpha-cli-1": "running"},
+        ) as states:
+            results = _check_unfired_hooks(None, None, fix=False)
+        states.assert_called_once_with()
+        assert [label for _, label, _ in results] == ["Task beta/1"]
+
+    def test_fix_reconciles_every_project(self, projects) -> None:
         with (
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.tasks_meta_dir", return_value=task_meta_dir
-            ),
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.get_container_state", return_value="exited"
-            ),
+            unittest.mock.patch("terok.cli.commands.sickbay.get_container_states", return_value={}),
+            unittest.mock.patch("terok.cli.commands.sickbay.run_hook") as mock_hook,
         ):
-            assert _check_task_hook("proj", "1", project, fix=False) is None
-
-    def test_unfired_returns_warn(self, task_meta_dir: Path) -> None:
-        _write_meta(task_meta_dir, "1", {"mode": "cli", "hooks_fired": ["post_start"]})
-        project = unittest.mock.MagicMock()
+            results = _check_unfired_hooks(None, None, fix=True)
+        assert sorted(c.kwargs["project_id"] for c in mock_hook.call_args_list) == ["alpha", "beta"]
+        assert {status for status, _, _ in results} == {"ok"}
+
+    def test_tasks_from_before_the_journal_use_hooks_fired(self, tmp_path: Path) -> None:
+        project = _project(tmp_path)
+        project.id = "legacy"
+        meta_dir = tasks_meta_dir("legacy")
+        meta_dir.mkdir(parents=True)
+        (meta_dir / "1.yml").write_text("mode: cli\nhooks_fired: [pre_start, post_start]\n")
+        (meta_dir / "2.yml").write_text("mode: cli\nhooks_fired: [pre_start, post_stop]\n")
+        (meta_dir / "3.yml").write_text("mode: cli\n")  # no hook history: not judged
         with (
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.tasks_meta_dir", return_value=task_meta_dir
-            ),
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.get_container_state", return_value="exited"
-            ),
+            unittest.mock.patch("terok.cli.commands.sickbay.load_project", return_value=project),
+            unittest.mock.patch("terok.cli.commands.sickbay.get_container_states", return_value={}),
+            unittest.mock.patch("terok.cli.commands.sickbay.run_hook") as mock_hook,
         ):
-            result = _check_task_hook("proj", "1", project, fix=False)
-            assert result is not None
-            assert result[0] == "warn"
-            assert "post_stop" in result[2]
-
-    def test_fix_calls_reconcile(self, task_meta_dir: Path) -> None:
-        _write_meta(task_meta_dir, "1", {"mode": "cli"})
-        project = unittest.mock.MagicMock()
-        project.hook_post_stop = "echo cleanup"
-        project.tasks_root = task_meta_dir.parent
+            assert [r[1] for r in _check_unfired_hooks("legacy", None, fix=False)] == [
+                "Task legacy/1"
+            ]
+            _check_unfired_hooks("legacy", "1", fix=True)
+
+        assert mock_hook.call_args.kwargs["cname"] == "legacy-cli-1"
+
+    def test_podman_failure_is_an_error(self, projects) -> None:
         with (
             unittest.mock.patch(
-                "terok.cli.commands.sickbay.tasks_meta_dir", return_value=task_meta_dir
-            ),
-            unittest.mock.patch(
-                "terok.cli.commands.sickbay.get_container_state", return_value=None
+                "terok.cli.commands.sickbay.get_container_states", return_value=None
             ),
             unittest.mock.patch("terok.cli.commands.sickbay.run_hook") as mock_hook,
         ):
-            result = _check_task_hook("proj", "1", project, fix=True)
-            assert result is not None
-            assert result[0] == "ok"
-            assert "reconciled" in result[2]
-            mock_hook.assert_called_once()
-
-    def test_bad_metadata_returns_warn(self, task_meta_dir: Path) -> None:
-        bad_path = task_meta_dir / "1.yml"
-        bad_path.write_bytes(b"\x80\x81\x82")  # invalid UTF-8
-        project = unittest.mock.MagicMock()
-        with unittest.mock.patch(
-            "terok.cli.commands.sickbay.tasks_meta_dir", return_value=task_meta_dir
-        ):
-            result = _check_task_hook("proj", "1", project, fix=False)
-            assert result is not None
-            assert result[0] == "warn"
-            assert "bad metadata" in result[2]
+            [(status, label, _)] = _check_unfired_hooks(None, None, fix=True)
+        assert (status, label) == ("error", "Container states")
+        mock_hook.assert_not_called()
 
 
-class TestReconcilePostStop:
-    def test_success(self, tmp_path: Path) -> None:
-        meta_path = tmp_path / "1.yml"
-        meta_path.write_text(yaml_dump({"mode": "cli"}))
-        project = unittest.mock.MagicMock()
-        project.hook_post_stop = "echo done"
-        project.tasks_root = tmp_path
-        with unittest.mock.patch("terok.cli.commands.sickbay.run_hook"):
-            result = _reconcile_post_stop("p", "1", "cli", "c", project, meta_path, "Task p/1")
-            assert result[0] == "ok"
+class TestJsonReport:
+    def test_report_lists_checks_with_timings(self, capsys: pytest.CaptureFixture[str]) -> None:
+        def _check_gate_server() -> tuple[str, str, str]:
+            """Report a healthy gate server."""
+            return ("ok", "Gate server", "systemd, port 9418")
 
-    def test_failure(self, tmp_path: Path) -> None:
-        meta_path = tmp_path / "1.yml"
-        meta_path.write_text(yaml_dump({"mode": "cli"}))
-        project = unittest.mock.MagicMock()
-        project.hook_post_stop = "exit 1"
-        project.tasks_root = tmp_path
-        with unittest.mock.patch(
-            "terok.cli.commands.sickbay.run_hook", side_effect=RuntimeError("boom")
+        with (
+            unittest.mock.patch("terok.cli.commands.sickbay._GLOBAL_CHECKS", [_check_gate_server]),
+            unittest.mock.patch(
+                "terok.cli.commands.sickbay._check_unfired_hooks",
+                return_value=[("warn", "Task p/1", "stopped without post_stop hook")],
+            ),
+            unittest.mock.patch("terok.cli.commands.sickbay._check_pending_hooks", return_value=[]),
+            pytest.raises(SystemExit) as exc_info,
         ):
-            result = _reconcile_post_stop("p", "1", "cli", "c", project, meta_path, "Task p/1")
-            assert result[0] == "error"
-            assert "boom" in result[2]
+            _cmd_sickbay(json_output=True)
+
+        assert exc_info.value.code == 1
+        report = json.loads(capsys.readouterr().out)
+        assert report["status"] == "warn"
+        assert [c["name"] for c in report["checks"]] == [
+            "gate_server",
+            "unfired_hooks",
+            "pending_hooks",
+        ]
+        assert report["checks"][1]["results"][0]["label"] == "Task p/1"
+        assert all(c["duration_ms"] >= 0 for c in report["checks"])
+
+
+class TestCheckPendingHooks:
+    def test_recent_queued_hooks_are_not_reported(self) -> None:
+        append_hook_record(_record("post_stop", time.time(), state="queued"))
+        assert _check_pending_hooks(None, fix=False) == []
+
+    def test_stale_queued_hooks_warn(self) -> None:
+        append_hook_record(_record("post_stop", time.time() - 3600, state="queued"))
+        [(status, label, detail)] = _check_pending_hooks("proj", fix=False)
+        assert status == "warn"
+        assert "1 queued hook" in detail
+
+    def test_fix_runs_pending_hooks(self) -> None:
+        append_hook_record(_record("post_stop", time.time() - 3600, state="queued"))
+        with unittest.mock.patch(
+            "terok.cli.commands.sickbay.run_pending_hooks", return_value=1
+        ) as runner:
+            assert _check_pending_hooks(None, fix=True) == [
+                ("ok", "Background hooks", "ran 1 queued hook(s)")
+            ]
+        runner.assert_called_once_with()
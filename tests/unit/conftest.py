@@ -3,9 +3,9 @@
 
 """Unit-test fixtures.
 
-Auto-mocks sandbox, shield, and credential proxy helpers so existing tests
-do not require a real OCI hook, nftables, podman, proxy daemon, or root
-privileges.
+Auto-mocks sandbox, shield, credential proxy, log tee, and trash reaper
+helpers so existing tests do not require a real OCI hook, nftables, podman,
+proxy daemon, background processes, or root privileges.
 """
 
 from collections.abc import Iterator
@@ -16,7 +16,7 @@ import pytest
 
 @pytest.fixture(autouse=True)
 def _mock_infrastructure() -> Iterator[None]:
-    """Replace Sandbox.run, shield down, and credential proxy with no-ops."""
+    """Replace Sandbox.run, shield down, credential proxy, log tee, and reaper with no-ops."""
     with (
         patch(
             "terok.lib.orchestration.task_runners._sandbox",
@@ -24,6 +24,12 @@ def _mock_infrastructure() -> Iterator[None]:
         patch(
             "terok.lib.orchestration.task_runners._shield_down_impl",
         ),
+        patch(
+            "terok.lib.orchestration.task_runners.start_log_tee",
+        ),
+        patch(
+            "terok.lib.orchestration.tasks.start_trash_reaper",
+        ),
         patch(
             "terok.lib.core.config.get_credential_proxy_bypass",
             return_value=True,
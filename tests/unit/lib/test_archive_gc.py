@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for archive retention and compaction."""
+
+from __future__ import annotations
+
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from terok.lib.core.config import ArchiveRetention, deleted_projects_dir
+from terok.lib.orchestration import archive_gc
+from terok.lib.orchestration.archive_gc import gc_archives
+from terok.lib.orchestration.archive_index import read_archive_index
+from terok.lib.orchestration.tasks import tasks_archive_dir
+from terok.lib.util.fs import disk_usages
+
+NOW = datetime(2026, 6, 15, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Isolated state root with the gc clock fixed at :data:`NOW`."""
+    monkeypatch.setenv("TEROK_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(
+        archive_gc, "datetime", type("_Clock", (datetime,), {"now": staticmethod(lambda tz: NOW)})
+    )
+    return tmp_path / "state"
+
+
+def _archives(project_id: str, *stamps: str, size: int = 0) -> None:
+    """Create one task archive per timestamp, each holding *size* bytes of logs."""
+    root = tasks_archive_dir(project_id)
+    for n, ts in enumerate(stamps, 1):
+        logs = root / f"{ts}_{n}" / "logs"
+        logs.mkdir(parents=True)
+        (root / f"{ts}_{n}" / "task.yml").write_text(f"task_id: '{n}'\n")
+        (logs / "container.log").write_bytes(os.urandom(size))
+
+
+def _ids(project_id: str) -> list[str]:
+    """Return the task IDs left in the project's archive, oldest first."""
+    return [e.task_id for e in read_archive_index(tasks_archive_dir(project_id))]
+
+
+STAMPS = ("20260101T000000Z", "20260301T000000Z", "20260601T000000Z", "20260610T000000Z")
+
+
+class TestTaskArchiveRetention:
+    """Age, count and size rules on per-project task archives."""
+
+    def test_max_age(self) -> None:
+        _archives("p", *STAMPS)
+        report = gc_archives(policy=ArchiveRetention(max_age_days=120, bundle_after_days=0))
+        assert report is not None and len(report.removed) == 1
+        assert _ids("p") == ["2", "3", "4"]
+
+    def test_keep_last_per_project(self) -> None:
+        _archives("p", *STAMPS)
+        _archives("q", *STAMPS[:2])
+        gc_archives(policy=ArchiveRetention(keep_last=2, bundle_after_days=0))
+        assert _ids("p") == ["3", "4"]
+        assert _ids("q") == ["1", "2"]
+
+    def test_max_total_removes_oldest(self) -> None:
+        _archives("p", *STAMPS, size=400 * 1024)
+        gc_archives(policy=ArchiveRetention(max_total_mb=1, bundle_after_days=0))
+        assert _ids("p") == ["3", "4"]
+
+    def test_dry_run_keeps_everything(self) -> None:
+        _archives("p", *STAMPS)
+        report = gc_archives(dry_run=True, policy=ArchiveRetention(keep_last=1))
+        assert report is not None
+        assert len(report.removed) == 3 and report.bundled == 0
+        assert _ids("p") == ["1", "2", "3", "4"]
+
+    def test_old_archives_are_bundled_by_month(self) -> None:
+        _archives("p", *STAMPS)
+        report = gc_archives(policy=ArchiveRetention(bundle_after_days=30))
+        assert report is not None and report.bundled == 2
+        entries = read_archive_index(tasks_archive_dir("p"))
+        assert [e.bundle for e in entries] == ["2026-01.tar", "2026-03.tar", None, None]
+
+    def test_running_collection_is_not_doubled(self, state: Path) -> None:
+        state.mkdir(parents=True)
+        fd = archive_gc._try_lock(state / archive_gc._GC_LOCK_FILENAME)
+        try:
+            assert gc_archives(policy=ArchiveRetention()) is None
+        finally:
+            os.close(fd)
+
+
+class TestDeletedProjects:
+    """Retention of deleted-project tarballs."""
+
+    def test_keep_last_per_project_and_total(self) -> None:
+        root = deleted_projects_dir()
+        root.mkdir(parents=True)
+        for name in (
+            "20260101T000000Z_alpha",
+            "20260201T000000Z_alpha",
+            "20260301T000000Z_beta",
+            "20260401T000000Z_gamma",
+        ):
+            (root / f"{name}.tar.gz").write_bytes(b"x" * (600 * 1024))
+
+        report = gc_archives(policy=ArchiveRetention(keep_last=1, max_total_mb=1))
+
+        assert report is not None
+        assert sorted(p.name for p in root.iterdir()) == ["20260401T000000Z_gamma.tar.gz"]
+
+    def test_project_scope_leaves_tarballs(self) -> None:
+        root = deleted_projects_dir()
+        root.mkdir(parents=True)
+        (root / "20200101T000000Z_old.tar.gz").write_bytes(b"x")
+        gc_archives("p", policy=ArchiveRetention(max_age_days=1))
+        assert (root / "20200101T000000Z_old.tar.gz").exists()
+
+
+def test_disk_usages_walks_trees(tmp_path: Path) -> None:
+    """Each tree is measured on its own, symlinks not followed."""
+    for name in ("a", "b"):
+        (tmp_path / name / "sub").mkdir(parents=True)
+        (tmp_path / name / "sub" / "f").write_bytes(os.urandom(64 * 1024))
+    (tmp_path / "b" / "link").symlink_to(tmp_path / "a")
+    a, b = disk_usages([tmp_path / "a", tmp_path / "b"])
+    assert a >= 64 * 1024
+    assert a <= b < 2 * a
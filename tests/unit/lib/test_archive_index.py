@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the task archive index."""
+
+from __future__ import annotations
+
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration import archive_index
+from terok.lib.orchestration.archive_index import (
+    archives_since,
+    bundle_archives,
+    entry_log_file,
+    find_archives,
+    index_is_current,
+    index_path,
+    read_archive_index,
+    record_archive,
+    remove_archives,
+)
+from terok.lib.util.log_store import iter_log_lines
+from terok.lib.util.yaml import dump as yaml_dump
+
+
+def _archive(root: Path, dir_name: str, *, logs: str | None = None) -> Path:
+    """Create an archive entry named *dir_name* with metadata and optional logs."""
+    entry = root / dir_name
+    entry.mkdir(parents=True)
+    ts, task_id, *rest = dir_name.split("_", 2)
+    (entry / "task.yml").write_text(
+        yaml_dump(
+            {"task_id": task_id, "name": rest[0] if rest else "", "mode": "cli", "exit_code": 0}
+        )
+    )
+    if logs is not None:
+        (entry / "logs").mkdir()
+        (entry / "logs" / "container.log").write_text(logs)
+    return entry
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    """An archive root with three legacy (unindexed) entries."""
+    root = tmp_path / "archive"
+    for name in ("20260301T100000Z_1_a", "20260302T100000Z_2_b", "20260303T100000Z_3"):
+        _archive(root, name)
+    return root
+
+
+class TestIndex:
+    """Building, appending to and reading the index."""
+
+    def test_legacy_archive_is_indexed_on_first_read(self, root: Path) -> None:
+        entries = read_archive_index(root)
+
+        assert [e.task_id for e in entries] == ["1", "2", "3"]
+        assert entries[0].name == "a" and entries[0].mode == "cli"
+        assert entries[2].archived_at == "20260303T100000Z"
+        assert index_path(root).is_file() and index_is_current(root)
+
+    def test_record_appends_without_reparsing(self, root: Path) -> None:
+        read_archive_index(root)
+        entry = _archive(root, "20260304T100000Z_4_d", logs="x" * 5000)
+        record_archive(entry)
+
+        with patch.object(archive_index, "_yaml_load") as load:
+            entries = read_archive_index(root)
+        load.assert_not_called()
+        assert entries[-1].task_id == "4"
+        assert entries[-1].log_size >= 5000
+
+    def test_record_rebuilds_index_that_was_not_current(self, root: Path) -> None:
+        current = index_is_current(root)
+        record_archive(_archive(root, "20260304T100000Z_4"), rebuild=not current)
+        assert [e.task_id for e in read_archive_index(root)] == ["1", "2", "3", "4"]
+
+    def test_unindexed_entries_trigger_rebuild(self, root: Path) -> None:
+        read_archive_index(root)
+        index = index_path(root)
+        os.utime(index, ns=(0, 0))
+        _archive(root, "20260304T100000Z_4")
+        assert len(read_archive_index(root)) == 4
+
+    def test_missing_root_is_empty(self, tmp_path: Path) -> None:
+        assert read_archive_index(tmp_path / "none") == []
+
+
+class TestLookup:
+    """Binary-search prefix and time lookups."""
+
+    def test_find_by_prefix_newest_first(self, root: Path) -> None:
+        _archive(root, "20260303T100000Z_3_1")
+        names = [e.dir_name for e in find_archives(root, "20260303")]
+        assert names == ["20260303T100000Z_3_1", "20260303T100000Z_3"]
+        assert find_archives(root, "20990101") == []
+        assert find_archives(root, "20260301T100000Z_1_a")[0].task_id == "1"
+
+    def test_since(self, root: Path) -> None:
+        entries = read_archive_index(root)
+        since = datetime(2026, 3, 2, tzinfo=UTC).strftime("%Y%m%dT%H%M%S%fZ")
+        assert [e.task_id for e in archives_since(entries, since)] == ["2", "3"]
+
+
+class TestBundles:
+    """Packing entries into monthly bundles and reading them back."""
+
+    def test_bundled_entries_stay_indexed_and_readable(self, root: Path) -> None:
+        _archive(root, "20260304T100000Z_4_d", logs="hello\n")
+        entries = read_archive_index(root)
+        bundle_archives(root, entries[2:], "2026-03.tar")
+
+        assert not (root / "20260304T100000Z_4_d").exists()
+        entries = read_archive_index(root)
+        assert [e.bundle for e in entries] == [None, None, "2026-03.tar", "2026-03.tar"]
+        log = entry_log_file(root, find_archives(root, "20260304")[0])
+        assert b"".join(iter_log_lines(log)) == b"hello\n"
+
+    def test_rebuild_reads_bundles(self, root: Path) -> None:
+        bundle_archives(root, read_archive_index(root), "2026-03.tar")
+        index_path(root).unlink()
+        entries = read_archive_index(root)
+        assert [(e.task_id, e.name, e.bundle) for e in entries] == [
+            ("1", "a", "2026-03.tar"),
+            ("2", "b", "2026-03.tar"),
+            ("3", "", "2026-03.tar"),
+        ]
+
+    def test_remove_bundled_and_unpacked(self, root: Path) -> None:
+        entries = read_archive_index(root)
+        bundle_archives(root, entries[:2], "2026-03.tar")
+        entries = read_archive_index(root)
+        remove_archives(root, [entries[0], entries[2]])
+
+        assert [e.task_id for e in read_archive_index(root)] == ["2"]
+        assert not (root / "20260303T100000Z_3").exists()
+        index_path(root).unlink()
+        assert [e.task_id for e in read_archive_index(root)] == ["2"]
@@ -152,6 +152,16 @@ def prepare_agent_config(
         )
 
 
+def _exit_immediately(
+    cname: str, project_id: str, task_id: str, timeout: float | None = None
+) -> tuple[int, None]:
+    """Stand-in for the exit watcher: record exit code 0 like the watcher would."""
+    from terok.lib.orchestration.tasks import update_task_exit_code
+
+    update_task_exit_code(project_id, task_id, 0)
+    return 0, None
+
+
 def run_headless_request(
     base: Path,
     config_file: Path,
@@ -163,7 +173,8 @@ def run_headless_request(
             mock_git_config(),
             unittest.mock.patch("terok.lib.orchestration.task_runners._sandbox") as sandbox_factory,
             unittest.mock.patch(
-                "terok.lib.orchestration.task_runners.wait_for_exit", return_value=0
+                "terok.lib.orchestration.task_runners.wait_for_container_exit",
+                side_effect=_exit_immediately,
             ) as wait_mock,
             unittest.mock.patch("terok.lib.orchestration.task_runners._print_run_summary"),
         ):
@@ -200,7 +211,8 @@ def run_followup_request(
                 return_value=None if isinstance(container_state, list) else container_state,
             ),
             unittest.mock.patch(
-                "terok.lib.orchestration.task_runners.wait_for_exit", return_value=0
+                "terok.lib.orchestration.task_runners.wait_for_container_exit",
+                side_effect=_exit_immediately,
             ) as wait_mock,
             unittest.mock.patch("terok.lib.orchestration.task_runners._print_run_summary"),
         ):
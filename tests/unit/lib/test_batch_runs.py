@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for batch fan-out of headless runs."""
+
+import json
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from terok.lib.domain.batch_runs import (
+    BatchEntry,
+    BatchResult,
+    load_batch_file,
+    print_batch_summary,
+    run_batch,
+)
+
+MODULE = "terok.lib.domain.batch_runs"
+
+
+def write_batch(tmp_path: Path, text: str) -> Path:
+    """Write a batch file and return its path."""
+    path = tmp_path / "prompts.yml"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+class TestLoadBatchFile:
+    """Parsing and validation of batch files."""
+
+    def test_defaults_layering(self, tmp_path: Path) -> None:
+        path = write_batch(
+            tmp_path,
+            "defaults:\n  preset: review\n  model: sonnet\n"
+            "tasks:\n  - one\n  - prompt: two\n    model: opus\n    name: second\n",
+        )
+        entries = load_batch_file(path, defaults={"provider": "claude", "model": "haiku"})
+        assert entries == [
+            BatchEntry(prompt="one", provider="claude", preset="review", model="sonnet"),
+            BatchEntry(
+                prompt="two", name="second", provider="claude", preset="review", model="opus"
+            ),
+        ]
+
+    def test_plain_list(self, tmp_path: Path) -> None:
+        path = write_batch(tmp_path, "- a\n- prompt: b\n  agents: planner\n")
+        entries = load_batch_file(path)
+        assert [e.prompt for e in entries] == ["a", "b"]
+        assert entries[1].agents == ["planner"]
+
+    @pytest.mark.parametrize(
+        ("text", "message"),
+        [
+            pytest.param("[]\n", "non-empty list", id="empty"),
+            pytest.param("- prompt: x\n  colour: red\n", "unknown key(s) in task #1", id="key"),
+            pytest.param("- name: no-prompt\n", "task #1 has no prompt", id="no-prompt"),
+            pytest.param("defaults:\n  prompt: x\ntasks: [a]\n", "in defaults", id="def"),
+        ],
+    )
+    def test_invalid_files(self, tmp_path: Path, text: str, message: str) -> None:
+        with pytest.raises(SystemExit, match=message.replace("(", r"\(").replace(")", r"\)")):
+            load_batch_file(write_batch(tmp_path, text))
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        with pytest.raises(SystemExit, match="not found"):
+            load_batch_file(tmp_path / "nope.yml")
+
+
+class TestRunBatch:
+    """Scheduling through the bounded worker pool."""
+
+    @pytest.fixture
+    def harness(self):
+        """Patch launching, waiting and cost lookup; track peak concurrency."""
+        state = {"live": 0, "peak": 0, "next_id": 0}
+        lock = threading.Lock()
+
+        def launch(request, *, plan=None):
+            with lock:
+                state["next_id"] += 1
+                state["live"] += 1
+                state["peak"] = max(state["peak"], state["live"])
+                return str(state["next_id"])
+
+        def wait(cname, project_id, task_id, timeout=None):
+            time.sleep(0.02)
+            with lock:
+                state["live"] -= 1
+            return (0 if task_id != "2" else 1), None
+
+        with (
+            mock.patch(f"{MODULE}.resolve_headless_plan", return_value="plan") as plan,
+            mock.patch(f"{MODULE}.task_run_headless", side_effect=launch) as run,
+            mock.patch(f"{MODULE}.wait_for_container_exit", side_effect=wait),
+            mock.patch(f"{MODULE}._result_cost", return_value=0.5),
+        ):
+            yield state, plan, run
+
+    def test_concurrency_is_bounded(self, harness, capsys) -> None:
+        state, _, run = harness
+        entries = [BatchEntry(prompt=f"p{i}") for i in range(6)]
+        results = run_batch("proj", entries, jobs=2)
+        assert state["peak"] <= 2
+        assert run.call_count == 6
+        assert [r.index for r in results] == [1, 2, 3, 4, 5, 6]
+        assert sum(r.ok for r in results) == 5
+        out = capsys.readouterr().out
+        assert "[6/6 done, 0 running, 0 queued]" in out
+        assert "5/6 succeeded, total cost $3.0000" in out
+
+    def test_plans_are_resolved_once_per_config(self, harness) -> None:
+        _, plan, run = harness
+        entries = [
+            BatchEntry(prompt="a", preset="x"),
+            BatchEntry(prompt="b", preset="x"),
+            BatchEntry(prompt="c", preset="y"),
+        ]
+        run_batch("proj", entries, jobs=3)
+        assert plan.call_count == 2
+        assert all(call.kwargs["plan"] == "plan" for call in run.call_args_list)
+
+    def test_runner_output_is_not_swallowed(self, harness, capsys) -> None:
+        _, _, run = harness
+        launch = run.side_effect
+
+        def noisy(request, *, plan=None):
+            print("Warning: pre_start hook said hi")
+            return launch(request, plan=plan)
+
+        run.side_effect = noisy
+        run_batch("proj", [BatchEntry(prompt="a")], jobs=1)
+        assert run.call_args.args[0].quiet
+        assert "Warning: pre_start hook said hi" in capsys.readouterr().out
+
+    def test_launch_failure_is_recorded(self, harness, tmp_path: Path) -> None:
+        _, _, run = harness
+        run.side_effect = SystemExit("Agent config file not found: x")
+        summary = tmp_path / "summary.json"
+        results = run_batch("proj", [BatchEntry(prompt="a")], jobs=1, summary_path=summary)
+        assert results[0].task_id is None
+        assert "not found" in results[0].error
+        data = json.loads(summary.read_text())
+        assert data["succeeded"] == 0
+        assert data["tasks"][0]["error"] == results[0].error
+
+
+def test_summary_table_formats_missing_values(capsys) -> None:
+    print_batch_summary(
+        [
+            BatchResult(1, "fix", "3", 0, 75.0, 0.1234),
+            BatchResult(2, None, None, error="boom"),
+        ]
+    )
+    out = capsys.readouterr().out
+    assert "1m15s" in out and "$0.1234" in out
+    assert "(boom)" in out
+    assert "1/2 succeeded, total cost $0.1234" in out
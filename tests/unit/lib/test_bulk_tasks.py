@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for bulk task selection, deletion and stopping."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from terok.lib.orchestration.tasks import (
+    BulkOutcome,
+    select_tasks,
+    task_delete_many,
+    task_new,
+    task_stop_many,
+)
+from terok.lib.util.yaml import dump as yaml_dump, load as yaml_load
+from tests.test_utils import mock_git_config, project_env
+
+MODULE = "terok.lib.orchestration.tasks"
+
+
+def _set_meta(ctx: SimpleNamespace, project_id: str, task_id: str, **changes: object) -> None:
+    """Update metadata keys of a generated task."""
+    path = ctx.state_dir / "projects" / project_id / "tasks" / f"{task_id}.yml"
+    meta = yaml_load(path.read_text()) or {}
+    meta.update(changes)
+    path.write_text(yaml_dump(meta), encoding="utf-8")
+
+
+def _age(ctx: SimpleNamespace, project_id: str, task_id: str, seconds: float) -> None:
+    """Backdate the metadata of a task by *seconds*."""
+    path = ctx.state_dir / "projects" / project_id / "tasks" / f"{task_id}.yml"
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+class TestSelectTasks:
+    """Selecting tasks by status and age."""
+
+    def test_selectors_combine(self) -> None:
+        project_id = "proj_select"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            with mock_git_config():
+                ids = [task_new(project_id) for _ in range(3)]
+            for tid in ids:
+                _set_meta(ctx, project_id, tid, mode="run", exit_code=0)
+            _age(ctx, project_id, ids[0], 3 * 86400)
+            _age(ctx, project_id, ids[1], 3 * 86400)
+            states = {ids[0]: "exited", ids[1]: "running", ids[2]: "exited"}
+
+            with patch(f"{MODULE}.get_all_task_states", return_value=states) as live:
+                assert [t.task_id for t in select_tasks(project_id)] == ids
+                old = select_tasks(project_id, older_than=86400)
+                done = select_tasks(project_id, status="completed", older_than=86400)
+
+            assert [t.task_id for t in old] == ids[:2]
+            assert [t.task_id for t in done] == [ids[0]]
+            live.assert_called_once()
+
+
+class TestTaskDeleteMany:
+    """Deleting several tasks at once."""
+
+    def test_containers_stopped_in_one_call(self) -> None:
+        project_id = "proj_bulk_delete"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            with mock_git_config():
+                ids = [task_new(project_id) for _ in range(4)]
+            meta_dir = ctx.state_dir / "projects" / project_id / "tasks"
+            seen: list[BulkOutcome] = []
+
+            with (
+                mock_git_config(),
+                patch(f"{MODULE}.stop_task_containers") as stop,
+                patch("terok_sandbox.revoke_token_for_task") as revoke,
+            ):
+                outcomes = task_delete_many(project_id, ids, workers=2, progress=seen.append)
+
+            assert [o.task_id for o in outcomes] == ids
+            assert {o.status for o in outcomes} == {"ok"}
+            assert sorted(o.task_id for o in seen) == sorted(ids)
+            stop.assert_called_once()
+            [names] = stop.call_args.args
+            assert f"{project_id}-cli-{ids[3]}" in names
+            assert len(names) == 4 * len(ids)
+            assert revoke.call_count == len(ids)
+            assert not any(meta_dir.glob("*.yml"))
+
+    def test_failed_archive_spares_the_task(self) -> None:
+        project_id = "proj_bulk_fail"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            with mock_git_config():
+                ids = [task_new(project_id) for _ in range(2)]
+            meta_dir = ctx.state_dir / "projects" / project_id / "tasks"
+            (meta_dir / f"{ids[0]}.yml").write_text("mode: [unclosed\n")
+
+            with (
+                mock_git_config(),
+                patch(f"{MODULE}.stop_task_containers") as stop,
+                patch("terok_sandbox.revoke_token_for_task"),
+            ):
+                first, second = task_delete_many(project_id, ids)
+
+            assert first.status == "failed"
+            assert second.status == "ok"
+            assert (meta_dir / f"{ids[0]}.yml").is_file()
+            assert f"{project_id}-cli-{ids[0]}" not in stop.call_args.args[0]
+
+
+class TestTaskStopMany:
+    """Stopping several tasks at once."""
+
+    def test_running_tasks_stopped_in_one_call(self) -> None:
+        project_id = "proj_bulk_stop"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            with mock_git_config():
+                ids = [task_new(project_id) for _ in range(3)]
+            for tid in ids:
+                _set_meta(ctx, project_id, tid, mode="cli")
+            states = {
+                f"{project_id}-cli-{ids[0]}": "running",
+                f"{project_id}-cli-{ids[1]}": "exited",
+                f"{project_id}-cli-{ids[2]}": "paused",
+            }
+
+            with (
+                mock_git_config(),
+                patch(f"{MODULE}.get_project_container_states", return_value=states),
+                patch(
+                    f"{MODULE}.subprocess.run",
+                    return_value=subprocess.CompletedProcess([], 0),
+                ) as run,
+            ):
+                outcomes = task_stop_many(project_id, ids, timeout=5)
+
+            assert [o.status for o in outcomes] == ["ok", "skipped", "ok"]
+            run.assert_called_once()
+            assert run.call_args.args[0] == [
+                "podman",
+                "stop",
+                "--time",
+                "5",
+                f"{project_id}-cli-{ids[0]}",
+                f"{project_id}-cli-{ids[2]}",
+            ]
+
+    def test_containers_left_running_are_failed(self) -> None:
+        project_id = "proj_bulk_stop_fail"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            with mock_git_config():
+                ids = [task_new(project_id) for _ in range(2)]
+            for tid in ids:
+                _set_meta(ctx, project_id, tid, mode="cli")
+            before = {f"{project_id}-cli-{tid}": "running" for tid in ids}
+            after = {**before, f"{project_id}-cli-{ids[0]}": "exited"}
+
+            with (
+                mock_git_config(),
+                patch(f"{MODULE}.get_project_container_states", side_effect=[before, after]),
+                patch(
+                    f"{MODULE}.subprocess.run",
+                    return_value=subprocess.CompletedProcess([], 125),
+                ),
+            ):
+                outcomes = task_stop_many(project_id, ids)
+
+            assert [o.status for o in outcomes] == ["ok", "failed"]
@@ -115,6 +115,17 @@ def test_tui_default_tmux(
     assert cfg.get_tui_default_tmux() is expected
 
 
+def test_queue_limits_are_read_from_global_config(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    text = "queue:\n  max_running: 4\n  max_cpus: 6.5\n  task_memory_mb: 1024\n"
+    monkeypatch.setenv("TEROK_CONFIG_FILE", str(write_config(tmp_path, text)))
+    assert cfg.get_queue_limits() == cfg.QueueLimits(
+        max_running=4, max_cpus=6.5, task_memory_mb=1024
+    )
+
+
 def test_experimental_flag_roundtrip() -> None:
     assert not cfg.is_experimental()
     cfg.set_experimental(True)
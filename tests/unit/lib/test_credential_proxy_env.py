@@ -15,6 +15,16 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    """Start every test without cached registry, reachability or credential sets."""
+    from terok.lib.orchestration.environment import clear_credential_proxy_caches
+
+    clear_credential_proxy_caches()
+    yield
+    clear_credential_proxy_caches()
+
+
 @pytest.fixture()
 def _enable_proxy():
     """Override the autouse bypass to test the proxy-enabled path."""
@@ -122,3 +132,79 @@ class TestCredentialProxyEnv:
         assert "MISTRAL_API_KEY" in env
         # Claude NOT stored → no phantom token
         assert "ANTHROPIC_API_KEY" not in env
+
+
+ENV_MODULE = "terok.lib.orchestration.environment"
+
+
+def _fake_registry() -> MagicMock:
+    """Return a registry routing ``claude`` and ``vibe`` through the proxy."""
+    registry = MagicMock()
+    registry.proxy_routes = {
+        "claude": MagicMock(phantom_env=["ANTHROPIC_API_KEY"], base_url_env=None),
+        "vibe": MagicMock(phantom_env=["MISTRAL_API_KEY"], base_url_env=None),
+    }
+    registry.providers = {}
+    return registry
+
+
+@pytest.mark.usefixtures("_enable_proxy")
+class TestCredentialProxyCaching:
+    """Registry, reachability and credential-set lookups are shared across launches."""
+
+    def test_repeated_launches_reuse_lookups(self, tmp_path: Path) -> None:
+        from terok.lib.orchestration.environment import _credential_proxy_env_and_volumes
+
+        db = MagicMock()
+        db.list_credentials.return_value = ["claude"]
+        db.create_proxy_token.side_effect = lambda _p, task, _s, name: f"{task}-{name}"
+        project = MagicMock()
+        project.id = "proj"
+        with (
+            patch("terok_sandbox.SandboxConfig") as cfg_cls,
+            patch("terok_sandbox.get_proxy_port", return_value=18731),
+            patch("terok_sandbox.ensure_proxy_reachable") as reachable,
+            patch("terok_agent.get_registry", return_value=_fake_registry()) as registry,
+            patch(f"{ENV_MODULE}._open_credential_db", return_value=db),
+        ):
+            cfg_cls.return_value.proxy_db_path = tmp_path / "credentials.db"
+            first, _ = _credential_proxy_env_and_volumes(project, "1")
+            second, _ = _credential_proxy_env_and_volumes(project, "2")
+
+        assert (first["ANTHROPIC_API_KEY"], second["ANTHROPIC_API_KEY"]) == ("1-claude", "2-claude")
+        assert "MISTRAL_API_KEY" not in first
+        reachable.assert_called_once_with()
+        registry.assert_called_once_with()
+        db.list_credentials.assert_called_once_with("default")
+
+    def test_unreachable_proxy_is_not_cached(self) -> None:
+        from terok.lib.orchestration.environment import _ensure_proxy_reachable_cached
+
+        with patch("terok_sandbox.ensure_proxy_reachable", side_effect=[SystemExit("down"), None]):
+            with pytest.raises(SystemExit):
+                _ensure_proxy_reachable_cached()
+            _ensure_proxy_reachable_cached()
+            _ensure_proxy_reachable_cached()
+
+
+class TestMintProxyTokens:
+    """Minting every provider's token for a task."""
+
+    def test_one_db_session_for_all_providers(self, tmp_path: Path) -> None:
+        from terok.lib.orchestration.environment import mint_proxy_tokens
+
+        db = MagicMock()
+        db.create_proxy_token.side_effect = lambda _p, task, _s, name: f"{task}-{name}"
+        with patch(f"{ENV_MODULE}._open_credential_db", return_value=db) as opener:
+            tokens = mint_proxy_tokens("proj", "1", {"vibe", "claude"}, db_path=tmp_path / "c.db")
+
+        assert tokens == {"claude": "1-claude", "vibe": "1-vibe"}
+        opener.assert_called_once_with(tmp_path / "c.db")
+        db.close.assert_called_once_with()
+
+    def test_nothing_routed_skips_the_db(self) -> None:
+        from terok.lib.orchestration.environment import mint_proxy_tokens
+
+        with patch(f"{ENV_MODULE}._open_credential_db") as opener:
+            assert mint_proxy_tokens("proj", "1", []) == {}
+        opener.assert_not_called()
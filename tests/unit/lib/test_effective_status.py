@@ -45,6 +45,8 @@ EFFECTIVE_STATUS_CASES = [
     ({"container_state": None, "mode": "run", "exit_code": 2}, "failed"),
     ({"container_state": "running", "mode": "cli", "deleting": True}, "deleting"),
     ({"container_state": "running", "mode": "cli", "deleting": False}, "running"),
+    ({"container_state": None, "mode": None, "queued": True}, "queued"),
+    ({"container_state": "running", "mode": "run", "queued": True}, "running"),
     ({}, "created"),
 ]
 
@@ -70,6 +72,8 @@ MODE_INFO_CASES = [
         "no-container-failure",
         "deleting-overrides-all",
         "deleting-false-ignored",
+        "queued-waiting",
+        "queued-but-started",
         "minimal-defaults",
     ],
 )
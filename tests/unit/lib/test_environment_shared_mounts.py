@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the lazily built shared-mount table and its directory probes."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from terok.lib import orchestration
+from terok.lib.orchestration import environment
+
+MODULE = "terok.lib.orchestration.environment"
+
+
+def _mounts(*names: str) -> tuple[environment.SharedMount, ...]:
+    """Build shared mounts named after *names*."""
+    return tuple(environment.SharedMount(n, n, n.title(), f"/home/dev/.{n}") for n in names)
+
+
+@pytest.fixture
+def shared(tmp_path: Path) -> Iterator[Path]:
+    """Two shared mounts and an empty probe cache; yields the envs base dir."""
+    with patch(f"{MODULE}.get_shared_mounts", return_value=_mounts("codex", "vibe")):
+        environment._verified_dirs.clear()
+        yield tmp_path
+        environment._verified_dirs.clear()
+
+
+class TestSharedMounts:
+    """The registry is parsed on first use, not on import."""
+
+    def test_import_does_not_load_registry(self) -> None:
+        registry = MagicMock()
+        try:
+            with patch("terok_agent.get_registry", registry):
+                sys.modules.pop(MODULE, None)
+                module = importlib.import_module(MODULE)
+        finally:
+            sys.modules[MODULE] = environment
+            orchestration.environment = environment
+        registry.assert_not_called()
+        assert module is not environment
+
+    def test_mounts_are_cached(self) -> None:
+        mount = MagicMock(host_dir="_codex-config", label="Codex", container_path="/c")
+        environment.get_shared_mounts.cache_clear()
+        try:
+            with patch("terok_agent.get_registry") as get_registry:
+                get_registry.return_value.mounts = [mount]
+                first = environment.get_shared_mounts()
+                assert environment.get_shared_mounts() is first
+            get_registry.assert_called_once_with()
+            assert first[0].container_path == "/c"
+        finally:
+            environment.get_shared_mounts.cache_clear()
+
+
+class TestSharedDirProbes:
+    """Writability probes run once per unchanged directory."""
+
+    def test_verified_dirs_are_not_probed_again(self, shared: Path) -> None:
+        with patch(f"{MODULE}.ensure_dir_writable", wraps=environment.ensure_dir_writable) as probe:
+            dirs = environment._ensure_shared_dirs(shared)
+            environment._ensure_shared_dirs(shared)
+        assert probe.call_count == 2
+        assert dirs == {"codex": shared / "codex", "vibe": shared / "vibe"}
+
+    def test_changed_or_missing_dirs_are_probed(self, shared: Path) -> None:
+        environment._ensure_shared_dirs(shared)
+        (shared / "codex").chmod(0o700)
+        (shared / "vibe").rmdir()
+        with patch(f"{MODULE}.ensure_dir_writable", wraps=environment.ensure_dir_writable) as probe:
+            environment._ensure_shared_dirs(shared)
+        assert sorted(c.args[0].name for c in probe.call_args_list) == ["codex", "vibe"]
+        assert (shared / "vibe").is_dir()
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the shared event-driven container exit watcher."""
+
+import json
+import subprocess
+from unittest import mock
+
+import pytest
+
+from terok.lib.orchestration.exit_watcher import ContainerExit, ExitWatcher
+
+
+def _ps(*rows: str) -> subprocess.CompletedProcess:
+    """Build a fake ``podman ps -a`` result with tab-separated *rows*."""
+    return subprocess.CompletedProcess([], 0, stdout="".join(f"{r}\n" for r in rows), stderr="")
+
+
+def _died(name: str, code: int | None) -> bytes:
+    """Build one ``podman events --format json`` line for a died event."""
+    event = {"Name": name, "Status": "died", "Type": "container"}
+    if code is not None:
+        event["ContainerExitCode"] = code
+    return json.dumps(event).encode()
+
+
+@pytest.fixture
+def update_exit_code():
+    """Patch the metadata writer used by the watcher."""
+    with mock.patch("terok.lib.orchestration.exit_watcher.update_task_exit_code") as m:
+        yield m
+
+
+@pytest.fixture
+def watcher():
+    """An ExitWatcher whose background thread never starts."""
+    w = ExitWatcher()
+    with mock.patch("terok.lib.orchestration.exit_watcher.threading.Thread"):
+        yield w
+
+
+class TestEvents:
+    """Resolution driven by ``podman events``."""
+
+    def test_died_event_records_exit_and_notifies(self, watcher, update_exit_code) -> None:
+        seen: list[ContainerExit] = []
+        watcher.watch("p-run-1", "p", "1", seen.append)
+        watcher._handle_event(_died("p-run-1", 3))
+        update_exit_code.assert_called_once_with("p", "1", 3)
+        assert seen == [ContainerExit("p-run-1", "p", "1", 3)]
+        assert watcher.watched() == []
+
+    def test_unwatched_container_is_ignored(self, watcher, update_exit_code) -> None:
+        watcher.watch("p-run-1", "p", "1")
+        watcher._handle_event(_died("other", 0))
+        update_exit_code.assert_not_called()
+        assert watcher.watched() == ["p-run-1"]
+
+    def test_missing_exit_code_defers_to_reconcile(self, watcher, update_exit_code) -> None:
+        watcher.watch("p-run-1", "p", "1")
+        watcher._reconcile_pending = False
+        watcher._handle_event(_died("p-run-1", None))
+        update_exit_code.assert_not_called()
+        assert watcher._reconcile_pending
+
+    def test_subscribers_see_every_exit(self, watcher, update_exit_code) -> None:
+        seen: list[str] = []
+        unsubscribe = watcher.subscribe(lambda r: seen.append(r.cname))
+        watcher.watch("p-run-1", "p", "1")
+        watcher.watch("p-run-2", "p", "2")
+        watcher._handle_event(_died("p-run-1", 0))
+        unsubscribe()
+        watcher._handle_event(_died("p-run-2", 0))
+        assert seen == ["p-run-1"]
+
+
+class TestReconcile:
+    """Low-frequency reconciliation against ``podman ps -a``."""
+
+    def test_exited_and_missing_containers_resolve(self, watcher, update_exit_code) -> None:
+        seen: dict[str, ContainerExit] = {}
+        for tid in ("1", "2", "3"):
+            watcher.watch(f"p-run-{tid}", "p", tid, lambda r: seen.__setitem__(r.task_id, r))
+        ps = _ps("p-run-1\texited\t0", "p-run-2\trunning\t0", "unrelated\texited\t1")
+        with mock.patch("terok.lib.orchestration.exit_watcher.subprocess.run", return_value=ps):
+            assert watcher._reconcile()
+        assert seen["1"].exit_code == 0
+        assert seen["3"].error == "container not found"
+        assert watcher.watched() == ["p-run-2"]
+        update_exit_code.assert_called_once_with("p", "1", 0)
+
+    def test_podman_failure_keeps_watches(self, watcher, update_exit_code) -> None:
+        watcher.watch("p-run-1", "p", "1")
+        with mock.patch(
+            "terok.lib.orchestration.exit_watcher.subprocess.run", side_effect=FileNotFoundError
+        ):
+            assert not watcher._reconcile()
+        assert watcher.watched() == ["p-run-1"]
+
+
+class TestWait:
+    """Blocking waits served by the watcher thread."""
+
+    def test_wait_falls_back_to_polling(self, update_exit_code) -> None:
+        watcher = ExitWatcher(poll_interval=0.01)
+        with (
+            mock.patch.object(watcher, "_open_events", return_value=None),
+            mock.patch(
+                "terok.lib.orchestration.exit_watcher.subprocess.run",
+                side_effect=[_ps("p-run-1\trunning\t0"), _ps("p-run-1\texited\t7")],
+            ),
+        ):
+            result = watcher.wait("p-run-1", "p", "1", timeout=5)
+        assert result is not None and result.exit_code == 7
+        watcher.stop()
+        assert watcher._thread is None
+
+    def test_wait_times_out(self, watcher) -> None:
+        assert watcher.wait("p-run-1", "p", "1", timeout=0.01) is None
+        assert watcher.watched() == []
+
+    def test_timeout_keeps_explicit_watches(self, watcher) -> None:
+        watcher.watch("p-run-1", "p", "1")
+        assert watcher.wait("p-run-1", "p", "1", timeout=0.01) is None
+        assert watcher.watched() == ["p-run-1"]
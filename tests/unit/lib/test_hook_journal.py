@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the hook run journal."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration import hook_journal
+from terok.lib.orchestration.hook_journal import (
+    append_hook_record,
+    journal_path,
+    journal_project_ids,
+    last_hooks_by_task,
+    new_hook_record,
+    pending_hook_runs,
+    read_hook_journal,
+)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the hook journal at a temporary state directory."""
+    monkeypatch.setenv("TEROK_STATE_DIR", str(tmp_path / "state"))
+    return tmp_path / "state"
+
+
+def _queued(task_id: str, hook: str = "post_stop", project_id: str = "proj"):
+    """Append and return a queued run of *hook* for *task_id*."""
+    rec = new_hook_record(
+        hook, "true", project_id=project_id, task_id=task_id, mode="cli", cname="c", state="queued"
+    )
+    append_hook_record(rec)
+    return rec
+
+
+class TestHookJournal:
+    """Reading pending and latest runs back from the journal."""
+
+    def test_pending_until_finished(self) -> None:
+        first = _queued("1")
+        _queued("2", project_id="other")
+        assert [r.run_id for r in pending_hook_runs("proj")] == [first.run_id]
+        assert len(pending_hook_runs()) == 2
+
+        append_hook_record(first.finished("ok"))
+        assert pending_hook_runs("proj") == []
+        assert last_hooks_by_task("proj")["1"]["post_stop"].state == "ok"
+        assert journal_project_ids() == ["other", "proj"]
+
+    def test_torn_lines_are_skipped(self) -> None:
+        rec = _queued("1")
+        with journal_path("proj").open("a") as fh:
+            fh.write('{"run_id": "x", "hook"\n')
+        assert read_hook_journal("proj") == [rec]
+
+    def test_large_journal_is_compacted(self) -> None:
+        pending = _queued("0")
+        with patch.object(hook_journal, "COMPACT_BYTES", 4096):
+            for i in range(40):
+                append_hook_record(_queued("1").finished("ok"))
+                append_hook_record(_queued("2", hook="post_start").finished("failed", str(i)))
+        records = read_hook_journal("proj")
+        assert len(records) < 40
+        assert pending_hook_runs("proj") == [pending]
+        latest = last_hooks_by_task("proj")
+        assert latest["2"]["post_start"].detail == "39"
+        assert latest["1"]["post_stop"].state == "ok"
@@ -5,13 +5,32 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
 import unittest.mock
 from pathlib import Path
 
 import pytest
 
-from terok.lib.orchestration.hooks import _build_hook_env, _record_hook, run_hook
+from terok.lib.orchestration import hooks
+from terok.lib.orchestration.hook_journal import (
+    append_hook_record,
+    new_hook_record,
+    read_hook_journal,
+)
+from terok.lib.orchestration.hooks import (
+    _build_hook_env,
+    run_hook,
+    run_pending_hooks,
+    run_project_hook,
+)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the hook journal at a temporary state directory."""
+    monkeypatch.setenv("TEROK_STATE_DIR", str(tmp_path / "state"))
+    return tmp_path / "state"
 
 
 class TestBuildHookEnv:
@@ -44,40 +63,6 @@ class TestBuildHookEnv:
         assert env["MY_CUSTOM_VAR"] == "hello"
 
 
-class TestRecordHook:
-    """Tests for _record_hook metadata tracking."""
-
-    def test_record_hook_writes_to_metadata(self, tmp_path: Path) -> None:
-        """Verify _record_hook appends hook_name to hooks_fired list."""
-        from terok.lib.util.yaml import dump as _yaml_dump, load as _yaml_load
-
-        meta_path = tmp_path / "1.yml"
-        meta_path.write_text(_yaml_dump({"task_id": "1", "mode": "cli"}))
-
-        _record_hook(meta_path, "post_start")
-
-        meta = _yaml_load(meta_path.read_text())
-        assert meta["hooks_fired"] == ["post_start"]
-
-    def test_record_hook_appends_without_duplicates(self, tmp_path: Path) -> None:
-        """Verify _record_hook doesn't duplicate existing entries."""
-        from terok.lib.util.yaml import dump as _yaml_dump, load as _yaml_load
-
-        meta_path = tmp_path / "1.yml"
-        meta_path.write_text(_yaml_dump({"task_id": "1", "hooks_fired": ["post_start"]}))
-
-        _record_hook(meta_path, "post_start")
-        _record_hook(meta_path, "post_ready")
-
-        meta = _yaml_load(meta_path.read_text())
-        assert meta["hooks_fired"] == ["post_start", "post_ready"]
-
-    def test_record_hook_skips_missing_file(self, tmp_path: Path) -> None:
-        """Verify _record_hook is a no-op when the metadata file doesn't exist."""
-        meta_path = tmp_path / "nonexistent.yml"
-        _record_hook(meta_path, "post_start")  # should not raise
-
-
 class TestRunHook:
     """Tests for run_hook execution."""
 
@@ -206,43 +191,107 @@ class TestRunHook:
                 cname="c",
             )
 
-    def test_run_hook_with_meta_path_records(self, tmp_path: Path) -> None:
-        """Verify run_hook records the hook name in metadata when meta_path is given."""
-        from terok.lib.util.yaml import dump as _yaml_dump, load as _yaml_load
+    def test_outcome_is_journaled(self) -> None:
+        """Verify a finished hook is recorded with its outcome."""
+        with unittest.mock.patch(
+            "terok.lib.orchestration.hooks.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 3, "", ""),
+        ):
+            run_hook("post_start", "exit 3", project_id="p", task_id="1", mode="cli", cname="c")
+
+        [rec] = read_hook_journal("p")
+        assert (rec.hook, rec.task_id, rec.state) == ("post_start", "1", "failed")
+        assert rec.detail == "exit code 3"
 
-        meta_path = tmp_path / "1.yml"
-        meta_path.write_text(_yaml_dump({"task_id": "1", "mode": "cli"}))
+    def test_run_hook_records_even_without_command(self) -> None:
+        """Verify run_hook records even when command is None (hook point reached)."""
+        run_hook("post_ready", None, project_id="p", task_id="1", mode="cli", cname="c")
 
-        with unittest.mock.patch("terok.lib.orchestration.hooks.subprocess.run"):
-            run_hook(
-                "post_start",
-                "echo hi",
+        [rec] = read_hook_journal("p")
+        assert (rec.hook, rec.state, rec.command) == ("post_ready", "none", None)
+
+
+class TestBackgroundHooks:
+    """Tests for hooks handed to the background runner."""
+
+    def _project(self, tmp_path: Path, background: list[str]) -> unittest.mock.MagicMock:
+        """Return a project stub whose post_stop hook runs ``cleanup.sh``."""
+        project = unittest.mock.MagicMock(id="proj", tasks_root=tmp_path)
+        project.hook_post_stop = "cleanup.sh"
+        project.hook_background = background
+        return project
+
+    def test_background_hook_is_queued(self, tmp_path: Path) -> None:
+        """A background hook is journaled as queued and the runner is started."""
+        project = self._project(tmp_path, ["post_stop"])
+        with (
+            unittest.mock.patch("terok.lib.orchestration.hooks.subprocess.run") as mock_run,
+            unittest.mock.patch.object(hooks, "start_hook_runner") as start,
+        ):
+            run_project_hook(project, "post_stop", task_id="7", mode="cli", cname="c")
+
+        mock_run.assert_not_called()
+        start.assert_called_once_with()
+        [rec] = read_hook_journal("proj")
+        assert rec.state == "queued"
+        assert rec.task_dir == str(tmp_path / "7")
+
+    def test_foreground_hook_runs_inline(self, tmp_path: Path) -> None:
+        """Hooks not listed as background run before returning."""
+        project = self._project(tmp_path, [])
+        with (
+            unittest.mock.patch("terok.lib.orchestration.hooks.subprocess.run") as mock_run,
+            unittest.mock.patch.object(hooks, "start_hook_runner") as start,
+        ):
+            mock_run.return_value.returncode = 0
+            run_project_hook(project, "post_stop", task_id="7", mode="cli", cname="c")
+
+        mock_run.assert_called_once()
+        start.assert_not_called()
+        assert [r.state for r in read_hook_journal("proj")] == ["ok"]
+
+    def test_runner_completes_queued_hooks(self, tmp_path: Path) -> None:
+        """The runner executes every queued run and journals its outcome."""
+        for tid in ("1", "2"):
+            append_hook_record(
+                new_hook_record(
+                    "post_stop",
+                    "true",
+                    project_id="proj",
+                    task_id=tid,
+                    mode="cli",
+                    cname=f"c{tid}",
+                    state="queued",
+                )
+            )
+        with unittest.mock.patch("terok.lib.orchestration.hooks.subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            assert run_pending_hooks(max_workers=2) == 2
+
+        assert mock_run.call_count == 2
+        states = [r.state for r in read_hook_journal("proj")]
+        assert states == ["queued", "queued", "ok", "ok"]
+        assert run_pending_hooks() == 0
+
+    def test_runner_yields_to_active_runner(self, state_dir: Path) -> None:
+        """A second runner exits at once while the runner lock is held."""
+        append_hook_record(
+            new_hook_record(
+                "post_stop",
+                "true",
                 project_id="p",
                 task_id="1",
                 mode="cli",
                 cname="c",
-                meta_path=meta_path,
+                state="queued",
             )
-
-        meta = _yaml_load(meta_path.read_text())
-        assert "post_start" in meta["hooks_fired"]
-
-    def test_run_hook_records_even_without_command(self, tmp_path: Path) -> None:
-        """Verify run_hook records even when command is None (hook point reached)."""
-        from terok.lib.util.yaml import dump as _yaml_dump, load as _yaml_load
-
-        meta_path = tmp_path / "1.yml"
-        meta_path.write_text(_yaml_dump({"task_id": "1", "mode": "cli"}))
-
-        run_hook(
-            "post_ready",
-            None,
-            project_id="p",
-            task_id="1",
-            mode="cli",
-            cname="c",
-            meta_path=meta_path,
         )
-
-        meta = _yaml_load(meta_path.read_text())
-        assert "post_ready" in meta["hooks_fired"]
+        lock = state_dir / "hooks" / "runner.lock"
+        fd = hooks._try_lock(lock)
+        assert fd is not None
+        try:
+            with unittest.mock.patch("terok.lib.orchestration.hooks.subprocess.run") as mock_run:
+                assert run_pending_hooks() == 0
+            mock_run.assert_not_called()
+        finally:
+            os.close(fd)
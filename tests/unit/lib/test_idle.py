@@ -0,0 +1,215 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for idle-task detection and automatic stop."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.core.projects import load_project
+from terok.lib.orchestration import idle
+from terok.lib.orchestration.idle import cpu_percent, find_idle_tasks, stop_idle_tasks
+from terok.lib.orchestration.tasks import (
+    BulkOutcome,
+    TaskMeta,
+    _validate_login,
+    get_tasks,
+    mark_idle_stopped,
+)
+from terok.lib.util.yaml import load as yaml_load
+from tests.test_utils import project_env
+
+NOW = 1_800_000_000.0
+HOUR = 3600
+
+
+def _project(tmp_path: Path, *, idle_timeout: int = HOUR) -> SimpleNamespace:
+    """A project stub with an idle policy."""
+    return SimpleNamespace(
+        id="proj", tasks_root=tmp_path, idle_timeout=idle_timeout, idle_cpu_percent=1.0
+    )
+
+
+def _task(task_id: str, *, work_status: str | None = None) -> TaskMeta:
+    """A running CLI task."""
+    return TaskMeta(
+        task_id=task_id,
+        mode="cli",
+        workspace="",
+        web_port=None,
+        initialized=True,
+        work_status=work_status,
+    )
+
+
+def _find(project, tasks, *, last_output=None, cpu=None, started=NOW - 5 * HOUR):
+    """Run :func:`find_idle_tasks` against stubbed podman queries."""
+    with (
+        patch.object(idle, "load_project", return_value=project),
+        patch.object(idle, "get_tasks", return_value=tasks),
+        patch.object(
+            idle, "_started_at", return_value={f"proj-cli-{t.task_id}": started for t in tasks}
+        ),
+        patch.object(idle, "_last_output", return_value=last_output),
+        patch.object(idle, "cpu_percent", return_value=cpu or {}) as cpu_mock,
+    ):
+        return find_idle_tasks("proj", now=NOW), cpu_mock
+
+
+class TestFindIdleTasks:
+    """The idle rules."""
+
+    def test_quiet_task_is_idle(self, tmp_path: Path) -> None:
+        found, _ = _find(_project(tmp_path), [_task("1")], last_output=NOW - 2 * HOUR)
+
+        assert [(t.task_id, t.reason) for t in found] == [("1", "no output for 2h 0m")]
+
+    def test_recent_output_keeps_task(self, tmp_path: Path) -> None:
+        found, cpu = _find(_project(tmp_path), [_task("1")], last_output=NOW - 60)
+
+        assert found == []
+        cpu.assert_called_once_with([])
+
+    def test_recent_start_keeps_task(self, tmp_path: Path) -> None:
+        found, _ = _find(_project(tmp_path), [_task("1")], started=NOW - 600)
+
+        assert found == []
+
+    def test_resting_work_status(self, tmp_path: Path) -> None:
+        status = tmp_path / "1" / "agent-config" / "work-status.yml"
+        status.parent.mkdir(parents=True)
+        status.write_text("status: blocked\n")
+        os.utime(status, (NOW - 3 * HOUR, NOW - 3 * HOUR))
+        found, _ = _find(
+            _project(tmp_path), [_task("1", work_status="blocked")], last_output=NOW - 60
+        )
+
+        assert [t.reason for t in found] == ["work status 'blocked' for 3h 0m"]
+
+    def test_busy_cpu_keeps_task(self, tmp_path: Path) -> None:
+        found, _ = _find(
+            _project(tmp_path),
+            [_task("1"), _task("2")],
+            last_output=NOW - 2 * HOUR,
+            cpu={"proj-cli-1": 35.0, "proj-cli-2": 0.2},
+        )
+
+        assert [(t.task_id, t.reason) for t in found] == [("2", "no output for 2h 0m, CPU 0.2%")]
+
+    def test_disabled_policy_queries_nothing(self, tmp_path: Path) -> None:
+        with (
+            patch.object(idle, "load_project", return_value=_project(tmp_path, idle_timeout=0)),
+            patch.object(idle, "_started_at") as started,
+        ):
+            assert find_idle_tasks("proj") == []
+        started.assert_not_called()
+
+
+def test_cpu_percent_from_two_samples() -> None:
+    """CPU use is the CPU time spent between two samples."""
+    samples = [{"a": 1_000_000_000, "b": 0}, {"a": 1_500_000_000, "b": 0}]
+    with (
+        patch.object(idle, "_cpu_nanos", side_effect=samples),
+        patch.object(idle.time, "sleep"),
+        patch.object(idle.time, "monotonic", side_effect=[10.0, 12.0]),
+    ):
+        usage = cpu_percent(["a", "b"])
+
+    assert usage == {"a": pytest.approx(25.0), "b": 0.0}
+
+
+class TestStopIdleTasks:
+    """Stopping idle tasks records why."""
+
+    def test_stops_and_records(self) -> None:
+        found = [
+            idle.IdleTask("proj", "1", "proj-cli-1", "no output for 2h 0m"),
+            idle.IdleTask("proj", "2", "proj-cli-2", "no output for 3h 0m"),
+            idle.IdleTask("proj", "3", "proj-cli-3", "no output for 4h 0m"),
+        ]
+        outcomes = [
+            BulkOutcome("1"),
+            BulkOutcome("2", "failed", "podman stop failed"),
+            BulkOutcome("3", "failed", "post_stop hook failed"),
+        ]
+        states = {"proj-cli-2": "running", "proj-cli-3": "exited"}
+        with (
+            patch.object(idle, "find_idle_tasks", return_value=found),
+            patch.object(idle, "task_stop_many", return_value=outcomes) as stop,
+            patch.object(idle, "get_project_container_states", return_value=states),
+            patch.object(idle, "mark_idle_stopped") as mark,
+        ):
+            stopped = stop_idle_tasks()
+
+        stop.assert_called_once_with("proj", ["1", "2", "3"])
+        assert [t.task_id for t in stopped] == ["1", "3"]
+        assert [c.args[1] for c in mark.call_args_list] == ["1", "3"]
+
+    def test_dry_run_stops_nothing(self) -> None:
+        found = [idle.IdleTask("proj", "1", "proj-cli-1", "no output for 2h 0m")]
+        with (
+            patch.object(idle, "find_idle_tasks", return_value=found),
+            patch.object(idle, "task_stop_many") as stop,
+        ):
+            assert stop_idle_tasks(dry_run=True) == found
+        stop.assert_not_called()
+
+
+class TestIdleResume:
+    """Idle-stopped tasks start again on login."""
+
+    def _write_meta(self, ctx, project_id: str) -> Path:
+        """Write a CLI task's metadata and return its path."""
+        meta_dir = ctx.state_dir / "projects" / project_id / "tasks"
+        meta_dir.mkdir(parents=True)
+        meta_path = meta_dir / "1.yml"
+        meta_path.write_text("task_id: '1'\nname: t\nmode: cli\nworkspace: /w\n")
+        return meta_path
+
+    def test_mark_is_listed(self) -> None:
+        project_id = "proj_idle_mark"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            self._write_meta(ctx, project_id)
+            mark_idle_stopped(project_id, "1", "no output for 2h 0m")
+
+            assert get_tasks(project_id)[0].idle_reason == "no output for 2h 0m"
+
+    def test_login_resumes_idle_stopped_task(self) -> None:
+        project_id = "proj_idle_login"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            meta_path = self._write_meta(ctx, project_id)
+            mark_idle_stopped(project_id, "1", "no output for 2h 0m")
+
+            with (
+                patch(
+                    "terok.lib.orchestration.tasks.get_container_state",
+                    side_effect=["exited", "running"],
+                ),
+                patch("terok.lib.orchestration.tasks.subprocess.run") as run,
+                patch("terok.lib.orchestration.tasks.start_log_tee") as tee,
+                patch("terok.lib.orchestration.hooks.run_project_hook") as hook,
+            ):
+                cname, mode = _validate_login(load_project(project_id), "1")
+
+            assert (cname, mode) == (f"{project_id}-cli-1", "cli")
+            assert run.call_args.args[0] == ["podman", "start", cname]
+            tee.assert_called_once()
+            assert hook.call_args.args[1] == "post_start"
+            assert "idle_stop" not in yaml_load(meta_path.read_text())
+
+    def test_login_refuses_plain_stopped_task(self) -> None:
+        project_id = "proj_idle_plain"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            self._write_meta(ctx, project_id)
+
+            with (
+                patch("terok.lib.orchestration.tasks.get_container_state", return_value="exited"),
+                pytest.raises(SystemExit, match="not running"),
+            ):
+                _validate_login(load_project(project_id), "1")
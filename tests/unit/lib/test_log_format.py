@@ -311,3 +311,16 @@ class TestAutoDetectFormatter:
         assert isinstance(fmt, ClaudeStreamJsonFormatter)
         output, _error = render_formatter(fmt, SYSTEM_INIT_EVENT)
         assert "\x1b[" in output
+
+    @pytest.mark.parametrize("mode", ["run", "cli"], ids=["claude", "plain"])
+    def test_out_stream_receives_all_output(self, mode: str) -> None:
+        """An explicit ``out`` stream captures lines and the result summary."""
+        out = StringIO()
+        fmt = auto_detect_formatter(mode, color=False, out=out)
+        stdout, stderr = render_formatter(
+            fmt, "plain", {"type": "result", "num_turns": 2}, finish=True
+        )
+        assert stdout == stderr == ""
+        assert "plain" in out.getvalue()
+        if mode == "run":
+            assert "[result] turns=2" in out.getvalue()
@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for multiplexed ``task logs --follow-all``."""
+
+import asyncio
+import json
+from io import StringIO
+from unittest import mock
+
+from terok.lib.domain.log_multiplex import (
+    FollowAllOptions,
+    _follow_all,
+    _make_label,
+    _PrefixWriter,
+    read_bounded_line,
+)
+
+
+def make_reader(data: bytes, *, limit: int = 64) -> asyncio.StreamReader:
+    """Return a StreamReader pre-loaded with *data* and EOF."""
+    reader = asyncio.StreamReader(limit=limit)
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class FakeProcess:
+    """Minimal stand-in for ``asyncio.subprocess.Process``."""
+
+    def __init__(self, data: bytes) -> None:
+        self.stdout = make_reader(data, limit=1024)
+        self.returncode: int | None = None
+
+    def terminate(self) -> None:
+        self.returncode = -15
+
+    async def wait(self) -> int:
+        if self.returncode is None:
+            self.returncode = 0
+        return self.returncode
+
+
+class TestPrefixWriter:
+    """Line prefixing and partial-line buffering."""
+
+    def test_prefixes_complete_lines_only(self) -> None:
+        target = StringIO()
+        w = _PrefixWriter("[1] ", target)
+        w.write("hello ")
+        assert target.getvalue() == ""
+        w.write("world\nnext\n")
+        assert target.getvalue() == "[1] hello world\n[1] next\n"
+
+    def test_close_line_flushes_partial(self) -> None:
+        target = StringIO()
+        w = _PrefixWriter("> ", target)
+        w.write("dangling")
+        w.close_line()
+        assert target.getvalue() == "> dangling\n"
+
+    def test_print_works_with_writer(self) -> None:
+        target = StringIO()
+        print("a", "b", file=_PrefixWriter("# ", target))
+        assert target.getvalue() == "# a b\n"
+
+
+class TestReadBoundedLine:
+    """Per-stream memory stays bounded by the reader limit."""
+
+    async def test_reads_lines_then_eof(self) -> None:
+        reader = make_reader(b"one\ntwo")
+        assert await read_bounded_line(reader) == b"one\n"
+        assert await read_bounded_line(reader) == b"two"
+        assert await read_bounded_line(reader) == b""
+
+    async def test_overlong_line_truncated_and_skipped(self) -> None:
+        reader = make_reader(b"x" * 500 + b"\nafter\n", limit=64)
+        first = await read_bounded_line(reader, limit=64)
+        assert first.endswith(b"[line truncated]\n")
+        assert len(first) < 200
+        assert await read_bounded_line(reader) == b"after\n"
+
+
+class TestFollowAll:
+    """End-to-end multiplexing with a fake podman."""
+
+    def test_make_label_truncates_long_names(self) -> None:
+        assert _make_label("3", "fix") == "[3 fix]"
+        assert _make_label("3", "") == "[3]"
+        assert len(_make_label("3", "n" * 80)) < 40
+
+    async def test_follows_all_running_tasks_with_prefixes(self, capsys) -> None:
+        event = {"type": "assistant", "message": {"content": [{"type": "text", "text": "hi"}]}}
+        outputs = {
+            "p-run-1": json.dumps(event).encode() + b"\n",
+            "p-cli-2": b"plain line\n",
+        }
+        calls: list[list[str]] = []
+
+        async def fake_exec(*cmd: str, **_kw: object) -> FakeProcess:
+            calls.append(list(cmd))
+            return FakeProcess(outputs[cmd[-1]])
+
+        stop = asyncio.Event()
+        running = [("1", "alpha", "run", None), ("2", "beta", "cli", None)]
+
+        def fake_running(_pid: str) -> list:
+            loop.call_later(0.05, stop.set)
+            return running
+
+        loop = asyncio.get_running_loop()
+        with (
+            mock.patch("terok.lib.domain.log_multiplex._running_tasks", fake_running),
+            mock.patch("asyncio.create_subprocess_exec", fake_exec),
+        ):
+            await _follow_all("p", FollowAllOptions(tail=5, color=False, rescan_interval=1), stop)
+
+        out = capsys.readouterr().out
+        assert "[1 alpha] hi" in out
+        assert "[2 beta] plain line" in out
+        assert "[2 beta] --- log stream ended ---" in out
+        assert all(c[:4] == ["podman", "logs", "-f", "--tail"] for c in calls)
+
+    async def test_new_task_attaches_on_rescan(self, capsys) -> None:
+        first = [("1", "a", "cli", None)]
+        both = [*first, ("2", "b", "cli", None)]
+        scans = [first, both, both]
+        calls: list[list[str]] = []
+        stop = asyncio.Event()
+
+        async def fake_exec(*cmd: str, **_kw: object) -> FakeProcess:
+            calls.append(list(cmd))
+            return FakeProcess(b"")
+
+        def fake_running(_pid: str) -> list:
+            if len(scans) == 1:
+                stop.set()
+            return scans.pop(0)
+
+        with (
+            mock.patch("terok.lib.domain.log_multiplex._running_tasks", fake_running),
+            mock.patch("asyncio.create_subprocess_exec", fake_exec),
+        ):
+            await _follow_all("p", FollowAllOptions(rescan_interval=0.01, color=False), stop)
+
+        first_call = {}
+        for c in calls:
+            first_call.setdefault(c[-1], c)
+        assert "--tail" in first_call["p-cli-1"]
+        assert "--tail" not in first_call["p-cli-2"]
+        # An ended stream whose container is still running resumes, not replays
+        assert any("--since" in c and c[-1] == "p-cli-1" for c in calls)
@@ -0,0 +1,208 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for raw-byte log search (``task logs --grep``)."""
+
+import json
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from terok.lib.domain.log_search import (
+    LogMatch,
+    LogSearchOptions,
+    LogSearchResult,
+    LogSource,
+    compile_pattern,
+    compile_text_pattern,
+    find_line,
+    print_search_results,
+    search_bytes,
+    search_file,
+    search_sources,
+    strip_log_timestamp,
+)
+from terok.lib.util.line_index import update_line_index
+
+SAMPLE = b"alpha\nbeta\ngamma ERROR one\ndelta\nepsilon\nzeta ERROR two\neta\n"
+
+
+def search(data: bytes, pattern: str, **kwargs: object) -> list[LogMatch]:
+    """Search *data* with default options plus *kwargs*."""
+    context = kwargs.pop("context", 0)
+    return search_bytes(data, compile_pattern(LogSearchOptions(pattern, **kwargs)), context=context)
+
+
+class TestSearchBytes:
+    """Matching, line numbering and context clipping."""
+
+    def test_reports_line_numbers(self) -> None:
+        matches = search(SAMPLE, "ERROR")
+        assert [(m.line_no, m.line) for m in matches] == [
+            (3, "gamma ERROR one"),
+            (6, "zeta ERROR two"),
+        ]
+
+    def test_one_match_per_line(self) -> None:
+        assert len(search(b"x x x\ny\n", "x")) == 1
+
+    def test_context_does_not_overlap(self) -> None:
+        matches = search(SAMPLE, "ERROR", context=2)
+        assert matches[0].before == ("alpha", "beta")
+        assert matches[0].after == ("delta", "epsilon")
+        assert matches[1].before == ()
+        assert matches[1].after == ("eta",)
+
+    def test_ignore_case_and_fixed(self) -> None:
+        assert search(SAMPLE, "error", ignore_case=True)[0].line_no == 3
+        assert search(b"a.b\naxb\n", "a.b", fixed=True)[0].line == "a.b"
+
+    def test_max_matches(self) -> None:
+        pattern = compile_pattern(LogSearchOptions("ERROR"))
+        assert len(search_bytes(SAMPLE, pattern, max_matches=1)) == 1
+
+    def test_last_line_without_newline(self) -> None:
+        assert search(b"a\nhit", "hit")[0].line_no == 2
+
+    def test_index_line_numbers_agree(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(
+            b"".join(f"{i} {'hit' if i % 7 == 0 else ''}\n".encode() for i in range(100))
+        )
+        index = update_line_index(log, stride=4)
+        pattern = compile_pattern(LogSearchOptions("hit"))
+        data = log.read_bytes()
+        with_index = search_bytes(data, pattern, index=index)
+        assert [m.line_no for m in with_index] == [m.line_no for m in search_bytes(data, pattern)]
+        assert with_index[1].line_no == 8
+
+    def test_invalid_pattern_raises_system_exit(self) -> None:
+        with pytest.raises(SystemExit, match="Invalid search pattern"):
+            compile_pattern(LogSearchOptions("("))
+
+
+class TestSearchFiles:
+    """File-backed and multi-source search."""
+
+    def test_search_file_uses_mmap_and_index(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(SAMPLE)
+        assert [m.line_no for m in search_file(log, LogSearchOptions("ERROR"))] == [3, 6]
+        assert (tmp_path / "container.log.idx").is_file()
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(b"")
+        assert search_file(log, LogSearchOptions("x")) == []
+
+    def test_search_sources_keeps_order_and_errors(self, tmp_path: Path) -> None:
+        files = []
+        for i in range(3):
+            f = tmp_path / f"{i}.log"
+            f.write_bytes(b"hit\n" * (i + 1))
+            files.append(LogSource(label=str(i), path=f))
+        files.append(LogSource(label="missing", path=tmp_path / "missing.log"))
+        results = search_sources(files, LogSearchOptions("hit"))
+        assert [len(r.matches) for r in results] == [1, 2, 3, 0]
+        assert results[3].error
+
+    def test_live_source_reads_podman_logs(self) -> None:
+        proc = mock.Mock(stdout=b"one\ntwo hit\n")
+        with mock.patch("terok.lib.domain.log_search.subprocess.run", return_value=proc) as run:
+            (result,) = search_sources(
+                [LogSource(label="t", cname="p-cli-1")], LogSearchOptions("hit")
+            )
+        assert run.call_args[0][0] == ["podman", "logs", "p-cli-1"]
+        assert result.matches[0].line_no == 2
+
+
+class TestFormatting:
+    """Only matches and context are printed, via the agent formatter."""
+
+    def test_prints_formatted_claude_event(self) -> None:
+        event = json.dumps(
+            {"type": "assistant", "message": {"content": [{"type": "text", "text": "found it"}]}}
+        )
+        result = LogSearchResult(
+            source=LogSource(label="task 1", mode="run"),
+            matches=[LogMatch(line_no=4, line=f"2026-03-05T14:30:00.123+00:00 {event}")],
+        )
+        out = StringIO()
+        with redirect_stdout(out):
+            total = print_search_results([result], color=False)
+        assert total == 1
+        text = out.getvalue()
+        assert "== task 1 (1 matches) ==" in text
+        assert "-- line 4 --" in text
+        assert "found it" in text
+        assert '"type"' not in text
+
+    def test_raw_prints_lines_verbatim(self) -> None:
+        result = LogSearchResult(
+            source=LogSource(label="t", mode="cli"),
+            matches=[LogMatch(line_no=1, line="hit", before=("pre",))],
+        )
+        out = StringIO()
+        with redirect_stdout(out):
+            print_search_results([result], raw=True, color=False)
+        assert out.getvalue().splitlines()[-2:] == ["pre", "hit"]
+
+    def test_strip_log_timestamp(self) -> None:
+        assert strip_log_timestamp("2026-03-05T14:30:00.1Z msg") == "msg"
+        assert strip_log_timestamp("plain msg") == "plain msg"
+
+
+class TestFindLine:
+    """Incremental find-next used by the TUI log viewer."""
+
+    def test_forward_and_backward_with_wrap(self) -> None:
+        lines = ["a", "hit 1", "b", "hit 2"]
+        pattern = compile_text_pattern(LogSearchOptions("hit"))
+        assert find_line(lines, pattern, -1) == 1
+        assert find_line(lines, pattern, 1) == 3
+        assert find_line(lines, pattern, 3) == 1
+        assert find_line(lines, pattern, 1, backwards=True) == 3
+
+    def test_no_match(self) -> None:
+        pattern = compile_text_pattern(LogSearchOptions("zzz"))
+        assert find_line(["a"], pattern, 0) is None
+        assert find_line([], pattern, 0) is None
+
+
+class TestSearchSegments:
+    """Search across rotated, compressed segments."""
+
+    def test_line_numbers_continue_across_segments(self, tmp_path: Path) -> None:
+        import gzip
+
+        from terok.lib.util.log_store import segment_path
+
+        log = tmp_path / "container.log"
+        segment_path(log, 1).write_bytes(gzip.compress(b"a\nERROR one\n"))
+        segment_path(log, 2).write_bytes(gzip.compress(b"b\nc\n"))
+        log.write_bytes(b"ERROR two\nd\n")
+        found = search_file(log, LogSearchOptions("ERROR"))
+        assert [(m.line_no, m.line) for m in found] == [(2, "ERROR one"), (5, "ERROR two")]
+
+        limited = search_file(log, LogSearchOptions("ERROR", max_matches=1))
+        assert [m.line_no for m in limited] == [2]
+
+    def test_truncated_segment_keeps_the_rest(self, tmp_path: Path) -> None:
+        import gzip
+
+        from terok.lib.util.log_store import iter_log_lines, segment_path
+
+        log = tmp_path / "container.log"
+        body = b"".join(f"line {i}\n".encode() for i in range(5000)) + b"ERROR lost\n"
+        damaged = gzip.compress(body)
+        segment_path(log, 1).write_bytes(damaged[: len(damaged) // 2])
+        segment_path(log, 2).write_bytes(gzip.compress(b"ERROR kept\n"))
+        log.write_bytes(b"ERROR live\n")
+
+        found = search_file(log, LogSearchOptions("ERROR|line 0$"))
+        lines = list(iter_log_lines(log))
+        assert [m.line for m in found] == ["line 0", "ERROR kept", "ERROR live"]
+        assert [lines[m.line_no - 1].decode().rstrip() for m in found] == [m.line for m in found]
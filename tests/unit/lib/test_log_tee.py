@@ -0,0 +1,188 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the background log tee (continuous host-side log persistence)."""
+
+import io
+import os
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from terok.lib.orchestration.log_tee import (
+    CURSOR_FILENAME,
+    LOG_FILENAME,
+    LogAppender,
+    _try_lock,
+    is_log_tee_running,
+    last_logged_timestamp,
+    line_timestamp,
+    read_cursor,
+    run_log_tee,
+    start_log_tee,
+    timestamp_key,
+    write_cursor,
+)
+
+L1 = b"2026-03-05T12:00:00.1Z first\n"
+L2 = b"2026-03-05T12:00:00.25Z second\n"
+L3 = b"2026-03-05T13:00:01+01:00 third\n"
+
+
+class TestTimestamps:
+    """Parsing and ordering of podman ``--timestamps`` prefixes."""
+
+    def test_trimmed_fraction_sorts_numerically(self) -> None:
+        # Lexically ".25" > ".1" but ".1" > ".05"; keys must compare as numbers.
+        assert timestamp_key("2026-03-05T12:00:00.1Z") > timestamp_key("2026-03-05T12:00:00.05Z")
+
+    def test_offset_is_normalised(self) -> None:
+        assert timestamp_key("2026-03-05T13:00:00+01:00") == timestamp_key("2026-03-05T12:00:00Z")
+
+    def test_nanoseconds(self) -> None:
+        assert timestamp_key("2026-03-05T12:00:00.000000001Z")[1] == 1
+
+    @pytest.mark.parametrize("value", ["", "hello", "2026-03-05 12:00:00Z", "2026-13-45T12:00:00Z"])
+    def test_invalid(self, value: str) -> None:
+        assert timestamp_key(value) is None
+
+    def test_line_timestamp(self) -> None:
+        assert line_timestamp(L1) == "2026-03-05T12:00:00.1Z"
+        assert line_timestamp(b"no timestamp here\n") is None
+        assert line_timestamp(b"2026-03-05T12:00:00Z\n") == "2026-03-05T12:00:00Z"
+
+
+class TestCursor:
+    """Cursor file round-trip and recovery from the log tail."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        write_cursor(tmp_path, "2026-03-05T12:00:00.5Z")
+        assert read_cursor(tmp_path) == "2026-03-05T12:00:00.5Z"
+
+    def test_missing_or_garbage(self, tmp_path: Path) -> None:
+        assert read_cursor(tmp_path) is None
+        (tmp_path / CURSOR_FILENAME).write_text("garbage")
+        assert read_cursor(tmp_path) is None
+
+    def test_last_logged_timestamp(self, tmp_path: Path) -> None:
+        log = tmp_path / LOG_FILENAME
+        log.write_bytes(L1 + L2 + b"continuation without timestamp\n")
+        assert last_logged_timestamp(log) == "2026-03-05T12:00:00.25Z"
+
+
+class TestLogAppender:
+    """De-duplicating appends."""
+
+    def test_appends_and_records_cursor(self, tmp_path: Path) -> None:
+        appender = LogAppender(tmp_path)
+        assert appender.feed_all([L1, L2]) == 2
+        appender.close()
+        assert (tmp_path / LOG_FILENAME).read_bytes() == L1 + L2
+        assert read_cursor(tmp_path) == "2026-03-05T12:00:00.25Z"
+
+    def test_skips_lines_not_newer_than_cursor(self, tmp_path: Path) -> None:
+        write_cursor(tmp_path, "2026-03-05T12:00:00.25Z")
+        appender = LogAppender(tmp_path)
+        assert appender.feed_all([L1, L2, b"untimestamped\n", L3]) == 2
+        appender.close()
+        assert (tmp_path / LOG_FILENAME).read_bytes() == b"untimestamped\n" + L3
+        assert read_cursor(tmp_path) == "2026-03-05T13:00:01+01:00"
+
+    def test_log_tail_beats_stale_cursor(self, tmp_path: Path) -> None:
+        """Lines written after the last cursor flush are not duplicated."""
+        (tmp_path / LOG_FILENAME).write_bytes(L1 + L2)
+        write_cursor(tmp_path, "2026-03-05T12:00:00.1Z")
+        appender = LogAppender(tmp_path)
+        assert appender.feed(L2) is False
+        assert appender.feed(L3) is True
+        appender.close()
+        assert (tmp_path / LOG_FILENAME).read_bytes() == L1 + L2 + L3
+
+
+class TestRunLogTee:
+    """The tee process loop."""
+
+    def _popen(self, lines: list[bytes]) -> mock.Mock:
+        """Return a fake ``Popen`` whose stdout yields *lines*."""
+        proc = mock.Mock()
+        proc.stdout = io.BytesIO(b"".join(lines))
+        proc.wait.return_value = 0
+        return proc
+
+    def test_follows_from_start_then_resumes(self, tmp_path: Path) -> None:
+        logs = tmp_path / "logs"
+        with mock.patch(
+            "terok.lib.orchestration.log_tee.subprocess.Popen",
+            return_value=self._popen([L1, L2]),
+        ) as popen:
+            assert run_log_tee("c1", logs) == 0
+        assert popen.call_args.args[0] == ["podman", "logs", "--timestamps", "-f", "c1"]
+
+        # A restart replays an overlapping window; only the new line is kept.
+        with mock.patch(
+            "terok.lib.orchestration.log_tee.subprocess.Popen",
+            return_value=self._popen([L2, L3]),
+        ) as popen:
+            assert run_log_tee("c1", logs) == 0
+        assert popen.call_args.args[0][4:6] == ["--since", "2026-03-05T12:00:00.25Z"]
+        assert (logs / LOG_FILENAME).read_bytes() == L1 + L2 + L3
+        assert not is_log_tee_running(logs)
+
+    def test_second_tee_exits_while_lock_is_held(self, tmp_path: Path) -> None:
+        fd = _try_lock(tmp_path)
+        try:
+            assert is_log_tee_running(tmp_path)
+            with mock.patch("terok.lib.orchestration.log_tee.subprocess.Popen") as popen:
+                assert run_log_tee("c1", tmp_path) == 0
+            popen.assert_not_called()
+        finally:
+            os.close(fd)
+
+
+class TestStartLogTee:
+    """Spawning the detached tee."""
+
+    def test_spawns_detached(self, tmp_path: Path) -> None:
+        with (
+            mock.patch("terok.lib.orchestration.log_tee.get_logs_persist", return_value=True),
+            mock.patch("terok.lib.orchestration.log_tee.subprocess.Popen") as popen,
+        ):
+            assert start_log_tee("c1", tmp_path) is True
+        argv = popen.call_args.args[0]
+        assert argv[1:] == ["-m", "terok.lib.orchestration.log_tee", "c1", str(tmp_path / "logs")]
+        assert popen.call_args.kwargs["start_new_session"] is True
+        assert popen.call_args.kwargs["stdout"] is subprocess.DEVNULL
+
+    def test_disabled_by_config(self, tmp_path: Path) -> None:
+        with (
+            mock.patch("terok.lib.orchestration.log_tee.get_logs_persist", return_value=False),
+            mock.patch("terok.lib.orchestration.log_tee.subprocess.Popen") as popen,
+        ):
+            assert start_log_tee("c1", tmp_path) is False
+        popen.assert_not_called()
+
+
+class TestAppenderRotation:
+    """Size-bounded persistence through the appender."""
+
+    def test_rotates_at_segment_size_and_caps_total(self, tmp_path: Path) -> None:
+        from terok.lib.util.log_store import iter_log_lines, log_segments
+
+        lines = [f"2026-03-05T12:00:{i:02d}Z line {i}\n".encode() for i in range(30)]
+        appender = LogAppender(tmp_path, segment_bytes=200, max_total_bytes=0)
+        appender.feed_all(lines)
+        appender.close()
+        assert len(log_segments(tmp_path / LOG_FILENAME)) >= 3
+        assert list(iter_log_lines(tmp_path / LOG_FILENAME)) == lines
+        assert read_cursor(tmp_path) == "2026-03-05T12:00:29Z"
+
+        capped = tmp_path / "capped"
+        capped.mkdir()
+        appender = LogAppender(capped, segment_bytes=200, max_total_bytes=300)
+        appender.feed_all(lines)
+        appender.close()
+        kept = list(iter_log_lines(capped / LOG_FILENAME))
+        assert kept == lines[-len(kept) :]
+        assert len(kept) < len(lines)
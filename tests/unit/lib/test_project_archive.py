@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import gzip
+import io
 import re
 import tarfile
 import tempfile
@@ -19,6 +21,7 @@ from terok.lib.core.config import build_root, deleted_projects_dir, state_root
 from terok.lib.core.projects import load_project
 from terok.lib.domain.facade import delete_project
 from terok.lib.domain.project import _archive_project
+from terok.lib.util.compress import ParallelGzipWriter, compressed_writer
 from terok.lib.util.fs import (
     archive_timestamp,
     create_archive_dir,
@@ -28,6 +31,13 @@ from terok.lib.util.fs import (
 from tests.test_utils import project_env
 
 
+@pytest.fixture(autouse=True)
+def _gzip_archives():
+    """Archive as gzip even where the optional ``zstandard`` is installed."""
+    with patch("terok.lib.util.compress._zstd", None):
+        yield
+
+
 def project_yaml(project_id: str) -> str:
     """Build a minimal project config for archive tests."""
     return f"project:\n  id: {project_id}\ngit:\n  upstream_url: https://example.com/repo.git\n"
@@ -143,9 +153,8 @@ class TestArchiveProject:
         [
             ("arch-cfg", lambda _pid: None, "config/"),
             ("arch-state", create_task_state, "state/"),
-            ("arch-build", create_build_dir, "build/"),
         ],
-        ids=["config", "state", "build"],
+        ids=["config", "state"],
     )
     def test_archive_includes_expected_sections(
         self,
@@ -159,6 +168,34 @@ class TestArchiveProject:
             assert archive_path is not None
             assert any(expected_fragment in name for name in archive_member_names(archive_path))
 
+    def test_build_artifacts_excluded(self) -> None:
+        with project_env(project_yaml("arch-build"), project_id="arch-build"):
+            create_build_dir("arch-build")
+            archive_path = _archive_project("arch-build")
+            assert archive_path is not None
+            assert not any(n.startswith("build/") for n in archive_member_names(archive_path))
+
+    def test_skips_index_sidecars_and_unbundled_cache(self) -> None:
+        with project_env(project_yaml("arch-skip"), project_id="arch-skip"):
+            archive = state_root() / "projects" / "arch-skip" / "archive"
+            (archive / ".unbundled" / "x").mkdir(parents=True)
+            (archive / ".unbundled" / "x" / "container.log").write_text("log")
+            (archive / "20260101T000000Z_1").mkdir()
+            (archive / "20260101T000000Z_1" / "container.log").write_text("log")
+            (archive / "20260101T000000Z_1" / "container.log.idx").write_text("idx")
+            names = archive_member_names(_archive_project("arch-skip"))
+            assert "state/archive/20260101T000000Z_1/container.log" in names
+            assert not any(".unbundled" in n or n.endswith(".idx") for n in names)
+
+    def test_progress_reports_bytes(self) -> None:
+        with project_env(project_yaml("arch-prog"), project_id="arch-prog"):
+            create_task_state("arch-prog")
+            calls: list[tuple[int, int]] = []
+            _archive_project("arch-prog", progress=lambda done, total: calls.append((done, total)))
+            assert len(calls) >= 2
+            assert [d for d, _ in calls] == sorted(d for d, _ in calls)
+            assert calls[-1][0] == calls[-1][1] > 0
+
     def test_missing_dirs_graceful(self) -> None:
         with project_env(project_yaml("arch-min"), project_id="arch-min"):
             archive_path = _archive_project("arch-min")
@@ -178,7 +215,6 @@ class TestDeleteProjectArchive:
     def test_delete_creates_archive_before_deleting(self) -> None:
         with project_env(project_yaml("del-arch"), project_id="del-arch"):
             create_task_state("del-arch")
-            create_build_dir("del-arch")
             result = delete_project("del-arch")
             assert "archive" in result
             archive_path = Path(result["archive"])
@@ -186,7 +222,6 @@ class TestDeleteProjectArchive:
             assert archive_path.is_file()
             assert archive_path.suffixes[-2:] == [".tar", ".gz"]
             assert "state/tasks/1.yml" in members
-            assert "build/L2.Dockerfile" in members
 
     def test_archive_survives_deletion(self) -> None:
         with project_env(project_yaml("del-surv"), project_id="del-surv"):
@@ -201,3 +236,36 @@ class TestDeleteProjectArchive:
             assert any(
                 name.startswith("config/") for name in archive_member_names(result["archive"])
             )
+
+
+class TestParallelGzipWriter:
+    """Tests for the block-parallel gzip writer."""
+
+    def test_multi_block_round_trip(self) -> None:
+        data = bytes(range(256)) * 4000
+        out = io.BytesIO()
+        writer = ParallelGzipWriter(out, workers=3, block_size=10_000)
+        writer.write(data[:12_345])
+        writer.write(data[12_345:])
+        writer.close()
+        assert gzip.decompress(out.getvalue()) == data
+        assert not out.closed
+
+    def test_empty_stream(self) -> None:
+        out = io.BytesIO()
+        ParallelGzipWriter(out).close()
+        assert gzip.decompress(out.getvalue()) == b""
+
+    def test_tar_stream_readable(self) -> None:
+        out = io.BytesIO()
+        with (
+            compressed_writer(out, workers=2) as stream,
+            tarfile.open(fileobj=stream, mode="w|") as tar,
+        ):
+            payload = b"x" * 50_000
+            info = tarfile.TarInfo("a.txt")
+            info.size = len(payload)
+            tar.addfile(info, io.BytesIO(payload))
+        out.seek(0)
+        with tarfile.open(fileobj=out, mode="r:gz") as tar:
+            assert tar.extractfile("a.txt").read() == payload
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for per-project container resource limits."""
+
+from __future__ import annotations
+
+import pytest
+
+from terok.lib.core.project_model import ResourceLimits
+from terok.lib.core.projects import (
+    load_project,
+    parse_resource_limits,
+    resolve_resource_limits,
+)
+from terok.lib.orchestration.task_runners import _resource_args
+from tests.test_utils import project_env
+
+PROJECT_YAML = """\
+project:
+  id: proj
+run:
+  resources:
+    cpus: 2
+    memory: 4g
+    pids_limit: 512
+"""
+
+
+class TestProjectConfig:
+    """``run.resources`` in ``project.yml``."""
+
+    def test_limits_are_loaded(self) -> None:
+        with project_env(PROJECT_YAML, project_id="proj"):
+            project = load_project("proj")
+
+        assert project.resources == ResourceLimits(cpus=2.0, memory="4g", pids_limit=512)
+
+    def test_no_limits_by_default(self) -> None:
+        with project_env("project:\n  id: proj\n", project_id="proj"):
+            assert load_project("proj").resources == ResourceLimits()
+
+    @pytest.mark.parametrize(
+        "resources",
+        [
+            pytest.param("memory: lots", id="bad-memory"),
+            pytest.param("blkio_weight: 5", id="weight-out-of-range"),
+            pytest.param("cpus: 0", id="zero-cpus"),
+            pytest.param("cpuset: 'a-b'", id="bad-cpuset"),
+            pytest.param("disk: 10g", id="unknown-key"),
+        ],
+    )
+    def test_invalid_limits_are_rejected(self, resources: str) -> None:
+        yaml_text = f"project:\n  id: proj\nrun:\n  resources:\n    {resources}\n"
+        with project_env(yaml_text, project_id="proj"), pytest.raises(SystemExit):
+            load_project("proj")
+
+
+class TestResolve:
+    """Layering ``run.resources``, the preset and per-run overrides."""
+
+    def test_each_layer_replaces_only_what_it_sets(self) -> None:
+        with project_env(PROJECT_YAML, project_id="proj") as ctx:
+            presets = ctx.config_root / "proj" / "presets"
+            presets.mkdir()
+            (presets / "big.yml").write_text("resources:\n  memory: 16g\n  cpus: 8\n")
+            project = load_project("proj")
+
+            limits = resolve_resource_limits(project, "big", ResourceLimits(cpus=4))
+
+        assert limits == ResourceLimits(cpus=4.0, memory="16g", pids_limit=512)
+
+    def test_invalid_preset_limits_name_the_preset(self) -> None:
+        with project_env(PROJECT_YAML, project_id="proj") as ctx:
+            presets = ctx.config_root / "proj" / "presets"
+            presets.mkdir()
+            (presets / "bad.yml").write_text("resources:\n  memory_swap: huge\n")
+            project = load_project("proj")
+
+            with pytest.raises(SystemExit, match="Invalid resources in preset 'bad'"):
+                resolve_resource_limits(project, "bad")
+
+    def test_parse_reports_the_source(self) -> None:
+        with pytest.raises(SystemExit, match="Invalid resources in --limit: pids_limit"):
+            parse_resource_limits({"pids_limit": -5}, "--limit")
+        assert parse_resource_limits({"memory_swap": "-1"}, "x") == ResourceLimits(memory_swap="-1")
+
+
+def test_podman_flags() -> None:
+    """Each limit maps onto its ``podman run`` flag; unset ones are omitted."""
+    limits = ResourceLimits(
+        cpus=1.5,
+        cpuset="0-3,6",
+        memory="2g",
+        memory_swap="-1",
+        pids_limit=256,
+        blkio_weight=500,
+    )
+
+    assert _resource_args(limits) == [
+        "--cpus=1.5",
+        "--cpuset-cpus=0-3,6",
+        "--memory=2g",
+        "--memory-swap=-1",
+        "--pids-limit=256",
+        "--blkio-weight=500",
+    ]
+    assert _resource_args(ResourceLimits()) == []
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the live resource monitor."""
+
+from __future__ import annotations
+
+import json
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration import resource_monitor as rm
+from terok.lib.orchestration.resource_monitor import (
+    ResourceMonitor,
+    format_top,
+    parse_task_container,
+    read_frames,
+    sparkline,
+    task_top,
+)
+
+
+def _entry(name: str, cpu: str = "1.50%", mem: str = "1.5MB / 8GB") -> dict:
+    """One ``podman stats --format json`` entry."""
+    return {
+        "id": "abc",
+        "name": name,
+        "cpu_percent": cpu,
+        "mem_usage": mem,
+        "net_io": "2kB / 3kB",
+        "block_io": "4MB / 5MB",
+        "pids": "7",
+    }
+
+
+def _stream(*frames: list[dict]) -> list[str]:
+    """Render *frames* the way ``podman stats`` streams them."""
+    lines: list[str] = []
+    for frame in frames:
+        lines.append("\x1b[2J\x1b[H")
+        lines += [line + "\n" for line in json.dumps(frame, indent=4).splitlines()]
+    return lines
+
+
+class TestParsing:
+    """Container names and podman's human-readable values."""
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("proj-cli-3", ("proj", "cli", "3")),
+            ("my-proj-run-12", ("my-proj", "run", "12")),
+            ("proj-web-x", None),
+            ("proj-shell-3", None),
+            ("postgres", None),
+        ],
+    )
+    def test_task_container(self, name: str, expected: tuple | None) -> None:
+        assert parse_task_container(name) == expected
+
+    def test_sample_values(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.feed([_entry("proj-cli-1", mem="512KiB / 2GiB")], at=1.0)
+        s = monitor.task("proj", "1").latest
+
+        assert (s.cpu_percent, s.mem_bytes, s.mem_limit) == (1.5, 512 * 1024, 2 * 1024**3)
+        assert (s.net_rx, s.net_tx, s.block_read, s.block_write, s.pids) == (
+            2000,
+            3000,
+            4_000_000,
+            5_000_000,
+            7,
+        )
+
+    def test_unknown_values_are_zero(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.feed([_entry("proj-cli-1", cpu="--", mem="-- / --")])
+        s = monitor.task("proj", "1").latest
+
+        assert (s.cpu_percent, s.mem_bytes) == (0.0, 0)
+
+
+def test_read_frames_skips_control_sequences() -> None:
+    """Each streamed array is one frame, whatever podman writes around it."""
+    first = [_entry("proj-cli-1"), _entry("db")]
+    lines = _stream(first, []) + ["null\n", "[\n", "garbage\n", "]\n"]
+
+    assert list(read_frames(lines)) == [first, [], []]
+
+
+class TestHistory:
+    """The rolling per-task history."""
+
+    def test_history_is_bounded(self) -> None:
+        monitor = ResourceMonitor(history=3)
+        for i in range(5):
+            monitor.feed([_entry("proj-cli-1", cpu=f"{i}%")], at=float(i))
+
+        res = monitor.task("proj", "1")
+        assert [s.cpu_percent for s in res.history] == [2.0, 3.0, 4.0]
+        assert res.latest.at == 4.0
+
+    def test_other_containers_are_ignored_and_gone_ones_dropped(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.feed([_entry("proj-cli-1"), _entry("other-run-2"), _entry("db")])
+        monitor.feed([_entry("other-run-2")])
+
+        assert [(r.project_id, r.task_id, r.mode) for r in monitor.snapshot()] == [
+            ("other", "2", "run")
+        ]
+        assert monitor.snapshot("proj") == []
+
+    def test_wait_frame_counts_frames(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.feed([])
+
+        assert monitor.wait_frame(0, timeout=0) == 1
+
+
+def test_one_stream_per_process() -> None:
+    """Every caller shares the same monitor, started once."""
+    with (
+        patch.object(rm, "_monitor", None),
+        patch.object(ResourceMonitor, "start") as start,
+    ):
+        assert rm.resource_monitor() is rm.resource_monitor()
+    assert start.call_count == 2  # idempotent: a running monitor ignores it
+
+
+def test_stream_is_read_from_podman() -> None:
+    """The monitor reads ``podman stats --format json`` until stopped."""
+    monitor = ResourceMonitor(interval=2)
+
+    class _Proc:
+        """A podman process streaming one frame."""
+
+        stdout = iter(_stream([_entry("proj-cli-1")]))
+        stderr = None
+
+        def wait(self) -> int:
+            monitor._stopping.set()
+            return 0
+
+        def poll(self) -> int:
+            return 0
+
+    with patch.object(rm.subprocess, "Popen", return_value=_Proc()) as popen:
+        monitor._run()
+
+    assert popen.call_args.args[0] == [
+        "podman",
+        "stats",
+        "--format",
+        "json",
+        "--interval",
+        "2",
+    ]
+    assert monitor.task("proj", "1") is not None
+
+
+def test_sparkline() -> None:
+    """Values map onto eight bar heights."""
+    assert sparkline([0, 50, 100, 250]) == "▁▅██"
+
+
+class TestTaskTop:
+    """The ``task top`` view."""
+
+    def test_table_busiest_first(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.feed([_entry("proj-cli-1", cpu="0.5%"), _entry("proj-run-2", cpu="80%")])
+        lines = format_top(monitor.snapshot())
+
+        assert lines[0].split()[:4] == ["PROJECT", "TASK", "MODE", "CPU%"]
+        assert [line.split()[1] for line in lines[1:]] == ["2", "1"]
+
+    def test_once_prints_one_table(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.feed([_entry("proj-cli-1"), _entry("other-cli-4")])
+        buf = StringIO()
+        with (
+            patch.object(rm, "resource_monitor", return_value=monitor),
+            redirect_stdout(buf),
+        ):
+            task_top("proj", once=True)
+
+        lines = buf.getvalue().splitlines()
+        assert len(lines) == 2 and lines[1].split()[:3] == ["proj", "1", "cli"]
+
+    def test_no_podman(self) -> None:
+        monitor = ResourceMonitor()
+        monitor.error = "cannot run podman stats: not found"
+        monitor._stopping.set()
+        with (
+            patch.object(rm, "resource_monitor", return_value=monitor),
+            pytest.raises(SystemExit, match="cannot run podman stats"),
+        ):
+            task_top(once=True)
@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the durable headless task queue."""
+
+from collections.abc import Iterator
+from unittest import mock
+
+import pytest
+
+from terok.lib.core.config import QueueLimits
+from terok.lib.core.project_model import ResourceLimits
+from terok.lib.orchestration.task_queue import (
+    _running_task_containers,
+    cancel_queued,
+    drain_queue,
+    enqueue_headless,
+    list_queue,
+    queue_dir,
+    resume_queue_drainer,
+)
+from terok.lib.orchestration.task_runners import HeadlessRunRequest
+from terok.lib.orchestration.tasks import task_delete, task_new, tasks_meta_dir
+from terok.lib.util.yaml import dump as yaml_dump, load as yaml_load
+from tests.test_utils import mock_git_config, project_env, write_project
+
+MODULE = "terok.lib.orchestration.task_queue"
+
+
+@pytest.fixture
+def queue_env() -> Iterator[object]:
+    """Two projects (``alpha`` and ``beta``) in an isolated state root."""
+    with project_env("project:\n  id: alpha\n", project_id="alpha") as ctx:
+        write_project(ctx.config_root, "beta", "project:\n  id: beta\n")
+        yield ctx
+
+
+def limits(**kwargs: float) -> mock._patch:
+    """Patch the queue limits read by the queue module."""
+    return mock.patch(f"{MODULE}.get_queue_limits", return_value=QueueLimits(**kwargs))
+
+
+def running(*names: str) -> mock._patch:
+    """Patch the running-container probe to report *names*."""
+    return mock.patch(f"{MODULE}._running_task_containers", return_value=list(names))
+
+
+def is_queued(project_id: str, task_id: str) -> bool:
+    """Return the ``queued`` flag from the task's metadata file."""
+    meta = yaml_load((tasks_meta_dir(project_id) / f"{task_id}.yml").read_text())
+    return bool(meta.get("queued"))
+
+
+def submit(project_id: str, prompt: str = "do it", **kwargs: float) -> str:
+    """Queue a headless run of *prompt* in *project_id*."""
+    return enqueue_headless(HeadlessRunRequest(project_id=project_id, prompt=prompt), **kwargs)
+
+
+class TestSubmission:
+    """Enqueue, list, and cancel."""
+
+    def test_enqueue_creates_queued_task(self, queue_env) -> None:
+        with limits(task_cpus=2.0, task_memory_mb=512):
+            tid = submit("alpha", "fix the bug")
+        [entry] = list_queue()
+        assert (entry.project_id, entry.task_id) == ("alpha", tid)
+        assert entry.request["prompt"] == "fix the bug"
+        assert (entry.cpus, entry.memory_mb) == (2.0, 512)
+        assert "follow" not in entry.request
+        assert is_queued("alpha", tid)
+
+    def test_entry_over_budget_is_rejected(self, queue_env) -> None:
+        with (
+            limits(max_cpus=2, max_memory_mb=1024),
+            pytest.raises(SystemExit, match="max_cpus is 2"),
+        ):
+            submit("alpha", cpus=4)
+        with limits(max_memory_mb=1024), pytest.raises(SystemExit, match="max_memory_mb is 1024"):
+            submit("alpha", memory_mb=2048)
+        assert list_queue() == []
+
+    def test_relative_config_path_is_resolved(self, queue_env, tmp_path, monkeypatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        request = HeadlessRunRequest(project_id="alpha", prompt="p", config_path="agent.yml")
+        with limits():
+            enqueue_headless(request)
+        assert list_queue()[0].request["config_path"] == str(tmp_path / "agent.yml")
+
+    def test_list_is_fifo_and_filters_by_project(self, queue_env) -> None:
+        with limits():
+            first = submit("alpha")
+            submit("beta")
+            second = submit("alpha")
+        assert [e.project_id for e in list_queue()] == ["alpha", "beta", "alpha"]
+        assert [e.task_id for e in list_queue("alpha")] == [first, second]
+
+    def test_cancel_leaves_created_task(self, queue_env) -> None:
+        with limits():
+            tid = submit("alpha")
+        assert cancel_queued("alpha", tid)
+        assert not cancel_queued("alpha", tid)
+        assert list_queue() == []
+        assert not is_queued("alpha", tid)
+
+
+class TestDrain:
+    """Launching pending entries within the configured limits."""
+
+    def test_unlimited_launches_everything_in_order(self, queue_env) -> None:
+        with limits():
+            ids = [submit("alpha"), submit("beta")]
+        launch = mock.Mock()
+        with limits(), running():
+            launched = drain_queue(launch=launch)
+        assert [e.task_id for e in launched] == ids
+        requests = [c.args[0] for c in launch.call_args_list]
+        assert [(r.project_id, r.task_id, r.follow) for r in requests] == [
+            ("alpha", ids[0], False),
+            ("beta", ids[1], False),
+        ]
+        assert list_queue() == []
+        assert not is_queued("alpha", ids[0])
+
+    def test_container_limits_survive_the_queue(self, queue_env) -> None:
+        request = HeadlessRunRequest(
+            project_id="alpha", prompt="p", resources=ResourceLimits(memory="4g")
+        )
+        with limits():
+            enqueue_headless(request)
+        assert list_queue()[0].request["resources"] == {"memory": "4g"}
+        launch = mock.Mock()
+        with limits(), running():
+            drain_queue(launch=launch)
+        assert launch.call_args.args[0].resources == ResourceLimits(memory="4g")
+
+    def test_global_limit_counts_running_containers(self, queue_env) -> None:
+        with limits():
+            submit("alpha")
+            submit("alpha")
+        with limits(max_running=2), running("other-cli-7"):
+            launched = drain_queue(launch=mock.Mock())
+        assert len(launched) == 1
+        assert len(list_queue()) == 1
+
+    def test_per_project_limit_lets_other_projects_pass(self, queue_env) -> None:
+        with limits():
+            submit("alpha")
+            beta = submit("beta")
+        with limits(max_running_per_project=1), running("alpha-cli-9"):
+            launched = drain_queue(launch=mock.Mock())
+        assert [(e.project_id, e.task_id) for e in launched] == [("beta", beta)]
+        assert [e.project_id for e in list_queue()] == ["alpha"]
+
+    def test_resource_budget_includes_previous_launches(self, queue_env) -> None:
+        with limits():
+            first = submit("alpha", cpus=2)
+            submit("alpha", cpus=2)
+            third = submit("beta", cpus=1)
+        with limits(max_cpus=3), running():
+            assert [e.task_id for e in drain_queue(launch=mock.Mock())] == [first, third]
+        with limits(max_cpus=3), running(f"alpha-run-{first}", f"beta-run-{third}"):
+            assert drain_queue(launch=mock.Mock()) == []
+        with limits(max_cpus=3), running(f"beta-run-{third}"):
+            assert len(drain_queue(launch=mock.Mock())) == 1
+
+    def test_idle_warm_containers_are_not_counted(self, queue_env) -> None:
+        with limits():
+            submit("alpha")
+            warm = task_new("alpha")
+        meta_path = tasks_meta_dir("alpha") / f"{warm}.yml"
+        meta = yaml_load(meta_path.read_text())
+        meta["warm"] = {"image_id": "img1", "started": True}
+        meta_path.write_text(yaml_dump(meta))
+        ps = mock.Mock(returncode=0, stdout=f"alpha-run-{warm}\nother-cli-3\n")
+        with mock.patch(f"{MODULE}.subprocess.run", return_value=ps):
+            assert _running_task_containers() == ["other-cli-3"]
+
+    def test_podman_failure_blocks_count_limits(self, queue_env) -> None:
+        with limits():
+            submit("alpha")
+        with (
+            limits(max_running=4),
+            mock.patch(f"{MODULE}._running_task_containers", return_value=None),
+        ):
+            assert drain_queue(launch=mock.Mock()) == []
+        assert len(list_queue()) == 1
+
+    def test_deleted_task_is_dropped(self, queue_env) -> None:
+        with limits():
+            tid = submit("alpha")
+        with (
+            mock.patch("terok.lib.orchestration.tasks.subprocess.run") as run_mock,
+            mock_git_config(),
+        ):
+            run_mock.return_value.returncode = 0
+            task_delete("alpha", tid)
+        launch = mock.Mock()
+        with limits(), running():
+            assert drain_queue(launch=launch) == []
+        launch.assert_not_called()
+        assert list_queue() == []
+
+    def test_failed_launch_is_not_accounted(self, queue_env, capsys) -> None:
+        with limits():
+            tid = submit("alpha")
+        with limits(), running():
+            launched = drain_queue(launch=mock.Mock(side_effect=SystemExit("no image")))
+        assert launched == []
+        assert "failed to start: no image" in capsys.readouterr().out
+        assert not any((queue_dir() / "running").glob("*.json"))
+        assert list_queue() == []
+        meta = yaml_load((tasks_meta_dir("alpha") / f"{tid}.yml").read_text())
+        assert (meta["exit_code"], meta["launch_error"]) == (125, "no image")
+        assert not meta.get("queued")
+
+
+class TestResume:
+    """Restarting the drainer for entries left pending."""
+
+    def test_resume_spawns_only_with_pending_entries(self, queue_env) -> None:
+        with mock.patch(f"{MODULE}.start_queue_drainer", return_value=True) as start:
+            assert not resume_queue_drainer()
+            with limits():
+                submit("alpha")
+            assert resume_queue_drainer()
+        start.assert_called_once_with()
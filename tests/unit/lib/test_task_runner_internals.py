@@ -166,11 +166,12 @@ class TestRunContainer:
 
     def _make_project(self) -> MagicMock:
         """Return a mock ProjectConfig for _run_container."""
-        from terok.lib.core.project_model import ProjectConfig
+        from terok.lib.core.project_model import ProjectConfig, ResourceLimits
 
         p = MagicMock(spec=ProjectConfig)
         p.gpu_enabled = False
         p.root = MOCK_TASK_DIR
+        p.resources = ResourceLimits()
         return p
 
     def test_builds_runspec_and_delegates(self) -> None:
@@ -375,6 +376,36 @@ class TestRunContainer:
         spec = sandbox_factory.return_value.run.call_args[0][0]
         assert spec.command == ()
 
+    def test_resource_limits_precede_extra_args(self) -> None:
+        """Limits (the project's unless given) become ``podman run`` flags."""
+        from terok.lib.core.project_model import ResourceLimits
+
+        project = self._make_project()
+        project.resources = ResourceLimits(cpus=2, memory="4g")
+        with (
+            patch("terok.lib.orchestration.task_runners._sandbox") as sandbox_factory,
+            patch(
+                "terok.lib.orchestration.task_runners.get_shield_bypass_firewall_no_protection",
+                return_value=False,
+            ),
+            patch("terok.lib.orchestration.task_runners.has_gpu", return_value=False),
+        ):
+            for resources in (None, ResourceLimits(pids_limit=256)):
+                _run_container(
+                    cname="ctr",
+                    image="img",
+                    env={},
+                    volumes=[],
+                    project=project,
+                    task_dir=MOCK_TASK_DIR,
+                    extra_args=["-p", "8080:80"],
+                    resources=resources,
+                )
+
+        specs = [c.args[0] for c in sandbox_factory.return_value.run.call_args_list]
+        assert specs[0].extra_args == ("--cpus=2.0", "--memory=4g", "-p", "8080:80")
+        assert specs[1].extra_args == ("--pids-limit=256", "-p", "8080:80")
+
 
 # ── _apply_unrestricted_env ───────────────────────────────
 
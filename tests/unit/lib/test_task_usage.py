@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for per-task disk usage accounting."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration import task_usage
+from terok.lib.orchestration.task_usage import scan_task_usage, usage_cache_path
+from terok.lib.orchestration.tasks import task_du
+from terok.lib.util.fs import disk_usage
+from tests.test_utils import project_env
+
+
+@pytest.fixture
+def tasks_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """A tasks root with two task directories; ``load_project`` is stubbed."""
+    monkeypatch.setenv("TEROK_STATE_DIR", str(tmp_path / "state"))
+    root = tmp_path / "tasks"
+    for tid in ("1", "2"):
+        ws = root / tid / "workspace-dangerous" / "src"
+        ws.mkdir(parents=True)
+        (ws / "main.py").write_bytes(b"x" * 20_000)
+        (root / tid / "logs").mkdir()
+        (root / tid / "logs" / "container.log").write_bytes(b"l" * 9_000)
+        (root / tid / "agent-config").mkdir()
+        (root / tid / "agent-config" / "prompt.txt").write_text("do it")
+        (root / tid / "README.md").write_text("task")
+    (root / ".trash").mkdir()
+    stub = SimpleNamespace(id="proj", tasks_root=root)
+    with patch("terok.lib.orchestration.task_usage.load_project", return_value=stub):
+        yield root
+
+
+def _counting_scans() -> tuple[list[str], object]:
+    """Return a list collecting directories listed, and a patch recording into it."""
+    listed: list[str] = []
+    real = task_usage._scan_dir
+
+    def _scan(path, dir_st, seen):
+        listed.append(path)
+        return real(path, dir_st, seen)
+
+    return listed, patch.object(task_usage, "_scan_dir", side_effect=_scan)
+
+
+class TestScanTaskUsage:
+    """Measuring task directories by category."""
+
+    def test_categories_add_up_to_du(self, tasks_root: Path) -> None:
+        usage = scan_task_usage("proj")
+
+        assert sorted(usage) == ["1", "2"]
+        u = usage["1"]
+        assert u.workspace >= 20_000 and u.logs >= 9_000 and u.agent_config > 0 and u.other > 0
+        assert u.total == disk_usage(tasks_root / "1")
+
+    def test_selected_tasks_only(self, tasks_root: Path) -> None:
+        assert list(scan_task_usage("proj", ["2", "missing"])) == ["2"]
+
+    def test_unchanged_directories_are_not_listed_again(self, tasks_root: Path) -> None:
+        scan_task_usage("proj")
+        listed, patcher = _counting_scans()
+        with patcher:
+            usage = scan_task_usage("proj")
+
+        assert all(Path(p).name == "logs" for p in listed)
+        assert usage["1"].total == disk_usage(tasks_root / "1")
+
+    def test_changed_directory_is_rescanned(self, tasks_root: Path) -> None:
+        before = scan_task_usage("proj")["1"].workspace
+        src = tasks_root / "1" / "workspace-dangerous" / "src"
+        (src / "big.bin").write_bytes(b"b" * 100_000)
+        listed, patcher = _counting_scans()
+        with patcher:
+            after = scan_task_usage("proj")["1"].workspace
+
+        assert str(src) in listed
+        assert str(tasks_root / "1" / "workspace-dangerous") not in listed
+        assert after >= before + 100_000
+
+    def test_growing_log_is_seen(self, tasks_root: Path) -> None:
+        before = scan_task_usage("proj")["1"].logs
+        with (tasks_root / "1" / "logs" / "container.log").open("ab") as f:
+            f.write(b"l" * 50_000)
+
+        assert scan_task_usage("proj")["1"].logs >= before + 40_000
+
+    def test_rescan_ignores_cache(self, tasks_root: Path) -> None:
+        scan_task_usage("proj")
+        listed, patcher = _counting_scans()
+        with patcher:
+            scan_task_usage("proj", rescan=True)
+
+        assert str(tasks_root / "1" / "workspace-dangerous" / "src") in listed
+
+    def test_full_scan_drops_deleted_tasks_from_cache(self, tasks_root: Path) -> None:
+        scan_task_usage("proj")
+        os.rename(tasks_root / "2", tasks_root / ".trash" / "2")
+        scan_task_usage("proj")
+
+        cached = json.loads(usage_cache_path("proj").read_text())["tasks"]
+        assert sorted(cached) == ["1"]
+
+    def test_corrupt_cache_is_ignored(self, tasks_root: Path) -> None:
+        usage_cache_path("proj").parent.mkdir(parents=True, exist_ok=True)
+        usage_cache_path("proj").write_text("{not json")
+
+        assert scan_task_usage("proj")["1"].total == disk_usage(tasks_root / "1")
+
+
+class TestTaskDu:
+    """The ``task du`` report."""
+
+    def test_table_sorted_by_size(self) -> None:
+        project_id = "proj_du"
+        with project_env(f"project:\n  id: {project_id}\n", project_id=project_id) as ctx:
+            meta_dir = ctx.state_dir / "projects" / project_id / "tasks"
+            meta_dir.mkdir(parents=True)
+            for tid in ("1", "2"):
+                ws = ctx.state_dir / "tasks" / project_id / tid / "workspace-dangerous"
+                ws.mkdir(parents=True)
+                (meta_dir / f"{tid}.yml").write_text(
+                    f"task_id: '{tid}'\nname: t{tid}\nmode: null\nworkspace: {ws.parent}\n"
+                )
+            (ws / "big").write_bytes(b"b" * 200_000)
+
+            buf = StringIO()
+            with redirect_stdout(buf):
+                task_du(project_id, sort="size")
+
+        lines = buf.getvalue().splitlines()
+        assert lines[0].split()[:3] == ["PROJECT", "TASK", "WORKSPACE"]
+        assert [line.split()[1] for line in lines[1:3]] == ["2", "1"]
+        assert lines[-1].startswith("Total: ") and lines[-1].endswith("in 2 task(s)")
+
+    def test_unknown_sort_key(self) -> None:
+        with pytest.raises(SystemExit, match="Unknown sort key"):
+            task_du("proj", sort="name")
@@ -7,6 +7,7 @@ import re
 import subprocess
 import unittest.mock
 from contextlib import redirect_stdout
+from datetime import UTC, datetime
 from io import StringIO
 from pathlib import Path
 
@@ -17,6 +18,7 @@ from terok.lib.domain.task_logs import LogViewOptions, task_logs
 from terok.lib.orchestration.environment import build_task_env_and_volumes
 from terok.lib.orchestration.task_runners import task_run_cli, task_run_toad
 from terok.lib.orchestration.tasks import (
+    get_container_states,
     get_workspace_git_diff,
     task_delete,
     task_list,
@@ -1113,6 +1115,10 @@ class TestTaskLogs:
                         "terok.lib.domain.task_logs.get_container_state",
                         return_value="exited",
                     ),
+                    unittest.mock.patch(
+                        "terok.lib.domain.task_logs.container_log_path",
+                        return_value=None,
+                    ),
                     unittest.mock.patch(
                         "terok.lib.domain.task_logs.subprocess.Popen",
                         return_value=mock_proc,
@@ -1223,6 +1229,86 @@ class TestTaskLogs:
                     task_logs("proj_logs_tail", task_id, LogViewOptions(tail=2))
                     assert mock_formatter.feed_line.call_count == 2
 
+    def test_exited_k8s_file_container_read_directly(self) -> None:
+        """task_logs reads an exited container's k8s-file log without podman logs."""
+        with project_env(
+            "project:\n  id: proj_logs_k8s\n",
+            project_id="proj_logs_k8s",
+        ) as ctx:
+            with mock_git_config():
+                task_id = self._setup_task_with_mode("proj_logs_k8s", "cli")
+                ctr_log = ctx.state_dir / "ctr.log"
+                ctr_log.write_bytes(
+                    b"2026-03-05T12:00:00Z stdout F a\n"
+                    b"2026-03-05T12:00:01Z stdout P b\n"
+                    b"2026-03-05T12:00:02Z stdout F c\n"
+                )
+                inspect = unittest.mock.Mock(returncode=0, stdout=f"k8s-file\t{ctr_log}\n")
+                mock_formatter = unittest.mock.Mock()
+
+                with (
+                    unittest.mock.patch(
+                        "terok.lib.domain.task_logs.get_container_state",
+                        return_value="exited",
+                    ),
+                    unittest.mock.patch(
+                        "terok.lib.domain.task_logs.subprocess.run", return_value=inspect
+                    ) as run,
+                    unittest.mock.patch("terok.lib.domain.task_logs.subprocess.Popen") as popen,
+                    unittest.mock.patch(
+                        "terok.lib.domain.task_logs.auto_detect_formatter",
+                        return_value=mock_formatter,
+                    ),
+                ):
+                    task_logs("proj_logs_k8s", task_id, LogViewOptions(tail=1))
+
+                assert "inspect" in run.call_args.args[0]
+                popen.assert_not_called()
+                fed = [c.args[0] for c in mock_formatter.feed_line.call_args_list]
+                assert fed == ["bc"]
+
+    def test_journald_container_falls_back_to_podman_logs(self) -> None:
+        """container_log_path returns None for drivers without a log file."""
+        from terok.lib.domain.task_logs import container_log_path
+
+        inspect = unittest.mock.Mock(returncode=0, stdout="journald\t\n")
+        with unittest.mock.patch("terok.lib.domain.task_logs.subprocess.run", return_value=inspect):
+            assert container_log_path("p-cli-1") is None
+
+    def test_persisted_logs_fallback_reads_compressed_segments(self) -> None:
+        """task_logs persisted fallback stream-decompresses rotated segments."""
+        import gzip
+
+        with project_env(
+            "project:\n  id: proj_logs_gz\n",
+            project_id="proj_logs_gz",
+        ):
+            with mock_git_config():
+                task_id = self._setup_task_with_mode("proj_logs_gz", "run")
+
+                from terok.lib.core.config import state_root
+
+                logs_dir = Path(state_root()) / "tasks" / "proj_logs_gz" / task_id / "logs"
+                logs_dir.mkdir(parents=True, exist_ok=True)
+                (logs_dir / "container.log.000001.gz").write_bytes(gzip.compress(b"a\nb\n"))
+                (logs_dir / "container.log").write_text("c\n", encoding="utf-8")
+
+                mock_formatter = unittest.mock.Mock()
+
+                with (
+                    unittest.mock.patch(
+                        "terok.lib.domain.task_logs.get_container_state",
+                        return_value=None,
+                    ),
+                    unittest.mock.patch(
+                        "terok.lib.domain.task_logs.auto_detect_formatter",
+                        return_value=mock_formatter,
+                    ),
+                ):
+                    task_logs("proj_logs_gz", task_id)
+                fed = [c.args[0] for c in mock_formatter.feed_line.call_args_list]
+                assert fed == ["a", "b", "c"]
+
     def test_no_container_no_logs_raises(self) -> None:
         """task_logs raises when container is gone and no persisted logs exist."""
         with project_env(
@@ -1329,10 +1415,13 @@ class TestTaskArchive:
                 assert archived_data["task_id"] == task_id
                 assert archived_data["name"] == "test-task"
 
-                # Archive should contain logs (captured from podman)
+                # Archive should contain logs (captured from podman), compressed
+                from terok.lib.util.log_store import iter_log_lines, log_segments
+
                 archived_logs = archive_entry / "logs" / "container.log"
-                assert archived_logs.is_file()
-                assert archived_logs.read_text() == "captured log output\n"
+                assert not archived_logs.exists()
+                assert len(log_segments(archived_logs)) == 1
+                assert b"".join(iter_log_lines(archived_logs)) == b"captured log output\n"
 
     def test_task_delete_archives_without_logs(self) -> None:
         """task_delete still archives metadata even when no logs exist."""
@@ -1401,6 +1490,14 @@ class TestTaskArchive:
             assert archived[2].task_id == "1"
             assert archived[0].archived_at == "20260303T100000Z"
 
+            # Paging: newest N, and only those archived since a time
+            assert [a.task_id for a in list_archived_tasks(project_id, limit=2)] == ["3", "2"]
+            since = datetime(2026, 3, 2, tzinfo=UTC)
+            assert [a.task_id for a in list_archived_tasks(project_id, since=since)] == ["3", "2"]
+            assert [a.task_id for a in list_archived_tasks(project_id, limit=1, since=since)] == [
+                "3"
+            ]
+
     def test_task_archive_logs(self) -> None:
         """task_archive_logs returns log file path for matching archive."""
         from terok.lib.orchestration.tasks import task_archive_logs, tasks_archive_dir
@@ -1494,3 +1591,68 @@ class TestTaskArchive:
                     result = capture_task_logs(project_id, task_id, "run")
 
                 assert result is None
+
+    def test_capture_task_logs_appends_since_cursor(self) -> None:
+        """capture_task_logs only fetches and appends output newer than the tee cursor."""
+        from terok.lib.orchestration.log_tee import read_cursor, write_cursor
+        from terok.lib.orchestration.tasks import capture_task_logs
+
+        project_id = "proj_capture3"
+        with project_env(
+            f"project:\n  id: {project_id}\n",
+            project_id=project_id,
+        ) as ctx:
+            with mock_git_config():
+                task_id = task_new(project_id)
+                logs_dir = ctx.state_dir / "tasks" / project_id / task_id / "logs"
+                logs_dir.mkdir(parents=True, exist_ok=True)
+                (logs_dir / "container.log").write_bytes(b"2026-03-05T12:00:00Z old\n")
+                write_cursor(logs_dir, "2026-03-05T12:00:00Z")
+
+                calls: list[list[str]] = []
+
+                def fake_run(cmd, *, stdout=None, stderr=None, timeout=None):
+                    """Replay the cursor line (``--since`` is inclusive) plus a new one."""
+                    calls.append(cmd)
+                    stdout.write(b"2026-03-05T12:00:00Z old\n2026-03-05T12:00:01Z new\n")
+                    return unittest.mock.Mock(returncode=0)
+
+                with unittest.mock.patch(
+                    "terok.lib.orchestration.tasks.subprocess.run",
+                    side_effect=fake_run,
+                ):
+                    log_file = capture_task_logs(project_id, task_id, "run")
+
+                assert calls[0][3:5] == ["--since", "2026-03-05T12:00:00Z"]
+                assert log_file.read_bytes() == (
+                    b"2026-03-05T12:00:00Z old\n2026-03-05T12:00:01Z new\n"
+                )
+                assert read_cursor(logs_dir) == "2026-03-05T12:00:01Z"
+
+                # A podman failure keeps what is already on disk.
+                with unittest.mock.patch(
+                    "terok.lib.orchestration.tasks.subprocess.run",
+                    side_effect=FileNotFoundError("podman"),
+                ):
+                    assert capture_task_logs(project_id, task_id, "run") == log_file
+                assert log_file.is_file()
+
+
+class TestGetContainerStates:
+    """Tests for the all-projects container state query."""
+
+    def test_states_of_all_containers(self) -> None:
+        """One ``podman ps -a`` maps every container to its lower-cased state."""
+        ps = subprocess.CompletedProcess([], 0, "a-cli-1\tRunning\nb-run-2\texited\n", "")
+        with unittest.mock.patch(
+            "terok.lib.orchestration.tasks.subprocess.run", return_value=ps
+        ) as mock_run:
+            assert get_container_states() == {"a-cli-1": "running", "b-run-2": "exited"}
+        mock_run.assert_called_once()
+
+    def test_podman_failure_returns_none(self) -> None:
+        """A missing or failing podman yields ``None`` rather than empty states."""
+        with unittest.mock.patch(
+            "terok.lib.orchestration.tasks.subprocess.run", side_effect=FileNotFoundError("podman")
+        ):
+            assert get_container_states() is None
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the task trash and its background reaper."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from terok.lib.orchestration import trash
+from terok.lib.orchestration.trash import (
+    move_to_trash,
+    reap_trash,
+    remove_tree,
+    resume_trash_reaper,
+    trash_dir,
+)
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """A project stub with one task workspace and its metadata file."""
+    monkeypatch.setenv("TEROK_STATE_DIR", str(tmp_path / "state"))
+    tasks_root = tmp_path / "tasks"
+    (tasks_root / "1" / "repo" / ".git").mkdir(parents=True)
+    (tasks_root / "1" / "repo" / "README").write_text("hi")
+    meta_dir = tmp_path / "meta"
+    meta_dir.mkdir()
+    (meta_dir / "1.yml").write_text("task_id: 1\n")
+    return SimpleNamespace(id="proj", tasks_root=tasks_root, meta_path=meta_dir / "1.yml")
+
+
+def _build_tree(root: Path, *, fanout: int = 3, depth: int = 3) -> None:
+    """Create a tree of directories and files under *root*."""
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "file").write_text("x")
+    if depth:
+        for i in range(fanout):
+            _build_tree(root / f"d{i}", fanout=fanout, depth=depth - 1)
+
+
+class TestMoveToTrash:
+    """Deleting a task only renames it."""
+
+    def test_workspace_and_meta_are_moved(self, project: SimpleNamespace) -> None:
+        entry = move_to_trash(project, "1", project.meta_path)
+
+        assert entry is not None and entry.parent == trash_dir(project)
+        assert not (project.tasks_root / "1").exists()
+        assert not project.meta_path.exists()
+        assert (entry / "workspace" / "repo" / "README").read_text() == "hi"
+        assert (entry / "1.yml").is_file()
+
+    def test_unrenamable_workspace_is_left_for_inline_removal(
+        self, project: SimpleNamespace
+    ) -> None:
+        with patch.object(trash.os, "rename", side_effect=OSError("busy")):
+            assert move_to_trash(project, "1", project.meta_path) is None
+        assert (project.tasks_root / "1").is_dir()
+        assert not any(trash_dir(project).iterdir())
+
+
+class TestRemoveTree:
+    """The parallel scandir-based remover."""
+
+    def test_removes_nested_tree(self, tmp_path: Path) -> None:
+        _build_tree(tmp_path / "t")
+        remove_tree(tmp_path / "t", workers=4)
+        assert not (tmp_path / "t").exists()
+
+    def test_fixes_permissions_and_spares_symlink_targets(self, tmp_path: Path) -> None:
+        keep = tmp_path / "keep"
+        keep.mkdir()
+        (keep / "precious").write_text("!")
+        root = tmp_path / "t"
+        _build_tree(root, fanout=2, depth=2)
+        (root / "d0" / "link").symlink_to(keep)
+        locked = root / "d1" / "d0"
+        locked.chmod(0o500)
+
+        remove_tree(root, workers=2)
+
+        assert not root.exists()
+        assert (keep / "precious").read_text() == "!"
+
+
+class TestReaper:
+    """Reclaiming the trash of all projects."""
+
+    def test_reap_removes_every_entry(self, project: SimpleNamespace) -> None:
+        move_to_trash(project, "1", project.meta_path)
+        assert reap_trash([trash_dir(project)]) == 1
+        assert not any(trash_dir(project).iterdir())
+
+    def test_reaper_yields_to_active_reaper(self, project: SimpleNamespace) -> None:
+        move_to_trash(project, "1", project.meta_path)
+        lock = trash._reaper_dir() / trash._REAPER_LOCK_FILENAME
+        lock.parent.mkdir(parents=True)
+        fd = trash._try_lock(lock)
+        assert fd is not None
+        try:
+            assert reap_trash([trash_dir(project)]) == 0
+        finally:
+            os.close(fd)
+        assert any(trash_dir(project).iterdir())
+
+    def test_resume_spawns_only_for_leftover_trash(self, project: SimpleNamespace) -> None:
+        with (
+            patch.object(trash, "list_projects", return_value=[project]),
+            patch.object(trash, "start_trash_reaper", return_value=True) as start,
+        ):
+            assert not resume_trash_reaper()
+            move_to_trash(project, "1", project.meta_path)
+            assert resume_trash_reaper()
+        start.assert_called_once_with()
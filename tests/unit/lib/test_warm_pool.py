@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the warm pool of pre-initialised headless containers."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from terok.lib.core.projects import ProjectConfig, load_project
+from terok.lib.orchestration.task_runners import fill_warm_pool
+from terok.lib.orchestration.tasks import get_tasks
+from terok.lib.orchestration.warm_pool import (
+    WARM_READY_MARKER,
+    WARM_START_SCRIPT,
+    claim_warm_task,
+    list_warm_tasks,
+    mark_warm_started,
+    release_warm_task,
+    reserve_warm_task,
+    warm_command,
+)
+from tests.test_utils import project_env
+
+MODULE = "terok.lib.orchestration.warm_pool"
+RUNNERS = "terok.lib.orchestration.task_runners"
+
+
+@pytest.fixture
+def project() -> Iterator[ProjectConfig]:
+    """A project with ``run.warm_pool: 2`` in an isolated state root."""
+    with project_env("project:\n  id: wp\nrun:\n  warm_pool: 2\n", project_id="wp"):
+        yield load_project("wp")
+
+
+def containers(**states: tuple[str, str]) -> mock._patch:
+    """Patch the podman query to report ``{cname: (state, image_id)}``."""
+    return mock.patch(f"{MODULE}._container_states", return_value=states)
+
+
+def all_running(project: ProjectConfig) -> mock._patch:
+    """Patch the podman query to report every warm container as running ``img1``."""
+    return mock.patch(
+        f"{MODULE}._container_states",
+        side_effect=lambda _pid: {w.cname: ("running", "img1") for w in list_warm_tasks(project)},
+    )
+
+
+def add_warm(project: ProjectConfig, *, unrestricted: bool = True, ready: bool = False) -> str:
+    """Reserve and start one warm task built from image ``img1``."""
+    with all_running(project):
+        tid = reserve_warm_task(project, image_id="img1", unrestricted=unrestricted)
+    assert tid is not None
+    mark_warm_started(project, tid)
+    if ready:
+        agent_dir = project.tasks_root / tid / "agent-config"
+        agent_dir.mkdir(parents=True, exist_ok=True)
+        (agent_dir / WARM_READY_MARKER).touch()
+    return tid
+
+
+class TestReserve:
+    """Filling the pool up to its configured size."""
+
+    def test_reserve_stops_at_pool_size(self, project: ProjectConfig) -> None:
+        with all_running(project):
+            ids = [reserve_warm_task(project, image_id="img1", unrestricted=True) for _ in "abc"]
+        assert ids[2] is None
+        assert [w.task_id for w in list_warm_tasks(project)] == ids[:2]
+
+    def test_warm_tasks_are_hidden_from_listings(self, project: ProjectConfig) -> None:
+        add_warm(project)
+        assert get_tasks("wp") == []
+
+    def test_dead_and_stale_containers_are_evicted(self, project: ProjectConfig) -> None:
+        dead = add_warm(project)
+        stale = add_warm(project)
+        states = {
+            f"wp-run-{dead}": ("exited", "img1"),
+            f"wp-run-{stale}": ("running", "img0"),
+        }
+        with (
+            containers(**states),
+            mock.patch(f"{MODULE}.task_delete") as delete,
+        ):
+            fresh = reserve_warm_task(project, image_id="img1", unrestricted=True)
+        assert fresh is not None
+        assert sorted(c.args[1] for c in delete.call_args_list) == sorted([dead, stale])
+
+    def test_podman_failure_reserves_nothing(self, project: ProjectConfig) -> None:
+        add_warm(project)
+        with mock.patch(f"{MODULE}._container_states", return_value=None):
+            assert reserve_warm_task(project, image_id="img1", unrestricted=True) is None
+        assert len(list_warm_tasks(project)) == 1
+
+
+class TestClaim:
+    """Taking a warm task for a headless run."""
+
+    def test_claim_prefers_ready_and_matching_mode(self, project: ProjectConfig) -> None:
+        add_warm(project)
+        ready = add_warm(project, ready=True)
+        with all_running(project):
+            assert claim_warm_task(project, image_id="img1", unrestricted=False) is None
+            assert claim_warm_task(project, image_id="img1", unrestricted=True) == ready
+        assert len(list_warm_tasks(project)) == 1
+        assert [t.task_id for t in get_tasks("wp")] == [ready]
+        marker = project.tasks_root / ready / "workspace-dangerous" / ".new-task-marker"
+        assert marker.is_file()
+
+    def test_unstarted_tasks_are_not_claimable(self, project: ProjectConfig) -> None:
+        with containers():
+            tid = reserve_warm_task(project, image_id="img1", unrestricted=True)
+        with containers(**{f"wp-run-{tid}": ("running", "img1")}):
+            assert claim_warm_task(project, image_id="img1", unrestricted=True) is None
+
+    def test_release_writes_start_script(self, tmp_path: Path) -> None:
+        release_warm_task(tmp_path, 'claude -p "$(cat prompt.txt)"')
+        lines = (tmp_path / WARM_START_SCRIPT).read_text().splitlines()
+        assert lines == ["init-ssh-and-repo.sh || exit $?", 'claude -p "$(cat prompt.txt)"']
+        assert WARM_START_SCRIPT in warm_command()[-1]
+
+
+class TestFill:
+    """Starting warm containers for the reserved slots."""
+
+    def test_fill_starts_missing_containers(self, project: ProjectConfig) -> None:
+        add_warm(project)
+        with (
+            mock.patch(f"{RUNNERS}.current_image_id", return_value="img1"),
+            mock.patch(f"{RUNNERS}._default_unrestricted", return_value=True),
+            mock.patch(f"{RUNNERS}._prepare_agent_config", return_value=Path("/cfg")),
+            mock.patch(f"{RUNNERS}.build_task_env_and_volumes", return_value=({}, [])),
+            mock.patch(f"{RUNNERS}._apply_unrestricted_env"),
+            mock.patch(f"{RUNNERS}._run_container") as run,
+            all_running(project),
+        ):
+            assert fill_warm_pool("wp") == 1
+        assert run.call_args.kwargs["command"] == warm_command()
+        assert all(w.started for w in list_warm_tasks(project))
+
+    def test_failed_start_evicts_reservation(self, project: ProjectConfig) -> None:
+        with (
+            mock.patch(f"{RUNNERS}.current_image_id", return_value="img1"),
+            mock.patch(f"{RUNNERS}._default_unrestricted", return_value=False),
+            mock.patch(f"{RUNNERS}._prepare_agent_config", side_effect=SystemExit("boom")),
+            containers(),
+            pytest.raises(SystemExit),
+        ):
+            fill_warm_pool("wp")
+        assert list_warm_tasks(project) == []
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for seeding task workspaces from the git gate."""
+
+import errno
+import shutil
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from terok.lib.core.projects import load_project
+from terok.lib.orchestration.tasks import task_new, tasks_meta_dir
+from terok.lib.orchestration.workspace_seed import refresh_workspace_template
+from terok.lib.util.yaml import load as yaml_load
+from tests.test_utils import project_env
+
+MODULE = "terok.lib.orchestration.workspace_seed"
+
+
+def git(*args: str, cwd: Path | None = None) -> str:
+    """Run git and return its stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def make_gate(gate: Path, work: Path) -> None:
+    """Create a bare gate at *gate* with two commits on ``main``."""
+    git("init", "-q", "-b", "main", str(work))
+    for n in (1, 2):
+        (work / "file.txt").write_text(f"v{n}\n")
+        git("add", ".", cwd=work)
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", f"c{n}", cwd=work)
+    git("clone", "-q", "--bare", str(work), str(gate))
+
+
+def seeded_env(mode: str) -> Iterator[object]:
+    """A project with a synced gate and ``tasks.workspace_seed: <mode>``."""
+    yaml = (
+        "project:\n  id: sp\n"
+        "git:\n  upstream_url: https://example.com/r.git\n  default_branch: main\n"
+        f"tasks:\n  workspace_seed: {mode}\n"
+    )
+    with project_env(yaml, project_id="sp", with_gate=True) as ctx:
+        gate = ctx.gate_dir
+        gate.rmdir()
+        make_gate(gate, ctx.base / "work")
+        yield ctx
+
+
+@pytest.fixture(params=["full", "shallow", "template"])
+def seeded(request) -> Iterator[object]:
+    """Seeded project environment, once per seeding mode."""
+    yield from seeded_env(request.param)
+
+
+class TestSeedWorkspace:
+    """Host-side clones made during task creation."""
+
+    def test_new_task_gets_seeded_repository(self, seeded) -> None:
+        project = load_project("sp")
+        tid = task_new("sp")
+        ws = project.tasks_root / tid / "workspace-dangerous"
+        assert (ws / ".new-task-marker").is_file()
+        assert git("rev-parse", "origin/main", cwd=ws)
+        assert git("remote", "get-url", "origin", cwd=ws) == "https://example.com/r.git"
+        assert not (ws / ".git" / "objects" / "info" / "alternates").exists()
+        commits = git("rev-list", "--count", "origin/main", cwd=ws)
+        assert not (ws / ".git" / "terok-template-rev").exists()
+        meta = yaml_load((tasks_meta_dir("sp") / f"{tid}.yml").read_text())
+        seed = meta["workspace_seed"]
+        assert seed["mode"] == project.workspace_seed
+        assert commits == ("1" if seed["mode"] == "shallow" else "2")
+        assert seed["bytes"] > 0
+
+    def test_objects_are_not_hard_linked(self, seeded) -> None:
+        project = load_project("sp")
+        ws = project.tasks_root / task_new("sp") / "workspace-dangerous"
+        linked = [
+            p for p in (ws / ".git" / "objects").rglob("*") if p.is_file() and p.stat().st_nlink > 1
+        ]
+        assert linked == []
+
+
+class TestTemplate:
+    """Copy-on-write provisioning from the per-project template workspace."""
+
+    @pytest.fixture
+    def template_env(self) -> Iterator[object]:
+        """A seeded environment in ``template`` mode."""
+        yield from seeded_env("template")
+
+    def test_workspace_is_a_checked_out_copy(self, template_env) -> None:
+        project = load_project("sp")
+        ws = project.tasks_root / task_new("sp") / "workspace-dangerous"
+        assert (ws / "file.txt").read_text() == "v2\n"
+        assert (ws / ".new-task-marker").is_file()
+        assert git("status", "--porcelain", "--untracked-files=no", cwd=ws) == ""
+        assert ws.stat().st_mode & 0o777 == 0o700
+
+    def test_template_follows_gate_updates(self, template_env) -> None:
+        project = load_project("sp")
+        task_new("sp")
+        assert not refresh_workspace_template(project)
+        work = template_env.base / "work"
+        (work / "file.txt").write_text("v3\n")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qam", "c3", cwd=work)
+        git("push", "-q", str(project.gate_path), "main", cwd=work)
+        ws = project.tasks_root / task_new("sp") / "workspace-dangerous"
+        assert (ws / "file.txt").read_text() == "v3\n"
+
+    def test_reflink_failure_falls_back_to_copy(self, template_env) -> None:
+        unsupported = OSError(errno.EOPNOTSUPP, "Operation not supported")
+        with mock.patch(f"{MODULE}.reflink_file", side_effect=unsupported) as reflink:
+            tid = task_new("sp")
+        assert reflink.call_count == 1  # Not retried for every file
+        meta = yaml_load((tasks_meta_dir("sp") / f"{tid}.yml").read_text())
+        assert meta["workspace_seed"]["saved_bytes"] == 0
+
+    def test_reflinked_bytes_count_as_saved(self, template_env) -> None:
+        def fake_reflink(src: Path, dst: Path) -> None:
+            shutil.copyfile(src, dst)
+
+        with mock.patch(f"{MODULE}.reflink_file", side_effect=fake_reflink):
+            tid = task_new("sp")
+        meta = yaml_load((tasks_meta_dir("sp") / f"{tid}.yml").read_text())
+        assert meta["workspace_seed"]["saved_bytes"] > 0
+
+
+def test_seeding_off_or_without_gate_leaves_workspace_empty() -> None:
+    with project_env("project:\n  id: sp\ntasks:\n  workspace_seed: full\n", project_id="sp"):
+        tid = task_new("sp")
+        ws = load_project("sp").tasks_root / tid / "workspace-dangerous"
+        assert not (ws / ".git").exists()
+        meta = yaml_load((tasks_meta_dir("sp") / f"{tid}.yml").read_text())
+        assert "workspace_seed" not in meta
+
+
+def test_invalid_mode_is_rejected() -> None:
+    with (
+        project_env("project:\n  id: sp\ntasks:\n  workspace_seed: cow\n", project_id="sp"),
+        pytest.raises((SystemExit, ValueError)),
+    ):
+        load_project("sp")
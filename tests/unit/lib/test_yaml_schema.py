@@ -276,6 +276,17 @@ class RawGlobalConfigTests(unittest.TestCase):
         with self.assertRaises(ValidationError):
             RawGlobalConfig.model_validate({"hooks": {"on_crash": "oops.sh"}})
 
+    def test_background_hooks_exclude_pre_start(self) -> None:
+        """Only post_* hooks may run in the background; pre_start must block."""
+        raw = RawProjectYaml.model_validate(
+            {"run": {"hooks": {"background": ["post_start", "post_stop"]}}}
+        )
+        self.assertEqual(raw.run.hooks.background, ["post_start", "post_stop"])
+        with self.assertRaises(ValidationError):
+            RawProjectYaml.model_validate({"run": {"hooks": {"background": ["pre_start"]}}})
+        with self.assertRaises(ValidationError):
+            RawGlobalConfig.model_validate({"hooks": {"background": ["pre_start"]}})
+
     def test_project_run_hooks(self) -> None:
         """Project run.hooks section parses correctly."""
         raw = RawProjectYaml.model_validate(
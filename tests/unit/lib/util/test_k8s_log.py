@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the direct k8s-file container log reader."""
+
+from pathlib import Path
+
+import pytest
+
+from terok.lib.util.k8s_log import iter_k8s_lines, read_k8s_log, split_record, tail_offset
+
+LOG = (
+    b"2026-03-05T12:00:00.1+01:00 stdout F one\n"
+    b"2026-03-05T12:00:01.1+01:00 stderr P tw\n"
+    b"2026-03-05T12:00:01.2+01:00 stderr P o and \n"
+    b"2026-03-05T12:00:01.3+01:00 stderr F more\n"
+    b"2026-03-05T12:00:02.1+01:00 stdout F \n"
+    b"2026-03-05T12:00:03.1+01:00 stdout F three with  spaces\n"
+)
+
+
+class TestSplitRecord:
+    """Parsing of single records."""
+
+    def test_full_record(self) -> None:
+        assert split_record(b"2026-03-05T12:00:00Z stdout F a b  c") == (
+            b"2026-03-05T12:00:00Z",
+            b"F",
+            b"a b  c",
+        )
+
+    def test_empty_content(self) -> None:
+        assert split_record(b"2026-03-05T12:00:00Z stdout F") == (
+            b"2026-03-05T12:00:00Z",
+            b"F",
+            b"",
+        )
+
+    def test_foreign_line_is_full_plain_text(self) -> None:
+        assert split_record(b"hello world") == (None, b"F", b"hello world")
+
+
+class TestIterLines:
+    """Reassembly of partial records."""
+
+    def test_partials_are_joined(self) -> None:
+        assert list(iter_k8s_lines(LOG)) == [
+            b"one\n",
+            b"two and more\n",
+            b"\n",
+            b"three with  spaces\n",
+        ]
+
+    def test_timestamps_use_first_record(self) -> None:
+        lines = list(iter_k8s_lines(LOG, timestamps=True))
+        assert lines[1] == b"2026-03-05T12:00:01.1+01:00 two and more\n"
+
+    def test_trailing_partial_is_flushed(self) -> None:
+        data = b"2026-03-05T12:00:00Z stdout P cut off"
+        assert list(iter_k8s_lines(data)) == [b"cut off\n"]
+
+
+class TestTail:
+    """Backwards scan for ``--tail``."""
+
+    @pytest.mark.parametrize(
+        ("n", "expected"),
+        [
+            (0, []),
+            (1, [b"three with  spaces\n"]),
+            (3, [b"two and more\n", b"\n", b"three with  spaces\n"]),
+            (10, [b"one\n", b"two and more\n", b"\n", b"three with  spaces\n"]),
+        ],
+    )
+    def test_tail_counts_logical_lines(self, n: int, expected: list[bytes]) -> None:
+        assert list(iter_k8s_lines(LOG, tail_offset(LOG, n))) == expected
+
+    def test_read_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "ctr.log"
+        path.write_bytes(LOG)
+        assert list(read_k8s_log(path, tail=2)) == [b"\n", b"three with  spaces\n"]
+        empty = tmp_path / "empty.log"
+        empty.touch()
+        assert list(read_k8s_log(empty)) == []
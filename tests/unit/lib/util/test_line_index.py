@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the sparse line-offset index sidecar."""
+
+from pathlib import Path
+
+from terok.lib.util.line_index import (
+    LineIndex,
+    index_path,
+    load_line_index,
+    update_line_index,
+)
+
+
+def write_lines(path: Path, count: int, *, start: int = 0) -> None:
+    """Append *count* numbered lines to *path*."""
+    with path.open("ab") as f:
+        for i in range(start, start + count):
+            f.write(f"line {i}\n".encode())
+
+
+class TestLineIndex:
+    """Build, extend, persist and query the index."""
+
+    def test_build_records_every_stride_line(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        write_lines(log, 10)
+        index = update_line_index(log, stride=4)
+        assert index is not None
+        assert index.line_count == 10
+        data = log.read_bytes()
+        assert [data[o : o + 6] for o in index.offsets] == [b"line 0", b"line 4", b"line 8"]
+        assert index_path(log).is_file()
+
+    def test_line_at_matches_linear_count(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        write_lines(log, 50)
+        index = update_line_index(log, stride=8)
+        data = log.read_bytes()
+        for lineno in (0, 7, 8, 9, 33, 49):
+            offset = data.index(f"line {lineno}\n".encode())
+            assert index.line_at(data, offset) == lineno
+
+    def test_seek_line(self) -> None:
+        index = LineIndex(stride=4)
+        index.offsets.extend([40, 80])
+        assert index.seek_line(5) == (40, 1)
+        assert index.seek_line(100) == (80, 92)
+        assert index.seek_line(0) == (0, 0)
+
+    def test_incremental_extension_reuses_sidecar(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        write_lines(log, 6)
+        update_line_index(log, stride=4)
+        write_lines(log, 6, start=6)
+        index = update_line_index(log, stride=4)
+        assert index.line_count == 12
+        assert load_line_index(log).offsets.tolist() == index.offsets.tolist()
+        assert len(index.offsets) == 4
+
+    def test_partial_trailing_line_not_indexed(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(b"a\nb\npartial")
+        index = update_line_index(log, stride=1)
+        assert index.line_count == 2
+        assert index.indexed_size == 4
+
+    def test_truncated_log_triggers_rebuild(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        write_lines(log, 20)
+        update_line_index(log, stride=4)
+        log.write_bytes(b"x\n")
+        index = update_line_index(log, stride=4)
+        assert index.line_count == 1
+        assert index.offsets.tolist() == [0]
+
+    def test_corrupt_sidecar_ignored(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        write_lines(log, 3)
+        index_path(log).write_bytes(b"garbage")
+        assert load_line_index(log) is None
+        assert update_line_index(log).line_count == 3
+
+    def test_missing_log_returns_none(self, tmp_path: Path) -> None:
+        assert update_line_index(tmp_path / "nope.log") is None
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for rotating, gzip-segmented task log storage."""
+
+import gzip
+import mmap
+from pathlib import Path
+
+from terok.lib.util.line_index import index_path, update_line_index
+from terok.lib.util.log_store import (
+    has_log,
+    iter_log_lines,
+    iter_log_text,
+    log_disk_usage,
+    log_segments,
+    prune_log,
+    rotate_log,
+    seal_log,
+    segment_path,
+)
+
+
+class TestRotation:
+    """Sealing the live file into numbered segments."""
+
+    def test_rotate_compresses_and_truncates(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(b"one\ntwo\n")
+        seg = rotate_log(log)
+        assert seg == segment_path(log, 1)
+        assert gzip.decompress(seg.read_bytes()) == b"one\ntwo\n"
+        assert log.read_bytes() == b""
+
+    def test_open_mmap_survives_rotation(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(b"needle\n" * 100)
+        with log.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            rotate_log(log)
+            assert mm[:7] == b"needle\n"
+            assert mm.size() == 700
+        assert not log.with_name("container.log.rotating").exists()
+
+    def test_interrupted_rotation_is_recovered(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.with_name("container.log.rotating").write_bytes(b"old\n")
+        log.write_bytes(b"new\n")
+        rotate_log(log)
+        assert list(iter_log_lines(log)) == [b"old\n", b"new\n"]
+
+    def test_sequence_numbers_increase(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        for chunk in (b"a\n", b"b\n", b"c\n"):
+            log.write_bytes(chunk)
+            rotate_log(log)
+        assert [p.name for p in log_segments(log)] == [
+            "container.log.000001.gz",
+            "container.log.000002.gz",
+            "container.log.000003.gz",
+        ]
+
+    def test_empty_or_missing_log_is_not_rotated(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        assert rotate_log(log) is None
+        log.touch()
+        assert rotate_log(log) is None
+        assert log_segments(log) == []
+
+    def test_rotation_drops_stale_line_index(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(b"x\n" * 10)
+        update_line_index(log, stride=2)
+        assert index_path(log).exists()
+        rotate_log(log)
+        assert not index_path(log).exists()
+
+    def test_seal_leaves_only_segments(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        log.write_bytes(b"tail\n")
+        seal_log(log)
+        assert not log.exists()
+        assert has_log(log)
+        assert list(iter_log_lines(log)) == [b"tail\n"]
+
+
+class TestReading:
+    """Transparent reads across segments and the live file."""
+
+    def test_lines_in_order(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        segment_path(log, 2).write_bytes(gzip.compress(b"c\n"))
+        segment_path(log, 1).write_bytes(gzip.compress(b"a\nb\n"))
+        log.write_bytes(b"d\ne")
+        assert list(iter_log_text(log)) == ["a", "b", "c", "d", "e"]
+
+    def test_corrupt_segment_is_skipped(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        segment_path(log, 1).write_bytes(b"not gzip")
+        log.write_bytes(b"live\n")
+        assert list(iter_log_text(log)) == ["live"]
+
+    def test_has_log(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        assert not has_log(log)
+        segment_path(log, 1).write_bytes(gzip.compress(b"x\n"))
+        assert has_log(log)
+
+
+class TestPrune:
+    """Enforcing the per-task size cap."""
+
+    def test_drops_oldest_segments_first(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        for seq in (1, 2, 3):
+            segment_path(log, seq).write_bytes(b"x" * 100)
+        log.write_bytes(b"y" * 50)
+        removed = prune_log(log, 260)
+        assert [p.name for p in removed] == ["container.log.000001.gz"]
+        assert log_disk_usage(log) == 250
+
+    def test_live_file_is_never_removed(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        segment_path(log, 1).write_bytes(b"x" * 100)
+        log.write_bytes(b"y" * 500)
+        prune_log(log, 10)
+        assert log_segments(log) == []
+        assert log.exists()
+
+    def test_zero_cap_is_unlimited(self, tmp_path: Path) -> None:
+        log = tmp_path / "container.log"
+        segment_path(log, 1).write_bytes(b"x" * 100)
+        assert prune_log(log, 0) == []
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 Jiri Vyskocil
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for launch phase timing spans."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from terok.lib.util.timings import (
+    TRACE_DIR_ENV,
+    launch_timings,
+    mark,
+    mark_first_call,
+    span,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_trace_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep an inherited ``TEROK_TRACE_DIR`` from leaking into the tests."""
+    monkeypatch.delenv(TRACE_DIR_ENV, raising=False)
+
+
+class TestSpans:
+    """Recording nested spans and milestones."""
+
+    def test_inactive_by_default(self) -> None:
+        with launch_timings("run") as rec:
+            with span("load_project"):
+                mark("ready")
+        assert rec is None
+
+    def test_nested_spans_and_marks(self) -> None:
+        out = io.StringIO()
+        with launch_timings("run-cli", show=True, out=out) as rec:
+            with span("build_task_env_and_volumes"):
+                with span("podman_run"):
+                    pass
+            check = mark_first_call("first_log_line", lambda line: "READY" in line)
+            assert not check("booting")
+            assert check("READY")
+        assert rec is not None
+        events = {e.name: e for e in rec.events}
+        assert events["podman_run"].depth == 1
+        assert events["build_task_env_and_volumes"].depth == 0
+        assert [e.name for e in rec.events].count("first_log_line") == 1
+        assert events["first_log_line"].duration is None
+        lines = out.getvalue().splitlines()
+        assert "Launch timings (run-cli)" in lines[1]
+        assert lines[2].startswith("  build_task_env_and_volumes ")
+        assert lines[3].startswith("    podman_run")
+        assert lines[-1].split()[0] == "total"
+
+    def test_span_recorded_when_block_raises(self) -> None:
+        out = io.StringIO()
+        with pytest.raises(SystemExit):
+            with launch_timings("restart", show=True, out=out):
+                with span("podman_start"):
+                    raise SystemExit("boom")
+        assert "podman_start" in out.getvalue()
+
+
+class TestTrace:
+    """Chrome trace-event output."""
+
+    def test_trace_written_to_env_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys
+    ) -> None:
+        monkeypatch.setenv(TRACE_DIR_ENV, str(tmp_path / "traces"))
+        with launch_timings("run"):
+            with span("podman_run"):
+                mark("started")
+        assert capsys.readouterr().out == ""
+        [trace] = (tmp_path / "traces").glob("*-run-*.trace.json")
+        events = json.loads(trace.read_text())["traceEvents"]
+        by_name = {e["name"]: e for e in events}
+        assert by_name["podman_run"]["ph"] == "X"
+        assert by_name["podman_run"]["dur"] >= 0
+        assert by_name["started"]["ph"] == "i"
+        assert by_name["started"]["ts"] >= by_name["podman_run"]["ts"]
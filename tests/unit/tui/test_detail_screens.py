@@ -238,6 +238,42 @@ class TestRenderHelpers:
         assert "Autopilot" in text_str
         assert "terokctl task logs" in text_str
 
+    def test_render_task_details_idle_stop(self) -> None:
+        text_str = render_task_details_text(
+            container_state="exited", idle_reason="no output for 2h 0m"
+        )
+        assert "Idle stop: no output for 2h 0m (resumes on login)" in text_str
+        assert "Idle stop" not in render_task_details_text(idle_reason="no output for 2h 0m")
+
+    def test_render_task_details_resources(self) -> None:
+        from terok.lib.orchestration.resource_monitor import ResourceMonitor
+
+        monitor = ResourceMonitor()
+        for cpu in ("10%", "90%"):
+            monitor.feed(
+                [
+                    {
+                        "name": "proj1-cli-1",
+                        "cpu_percent": cpu,
+                        "mem_usage": "2MiB / 1GiB",
+                        "net_io": "1kB / 2kB",
+                        "block_io": "0B / 0B",
+                        "pids": "4",
+                    }
+                ]
+            )
+        widgets = import_widgets()
+        resources = monitor.task("proj1", "1")
+        text_str = str(
+            widgets.render_task_details(make_task(widgets), project_id="proj1", resources=resources)
+        )
+        assert "CPU:       90.0%  ▂▇" in text_str
+        assert "Memory:    2.0 MB of 1.0 GB · 4 processes" in text_str
+        stopped = make_task(widgets, container_state="exited")
+        assert "CPU:" not in str(
+            widgets.render_task_details(stopped, project_id="proj1", resources=resources)
+        )
+
     def test_render_task_details_autopilot_with_exit_code(self) -> None:
         widgets = import_widgets()
         task = make_task(widgets, task_id="5", mode="run", exit_code=0)
@@ -725,6 +761,45 @@ class TestActionSelection:
         instance.refresh_tasks.assert_awaited_once()
 
 
+class TestAutopilotExitWatcher:
+    """Autopilot exits are delivered by the shared exit watcher."""
+
+    def test_start_watcher_registers_container(self) -> None:
+        _, app_class = import_app()
+        instance = mock.Mock()
+        watch = mock.Mock()
+        with mock.patch.dict(
+            app_class._start_autopilot_watcher.__globals__, {"watch_container_exit": watch}
+        ):
+            app_class._start_autopilot_watcher(instance, "proj1", "7")
+        watch.assert_called_once_with("proj1-run-7", "proj1", "7", instance._post_autopilot_exit)
+
+    @pytest.mark.parametrize(
+        ("exit_code", "error", "message"),
+        [
+            (0, None, "Autopilot task 7 completed successfully"),
+            (2, None, "Autopilot task 7 failed (exit 2)"),
+            (
+                None,
+                "container not found",
+                "Autopilot watcher error for task 7: container not found",
+            ),
+        ],
+    )
+    def test_exit_notifies_and_refreshes(self, exit_code, error, message) -> None:
+        from terok.lib.orchestration.exit_watcher import ContainerExit
+
+        _, app_class = import_app()
+        instance = mock.Mock()
+        instance.current_project_id = "proj1"
+        result = ContainerExit("proj1-run-7", "proj1", "7", exit_code, error)
+
+        app_class._on_autopilot_exit(instance, result)
+
+        instance.notify.assert_called_once_with(message)
+        instance.call_later.assert_called_once_with(instance.refresh_tasks)
+
+
 class TestGateSyncAction:
     """Tests for gate sync action behavior in suspended terminal mode."""
 
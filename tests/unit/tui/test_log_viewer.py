@@ -594,9 +594,10 @@ class TestStreamLogs:
         cmd = mock_popen.call_args[0][0]
         assert "-f" in cmd
 
+    @mock.patch("terok.lib.domain.facade.container_log_path", return_value=None)
     @mock.patch("subprocess.Popen")
     @mock.patch("select.select")
-    def test_no_follow_flag_when_static(self, mock_select, mock_popen):
+    def test_no_follow_flag_when_static(self, mock_select, mock_popen, _mock_path):
         """Static mode (follow=False) does not include -f."""
         screen = make_log_viewer_screen(follow=False)
 
@@ -612,6 +613,21 @@ class TestStreamLogs:
         cmd = mock_popen.call_args[0][0]
         assert "-f" not in cmd
 
+    @mock.patch("subprocess.Popen")
+    def test_static_view_reads_k8s_file_directly(self, mock_popen, tmp_path):
+        """Static mode renders a k8s-file log from disk without spawning podman."""
+        log = tmp_path / "ctr.log"
+        log.write_bytes(b"2026-03-05T12:00:00Z stdout P hel\n2026-03-05T12:00:01Z stdout F lo\n")
+        screen = make_log_viewer_screen(follow=False)
+
+        with mock.patch("terok.lib.domain.facade.container_log_path", return_value=log):
+            screen._stream_logs()
+
+        mock_popen.assert_not_called()
+        texts = [t.plain for t in screen._posted]
+        assert "hello" in texts
+        assert texts[-1] == "--- End of container log ---"
+
     @mock.patch("subprocess.Popen")
     @mock.patch("select.select")
     def test_process_terminated_in_finally(self, mock_select, mock_popen):
@@ -636,3 +652,43 @@ class TestStreamLogs:
         screen._stream_logs()
 
         proc.terminate.assert_called_once()
+
+
+class TestLogViewerSearch:
+    """Tests for incremental find-next in LogViewerScreen."""
+
+    @staticmethod
+    def make_searchable_screen(lines: list[str]) -> tuple[object, mock.MagicMock]:
+        """Build a screen whose RichLog exposes *lines* as rendered strips."""
+        screen = make_log_viewer_screen()
+        log_widget = mock.MagicMock()
+        log_widget.lines = [mock.Mock(text=line) for line in lines]
+        log_widget.scroll_y = 0
+        footer = mock.MagicMock()
+        screen.query_one = lambda selector, *_: footer if selector == "#log-footer" else log_widget
+        return screen, log_widget
+
+    def test_submit_jumps_to_first_match(self) -> None:
+        screen, log_widget = self.make_searchable_screen(["a", "hit", "b", "hit"])
+        event = mock.Mock(value="hit")
+        event.input.id = "log-search"
+        screen.on_input_submitted(event)
+        log_widget.scroll_to.assert_called_with(y=1, animate=False)
+        assert not log_widget.auto_scroll
+
+    def test_next_and_previous_wrap(self) -> None:
+        screen, log_widget = self.make_searchable_screen(["a", "hit", "b", "hit"])
+        event = mock.Mock(value="hit")
+        event.input.id = "log-search"
+        screen.on_input_submitted(event)
+        screen.action_find_next()
+        log_widget.scroll_to.assert_called_with(y=3, animate=False)
+        screen.action_find_next()
+        log_widget.scroll_to.assert_called_with(y=1, animate=False)
+        screen.action_find_previous()
+        log_widget.scroll_to.assert_called_with(y=3, animate=False)
+
+    def test_find_without_pattern_does_not_scroll(self) -> None:
+        screen, log_widget = self.make_searchable_screen(["a"])
+        screen.action_find_next()
+        log_widget.scroll_to.assert_not_called()